@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmarks for rwlock.
+
+Usage: python3 benchmarks/benchmark_rwlock.py [benchmark name…]
+"""
+
+import random
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Type
+from typing import Union
+
+from readerwriterlock import rwlock
+
+s_duration_sec: float = 2.0
+
+
+def report(p_name: str, p_samples: List[float]) -> None:
+	"""Print the latency distribution of the samples (in seconds)."""
+	p_samples.sort()
+	c_p99: float = p_samples[min(len(p_samples) - 1, int(len(p_samples) * 0.99))]
+	print(f"    {p_name:<40} n={len(p_samples):<8} median={statistics.median(p_samples) * 1e6:10.2f}µs p99={c_p99 * 1e6:10.2f}µs max={p_samples[-1] * 1e6:10.2f}µs", flush=True)
+
+
+def bench_uncontended() -> None:
+	"""Uncontended acquire/release of a reader lock and of a writer lock."""
+	c_rwlock_type: Type[Union[rwlock.RWLockable, rwlock.RWLockableD]]
+	for c_rwlock_type in (rwlock.RWLockRead, rwlock.RWLockWrite, rwlock.RWLockFair, rwlock.RWLockReadD, rwlock.RWLockWriteD, rwlock.RWLockFairD, rwlock.RWLockWriteM, rwlock.RWLockWriteB, rwlock.RWLockPhaseFair, rwlock.RWLockFairQ):
+		c_rw_lock = c_rwlock_type()
+		for c_name, c_lock in (("read", c_rw_lock.gen_rlock()), ("write", c_rw_lock.gen_wlock())):
+			v_count: int = 0
+			c_end: float = time.perf_counter() + s_duration_sec / 2
+			while time.perf_counter() < c_end:
+				for _ in range(1000):
+					c_lock.acquire()
+					c_lock.release()
+				v_count += 1000
+			print(f"    {c_rwlock_type.__name__ + ' ' + c_name:<40} {v_count / (s_duration_sec / 2):14.0f} acquire+release/s", flush=True)
+
+
+def bench_downgrade() -> None:
+	"""Latency of downgrade while reader threads and a writer thread are waiting on the same lock."""
+	for c_rwlock_type in (rwlock.RWLockReadD, rwlock.RWLockWriteD, rwlock.RWLockFairD, rwlock.RWLockWriteM, rwlock.RWLockPhaseFair):
+		c_rw_lock: rwlock.RWLockableD = c_rwlock_type()
+		c_contender_locks: List[rwlock.Lockable] = [c_rw_lock.gen_rlock() for _ in range(7)] + [c_rw_lock.gen_wlock()]
+		c_barrier_start = threading.Barrier(len(c_contender_locks) + 1)
+		c_barrier_end = threading.Barrier(len(c_contender_locks) + 1)
+		v_running: bool = True
+
+		def contender(p_lock: rwlock.Lockable) -> None:
+			while True:
+				c_barrier_start.wait()
+				if not v_running: return
+				with p_lock:
+					pass
+				c_barrier_end.wait()
+
+		c_threads: List[threading.Thread] = [threading.Thread(target=contender, args=(c_lock,)) for c_lock in c_contender_locks]
+		for c_thread in c_threads:
+			c_thread.start()
+		c_samples: List[float] = []
+		c_end: float = time.perf_counter() + s_duration_sec
+		while time.perf_counter() < c_end:
+			c_lock_w = c_rw_lock.gen_wlock()
+			c_lock_w.acquire()
+			c_barrier_start.wait()
+			time.sleep(0.0005)  # Let the contenders block on the lock.
+			c_start: float = time.perf_counter()
+			c_lock_r = c_lock_w.downgrade()
+			c_samples.append(time.perf_counter() - c_start)
+			c_lock_r.release()
+			c_barrier_end.wait()
+		v_running = False
+		c_barrier_start.wait()
+		for c_thread in c_threads:
+			c_thread.join()
+		report(c_rwlock_type.__name__, c_samples)
+
+
+def bench_reader_scaling() -> None:
+	"""Read throughput of 1 to 64 reader threads (no writer)."""
+	for c_rwlock_type in (rwlock.RWLockFair, rwlock.RWLockPhaseFair, rwlock.RWLockWriteB):
+		for c_thread_count in (1, 2, 4, 8, 16, 32, 64):
+			c_rw_lock: rwlock.RWLockable = c_rwlock_type()
+			c_barrier = threading.Barrier(c_thread_count + 1)
+			c_counts: List[int] = [0] * c_thread_count
+			c_end: List[float] = []
+
+			def reader(p_index: int) -> None:
+				c_lock = c_rw_lock.gen_rlock()
+				v_count: int = 0
+				c_barrier.wait()
+				while time.perf_counter() < c_end[0]:
+					for _ in range(100):
+						c_lock.acquire()
+						c_lock.release()
+					v_count += 100
+				c_counts[p_index] = v_count
+
+			c_threads: List[threading.Thread] = [threading.Thread(target=reader, args=(c_index,)) for c_index in range(c_thread_count)]
+			for c_thread in c_threads:
+				c_thread.start()
+			c_end.append(time.perf_counter() + s_duration_sec / 2)
+			c_barrier.wait()
+			for c_thread in c_threads:
+				c_thread.join()
+			print(f"    {c_rwlock_type.__name__ + ' ' + str(c_thread_count) + ' threads':<40} {sum(c_counts) / (s_duration_sec / 2):14.0f} acquire+release/s", flush=True)
+
+
+def bench_wait_latency() -> None:
+	"""Acquire latency distribution of 6 reader threads and 2 writer threads sharing the same lock."""
+	for c_rwlock_type in (rwlock.RWLockRead, rwlock.RWLockWrite, rwlock.RWLockFair, rwlock.RWLockFairD, rwlock.RWLockPhaseFair, rwlock.RWLockFairQ):
+		c_rw_lock: rwlock.RWLockable = c_rwlock_type()
+		c_samples: List[List[float]] = [[] for _ in range(8)]
+		c_end: float = time.perf_counter() + s_duration_sec
+
+		def worker(p_index: int) -> None:
+			c_lock = c_rw_lock.gen_wlock() if p_index < 2 else c_rw_lock.gen_rlock()
+			c_samples_local = c_samples[p_index]
+			while time.perf_counter() < c_end:
+				c_start: float = time.perf_counter()
+				c_lock.acquire()
+				c_samples_local.append(time.perf_counter() - c_start)
+				time.sleep(0)
+				c_lock.release()
+
+		c_threads: List[threading.Thread] = [threading.Thread(target=worker, args=(c_index,)) for c_index in range(8)]
+		for c_thread in c_threads:
+			c_thread.start()
+		for c_thread in c_threads:
+			c_thread.join()
+		report(c_rwlock_type.__name__ + " read", [c_sample for c_samples_local in c_samples[2:] for c_sample in c_samples_local])
+		report(c_rwlock_type.__name__ + " write", c_samples[0] + c_samples[1])
+
+
+def bench_wait_policy() -> None:
+	"""Throughput of 4 writer threads holding the lock for a few microseconds, parking vs spin then park."""
+	for c_rwlock_type in (rwlock.RWLockWrite, rwlock.RWLockFair, rwlock.RWLockWriteD, rwlock.RWLockFairQ):
+		for c_wait_policy in (None, rwlock.SpinThenPark()):
+			c_rw_lock: rwlock.RWLockable = c_rwlock_type(wait_policy=c_wait_policy)
+			c_counts: List[int] = [0] * 4
+			c_end: float = time.perf_counter() + s_duration_sec / 2
+
+			def writer(p_index: int) -> None:
+				c_lock = c_rw_lock.gen_wlock()
+				v_count: int = 0
+				while time.perf_counter() < c_end:
+					with c_lock:
+						c_hold_end: float = time.perf_counter() + 0.000005
+						while time.perf_counter() < c_hold_end:
+							pass
+					v_count += 1
+				c_counts[p_index] = v_count
+
+			c_threads: List[threading.Thread] = [threading.Thread(target=writer, args=(c_index,)) for c_index in range(4)]
+			for c_thread in c_threads:
+				c_thread.start()
+			for c_thread in c_threads:
+				c_thread.join()
+			print(f"    {c_rwlock_type.__name__ + ' ' + ('park' if c_wait_policy is None else 'spin then park'):<40} {sum(c_counts) / (s_duration_sec / 2):14.0f} acquire+release/s", flush=True)
+
+
+def bench_allocations() -> None:
+	"""Bytes allocated per gen+acquire+release cycle of an uncontended reader lock and writer lock, new handles vs HandlePool."""
+	for c_rwlock_type in (rwlock.RWLockRead, rwlock.RWLockWrite, rwlock.RWLockFair, rwlock.RWLockReadD, rwlock.RWLockWriteD, rwlock.RWLockFairD, rwlock.RWLockWriteM, rwlock.RWLockWriteB, rwlock.RWLockPhaseFair, rwlock.RWLockFairQ):
+		for c_pooled in (False, True):
+			c_rw_lock: Union[rwlock.RWLockable, rwlock.RWLockableD] = c_rwlock_type()
+			if c_pooled:
+				c_rw_lock = rwlock.HandlePool(c_rw_lock)
+			for c_name, c_gen in (("read", c_rw_lock.gen_rlock), ("write", c_rw_lock.gen_wlock)):
+				for _ in range(10):  # Warm up.
+					c_lock = c_gen()
+					c_lock.acquire()
+					c_lock.release()
+				v_bytes: int = 0
+				tracemalloc.start()
+				for _ in range(1000):
+					tracemalloc.clear_traces()
+					c_lock = c_gen()
+					c_lock.acquire()
+					c_lock.release()
+					v_bytes += tracemalloc.get_traced_memory()[1]
+				tracemalloc.stop()
+				print(f"    {c_rwlock_type.__name__ + ' ' + c_name + (' pooled' if c_pooled else ''):<40} {v_bytes / 1000:14.1f} bytes/cycle", flush=True)
+
+
+def bench_striped() -> None:
+	"""Throughput of 8 threads reading (80%) and writing (20%) random keys among 1024, a single RWLockFair vs StripedRWLock of RWLockFair at several stripe counts."""
+	for c_stripe_count in (0, 1, 4, 16, 64):
+		c_rw_lock_single = rwlock.RWLockFair()
+		c_rw_lock_striped = rwlock.StripedRWLock(max(1, c_stripe_count))
+		c_counts: List[int] = [0] * 8
+		c_end: float = time.perf_counter() + s_duration_sec / 2
+
+		def worker(p_index: int) -> None:
+			c_random = random.Random(p_index)
+			c_ops = [(c_random.randrange(1024), c_random.random() < 0.2) for _ in range(100)]
+			v_count: int = 0
+			while time.perf_counter() < c_end:
+				for c_key, c_is_writer in c_ops:
+					c_lock: rwlock.Lockable
+					if 0 == c_stripe_count:
+						c_lock = c_rw_lock_single.gen_wlock() if c_is_writer else c_rw_lock_single.gen_rlock()
+					else:
+						c_lock = c_rw_lock_striped.gen_wlock(c_key) if c_is_writer else c_rw_lock_striped.gen_rlock(c_key)
+					with c_lock:
+						time.sleep(0)  # Let the other threads run while holding the lock.
+				v_count += len(c_ops)
+			c_counts[p_index] = v_count
+
+		c_threads: List[threading.Thread] = [threading.Thread(target=worker, args=(c_index,)) for c_index in range(8)]
+		for c_thread in c_threads:
+			c_thread.start()
+		for c_thread in c_threads:
+			c_thread.join()
+		print(f"    {'RWLockFair' if 0 == c_stripe_count else 'StripedRWLock ' + str(c_stripe_count) + ' stripes':<40} {sum(c_counts) / (s_duration_sec / 2):14.0f} acquire+release/s", flush=True)
+
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+	"uncontended": bench_uncontended,
+	"downgrade": bench_downgrade,
+	"reader_scaling": bench_reader_scaling,
+	"wait_latency": bench_wait_latency,
+	"wait_policy": bench_wait_policy,
+	"allocations": bench_allocations,
+	"striped": bench_striped,
+}
+
+if "__main__" == __name__:
+	for c_name in sys.argv[1:] or list(BENCHMARKS):
+		print(f"{c_name}: {BENCHMARKS[c_name].__doc__}", flush=True)
+		BENCHMARKS[c_name]()
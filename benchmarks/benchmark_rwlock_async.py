@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmarks for rwlock_async.
+
+Usage: python3 benchmarks/benchmark_rwlock_async.py [benchmark name…]
+"""
+
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Type
+from typing import Union
+
+from readerwriterlock import rwlock_async
+
+s_duration_sec: float = 2.0
+
+
+def bench_uncontended() -> None:
+	"""Uncontended acquire/release of a reader lock and of a writer lock (an event loop native engine is compared to the original engine of the same policy)."""
+	async def run() -> None:
+		c_rwlock_type: Type[Union[rwlock_async.RWLockable, rwlock_async.RWLockableD]]
+		c_rates: Dict[str, float] = {}
+		for c_rwlock_type in (rwlock_async.RWLockRead, rwlock_async.RWLockWrite, rwlock_async.RWLockFair, rwlock_async.RWLockReadD, rwlock_async.RWLockWriteD, rwlock_async.RWLockFairD, rwlock_async.RWLockReadM, rwlock_async.RWLockWriteM, rwlock_async.RWLockFairM):
+			c_rw_lock = c_rwlock_type()
+			for c_name, c_lock in (("read", await c_rw_lock.gen_rlock()), ("write", await c_rw_lock.gen_wlock())):
+				v_count: int = 0
+				c_end: float = time.perf_counter() + s_duration_sec / 2
+				while time.perf_counter() < c_end:
+					for _ in range(1000):
+						await c_lock.acquire()
+						await c_lock.release()
+					v_count += 1000
+				c_name = c_rwlock_type.__name__ + " " + c_name
+				c_rates[c_name] = v_count / (s_duration_sec / 2)
+				c_original: Optional[float] = c_rates.get(c_name.replace("M ", " ")) if c_rwlock_type.__name__.endswith("M") else None
+				print(f"    {c_name:<40} {c_rates[c_name]:14.0f} acquire+release/s" + ("" if c_original is None else f" (x{c_rates[c_name] / c_original:.1f})"), flush=True)
+	asyncio.get_event_loop().run_until_complete(run())
+
+
+def bench_contended() -> None:
+	"""Throughput of 8 reader tasks and 2 writer tasks sharing the same lock."""
+	async def run() -> None:
+		for c_rwlock_type in (rwlock_async.RWLockRead, rwlock_async.RWLockWrite, rwlock_async.RWLockFair, rwlock_async.RWLockReadM, rwlock_async.RWLockWriteM, rwlock_async.RWLockFairM, rwlock_async.RWLockPhaseFair):
+			c_rw_lock = c_rwlock_type()
+			c_end: float = time.perf_counter() + s_duration_sec / 2
+
+			async def worker(p_lock: rwlock_async.Lockable) -> int:
+				v_count: int = 0
+				while time.perf_counter() < c_end:
+					async with p_lock:
+						await asyncio.sleep(0)
+					v_count += 1
+				return v_count
+			c_counts = await asyncio.gather(*[worker(await c_rw_lock.gen_rlock()) for _ in range(8)], *[worker(await c_rw_lock.gen_wlock()) for _ in range(2)])
+			print(f"    {c_rwlock_type.__name__:<40} read={sum(c_counts[:8]) / (s_duration_sec / 2):12.0f}/s write={sum(c_counts[8:]) / (s_duration_sec / 2):12.0f}/s", flush=True)
+	asyncio.get_event_loop().run_until_complete(run())
+
+
+def bench_allocations() -> None:
+	"""Bytes allocated per gen+acquire+release cycle of an uncontended reader lock and writer lock (the coroutines of the cycle included, there is thus no handle pool in rwlock_async)."""
+	async def run() -> None:
+		for c_rwlock_type in (rwlock_async.RWLockRead, rwlock_async.RWLockWrite, rwlock_async.RWLockFair, rwlock_async.RWLockReadD, rwlock_async.RWLockWriteD, rwlock_async.RWLockFairD, rwlock_async.RWLockReadM, rwlock_async.RWLockWriteM, rwlock_async.RWLockFairM, rwlock_async.RWLockPhaseFair):
+			c_rw_lock: rwlock_async.RWLockable = c_rwlock_type()
+			for c_name, c_gen in (("read", c_rw_lock.gen_rlock), ("write", c_rw_lock.gen_wlock)):
+				for _ in range(10):  # Warm up.
+					c_lock = await c_gen()
+					await c_lock.acquire()
+					await c_lock.release()
+				v_bytes: int = 0
+				tracemalloc.start()
+				for _ in range(1000):
+					tracemalloc.clear_traces()
+					c_lock = await c_gen()
+					await c_lock.acquire()
+					await c_lock.release()
+					v_bytes += tracemalloc.get_traced_memory()[1]
+				tracemalloc.stop()
+				print(f"    {c_rwlock_type.__name__ + ' ' + c_name:<40} {v_bytes / 1000:14.1f} bytes/cycle", flush=True)
+	asyncio.get_event_loop().run_until_complete(run())
+
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+	"uncontended": bench_uncontended,
+	"contended": bench_contended,
+	"allocations": bench_allocations,
+}
+
+if "__main__" == __name__:
+	for c_name in sys.argv[1:] or list(BENCHMARKS):
+		print(f"{c_name}: {BENCHMARKS[c_name].__doc__}", flush=True)
+		BENCHMARKS[c_name]()
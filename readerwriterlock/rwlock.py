@@ -3,14 +3,36 @@
 
 """Read Write Lock."""
 
-import threading
+import array
+import collections
+import inspect
+import itertools
+import json
+import os
+import math
+import random
 import sys
+import threading
 import time
+import traceback
+import warnings
+import weakref
 
 from typing import Any
 from typing import Callable
+from typing import cast
+from typing import Deque
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
 from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Tuple
 from typing import Type
+from typing import Union
 from types import TracebackType
 from typing_extensions import Protocol
 from typing_extensions import runtime_checkable
@@ -18,6 +40,8 @@ from typing_extensions import runtime_checkable
 RELEASE_ERR_MSG: str
 RELEASE_ERR_CLS: type
 
+_GIL_ENABLED: bool = getattr(sys, "_is_gil_enabled", lambda: True)()  # False on a free-threaded build running without the GIL (it is never disabled later on).
+
 try:
 	threading.Lock().release()
 	raise AssertionError()  # pragma: no cover
@@ -29,8 +53,10 @@ else:
 
 
 @runtime_checkable
-class Lockable(Protocol):
-	"""Lockable.  Compatible with threading.Lock interface."""
+class BaseLockable(Protocol):
+	"""Lockable of the threading.Lock interface: what a lock factory produces."""
+
+	__slots__ = ()
 
 	def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
 		"""Acquire a lock."""
@@ -55,22 +81,48 @@ class Lockable(Protocol):
 		return False
 
 
+@runtime_checkable
+class Lockable(BaseLockable, Protocol):
+	"""Lockable.  Compatible with threading.Lock interface, its acquire also takes an absolute deadline (of the time source of the lock)."""
+
+	__slots__ = ()
+
+	def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+		"""Acquire a lock."""
+		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
+
+
 @runtime_checkable
 class LockableD(Lockable, Protocol):
 	"""Lockable Downgradable."""
 
+	__slots__ = ()
+
 	def downgrade(self) -> Lockable:
 		"""Downgrade."""
 		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
 
 
+@runtime_checkable
+class LockableU(Lockable, Protocol):
+	"""Lockable Upgradable."""
+
+	__slots__ = ()
+
+	def upgrade(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> Optional[LockableD]:
+		"""Upgrade, None if it could not before the deadline."""
+		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
+
+
 class _ThreadSafeInt():
 	"""Internal thread safe integer like object.
 
 	Implements only the bare minimum features for the RWLock implementation's need.
 	"""
 
-	def __init__(self, initial_value: int, lock_factory: Callable[[], Lockable] = threading.Lock) -> None:
+	__slots__ = ("__value_lock", "__value")
+
+	def __init__(self, initial_value: int, lock_factory: Callable[[], BaseLockable] = threading.Lock) -> None:
 		"""Init."""
 		self.__value_lock = lock_factory()
 		self.__value: int = initial_value
@@ -85,19 +137,177 @@ class _ThreadSafeInt():
 
 	def increment(self) -> None:
 		"""Increment value by one."""
-		with self.__value_lock:
+		self.__value_lock.acquire()
+		try:
 			self.__value += 1
+		finally:
+			self.__value_lock.release()
 
 	def decrement(self) -> None:
 		"""Decrement value by one."""
-		with self.__value_lock:
+		self.__value_lock.acquire()
+		try:
 			self.__value -= 1
+		finally:
+			self.__value_lock.release()
+
+
+def _wait_condition(p_condition: threading.Condition, c_deadline: Optional[float], time_source: Callable[[], float]) -> bool:
+	"""Wait on a condition whose lock is held, return False if the deadline is expired."""
+	if c_deadline is None:
+		p_condition.wait()
+		return True
+	c_remaining: float = c_deadline - time_source()
+	if c_remaining <= 0: return False
+	p_condition.wait(c_remaining)
+	return True
+
+
+def _deadline(blocking: bool, timeout: float, deadline: Optional[float], time_source: Callable[[], float]) -> Optional[float]:
+	"""Absolute deadline of an acquire (None if it can wait forever, -inf if it cannot wait), the clock is only read for a relative timeout."""
+	if not blocking: return -math.inf
+	if timeout < 0: return deadline
+	c_deadline: float = time_source() + timeout
+	return c_deadline if deadline is None or c_deadline < deadline else deadline
+
+
+class _Deadline():
+	"""Internal deadline of an acquire with a relative timeout, turned into an absolute deadline the first time it is needed."""
+
+	__slots__ = ("c_timeout", "c_deadline", "c_time_source", "v_at")
+
+	def __init__(self, p_timeout: float, p_deadline: Optional[float], p_time_source: Callable[[], float]) -> None:
+		"""Init."""
+		self.c_timeout = p_timeout
+		self.c_deadline = p_deadline
+		self.c_time_source = p_time_source
+		self.v_at: Optional[float] = None
+
+	def at(self) -> float:
+		"""Absolute deadline, the clock is read on the first call."""
+		if self.v_at is None:
+			c_at: float = self.c_time_source() + self.c_timeout
+			self.v_at = c_at if self.c_deadline is None or c_at < self.c_deadline else self.c_deadline
+		return self.v_at
+
+
+def _lazy_deadline(blocking: bool, timeout: float, deadline: Optional[float], time_source: Callable[[], float]) -> Union[None, float, _Deadline]:
+	"""Deadline of an acquire like _deadline(), except that a relative timeout only reads the clock once a lock is busy (see _acquire_before())."""
+	if not blocking: return -math.inf
+	if timeout < 0: return deadline
+	return _Deadline(timeout, deadline, time_source)
+
+
+def _acquire_before(p_lock: BaseLockable, c_deadline: Union[None, float, _Deadline], time_source: Callable[[], float]) -> bool:
+	"""Acquire the lock before the deadline, the clock is only read when the lock is busy."""
+	if c_deadline is None: return p_lock.acquire()
+	if p_lock.acquire(False): return True
+	if -math.inf == c_deadline: return False
+	c_remaining: float = (c_deadline.at() if isinstance(c_deadline, _Deadline) else c_deadline) - time_source()
+	return 0 < c_remaining and p_lock.acquire(True, c_remaining)
+
+
+def _timeout(timeout: float, deadline: Optional[float], time_source: Callable[[], float]) -> float:
+	"""Relative timeout of a blocking acquire bounded by its deadline (-1 if none, 0 if expired), the clock is only read for a deadline."""
+	if deadline is None: return timeout
+	c_remaining: float = max(0.0, deadline - time_source())
+	return c_remaining if timeout < 0 or c_remaining < timeout else timeout
+
+
+_TAKES_DEADLINE: Dict[type, bool] = {}
+
+
+def _takes_deadline(p_lock: Any) -> bool:
+	"""Answer to 'does the acquire of this lock take a deadline?' (a lock of another package may only take the documented blocking and timeout)."""
+	c_type = type(p_lock)
+	result: Optional[bool] = _TAKES_DEADLINE.get(c_type)
+	if result is None:
+		try:
+			result = "deadline" in inspect.signature(p_lock.acquire).parameters
+		except (TypeError, ValueError):  # No signature (e.g. a builtin lock).
+			result = False
+		_TAKES_DEADLINE[c_type] = result
+	return result
+
+
+def _acquire_lock(p_lock: BaseLockable, blocking: bool, timeout: float, deadline: Optional[float], time_source: Callable[[], float] = time.perf_counter) -> bool:
+	"""Acquire a wrapped lock, the deadline is forwarded only when set and turned into the time left for a lock whose acquire does not take one."""
+	if deadline is None: return p_lock.acquire(blocking, timeout)
+	if _takes_deadline(p_lock): return cast(Lockable, p_lock).acquire(blocking, timeout, deadline=deadline)
+	return p_lock.acquire(True, _timeout(timeout, deadline, time_source)) if blocking else p_lock.acquire(False)
+
+
+@runtime_checkable
+class WaitPolicy(Protocol):
+	"""Wait policy: decorate a lock factory so that the produced locks wait according to the policy."""
+
+	__slots__ = ()
+
+	def __call__(self, lock_factory: Callable[[], BaseLockable]) -> Callable[[], BaseLockable]:
+		"""Decorate the lock factory."""
+		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
+
+
+class SpinThenPark(WaitPolicy):
+	"""Wait policy polling a busy lock for a bounded, self tuned, number of iterations before parking on it.
+
+	Each produced lock keeps a moving average of the number of polls its recent contended acquisitions needed (a measure of its recent hold times):
+	- It polls up to twice that average (capped by max_spin), yielding the GIL between the polls, before parking.
+	- A poll which succeeds pulls the average toward its iteration, a fruitless spin halves it so that long hold times quickly go back to parking.
+	The average is only a hint: concurrent updates of it may be lost (with or without the GIL), it then merely polls a little more or less.
+	"""
+
+	__slots__ = ("c_max_spin", "c_time_source")
+
+	def __init__(self, max_spin: int = 100, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init."""
+		self.c_max_spin = max_spin
+		self.c_time_source = time_source
+
+	def __call__(self, lock_factory: Callable[[], BaseLockable]) -> Callable[[], BaseLockable]:
+		"""Decorate the lock factory."""
+		return lambda: SpinThenPark._aLock(lock_factory(), self)
+
+	class _aLock(BaseLockable):
+		__slots__ = ("c_lock", "c_policy", "v_spin_avg")
+
+		def __init__(self, p_lock: BaseLockable, p_policy: "SpinThenPark") -> None:
+			self.c_lock = p_lock
+			self.c_policy = p_policy
+			self.v_spin_avg: float = p_policy.c_max_spin / 4
+
+		def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+			"""Acquire a lock."""
+			c_lock = self.c_lock
+			if c_lock.acquire(False): return True
+			if not blocking or 0 == timeout: return False
+			c_time_source = self.c_policy.c_time_source
+			c_deadline: Optional[float] = None if timeout < 0 else (c_time_source() + timeout)
+			c_spin_max: int = min(self.c_policy.c_max_spin, 2 * int(self.v_spin_avg) + 1)
+			for c_spin in range(1, c_spin_max + 1):
+				time.sleep(0)  # Yield, the holder may be waiting for the GIL.
+				if c_lock.acquire(False):
+					self.v_spin_avg += (c_spin - self.v_spin_avg) / 8
+					return True
+				if c_deadline is not None and c_time_source() >= c_deadline: return False
+			self.v_spin_avg /= 2
+			return c_lock.acquire(True, (-1 if c_deadline is None else max(0.0, c_deadline - c_time_source())))
+
+		def release(self) -> None:
+			"""Release the lock."""
+			self.c_lock.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.c_lock.locked()
 
 
 @runtime_checkable
 class RWLockable(Protocol):
 	"""Read/write lock."""
 
+	__slots__ = ()
+
 	def gen_rlock(self) -> Lockable:
 		"""Generate a reader lock."""
 		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
@@ -111,6 +321,23 @@ class RWLockable(Protocol):
 class RWLockableD(Protocol):
 	"""Read/write lock Downgradable."""
 
+	__slots__ = ()
+
+	def gen_rlock(self) -> Lockable:
+		"""Generate a reader lock."""
+		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
+
+	def gen_wlock(self) -> LockableD:
+		"""Generate a writer lock."""
+		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
+
+
+@runtime_checkable
+class RWLockableU(Protocol):
+	"""Read/write lock Upgradable."""
+
+	__slots__ = ()
+
 	def gen_rlock(self) -> Lockable:
 		"""Generate a reader lock."""
 		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
@@ -119,31 +346,40 @@ class RWLockableD(Protocol):
 		"""Generate a writer lock."""
 		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
 
+	def gen_ulock(self) -> LockableU:
+		"""Generate an upgradable reader lock."""
+		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
+
 
 class RWLockRead(RWLockable):
 	"""A Read/Write lock giving preference to Reader."""
 
-	def __init__(self, lock_factory: Callable[[], Lockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+	__slots__ = ("v_read_count", "c_time_source", "c_resource", "c_lock_read_count")
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
 		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
 		self.v_read_count: int = 0
 		self.c_time_source = time_source
 		self.c_resource = lock_factory()
 		self.c_lock_read_count = lock_factory()
 
 	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockRead") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout: Optional[float] = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline: Optional[float] = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			if not self.c_rw_lock.c_lock_read_count.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not _acquire_before(self.c_rw_lock.c_lock_read_count, c_deadline, self.c_rw_lock.c_time_source):
 				return False
 			self.c_rw_lock.v_read_count += 1
 			if 1 == self.c_rw_lock.v_read_count:
-				if not self.c_rw_lock.c_resource.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+				if not _acquire_before(self.c_rw_lock.c_resource, c_deadline, self.c_rw_lock.c_time_source):
 					self.c_rw_lock.v_read_count -= 1
 					self.c_rw_lock.c_lock_read_count.release()
 					return False
@@ -166,13 +402,16 @@ class RWLockRead(RWLockable):
 			return self.v_locked
 
 	class _aWriter(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockRead") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			locked: bool = self.c_rw_lock.c_resource.acquire(blocking, timeout)
+			c_rw_lock = self.c_rw_lock
+			locked: bool = c_rw_lock.c_resource.acquire(blocking, timeout) if deadline is None else _acquire_before(c_rw_lock.c_resource, _lazy_deadline(blocking, timeout, deadline, c_rw_lock.c_time_source), c_rw_lock.c_time_source)
 			self.v_locked = locked
 			return locked
 
@@ -198,8 +437,12 @@ class RWLockRead(RWLockable):
 class RWLockWrite(RWLockable):
 	"""A Read/Write lock giving preference to Writer."""
 
-	def __init__(self, lock_factory: Callable[[], Lockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+	__slots__ = ("v_read_count", "v_write_count", "c_time_source", "c_lock_read_count", "c_lock_write_count", "c_lock_read_entry", "c_lock_read_try", "c_resource")
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
 		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
 		self.v_read_count: int = 0
 		self.v_write_count: int = 0
 		self.c_time_source = time_source
@@ -210,26 +453,27 @@ class RWLockWrite(RWLockable):
 		self.c_resource = lock_factory()
 
 	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockWrite") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			if not self.c_rw_lock.c_lock_read_entry.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not _acquire_before(self.c_rw_lock.c_lock_read_entry, c_deadline, self.c_rw_lock.c_time_source):
 				return False
-			if not self.c_rw_lock.c_lock_read_try.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			if not _acquire_before(self.c_rw_lock.c_lock_read_try, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_read_entry.release()
 				return False
-			if not self.c_rw_lock.c_lock_read_count.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			if not _acquire_before(self.c_rw_lock.c_lock_read_count, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_read_try.release()
 				self.c_rw_lock.c_lock_read_entry.release()
 				return False
 			self.c_rw_lock.v_read_count += 1
 			if 1 == self.c_rw_lock.v_read_count:
-				if not self.c_rw_lock.c_resource.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+				if not _acquire_before(self.c_rw_lock.c_resource, c_deadline, self.c_rw_lock.c_time_source):
 					self.c_rw_lock.c_lock_read_try.release()
 					self.c_rw_lock.c_lock_read_entry.release()
 					self.c_rw_lock.v_read_count -= 1
@@ -256,24 +500,25 @@ class RWLockWrite(RWLockable):
 			return self.v_locked
 
 	class _aWriter(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockWrite") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			if not self.c_rw_lock.c_lock_write_count.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not _acquire_before(self.c_rw_lock.c_lock_write_count, c_deadline, self.c_rw_lock.c_time_source):
 				return False
 			self.c_rw_lock.v_write_count += 1
 			if 1 == self.c_rw_lock.v_write_count:
-				if not self.c_rw_lock.c_lock_read_try.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+				if not _acquire_before(self.c_rw_lock.c_lock_read_try, c_deadline, self.c_rw_lock.c_time_source):
 					self.c_rw_lock.v_write_count -= 1
 					self.c_rw_lock.c_lock_write_count.release()
 					return False
 			self.c_rw_lock.c_lock_write_count.release()
-			if not self.c_rw_lock.c_resource.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			if not _acquire_before(self.c_rw_lock.c_resource, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_write_count.acquire()
 				self.c_rw_lock.v_write_count -= 1
 				if 0 == self.c_rw_lock.v_write_count:
@@ -310,8 +555,12 @@ class RWLockWrite(RWLockable):
 class RWLockFair(RWLockable):
 	"""A Read/Write lock giving fairness to both Reader and Writer."""
 
-	def __init__(self, lock_factory: Callable[[], Lockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+	__slots__ = ("v_read_count", "c_time_source", "c_lock_read_count", "c_lock_read", "c_lock_write")
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
 		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
 		self.v_read_count: int = 0
 		self.c_time_source = time_source
 		self.c_lock_read_count = lock_factory()
@@ -319,22 +568,23 @@ class RWLockFair(RWLockable):
 		self.c_lock_write = lock_factory()
 
 	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockFair") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			if not self.c_rw_lock.c_lock_read.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not _acquire_before(self.c_rw_lock.c_lock_read, c_deadline, self.c_rw_lock.c_time_source):
 				return False
-			if not self.c_rw_lock.c_lock_read_count.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			if not _acquire_before(self.c_rw_lock.c_lock_read_count, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_read.release()
 				return False
 			self.c_rw_lock.v_read_count += 1
 			if 1 == self.c_rw_lock.v_read_count:
-				if not self.c_rw_lock.c_lock_write.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+				if not _acquire_before(self.c_rw_lock.c_lock_write, c_deadline, self.c_rw_lock.c_time_source):
 					self.c_rw_lock.v_read_count -= 1
 					self.c_rw_lock.c_lock_read_count.release()
 					self.c_rw_lock.c_lock_read.release()
@@ -359,17 +609,18 @@ class RWLockFair(RWLockable):
 			return self.v_locked
 
 	class _aWriter(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockFair") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			if not self.c_rw_lock.c_lock_read.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not _acquire_before(self.c_rw_lock.c_lock_read, c_deadline, self.c_rw_lock.c_time_source):
 				return False
-			if not self.c_rw_lock.c_lock_write.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			if not _acquire_before(self.c_rw_lock.c_lock_write, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_read.release()
 				return False
 			self.v_locked = True
@@ -396,33 +647,51 @@ class RWLockFair(RWLockable):
 
 
 class RWLockReadD(RWLockableD):
-	"""A Read/Write lock giving preference to Reader."""
+	"""A Read/Write lock giving preference to Reader.
+
+	Implemented as a single monitor so that a writer can be downgraded atomically: it turns directly into a reader within the lock state.
+	"""
+
+	__slots__ = ("v_read_count", "v_read_waiting", "v_write_count", "c_time_source", "c_lock_state", "c_cond_read", "c_cond_write")
 
-	def __init__(self, lock_factory: Callable[[], Lockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
 		"""Init."""
-		self.v_read_count: _ThreadSafeInt = _ThreadSafeInt(initial_value=0, lock_factory=lock_factory)
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
+		self.v_read_count: int = 0
+		self.v_read_waiting: int = 0
+		self.v_write_count: int = 0
 		self.c_time_source = time_source
-		self.c_resource = lock_factory()
-		self.c_lock_read_count = lock_factory()
+		self.c_lock_state = lock_factory()
+		self.c_cond_read = threading.Condition(self.c_lock_state)  # type: ignore [arg-type]
+		self.c_cond_write = threading.Condition(self.c_lock_state)  # type: ignore [arg-type]
 
 	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockReadD") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout: Optional[float] = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline: Optional[float] = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			if not self.c_rw_lock.c_lock_read_count.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
-				return False
-			self.c_rw_lock.v_read_count.increment()
-			if 1 == int(self.c_rw_lock.v_read_count):
-				if not self.c_rw_lock.c_resource.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
-					self.c_rw_lock.v_read_count.decrement()
-					self.c_rw_lock.c_lock_read_count.release()
-					return False
-			self.c_rw_lock.c_lock_read_count.release()
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				if c_rw_lock.v_write_count:
+					if not blocking: return False
+					c_deadline: Optional[float] = _deadline(True, timeout, deadline, c_rw_lock.c_time_source)
+					c_rw_lock.v_read_waiting += 1
+					while c_rw_lock.v_write_count:
+						if not _wait_condition(c_rw_lock.c_cond_read, c_deadline, c_rw_lock.c_time_source):
+							c_rw_lock.v_read_waiting -= 1
+							if 0 == c_rw_lock.v_read_waiting and 0 == c_rw_lock.v_write_count and 0 == c_rw_lock.v_read_count:
+								c_rw_lock.c_cond_write.notify()  # Writers were only held back by this waiting reader.
+							return False
+					c_rw_lock.v_read_waiting -= 1
+				c_rw_lock.v_read_count += 1
+			finally:
+				c_rw_lock.c_lock_state.release()
 			self.v_locked = True
 			return True
 
@@ -430,57 +699,74 @@ class RWLockReadD(RWLockableD):
 			"""Release the lock."""
 			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
 			self.v_locked = False
-			self.c_rw_lock.c_lock_read_count.acquire()
-			self.c_rw_lock.v_read_count.decrement()
-			if 0 == int(self.c_rw_lock.v_read_count):
-				self.c_rw_lock.c_resource.release()
-			self.c_rw_lock.c_lock_read_count.release()
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				c_rw_lock.v_read_count -= 1
+				if 0 == c_rw_lock.v_read_count and 0 == c_rw_lock.v_read_waiting:
+					c_rw_lock.c_cond_write.notify()
+			finally:
+				c_rw_lock.c_lock_state.release()
 
 		def locked(self) -> bool:
 			"""Answer to 'is it currently locked?'."""
 			return self.v_locked
 
 	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockReadD") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			locked: bool = self.c_rw_lock.c_resource.acquire(blocking, timeout)
-			self.v_locked = locked
-			return locked
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				if c_rw_lock.v_write_count or c_rw_lock.v_read_count or c_rw_lock.v_read_waiting:
+					if not blocking: return False
+					c_deadline: Optional[float] = _deadline(True, timeout, deadline, c_rw_lock.c_time_source)
+					while c_rw_lock.v_write_count or c_rw_lock.v_read_count or c_rw_lock.v_read_waiting:
+						if not _wait_condition(c_rw_lock.c_cond_write, c_deadline, c_rw_lock.c_time_source): return False
+				c_rw_lock.v_write_count = 1
+			finally:
+				c_rw_lock.c_lock_state.release()
+			self.v_locked = True
+			return True
 
 		def downgrade(self) -> Lockable:
 			"""Downgrade."""
 			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				c_rw_lock.v_write_count = 0
+				c_rw_lock.v_read_count += 1
+				if c_rw_lock.v_read_waiting:
+					c_rw_lock.c_cond_read.notify_all()
+			finally:
+				c_rw_lock.c_lock_state.release()
+			self.v_locked = False
 
-			result = self.c_rw_lock.gen_rlock()
-
-			wait_blocking: bool = True
-
-			def lock_result() -> None:
-				nonlocal wait_blocking
-				wait_blocking = False
-				result.acquire()  # This is a blocking action
-
-			threading.Thread(group=None, target=lock_result, name="RWLockReadD_Downgrade", daemon=False).start()
-			while wait_blocking:  # Busy wait for the thread to be almost in its blocking state.
-				time.sleep(sys.float_info.min)
-
-			for _ in range(123): time.sleep(sys.float_info.min)  # Heuristic sleep delay to leave some extra time for the thread to block.
-
-			self.release()  # Open the gate! the current RW lock strategy gives priority to reader, therefore the result will acquire lock before any other writer lock.
-
-			while not result.locked():
-				time.sleep(sys.float_info.min)  # Busy wait for the threads to complete their tasks.
+			result = c_rw_lock._aReader(p_RWLock=c_rw_lock)
+			result.v_locked = True
 			return result
 
 		def release(self) -> None:
 			"""Release the lock."""
 			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
 			self.v_locked = False
-			self.c_rw_lock.c_resource.release()
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				c_rw_lock.v_write_count = 0
+				if c_rw_lock.v_read_waiting:
+					c_rw_lock.c_cond_read.notify_all()
+				else:
+					c_rw_lock.c_cond_write.notify()
+			finally:
+				c_rw_lock.c_lock_state.release()
 
 		def locked(self) -> bool:
 			"""Answer to 'is it currently locked?'."""
@@ -498,8 +784,12 @@ class RWLockReadD(RWLockableD):
 class RWLockWriteD(RWLockableD):
 	"""A Read/Write lock giving preference to Writer."""
 
-	def __init__(self, lock_factory: Callable[[], Lockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+	__slots__ = ("v_read_count", "v_write_count", "c_time_source", "c_lock_read_count", "c_lock_write_count", "c_lock_read_entry", "c_lock_read_try", "c_resource")
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
 		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
 		self.v_read_count: _ThreadSafeInt = _ThreadSafeInt(lock_factory=lock_factory, initial_value=0)
 		self.v_write_count: int = 0
 		self.c_time_source = time_source
@@ -510,26 +800,27 @@ class RWLockWriteD(RWLockableD):
 		self.c_resource = lock_factory()
 
 	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockWriteD") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			if not self.c_rw_lock.c_lock_read_entry.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not _acquire_before(self.c_rw_lock.c_lock_read_entry, c_deadline, self.c_rw_lock.c_time_source):
 				return False
-			if not self.c_rw_lock.c_lock_read_try.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			if not _acquire_before(self.c_rw_lock.c_lock_read_try, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_read_entry.release()
 				return False
-			if not self.c_rw_lock.c_lock_read_count.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			if not _acquire_before(self.c_rw_lock.c_lock_read_count, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_read_try.release()
 				self.c_rw_lock.c_lock_read_entry.release()
 				return False
 			self.c_rw_lock.v_read_count.increment()
 			if 1 == self.c_rw_lock.v_read_count:
-				if not self.c_rw_lock.c_resource.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+				if not _acquire_before(self.c_rw_lock.c_resource, c_deadline, self.c_rw_lock.c_time_source):
 					self.c_rw_lock.c_lock_read_try.release()
 					self.c_rw_lock.c_lock_read_entry.release()
 					self.c_rw_lock.v_read_count.decrement()
@@ -556,24 +847,25 @@ class RWLockWriteD(RWLockableD):
 			return self.v_locked
 
 	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockWriteD") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			if not self.c_rw_lock.c_lock_write_count.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not _acquire_before(self.c_rw_lock.c_lock_write_count, c_deadline, self.c_rw_lock.c_time_source):
 				return False
 			self.c_rw_lock.v_write_count += 1
 			if 1 == self.c_rw_lock.v_write_count:
-				if not self.c_rw_lock.c_lock_read_try.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+				if not _acquire_before(self.c_rw_lock.c_lock_read_try, c_deadline, self.c_rw_lock.c_time_source):
 					self.c_rw_lock.v_write_count -= 1
 					self.c_rw_lock.c_lock_write_count.release()
 					return False
 			self.c_rw_lock.c_lock_write_count.release()
-			if not self.c_rw_lock.c_resource.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			if not _acquire_before(self.c_rw_lock.c_resource, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_write_count.acquire()
 				self.c_rw_lock.v_write_count -= 1
 				if 0 == self.c_rw_lock.v_write_count:
@@ -626,8 +918,12 @@ class RWLockWriteD(RWLockableD):
 class RWLockFairD(RWLockableD):
 	"""A Read/Write lock giving fairness to both Reader and Writer."""
 
-	def __init__(self, lock_factory: Callable[[], Lockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+	__slots__ = ("v_read_count", "c_time_source", "c_lock_read_count", "c_lock_read", "c_lock_write")
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
 		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
 		self.v_read_count: int = 0
 		self.c_time_source = time_source
 		self.c_lock_read_count = lock_factory()
@@ -635,22 +931,23 @@ class RWLockFairD(RWLockableD):
 		self.c_lock_write = lock_factory()
 
 	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockFairD") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			if not self.c_rw_lock.c_lock_read.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not _acquire_before(self.c_rw_lock.c_lock_read, c_deadline, self.c_rw_lock.c_time_source):
 				return False
-			if not self.c_rw_lock.c_lock_read_count.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			if not _acquire_before(self.c_rw_lock.c_lock_read_count, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_read.release()
 				return False
 			self.c_rw_lock.v_read_count += 1
 			if 1 == self.c_rw_lock.v_read_count:
-				if not self.c_rw_lock.c_lock_write.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+				if not _acquire_before(self.c_rw_lock.c_lock_write, c_deadline, self.c_rw_lock.c_time_source):
 					self.c_rw_lock.v_read_count -= 1
 					self.c_rw_lock.c_lock_read_count.release()
 					self.c_rw_lock.c_lock_read.release()
@@ -675,17 +972,18 @@ class RWLockFairD(RWLockableD):
 			return self.v_locked
 
 	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockFairD") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			if not self.c_rw_lock.c_lock_read.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not _acquire_before(self.c_rw_lock.c_lock_read, c_deadline, self.c_rw_lock.c_time_source):
 				return False
-			if not self.c_rw_lock.c_lock_write.acquire(blocking=True, timeout=-1 if c_deadline is None else max(0, c_deadline - self.c_rw_lock.c_time_source())):
+			if not _acquire_before(self.c_rw_lock.c_lock_write, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_read.release()
 				return False
 			self.v_locked = True
@@ -694,7 +992,9 @@ class RWLockFairD(RWLockableD):
 		def downgrade(self) -> Lockable:
 			"""Downgrade."""
 			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.c_rw_lock.c_lock_read_count.acquire()
 			self.c_rw_lock.v_read_count += 1
+			self.c_rw_lock.c_lock_read_count.release()
 
 			self.v_locked = False
 			self.c_rw_lock.c_lock_read.release()
@@ -721,3 +1021,2667 @@ class RWLockFairD(RWLockableD):
 	def gen_wlock(self) -> "RWLockFairD._aWriter":
 		"""Generate a writer lock."""
 		return RWLockFairD._aWriter(self)
+
+
+class RWLockWriteM(RWLockableD):
+	"""A Read/Write lock giving preference to Writer.
+
+	Implemented as a single monitor: the reader count, the writer count and the waiting writer count are protected by one mutex and waited on through condition variables.
+	"""
+
+	__slots__ = ("v_read_count", "v_write_count", "v_write_waiting", "c_time_source", "c_lock_state", "c_cond_read", "c_cond_write")
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
+		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
+		self.v_read_count: int = 0
+		self.v_write_count: int = 0
+		self.v_write_waiting: int = 0
+		self.c_time_source = time_source
+		self.c_lock_state = lock_factory()
+		self.c_cond_read = threading.Condition(self.c_lock_state)  # type: ignore [arg-type]
+		self.c_cond_write = threading.Condition(self.c_lock_state)  # type: ignore [arg-type]
+
+	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "RWLockWriteM") -> None:
+			self.c_rw_lock = p_RWLock
+			self.v_locked: bool = False
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				if c_rw_lock.v_write_count or c_rw_lock.v_write_waiting:
+					if not blocking: return False
+					c_deadline: Optional[float] = _deadline(True, timeout, deadline, c_rw_lock.c_time_source)
+					while c_rw_lock.v_write_count or c_rw_lock.v_write_waiting:
+						if not _wait_condition(c_rw_lock.c_cond_read, c_deadline, c_rw_lock.c_time_source): return False
+				c_rw_lock.v_read_count += 1
+			finally:
+				c_rw_lock.c_lock_state.release()
+			self.v_locked = True
+			return True
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				c_rw_lock.v_read_count -= 1
+				if 0 == c_rw_lock.v_read_count and c_rw_lock.v_write_waiting:
+					c_rw_lock.c_cond_write.notify()
+			finally:
+				c_rw_lock.c_lock_state.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "RWLockWriteM") -> None:
+			self.c_rw_lock = p_RWLock
+			self.v_locked: bool = False
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				if c_rw_lock.v_write_count or c_rw_lock.v_read_count:
+					if not blocking: return False
+					c_deadline: Optional[float] = _deadline(True, timeout, deadline, c_rw_lock.c_time_source)
+					c_rw_lock.v_write_waiting += 1
+					while c_rw_lock.v_write_count or c_rw_lock.v_read_count:
+						if not _wait_condition(c_rw_lock.c_cond_write, c_deadline, c_rw_lock.c_time_source):
+							c_rw_lock.v_write_waiting -= 1
+							if 0 == c_rw_lock.v_write_waiting and 0 == c_rw_lock.v_write_count:
+								c_rw_lock.c_cond_read.notify_all()  # Readers were only held back by this waiting writer.
+							return False
+					c_rw_lock.v_write_waiting -= 1
+				c_rw_lock.v_write_count = 1
+			finally:
+				c_rw_lock.c_lock_state.release()
+			self.v_locked = True
+			return True
+
+		def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				c_rw_lock.v_write_count = 0
+				c_rw_lock.v_read_count += 1
+				if 0 == c_rw_lock.v_write_waiting:
+					c_rw_lock.c_cond_read.notify_all()
+			finally:
+				c_rw_lock.c_lock_state.release()
+			self.v_locked = False
+
+			result = c_rw_lock._aReader(p_RWLock=c_rw_lock)
+			result.v_locked = True
+			return result
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				c_rw_lock.v_write_count = 0
+				if c_rw_lock.v_write_waiting:
+					c_rw_lock.c_cond_write.notify()
+				else:
+					c_rw_lock.c_cond_read.notify_all()
+			finally:
+				c_rw_lock.c_lock_state.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	def gen_rlock(self) -> "RWLockWriteM._aReader":
+		"""Generate a reader lock."""
+		return RWLockWriteM._aReader(self)
+
+	def gen_wlock(self) -> "RWLockWriteM._aWriter":
+		"""Generate a writer lock."""
+		return RWLockWriteM._aWriter(self)
+
+
+class RWLockPhaseFair(RWLockableD):
+	"""A Read/Write lock alternating read phases and write phases.
+
+	Implemented as a single monitor:
+	- A reader gets in right away unless a writer holds or waits for the lock, it then waits for the end of the next write phase.
+	- When a writer gives back the lock, all the waiting readers are admitted together (as one read phase) before the next writer.
+	- A writer waits for the readers of the current read phase to drain.
+	"""
+
+	__slots__ = ("v_read_count", "v_read_waiting", "v_write_count", "v_write_waiting", "v_phase", "c_time_source", "c_lock_state", "c_cond_read", "c_cond_write")
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
+		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
+		self.v_read_count: int = 0
+		self.v_read_waiting: int = 0
+		self.v_write_count: int = 0
+		self.v_write_waiting: int = 0
+		self.v_phase: int = 0
+		self.c_time_source = time_source
+		self.c_lock_state = lock_factory()
+		self.c_cond_read = threading.Condition(self.c_lock_state)  # type: ignore [arg-type]
+		self.c_cond_write = threading.Condition(self.c_lock_state)  # type: ignore [arg-type]
+
+	def _start_read_phase(self) -> None:
+		"""Admit all the waiting readers together (the lock state must be locked)."""
+		self.v_read_count += self.v_read_waiting
+		self.v_read_waiting = 0
+		self.v_phase += 1
+		self.c_cond_read.notify_all()
+
+	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "RWLockPhaseFair") -> None:
+			self.c_rw_lock = p_RWLock
+			self.v_locked: bool = False
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				if c_rw_lock.v_write_count or c_rw_lock.v_write_waiting:
+					if not blocking: return False
+					c_deadline: Optional[float] = _deadline(True, timeout, deadline, c_rw_lock.c_time_source)
+					c_phase: int = c_rw_lock.v_phase
+					c_rw_lock.v_read_waiting += 1
+					while c_phase == c_rw_lock.v_phase:
+						if not _wait_condition(c_rw_lock.c_cond_read, c_deadline, c_rw_lock.c_time_source):
+							c_rw_lock.v_read_waiting -= 1
+							return False
+					# Admitted (and counted) along with its read phase.
+				else:
+					c_rw_lock.v_read_count += 1
+			finally:
+				c_rw_lock.c_lock_state.release()
+			self.v_locked = True
+			return True
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				c_rw_lock.v_read_count -= 1
+				if 0 == c_rw_lock.v_read_count and c_rw_lock.v_write_waiting:
+					c_rw_lock.c_cond_write.notify()
+			finally:
+				c_rw_lock.c_lock_state.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "RWLockPhaseFair") -> None:
+			self.c_rw_lock = p_RWLock
+			self.v_locked: bool = False
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				if c_rw_lock.v_write_count or c_rw_lock.v_read_count:
+					if not blocking: return False
+					c_deadline: Optional[float] = _deadline(True, timeout, deadline, c_rw_lock.c_time_source)
+					c_rw_lock.v_write_waiting += 1
+					while c_rw_lock.v_write_count or c_rw_lock.v_read_count:
+						if not _wait_condition(c_rw_lock.c_cond_write, c_deadline, c_rw_lock.c_time_source):
+							c_rw_lock.v_write_waiting -= 1
+							if 0 == c_rw_lock.v_write_waiting and 0 == c_rw_lock.v_write_count and c_rw_lock.v_read_waiting:
+								c_rw_lock._start_read_phase()  # Readers were only held back by this waiting writer.
+							return False
+					c_rw_lock.v_write_waiting -= 1
+				c_rw_lock.v_write_count = 1
+			finally:
+				c_rw_lock.c_lock_state.release()
+			self.v_locked = True
+			return True
+
+		def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				c_rw_lock.v_write_count = 0
+				c_rw_lock.v_read_count += 1
+				if c_rw_lock.v_read_waiting:
+					c_rw_lock._start_read_phase()
+			finally:
+				c_rw_lock.c_lock_state.release()
+			self.v_locked = False
+
+			result = c_rw_lock._aReader(p_RWLock=c_rw_lock)
+			result.v_locked = True
+			return result
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				c_rw_lock.v_write_count = 0
+				if c_rw_lock.v_read_waiting:
+					c_rw_lock._start_read_phase()
+				elif c_rw_lock.v_write_waiting:
+					c_rw_lock.c_cond_write.notify()
+			finally:
+				c_rw_lock.c_lock_state.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	def gen_rlock(self) -> "RWLockPhaseFair._aReader":
+		"""Generate a reader lock."""
+		return RWLockPhaseFair._aReader(self)
+
+	def gen_wlock(self) -> "RWLockPhaseFair._aWriter":
+		"""Generate a writer lock."""
+		return RWLockPhaseFair._aWriter(self)
+
+
+class RWLockFairQ(RWLockableD):
+	"""A Read/Write lock giving fairness to both Reader and Writer.
+
+	Implemented as an explicit FIFO waiter queue with direct handoff:
+	- A lock request is granted right away only when nobody waits, otherwise it is queued and parks on its own lock.
+	- Releases hand the lock over to the head of the queue: a writer or the whole group of adjacent readers.
+	The waiters thereby get the lock in strict arrival order instead of racing for it.
+	"""
+
+	__slots__ = ("c_lock_factory", "v_read_count", "v_write_count", "c_time_source", "c_lock_state", "c_waiters")
+
+	class _Waiter():
+		"""A queued lock request."""
+
+		__slots__ = ("v_is_writer", "v_granted", "c_lock_park")
+
+		def __init__(self, p_is_writer: bool, lock_factory: Callable[[], BaseLockable]) -> None:
+			"""Init."""
+			self.v_is_writer = p_is_writer
+			self.v_granted: bool = False
+			self.c_lock_park = lock_factory()
+			self.c_lock_park.acquire()  # Released on handoff.
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
+		"""Init."""
+		self.c_lock_factory = lock_factory  # The queued waiters park right away: spinning for their turn would only slow down the holder.
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
+		self.v_read_count: int = 0
+		self.v_write_count: int = 0
+		self.c_time_source = time_source
+		self.c_lock_state = lock_factory()
+		self.c_waiters: Deque[RWLockFairQ._Waiter] = collections.deque()
+
+	def _wake(self) -> None:
+		"""Hand the lock over to the head of the queue (the lock state must be locked)."""
+		c_waiters = self.c_waiters
+		while c_waiters and 0 == self.v_write_count:
+			c_waiter = c_waiters[0]
+			if c_waiter.v_is_writer:
+				if self.v_read_count: return
+				self.v_write_count = 1
+			else:
+				self.v_read_count += 1
+			c_waiters.popleft()
+			c_waiter.v_granted = True
+			c_waiter.c_lock_park.release()
+
+	def _wait(self, p_waiter: "RWLockFairQ._Waiter", timeout: float) -> bool:
+		"""Park until the queued request is granted or its timeout expires."""
+		if p_waiter.c_lock_park.acquire(True, timeout): return True
+		self.c_lock_state.acquire()
+		try:
+			if p_waiter.v_granted: return True  # Handed over right at the timeout.
+			self.c_waiters.remove(p_waiter)
+			self._wake()  # The ones behind it may have been held back by it.
+		finally:
+			self.c_lock_state.release()
+		return False
+
+	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "RWLockFairQ") -> None:
+			self.c_rw_lock = p_RWLock
+			self.v_locked: bool = False
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				if 0 == c_rw_lock.v_write_count and not c_rw_lock.c_waiters:
+					c_rw_lock.v_read_count += 1
+					self.v_locked = True
+					return True
+				if not blocking: return False
+				timeout = _timeout(timeout, deadline, c_rw_lock.c_time_source)
+				if 0 == timeout: return False
+				c_waiter = RWLockFairQ._Waiter(False, c_rw_lock.c_lock_factory)
+				c_rw_lock.c_waiters.append(c_waiter)
+			finally:
+				c_rw_lock.c_lock_state.release()
+			self.v_locked = c_rw_lock._wait(c_waiter, timeout)
+			return self.v_locked
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				c_rw_lock.v_read_count -= 1
+				if 0 == c_rw_lock.v_read_count and c_rw_lock.c_waiters:
+					c_rw_lock._wake()
+			finally:
+				c_rw_lock.c_lock_state.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "RWLockFairQ") -> None:
+			self.c_rw_lock = p_RWLock
+			self.v_locked: bool = False
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				if 0 == c_rw_lock.v_write_count and 0 == c_rw_lock.v_read_count and not c_rw_lock.c_waiters:
+					c_rw_lock.v_write_count = 1
+					self.v_locked = True
+					return True
+				if not blocking: return False
+				timeout = _timeout(timeout, deadline, c_rw_lock.c_time_source)
+				if 0 == timeout: return False
+				c_waiter = RWLockFairQ._Waiter(True, c_rw_lock.c_lock_factory)
+				c_rw_lock.c_waiters.append(c_waiter)
+			finally:
+				c_rw_lock.c_lock_state.release()
+			self.v_locked = c_rw_lock._wait(c_waiter, timeout)
+			return self.v_locked
+
+		def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				c_rw_lock.v_write_count = 0
+				c_rw_lock.v_read_count += 1
+				if c_rw_lock.c_waiters:
+					c_rw_lock._wake()
+			finally:
+				c_rw_lock.c_lock_state.release()
+			self.v_locked = False
+
+			result = c_rw_lock._aReader(p_RWLock=c_rw_lock)
+			result.v_locked = True
+			return result
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				c_rw_lock.v_write_count = 0
+				if c_rw_lock.c_waiters:
+					c_rw_lock._wake()
+			finally:
+				c_rw_lock.c_lock_state.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	def gen_rlock(self) -> "RWLockFairQ._aReader":
+		"""Generate a reader lock."""
+		return RWLockFairQ._aReader(self)
+
+	def gen_wlock(self) -> "RWLockFairQ._aWriter":
+		"""Generate a writer lock."""
+		return RWLockFairQ._aWriter(self)
+
+
+class RWLockWriteB(RWLockableD):
+	"""A Read/Write lock giving preference to Writer.
+
+	Implemented as a big-reader lock: each reader thread gets its own slot (a counter only mutated by that thread) so readers never write shared state on the fast path, a writer raises a flag then waits for all the slots to drain.
+	A reader lock must be released by the thread which acquired it, a release from another thread raises (it would race with the slot owner).
+
+	Without the GIL (free-threaded build) a slot is only mutated and read under its own lock: a reader publishing its slot then checking the flag while a writer raises the flag then checks the slots needs a store/load ordering which the GIL provides otherwise.
+	"""
+
+	__slots__ = ("v_writer", "c_time_source", "c_slots", "c_lock_write", "c_lock_state", "c_cond_read", "c_cond_write", "c_local")
+
+	class _Slot():
+		"""Reader slot of a thread."""
+
+		__slots__ = ("v_count", "c_lock", "c_ident", "__weakref__")
+
+		def __init__(self) -> None:
+			"""Init."""
+			self.v_count: int = 0
+			self.c_lock = threading.Lock()  # Only contended by a writer draining the slots.
+			self.c_ident: int = threading.get_ident()  # The only thread mutating the count.
+
+		def add(self, p_delta: int) -> None:
+			"""Add to the count of the slot."""
+			if _GIL_ENABLED:
+				self.v_count += p_delta
+				return
+			c_lock = self.c_lock
+			c_lock.acquire()
+			self.v_count += p_delta
+			c_lock.release()
+
+		def count(self) -> int:
+			"""Get the count of the slot."""
+			if _GIL_ENABLED: return self.v_count
+			c_lock = self.c_lock
+			c_lock.acquire()
+			result: int = self.v_count
+			c_lock.release()
+			return result
+
+	class _ThreadSlot(threading.local):
+		"""Reader slot of the current thread, registered on first use."""
+
+		def __init__(self, p_RWLock: "RWLockWriteB") -> None:
+			"""Init."""
+			self.c_slot = RWLockWriteB._Slot()
+			p_RWLock.c_lock_state.acquire()
+			try:
+				p_RWLock.c_slots.add(self.c_slot)
+			finally:
+				p_RWLock.c_lock_state.release()
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
+		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
+		self.v_writer: bool = False
+		self.c_time_source = time_source
+		self.c_slots: "weakref.WeakSet[RWLockWriteB._Slot]" = weakref.WeakSet()  # Slots vanish along with their thread.
+		self.c_lock_write = lock_factory()
+		self.c_lock_state = lock_factory()
+		self.c_cond_read = threading.Condition(self.c_lock_state)  # type: ignore [arg-type]
+		self.c_cond_write = threading.Condition(self.c_lock_state)  # type: ignore [arg-type]
+		self.c_local = RWLockWriteB._ThreadSlot(self)
+
+	def _drained(self) -> bool:
+		"""Answer to 'are all the reader slots empty?'."""
+		return not any(c_slot.count() for c_slot in self.c_slots)
+
+	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "c_slot", "v_locked")
+
+		def __init__(self, p_RWLock: "RWLockWriteB") -> None:
+			self.c_rw_lock = p_RWLock
+			self.c_slot: Optional[RWLockWriteB._Slot] = None
+			self.v_locked: bool = False
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_slot = c_rw_lock.c_local.c_slot
+			c_deadline: Optional[float] = None
+			while True:
+				if _GIL_ENABLED: c_slot.v_count += 1  # Fast path, inlined.
+				else: c_slot.add(1)
+				if not c_rw_lock.v_writer: break
+				c_slot.add(-1)
+				c_rw_lock.c_lock_state.acquire()
+				try:
+					c_rw_lock.c_cond_write.notify()  # The writer may be waiting for this slot to drain.
+					if not blocking or 0 == timeout: return False
+					if c_deadline is None:
+						c_deadline = _deadline(True, timeout, deadline, c_rw_lock.c_time_source)
+					while c_rw_lock.v_writer:
+						if not _wait_condition(c_rw_lock.c_cond_read, c_deadline, c_rw_lock.c_time_source): return False
+				finally:
+					c_rw_lock.c_lock_state.release()
+			self.c_slot = c_slot
+			self.v_locked = True
+			return True
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_slot = cast(RWLockWriteB._Slot, self.c_slot)
+			if threading.get_ident() != c_slot.c_ident: raise RELEASE_ERR_CLS("cannot release a reader lock acquired by another thread")
+			self.v_locked = False
+			c_rw_lock = self.c_rw_lock
+			if _GIL_ENABLED: c_slot.v_count -= 1  # Fast path, inlined.
+			else: c_slot.add(-1)
+			if c_rw_lock.v_writer:
+				c_rw_lock.c_lock_state.acquire()
+				try:
+					c_rw_lock.c_cond_write.notify()
+				finally:
+					c_rw_lock.c_lock_state.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "RWLockWriteB") -> None:
+			self.c_rw_lock = p_RWLock
+			self.v_locked: bool = False
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_deadline: Optional[float] = None
+			if not c_rw_lock.c_lock_write.acquire(False):
+				if not blocking or 0 == timeout: return False
+				c_deadline = _deadline(True, timeout, deadline, c_rw_lock.c_time_source)
+				if not _acquire_before(c_rw_lock.c_lock_write, c_deadline, c_rw_lock.c_time_source): return False
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				c_rw_lock.v_writer = True
+				if not c_rw_lock._drained():
+					if blocking and 0 != timeout:
+						if c_deadline is None:
+							c_deadline = _deadline(True, timeout, deadline, c_rw_lock.c_time_source)
+						while not c_rw_lock._drained():
+							if not _wait_condition(c_rw_lock.c_cond_write, c_deadline, c_rw_lock.c_time_source): break
+					if not c_rw_lock._drained():
+						c_rw_lock.v_writer = False
+						c_rw_lock.c_cond_read.notify_all()
+						c_rw_lock.c_lock_write.release()
+						return False
+			finally:
+				c_rw_lock.c_lock_state.release()
+			self.v_locked = True
+			return True
+
+		def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_rw_lock = self.c_rw_lock
+			c_slot = c_rw_lock.c_local.c_slot
+			c_slot.add(1)
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				c_rw_lock.v_writer = False
+				c_rw_lock.c_cond_read.notify_all()
+			finally:
+				c_rw_lock.c_lock_state.release()
+			c_rw_lock.c_lock_write.release()
+			self.v_locked = False
+
+			result = c_rw_lock._aReader(p_RWLock=c_rw_lock)
+			result.c_slot = c_slot
+			result.v_locked = True
+			return result
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.c_lock_state.acquire()
+			try:
+				c_rw_lock.v_writer = False
+				c_rw_lock.c_cond_read.notify_all()
+			finally:
+				c_rw_lock.c_lock_state.release()
+			c_rw_lock.c_lock_write.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	def gen_rlock(self) -> "RWLockWriteB._aReader":
+		"""Generate a reader lock."""
+		return RWLockWriteB._aReader(self)
+
+	def gen_wlock(self) -> "RWLockWriteB._aWriter":
+		"""Generate a writer lock."""
+		return RWLockWriteB._aWriter(self)
+
+
+class _RWLockR(RWLockable):
+	"""Internal reentrant Read/Write lock.
+
+	Wraps a downgradable engine and keeps the hold counts of each thread:
+	- Only the outermost acquire of a thread goes through the engine, a nested one (read in read, read in write, write in write) is a counter bump on thread local state.
+	- Releasing the outermost writer lock while reader locks are still held atomically downgrades the engine lock.
+	- Acquiring a writer lock while only holding reader locks is refused since it would deadlock.
+	"""
+
+	__slots__ = ("c_engine", "c_state")
+
+	class _ThreadState(threading.local):
+		"""Hold counts of the current thread."""
+
+		def __init__(self) -> None:
+			"""Init."""
+			self.v_read_count: int = 0
+			self.v_write_count: int = 0
+			self.c_lock_r: Optional[Lockable] = None
+			self.c_lock_w: Optional[LockableD] = None
+
+	def __init__(self, p_engine: RWLockableD) -> None:
+		"""Init."""
+		self.c_engine = p_engine
+		self.c_state = _RWLockR._ThreadState()
+
+	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "_RWLockR") -> None:
+			self.c_rw_lock = p_RWLock
+			self.v_locked: int = 0
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_state = self.c_rw_lock.c_state
+			if 0 == c_state.v_read_count and 0 == c_state.v_write_count:
+				c_lock = self.c_rw_lock.c_engine.gen_rlock()
+				if not c_lock.acquire(blocking, timeout, deadline=deadline): return False
+				c_state.c_lock_r = c_lock
+			c_state.v_read_count += 1
+			self.v_locked += 1
+			return True
+
+		def release(self) -> None:
+			"""Release the lock."""
+			c_state = self.c_rw_lock.c_state
+			if 0 == self.v_locked or 0 == c_state.v_read_count: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked -= 1
+			c_state.v_read_count -= 1
+			if 0 == c_state.v_read_count and c_state.c_lock_r is not None:
+				c_lock = c_state.c_lock_r
+				c_state.c_lock_r = None
+				c_lock.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return 0 != self.v_locked
+
+	class _aWriter(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "_RWLockR") -> None:
+			self.c_rw_lock = p_RWLock
+			self.v_locked: int = 0
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_state = self.c_rw_lock.c_state
+			if 0 == c_state.v_write_count:
+				if c_state.v_read_count: raise RuntimeError("cannot acquire a writer lock while holding a reader lock")
+				c_lock = self.c_rw_lock.c_engine.gen_wlock()
+				if not c_lock.acquire(blocking, timeout, deadline=deadline): return False
+				c_state.c_lock_w = c_lock
+			c_state.v_write_count += 1
+			self.v_locked += 1
+			return True
+
+		def release(self) -> None:
+			"""Release the lock."""
+			c_state = self.c_rw_lock.c_state
+			if 0 == self.v_locked or 0 == c_state.v_write_count: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked -= 1
+			c_state.v_write_count -= 1
+			if 0 == c_state.v_write_count:
+				c_lock = cast(LockableD, c_state.c_lock_w)
+				c_state.c_lock_w = None
+				if c_state.v_read_count:
+					c_state.c_lock_r = c_lock.downgrade()
+				else:
+					c_lock.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return 0 != self.v_locked
+
+	def gen_rlock(self) -> "_RWLockR._aReader":
+		"""Generate a reader lock."""
+		return _RWLockR._aReader(self)
+
+	def gen_wlock(self) -> "_RWLockR._aWriter":
+		"""Generate a writer lock."""
+		return _RWLockR._aWriter(self)
+
+
+class RWLockReadR(_RWLockR):
+	"""A reentrant Read/Write lock giving preference to Reader."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
+		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
+		super().__init__(RWLockReadD(lock_factory=lock_factory, time_source=time_source))
+
+
+class RWLockWriteR(_RWLockR):
+	"""A reentrant Read/Write lock giving preference to Writer."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
+		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
+		super().__init__(RWLockWriteM(lock_factory=lock_factory, time_source=time_source))
+
+
+class RWLockFairR(_RWLockR):
+	"""A reentrant Read/Write lock giving fairness to both Reader and Writer."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
+		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
+		super().__init__(RWLockFairD(lock_factory=lock_factory, time_source=time_source))
+
+
+class _RWLockU(RWLockableU):
+	"""Internal upgradable Read/Write lock.
+
+	Wraps a downgradable engine with an intent lock held by the upgradable reader and by the writer:
+	- A reader goes straight to the engine, it coexists with the upgradable reader.
+	- The upgradable reader excludes the writers and the other upgradable readers while it reads.
+	- Since no writer can get in while it holds the intent lock, its upgrade only waits for the current readers to drain.
+	- The upgrade holds a gate from its start: the new readers wait for it instead of starving it (even with a reader preference engine).
+	"""
+
+	__slots__ = ("c_engine", "c_time_source", "c_lock_intent", "c_lock_gate", "v_upgrading")
+
+	def __init__(self, p_engine: RWLockableD, lock_factory: Callable[[], BaseLockable], time_source: Callable[[], float]) -> None:
+		"""Init."""
+		self.c_engine = p_engine
+		self.c_time_source = time_source
+		self.c_lock_intent = lock_factory()
+		self.c_lock_gate = lock_factory()
+		self.v_upgrading: bool = False
+
+	@staticmethod
+	def _acquire_engine(p_lock: Lockable, blocking: bool, c_deadline: Union[None, float, _Deadline]) -> bool:
+		"""Acquire the given engine lock before the deadline."""
+		if isinstance(c_deadline, _Deadline):  # The engine lock reads the clock itself if it is busy, unless a gate already did.
+			return p_lock.acquire(True, c_deadline.c_timeout, deadline=c_deadline.c_deadline) if c_deadline.v_at is None else p_lock.acquire(True, -1, deadline=c_deadline.v_at)
+		return p_lock.acquire(blocking, -1, deadline=c_deadline)
+
+	def _acquire(self, p_lock: Lockable, blocking: bool, timeout: float, deadline: Optional[float]) -> bool:
+		"""Acquire the intent lock then the given engine lock before the same deadline."""
+		c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_time_source)
+		if not _acquire_before(self.c_lock_intent, c_deadline, self.c_time_source): return False
+		if not self._acquire_engine(p_lock, blocking, c_deadline):
+			self.c_lock_intent.release()
+			return False
+		return True
+
+	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "c_lock")
+
+		def __init__(self, p_RWLock: "_RWLockU") -> None:
+			self.c_rw_lock = p_RWLock
+			self.c_lock = p_RWLock.c_engine.gen_rlock()
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			if not c_rw_lock.v_upgrading: return self.c_lock.acquire(blocking, timeout, deadline=deadline)
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, c_rw_lock.c_time_source)
+			if not _acquire_before(c_rw_lock.c_lock_gate, c_deadline, c_rw_lock.c_time_source): return False  # Let the upgrade in progress through first.
+			c_rw_lock.c_lock_gate.release()
+			return c_rw_lock._acquire_engine(self.c_lock, blocking, c_deadline)
+
+		def release(self) -> None:
+			"""Release the lock."""
+			self.c_lock.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.c_lock.locked()
+
+	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "c_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "_RWLockU") -> None:
+			self.c_rw_lock = p_RWLock
+			self.c_lock = p_RWLock.c_engine.gen_wlock()
+			self.v_locked: bool = False
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			self.v_locked = self.c_rw_lock._acquire(self.c_lock, blocking, timeout, deadline)
+			return self.v_locked
+
+		def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			result = self.c_lock.downgrade()
+			self.c_rw_lock.c_lock_intent.release()
+			return result
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			self.c_lock.release()
+			self.c_rw_lock.c_lock_intent.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	class _aUpgrader(LockableU):
+		__slots__ = ("c_rw_lock", "c_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "_RWLockU") -> None:
+			self.c_rw_lock = p_RWLock
+			self.c_lock = p_RWLock.c_engine.gen_rlock()
+			self.v_locked: bool = False
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			self.v_locked = self.c_rw_lock._acquire(self.c_lock, blocking, timeout, deadline)
+			return self.v_locked
+
+		def upgrade(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> Optional[LockableD]:
+			"""Upgrade, None if it could not before the deadline (the upgradable reader lock is then still held)."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_rw_lock = self.c_rw_lock
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, c_rw_lock.c_time_source)
+			if not _acquire_before(c_rw_lock.c_lock_gate, c_deadline, c_rw_lock.c_time_source): return None
+			c_rw_lock.v_upgrading = True  # From now on the new readers wait for the upgrade.
+			try:
+				result = _RWLockU._aWriter(c_rw_lock)
+				self.c_lock.release()
+				if not c_rw_lock._acquire_engine(result.c_lock, blocking, c_deadline):  # The intent lock is kept: only the current readers are left to wait for.
+					self.c_lock.acquire()  # Granted right away: the intent lock keeps the writers out.
+					return None
+			finally:
+				c_rw_lock.v_upgrading = False
+				c_rw_lock.c_lock_gate.release()
+			self.v_locked = False
+			result.v_locked = True
+			return result
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			self.c_lock.release()
+			self.c_rw_lock.c_lock_intent.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	def gen_rlock(self) -> "_RWLockU._aReader":
+		"""Generate a reader lock."""
+		return _RWLockU._aReader(self)
+
+	def gen_wlock(self) -> "_RWLockU._aWriter":
+		"""Generate a writer lock."""
+		return _RWLockU._aWriter(self)
+
+	def gen_ulock(self) -> "_RWLockU._aUpgrader":
+		"""Generate an upgradable reader lock."""
+		return _RWLockU._aUpgrader(self)
+
+
+class RWLockReadU(_RWLockU):
+	"""An upgradable Read/Write lock giving preference to Reader."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
+		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
+		super().__init__(RWLockReadD(lock_factory=lock_factory, time_source=time_source), lock_factory=lock_factory, time_source=time_source)
+
+
+class RWLockWriteU(_RWLockU):
+	"""An upgradable Read/Write lock giving preference to Writer."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
+		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
+		super().__init__(RWLockWriteM(lock_factory=lock_factory, time_source=time_source), lock_factory=lock_factory, time_source=time_source)
+
+
+class RWLockFairU(_RWLockU):
+	"""An upgradable Read/Write lock giving fairness to both Reader and Writer."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
+		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
+		super().__init__(RWLockFairD(lock_factory=lock_factory, time_source=time_source), lock_factory=lock_factory, time_source=time_source)
+
+
+class _RWLockS(RWLockableD):
+	"""Internal Read/Write lock providing optimistic reads.
+
+	Wraps a downgradable engine with a version counter bumped by the writers when they get and when they give back the lock (it is odd while a writer holds the lock):
+	- try_optimistic_read() returns a stamp without locking anything, 0 if a writer holds the lock.
+	- validate(stamp) answers to 'did no writer get the lock since the stamp was taken?', when it did the reader falls back to a reader lock.
+	"""
+
+	__slots__ = ("c_engine", "v_version")
+
+	def __init__(self, p_engine: RWLockableD) -> None:
+		"""Init."""
+		self.c_engine = p_engine
+		self.v_version: int = 2  # 0 is reserved for the invalid stamp.
+
+	def try_optimistic_read(self) -> int:
+		"""Get a stamp to later validate an optimistic read, 0 if a writer holds the lock."""
+		c_version = self.v_version
+		return 0 if c_version & 1 else c_version
+
+	def validate(self, p_stamp: int) -> bool:
+		"""Answer to 'did no writer get the lock since the stamp was taken?'."""
+		return 0 != p_stamp and p_stamp == self.v_version
+
+	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "c_lock")
+
+		def __init__(self, p_RWLock: "_RWLockS") -> None:
+			self.c_rw_lock = p_RWLock
+			self.c_lock = p_RWLock.c_engine.gen_wlock()
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			if not self.c_lock.acquire(blocking, timeout, deadline=deadline): return False
+			self.c_rw_lock.v_version += 1
+			return True
+
+		def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			if not self.c_lock.locked(): raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.c_rw_lock.v_version += 1
+			return self.c_lock.downgrade()
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.c_lock.locked(): raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.c_rw_lock.v_version += 1
+			self.c_lock.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.c_lock.locked()
+
+	def gen_rlock(self) -> Lockable:
+		"""Generate a reader lock."""
+		return self.c_engine.gen_rlock()
+
+	def gen_wlock(self) -> "_RWLockS._aWriter":
+		"""Generate a writer lock."""
+		return _RWLockS._aWriter(self)
+
+
+class RWLockReadS(_RWLockS):
+	"""A Read/Write lock giving preference to Reader and providing optimistic reads."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
+		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
+		super().__init__(RWLockReadD(lock_factory=lock_factory, time_source=time_source))
+
+
+class RWLockWriteS(_RWLockS):
+	"""A Read/Write lock giving preference to Writer and providing optimistic reads."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
+		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
+		super().__init__(RWLockWriteM(lock_factory=lock_factory, time_source=time_source))
+
+
+class RWLockFairS(_RWLockS):
+	"""A Read/Write lock giving fairness to both Reader and Writer and providing optimistic reads."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
+		"""Init."""
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
+		super().__init__(RWLockFairD(lock_factory=lock_factory, time_source=time_source))
+
+
+class _Range():
+	"""Internal range [start, end) of a lock request, also the node of the _RangeTree holding it."""
+
+	__slots__ = ("c_start", "c_end", "v_is_writer", "v_seq", "v_granted", "v_lock_park", "c_priority", "v_left", "v_right", "v_max_end")
+
+	def __init__(self, p_start: float, p_end: float, p_is_writer: bool) -> None:
+		"""Init."""
+		self.c_start = p_start
+		self.c_end = p_end
+		self.v_is_writer = p_is_writer
+		self.v_seq: int = 0
+		self.v_granted: bool = False
+		self.v_lock_park: Optional[BaseLockable] = None  # Only for a queued request.
+		self.c_priority: float = random.random()
+		self.v_left: Optional[_Range] = None
+		self.v_right: Optional[_Range] = None
+		self.v_max_end: float = p_end
+
+
+class _RangeTree():
+	"""Internal set of ranges answering overlap queries in O(log n).
+
+	Implemented as a treap ordered by (start, arrival) whose nodes also keep the greatest end found in their subtree.
+	"""
+
+	__slots__ = ("v_root",)
+
+	def __init__(self) -> None:
+		"""Init."""
+		self.v_root: Optional[_Range] = None
+
+	@staticmethod
+	def _update(p_node: _Range) -> None:
+		"""Recompute the greatest end of the subtree."""
+		v_max_end: float = p_node.c_end
+		if p_node.v_left is not None and v_max_end < p_node.v_left.v_max_end: v_max_end = p_node.v_left.v_max_end
+		if p_node.v_right is not None and v_max_end < p_node.v_right.v_max_end: v_max_end = p_node.v_right.v_max_end
+		p_node.v_max_end = v_max_end
+
+	@staticmethod
+	def _insert(p_node: Optional[_Range], p_range: _Range) -> _Range:
+		"""Insert the range in the subtree, answer its new root."""
+		if p_node is None: return p_range
+		if (p_range.c_start, p_range.v_seq) < (p_node.c_start, p_node.v_seq):
+			c_child = _RangeTree._insert(p_node.v_left, p_range)
+			p_node.v_left = c_child
+			if p_node.c_priority < c_child.c_priority:  # Rotate right.
+				p_node.v_left = c_child.v_right
+				c_child.v_right = p_node
+				_RangeTree._update(p_node)
+				_RangeTree._update(c_child)
+				return c_child
+		else:
+			c_child = _RangeTree._insert(p_node.v_right, p_range)
+			p_node.v_right = c_child
+			if p_node.c_priority < c_child.c_priority:  # Rotate left.
+				p_node.v_right = c_child.v_left
+				c_child.v_left = p_node
+				_RangeTree._update(p_node)
+				_RangeTree._update(c_child)
+				return c_child
+		_RangeTree._update(p_node)
+		return p_node
+
+	@staticmethod
+	def _merge(p_left: Optional[_Range], p_right: Optional[_Range]) -> Optional[_Range]:
+		"""Merge two subtrees (all of the left one before all of the right one), answer the new root."""
+		if p_left is None: return p_right
+		if p_right is None: return p_left
+		if p_right.c_priority < p_left.c_priority:
+			p_left.v_right = _RangeTree._merge(p_left.v_right, p_right)
+			_RangeTree._update(p_left)
+			return p_left
+		p_right.v_left = _RangeTree._merge(p_left, p_right.v_left)
+		_RangeTree._update(p_right)
+		return p_right
+
+	@staticmethod
+	def _remove(p_node: Optional[_Range], p_range: _Range) -> Optional[_Range]:
+		"""Remove the range from the subtree, answer its new root."""
+		if p_node is None: return None
+		if p_node is p_range: return _RangeTree._merge(p_node.v_left, p_node.v_right)
+		if (p_range.c_start, p_range.v_seq) < (p_node.c_start, p_node.v_seq):
+			p_node.v_left = _RangeTree._remove(p_node.v_left, p_range)
+		else:
+			p_node.v_right = _RangeTree._remove(p_node.v_right, p_range)
+		_RangeTree._update(p_node)
+		return p_node
+
+	def add(self, p_range: _Range) -> None:
+		"""Add the range."""
+		p_range.v_left = None
+		p_range.v_right = None
+		p_range.v_max_end = p_range.c_end
+		self.v_root = _RangeTree._insert(self.v_root, p_range)
+
+	def remove(self, p_range: _Range) -> None:
+		"""Remove the range."""
+		self.v_root = _RangeTree._remove(self.v_root, p_range)
+
+	def overlaps(self, p_start: float, p_end: float) -> bool:
+		"""Answer to 'does a range overlap [start, end)?'."""
+		v_node: Optional[_Range] = self.v_root
+		while v_node is not None:
+			if v_node.c_start < p_end and p_start < v_node.c_end: return True
+			# Sorted by start: if an overlapping range exists and the left subtree reaches past start, one is in there.
+			v_node = v_node.v_left if v_node.v_left is not None and p_start < v_node.v_left.v_max_end else v_node.v_right
+		return False
+
+	def overlapping(self, p_start: float, p_end: float) -> List[_Range]:
+		"""List the ranges overlapping [start, end)."""
+		result: List[_Range] = []
+		c_stack: List[Optional[_Range]] = [self.v_root]
+		while c_stack:
+			c_node = c_stack.pop()
+			if c_node is None or c_node.v_max_end <= p_start: continue
+			c_stack.append(c_node.v_left)
+			if c_node.c_start < p_end:
+				if p_start < c_node.c_end: result.append(c_node)
+				c_stack.append(c_node.v_right)
+		return result
+
+
+class _RWLockRange(RWLockableD):
+	"""Internal Read/Write lock over ranges: its locks only conflict when their ranges overlap.
+
+	Implemented as interval trees of the granted and of the queued requests, with direct handoff:
+	- A request is granted right away unless _blocked() by an overlapping one, otherwise it is queued and parks on its own lock.
+	- Once a request is released, downgraded or gives up, the queued ones overlapping its range are granted in arrival order unless still blocked.
+	The strategy is defined by the subclass with _blocked(), called with the lock state held.
+	"""
+
+	__slots__ = ("c_lock_factory", "c_time_source", "c_lock_state", "c_granted_r", "c_granted_w", "c_queued_r", "c_queued_w", "v_seq")
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
+		"""Init."""
+		self.c_lock_factory = lock_factory  # The queued requests park right away: spinning for their turn would only slow down the holders.
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
+		self.c_time_source = time_source
+		self.c_lock_state = lock_factory()
+		self.c_granted_r = _RangeTree()
+		self.c_granted_w = _RangeTree()
+		self.c_queued_r = _RangeTree()
+		self.c_queued_w = _RangeTree()
+		self.v_seq: int = 0
+
+	def _blocked(self, p_range: _Range) -> bool:
+		"""Answer to 'must the request wait?' considering the granted requests (the lock state must be locked)."""
+		if p_range.v_is_writer and self.c_granted_r.overlaps(p_range.c_start, p_range.c_end): return True
+		return self.c_granted_w.overlaps(p_range.c_start, p_range.c_end)
+
+	@staticmethod
+	def _queued_before(p_tree: _RangeTree, p_range: _Range) -> bool:
+		"""Answer to 'is an overlapping request of the tree queued since before the request?'."""
+		if p_range.v_lock_park is None: return p_tree.overlaps(p_range.c_start, p_range.c_end)  # A new request comes after all the queued ones.
+		return any(c_range.v_seq < p_range.v_seq for c_range in p_tree.overlapping(p_range.c_start, p_range.c_end))
+
+	def _wake(self, p_range: _Range) -> None:
+		"""Grant the queued requests overlapping the range which are no longer blocked (the lock state must be locked)."""
+		if self.c_queued_r.v_root is None and self.c_queued_w.v_root is None: return
+		c_queued = self.c_queued_r.overlapping(p_range.c_start, p_range.c_end) + self.c_queued_w.overlapping(p_range.c_start, p_range.c_end)
+		c_queued.sort(key=lambda p_queued: p_queued.v_seq)
+		for c_range in c_queued:
+			if self._blocked(c_range): continue
+			if c_range.v_is_writer:
+				self.c_queued_w.remove(c_range)
+				self.c_granted_w.add(c_range)
+			else:
+				self.c_queued_r.remove(c_range)
+				self.c_granted_r.add(c_range)
+			c_range.v_granted = True
+			cast(BaseLockable, c_range.v_lock_park).release()
+
+	def _acquire(self, p_range: _Range, blocking: bool, timeout: float, deadline: Optional[float]) -> bool:
+		"""Grant the request, or queue it until it is granted or its timeout expires."""
+		self.c_lock_state.acquire()
+		try:
+			self.v_seq += 1
+			p_range.v_seq = self.v_seq
+			if not self._blocked(p_range):
+				(self.c_granted_w if p_range.v_is_writer else self.c_granted_r).add(p_range)
+				return True
+			if not blocking: return False
+			timeout = _timeout(timeout, deadline, self.c_time_source)
+			if 0 == timeout: return False
+			c_lock_park = self.c_lock_factory()
+			c_lock_park.acquire()  # Released on handoff.
+			p_range.v_lock_park = c_lock_park
+			(self.c_queued_w if p_range.v_is_writer else self.c_queued_r).add(p_range)
+		finally:
+			self.c_lock_state.release()
+		if c_lock_park.acquire(True, timeout): return True
+		self.c_lock_state.acquire()
+		try:
+			if p_range.v_granted: return True  # Handed over right at the timeout.
+			(self.c_queued_w if p_range.v_is_writer else self.c_queued_r).remove(p_range)
+			self._wake(p_range)  # The ones behind it may have been held back by it.
+		finally:
+			self.c_lock_state.release()
+		return False
+
+	def _release(self, p_range: _Range) -> None:
+		"""Remove the granted request."""
+		self.c_lock_state.acquire()
+		try:
+			(self.c_granted_w if p_range.v_is_writer else self.c_granted_r).remove(p_range)
+			self._wake(p_range)
+		finally:
+			self.c_lock_state.release()
+
+	def _downgrade(self, p_range: _Range) -> None:
+		"""Turn the granted writer request into a reader one."""
+		self.c_lock_state.acquire()
+		try:
+			self.c_granted_w.remove(p_range)
+			p_range.v_is_writer = False
+			self.c_granted_r.add(p_range)
+			self._wake(p_range)
+		finally:
+			self.c_lock_state.release()
+
+	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "c_start", "c_end", "v_range")
+
+		def __init__(self, p_RWLock: "_RWLockRange", p_start: float, p_end: float) -> None:
+			self.c_rw_lock = p_RWLock
+			self.c_start = p_start
+			self.c_end = p_end
+			self.v_range: Optional[_Range] = None
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_range = _Range(self.c_start, self.c_end, False)
+			if not self.c_rw_lock._acquire(c_range, blocking, timeout, deadline): return False
+			self.v_range = c_range
+			return True
+
+		def release(self) -> None:
+			"""Release the lock."""
+			c_range = self.v_range
+			if c_range is None: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_range = None
+			self.c_rw_lock._release(c_range)
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_range is not None
+
+	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "c_start", "c_end", "v_range")
+
+		def __init__(self, p_RWLock: "_RWLockRange", p_start: float, p_end: float) -> None:
+			self.c_rw_lock = p_RWLock
+			self.c_start = p_start
+			self.c_end = p_end
+			self.v_range: Optional[_Range] = None
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_range = _Range(self.c_start, self.c_end, True)
+			if not self.c_rw_lock._acquire(c_range, blocking, timeout, deadline): return False
+			self.v_range = c_range
+			return True
+
+		def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			c_range = self.v_range
+			if c_range is None: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.c_rw_lock._downgrade(c_range)
+			self.v_range = None
+
+			result = _RWLockRange._aReader(self.c_rw_lock, self.c_start, self.c_end)
+			result.v_range = c_range
+			return result
+
+		def release(self) -> None:
+			"""Release the lock."""
+			c_range = self.v_range
+			if c_range is None: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_range = None
+			self.c_rw_lock._release(c_range)
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_range is not None
+
+	def gen_rlock(self, start: float = -math.inf, end: float = math.inf) -> "_RWLockRange._aReader":
+		"""Generate a reader lock over [start, end), the whole range by default."""
+		if not start < end: raise ValueError(f"empty range [{start}, {end})")
+		return _RWLockRange._aReader(self, start, end)
+
+	def gen_wlock(self, start: float = -math.inf, end: float = math.inf) -> "_RWLockRange._aWriter":
+		"""Generate a writer lock over [start, end), the whole range by default."""
+		if not start < end: raise ValueError(f"empty range [{start}, {end})")
+		return _RWLockRange._aWriter(self, start, end)
+
+
+class RWLockReadRange(_RWLockRange):
+	"""A Read/Write lock over ranges giving preference to Reader."""
+
+	__slots__ = ()
+
+
+class RWLockWriteRange(_RWLockRange):
+	"""A Read/Write lock over ranges giving preference to Writer: a reader also waits for the overlapping queued writers."""
+
+	__slots__ = ()
+
+	def _blocked(self, p_range: _Range) -> bool:
+		"""Answer to 'must the request wait?' (the lock state must be locked)."""
+		if super()._blocked(p_range): return True
+		return not p_range.v_is_writer and self._queued_before(self.c_queued_w, p_range)
+
+
+class RWLockFairRange(_RWLockRange):
+	"""A Read/Write lock over ranges giving fairness to both Reader and Writer: overlapping conflicting requests are granted in arrival order."""
+
+	__slots__ = ()
+
+	def _blocked(self, p_range: _Range) -> bool:
+		"""Answer to 'must the request wait?' (the lock state must be locked)."""
+		if super()._blocked(p_range): return True
+		if self._queued_before(self.c_queued_w, p_range): return True
+		return p_range.v_is_writer and self._queued_before(self.c_queued_r, p_range)
+
+
+_MODES: Tuple[str, ...] = ("IS", "IX", "S", "SIX", "X")  # Multiple granularity locking modes, by index.
+_CONFLICTS: Tuple[Tuple[int, ...], ...] = ((4,), (2, 3, 4), (1, 3, 4), (1, 2, 3, 4), (0, 1, 2, 3, 4))  # The modes each mode conflicts with.
+_DOWNGRADED: Tuple[int, ...] = (0, 0, 2, 2, 2)  # The reading counterpart of each mode.
+
+
+class _RWLockHierarchy(RWLockableD):
+	"""Internal hierarchical Read/Write lock: a tree of resources locked with the intention modes of multiple granularity locking.
+
+	A resource is identified by its path from the root (e.g. ("db", "users", 42), the root () being the whole tree):
+	- Locking a resource first locks each of its ancestors top down with the matching intention mode: IS for IS and S, IX for IX, SIX and X.
+	- The IS, IX, S, SIX and X modes held on a same resource follow the usual compatibility matrix, the locks of unrelated resources never conflict.
+	- Each resource counts its granted modes and queues the blocked requests which park on their own lock, it only exists while in use.
+	The strategy is defined by the subclass with _QUEUE_CONFLICTS: the queued modes holding back a new request of each mode.
+	"""
+
+	__slots__ = ("c_lock_factory", "c_time_source", "c_lock_state", "c_nodes")
+
+	_QUEUE_CONFLICTS: Tuple[Tuple[int, ...], ...] = ((), (), (), (), ())
+
+	class _Node():
+		"""A resource in use."""
+
+		__slots__ = ("v_granted", "v_queued", "c_queue", "v_users")
+
+		def __init__(self) -> None:
+			"""Init."""
+			self.v_granted: List[int] = [0] * len(_MODES)
+			self.v_queued: List[int] = [0] * len(_MODES)
+			self.c_queue: Deque[_RWLockHierarchy._Waiter] = collections.deque()
+			self.v_users: int = 0  # Granted and queued requests.
+
+	class _Waiter():
+		"""A queued lock request."""
+
+		__slots__ = ("c_mode", "v_granted", "c_lock_park")
+
+		def __init__(self, p_mode: int, lock_factory: Callable[[], BaseLockable]) -> None:
+			"""Init."""
+			self.c_mode = p_mode
+			self.v_granted: bool = False
+			self.c_lock_park = lock_factory()
+			self.c_lock_park.acquire()  # Released on handoff.
+
+	def __init__(self, lock_factory: Callable[[], BaseLockable] = threading.Lock, time_source: Callable[[], float] = time.perf_counter, wait_policy: Optional[WaitPolicy] = None) -> None:
+		"""Init."""
+		self.c_lock_factory = lock_factory  # The queued requests park right away: spinning for their turn would only slow down the holders.
+		if wait_policy is not None:
+			lock_factory = wait_policy(lock_factory)
+		self.c_time_source = time_source
+		self.c_lock_state = lock_factory()
+		self.c_nodes: Dict[Tuple[Hashable, ...], _RWLockHierarchy._Node] = {}
+
+	def _wake(self, p_node: "_RWLockHierarchy._Node") -> None:
+		"""Grant the queued requests of the resource in arrival order unless still blocked (the lock state must be locked)."""
+		c_granted = p_node.v_granted
+		c_queue_conflicts = self._QUEUE_CONFLICTS
+		c_earlier: List[int] = [0] * len(_MODES)
+		c_waiting: Deque[_RWLockHierarchy._Waiter] = collections.deque()
+		for c_waiter in p_node.c_queue:
+			c_mode = c_waiter.c_mode
+			if any(c_granted[c_other] for c_other in _CONFLICTS[c_mode]) or any(c_earlier[c_other] for c_other in c_queue_conflicts[c_mode]):
+				c_earlier[c_mode] += 1
+				c_waiting.append(c_waiter)
+				continue
+			c_granted[c_mode] += 1
+			p_node.v_queued[c_mode] -= 1
+			c_waiter.v_granted = True
+			c_waiter.c_lock_park.release()
+		p_node.c_queue.clear()
+		p_node.c_queue.extend(c_waiting)
+
+	def _unuse(self, p_key: Tuple[Hashable, ...], p_node: "_RWLockHierarchy._Node") -> None:
+		"""Forget a request of the resource (the lock state must be locked)."""
+		p_node.v_users -= 1
+		if 0 == p_node.v_users:
+			del self.c_nodes[p_key]
+		elif p_node.c_queue:
+			self._wake(p_node)
+
+	def _acquire(self, p_key: Tuple[Hashable, ...], p_mode: int, c_deadline: Union[None, float, _Deadline]) -> bool:
+		"""Lock the resource in the mode before the deadline."""
+		self.c_lock_state.acquire()
+		try:
+			c_node = self.c_nodes.get(p_key)
+			if c_node is None:
+				c_node = self.c_nodes[p_key] = _RWLockHierarchy._Node()
+			if not (any(c_node.v_granted[c_other] for c_other in _CONFLICTS[p_mode]) or any(c_node.v_queued[c_other] for c_other in self._QUEUE_CONFLICTS[p_mode])):
+				c_node.v_granted[p_mode] += 1
+				c_node.v_users += 1
+				return True
+			timeout: float = -1 if c_deadline is None else (0 if -math.inf == c_deadline else (c_deadline.at() if isinstance(c_deadline, _Deadline) else c_deadline) - self.c_time_source())
+			if c_deadline is not None and timeout <= 0:
+				if 0 == c_node.v_users: del self.c_nodes[p_key]
+				return False
+			c_waiter = _RWLockHierarchy._Waiter(p_mode, self.c_lock_factory)
+			c_node.c_queue.append(c_waiter)
+			c_node.v_queued[p_mode] += 1
+			c_node.v_users += 1
+		finally:
+			self.c_lock_state.release()
+		if c_waiter.c_lock_park.acquire(True, timeout): return True
+		self.c_lock_state.acquire()
+		try:
+			if c_waiter.v_granted: return True  # Handed over right at the timeout.
+			c_node.c_queue.remove(c_waiter)
+			c_node.v_queued[p_mode] -= 1
+			self._unuse(p_key, c_node)  # The ones behind it may have been held back by it.
+		finally:
+			self.c_lock_state.release()
+		return False
+
+	def _release(self, p_key: Tuple[Hashable, ...], p_mode: int) -> None:
+		"""Unlock the resource from the mode."""
+		self.c_lock_state.acquire()
+		try:
+			c_node = self.c_nodes[p_key]
+			c_node.v_granted[p_mode] -= 1
+			self._unuse(p_key, c_node)
+		finally:
+			self.c_lock_state.release()
+
+	def _downgrade(self, p_key: Tuple[Hashable, ...], p_mode: int, p_mode_new: int) -> None:
+		"""Convert the mode held on the resource into a weaker one."""
+		self.c_lock_state.acquire()
+		try:
+			c_node = self.c_nodes[p_key]
+			c_node.v_granted[p_mode] -= 1
+			c_node.v_granted[p_mode_new] += 1
+			if c_node.c_queue:
+				self._wake(c_node)
+		finally:
+			self.c_lock_state.release()
+
+	class _aLock(LockableD):
+		__slots__ = ("c_rw_lock", "c_keys", "c_modes", "v_locked")
+
+		def __init__(self, p_RWLock: "_RWLockHierarchy", p_keys: Tuple[Tuple[Hashable, ...], ...], p_modes: Tuple[int, ...]) -> None:
+			self.c_rw_lock = p_RWLock
+			self.c_keys = p_keys  # The root down to the resource.
+			self.c_modes = p_modes
+			self.v_locked: bool = False
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, c_rw_lock.c_time_source)
+			for c_level, c_key in enumerate(self.c_keys):
+				if not c_rw_lock._acquire(c_key, self.c_modes[c_level], c_deadline):
+					for c_level_undo in reversed(range(c_level)):
+						c_rw_lock._release(self.c_keys[c_level_undo], self.c_modes[c_level_undo])
+					return False
+			self.v_locked = True
+			return True
+
+		def downgrade(self) -> Lockable:
+			"""Downgrade: X and SIX to S, IX to IS."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_rw_lock = self.c_rw_lock
+			c_modes_new = tuple(_DOWNGRADED[c_mode] for c_mode in self.c_modes)
+			for c_level in reversed(range(len(self.c_keys))):
+				if c_modes_new[c_level] != self.c_modes[c_level]:
+					c_rw_lock._downgrade(self.c_keys[c_level], self.c_modes[c_level], c_modes_new[c_level])
+			self.v_locked = False
+
+			result = _RWLockHierarchy._aLock(c_rw_lock, self.c_keys, c_modes_new)
+			result.v_locked = True
+			return result
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			c_rw_lock = self.c_rw_lock
+			for c_level in reversed(range(len(self.c_keys))):
+				c_rw_lock._release(self.c_keys[c_level], self.c_modes[c_level])
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	def gen_lock(self, path: Sequence[Hashable] = (), mode: str = "X") -> "_RWLockHierarchy._aLock":
+		"""Generate a lock of the resource (the whole tree by default) in the mode: "IS", "IX", "S", "SIX" or "X"."""
+		if mode not in _MODES: raise ValueError(f"unknown mode {mode!r}")
+		c_path = tuple(path)
+		c_mode = _MODES.index(mode)
+		c_intent = 0 if c_mode in (0, 2) else 1
+		return _RWLockHierarchy._aLock(self, tuple(c_path[:c_level] for c_level in range(len(c_path) + 1)), (c_intent,) * len(c_path) + (c_mode,))
+
+	def gen_rlock(self, path: Sequence[Hashable] = ()) -> "_RWLockHierarchy._aLock":
+		"""Generate a reader lock (S) of the resource, the whole tree by default."""
+		return self.gen_lock(path, "S")
+
+	def gen_wlock(self, path: Sequence[Hashable] = ()) -> "_RWLockHierarchy._aLock":
+		"""Generate a writer lock (X) of the resource, the whole tree by default."""
+		return self.gen_lock(path, "X")
+
+
+class RWLockReadHierarchy(_RWLockHierarchy):
+	"""A hierarchical Read/Write lock giving preference to Reader: only the granted modes hold back a request."""
+
+	__slots__ = ()
+
+
+class RWLockWriteHierarchy(_RWLockHierarchy):
+	"""A hierarchical Read/Write lock giving preference to Writer: the IS and S requests also wait for the conflicting queued ones."""
+
+	__slots__ = ()
+
+	_QUEUE_CONFLICTS = ((4,), (), (1, 3, 4), (), ())
+
+
+class RWLockFairHierarchy(_RWLockHierarchy):
+	"""A hierarchical Read/Write lock giving fairness to both Reader and Writer: the conflicting requests of a resource are granted in arrival order."""
+
+	__slots__ = ()
+
+	_QUEUE_CONFLICTS = _CONFLICTS
+
+
+class HandlePool(RWLockableD):
+	"""A per thread pool of reusable handles over a RW lock.
+
+	A handle obtained from the pool belongs to the caller until its release(), it then goes back to the pool of the releasing thread to be handed out again; it must not be used anymore after its release.
+	Acquiring a handle which went back to the pool (e.g. a handle reused across `with` blocks) raises a RuntimeError instead of silently sharing it.
+	"""
+
+	__slots__ = ("c_rw_lock", "c_local")
+
+	def __init__(self, p_rw_lock: RWLockable) -> None:
+		"""Init."""
+		self.c_rw_lock = p_rw_lock
+		self.c_local = HandlePool._FreeHandles()
+
+	class _FreeHandles(threading.local):
+		def __init__(self) -> None:
+			self.v_reader: Optional[HandlePool._aHandle] = None
+			self.v_writer: Optional[HandlePool._aHandle] = None
+
+	class _aHandle(LockableD):
+		__slots__ = ("c_pool", "c_lock", "c_is_writer", "v_recycled", "v_next")
+
+		def __init__(self, p_pool: "HandlePool", p_lock: Lockable, p_is_writer: bool) -> None:
+			self.c_pool = p_pool
+			self.c_lock = p_lock
+			self.c_is_writer = p_is_writer
+			self.v_recycled: bool = False
+			self.v_next: Optional[HandlePool._aHandle] = None
+
+		def _recycle(self) -> None:
+			self.v_recycled = True
+			c_local = self.c_pool.c_local
+			if self.c_is_writer:
+				self.v_next = c_local.v_writer
+				c_local.v_writer = self
+			else:
+				self.v_next = c_local.v_reader
+				c_local.v_reader = self
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			if self.v_recycled: raise RuntimeError("a pooled handle must not be used anymore after its release")
+			return _acquire_lock(self.c_lock, blocking, timeout, deadline)
+
+		def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			result = cast(LockableD, self.c_lock).downgrade()
+			self._recycle()
+			return result
+
+		def release(self) -> None:
+			"""Release the lock."""
+			self.c_lock.release()
+			if not self.c_lock.locked():  # A reentrant handle is only given back once fully released.
+				self._recycle()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.c_lock.locked()
+
+	def gen_rlock(self) -> "HandlePool._aHandle":
+		"""Generate a reader lock."""
+		c_local = self.c_local
+		c_handle = c_local.v_reader
+		if c_handle is None:
+			return HandlePool._aHandle(self, self.c_rw_lock.gen_rlock(), False)
+		c_local.v_reader = c_handle.v_next
+		c_handle.v_next = None
+		c_handle.v_recycled = False
+		return c_handle
+
+	def gen_wlock(self) -> "HandlePool._aHandle":
+		"""Generate a writer lock."""
+		c_local = self.c_local
+		c_handle = c_local.v_writer
+		if c_handle is None:
+			return HandlePool._aHandle(self, self.c_rw_lock.gen_wlock(), True)
+		c_local.v_writer = c_handle.v_next
+		c_handle.v_next = None
+		c_handle.v_recycled = False
+		return c_handle
+
+
+class RWLockTable():
+	"""A table of Read/Write locks, one per key, each created on demand and dropped once nobody holds nor waits for it.
+
+	The lock of a key is built by the strategy (a RW lock type or any factory of RW lock) when a first handle of the key acquires it:
+	- The table counts the handles holding or waiting for the lock of each key, it drops the lock once that count falls back to 0.
+	- The memory is thereby proportional to the number of keys in use, whatever the number of keys ever used.
+	A writer handle is downgradable when the strategy is.
+	"""
+
+	__slots__ = ("c_strategy", "c_lock_table", "c_entries")
+
+	class _Entry():
+		"""The lock of a key in use."""
+
+		__slots__ = ("c_rw_lock", "v_users")
+
+		def __init__(self, p_rw_lock: RWLockable) -> None:
+			"""Init."""
+			self.c_rw_lock = p_rw_lock
+			self.v_users: int = 0  # Handles holding or waiting for the lock.
+
+	def __init__(self, strategy: Callable[[], RWLockable] = RWLockFair, lock_factory: Callable[[], BaseLockable] = threading.Lock) -> None:
+		"""Init."""
+		self.c_strategy = strategy
+		self.c_lock_table = lock_factory()
+		self.c_entries: Dict[Hashable, RWLockTable._Entry] = {}
+
+	def _use(self, p_key: Hashable) -> RWLockable:
+		"""Get the lock of the key, created if needed, for a handle about to acquire it."""
+		self.c_lock_table.acquire()
+		try:
+			c_entry = self.c_entries.get(p_key)
+			if c_entry is None:
+				c_entry = self.c_entries[p_key] = RWLockTable._Entry(self.c_strategy())
+			c_entry.v_users += 1
+			return c_entry.c_rw_lock
+		finally:
+			self.c_lock_table.release()
+
+	def _unuse(self, p_key: Hashable) -> None:
+		"""Forget a handle which released the lock of the key or gave up acquiring it, drop the lock if it was the last one."""
+		self.c_lock_table.acquire()
+		try:
+			c_entry = self.c_entries[p_key]
+			c_entry.v_users -= 1
+			if 0 == c_entry.v_users:
+				del self.c_entries[p_key]
+		finally:
+			self.c_lock_table.release()
+
+	class _aReader(Lockable):
+		__slots__ = ("c_table", "c_key", "v_lock")
+
+		def __init__(self, p_table: "RWLockTable", p_key: Hashable) -> None:
+			self.c_table = p_table
+			self.c_key = p_key
+			self.v_lock: Optional[Lockable] = None
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_lock = self.c_table._use(self.c_key).gen_rlock()
+			locked: bool = False
+			try:
+				locked = _acquire_lock(c_lock, blocking, timeout, deadline)
+			finally:
+				if not locked: self.c_table._unuse(self.c_key)
+			if locked: self.v_lock = c_lock
+			return locked
+
+		def release(self) -> None:
+			"""Release the lock."""
+			c_lock = self.v_lock
+			if c_lock is None: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_lock = None
+			try:
+				c_lock.release()
+			finally:
+				self.c_table._unuse(self.c_key)
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_lock is not None
+
+	class _aWriter(LockableD):
+		__slots__ = ("c_table", "c_key", "v_lock")
+
+		def __init__(self, p_table: "RWLockTable", p_key: Hashable) -> None:
+			self.c_table = p_table
+			self.c_key = p_key
+			self.v_lock: Optional[Lockable] = None
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_lock = self.c_table._use(self.c_key).gen_wlock()
+			locked: bool = False
+			try:
+				locked = _acquire_lock(c_lock, blocking, timeout, deadline)
+			finally:
+				if not locked: self.c_table._unuse(self.c_key)
+			if locked: self.v_lock = c_lock
+			return locked
+
+		def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			c_lock = self.v_lock
+			if c_lock is None: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			result = RWLockTable._aReader(self.c_table, self.c_key)
+			result.v_lock = cast(LockableD, c_lock).downgrade()
+			self.v_lock = None
+			return result
+
+		def release(self) -> None:
+			"""Release the lock."""
+			c_lock = self.v_lock
+			if c_lock is None: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_lock = None
+			try:
+				c_lock.release()
+			finally:
+				self.c_table._unuse(self.c_key)
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_lock is not None
+
+	def gen_rlock(self, key: Hashable) -> "RWLockTable._aReader":
+		"""Generate a reader lock of the key."""
+		return RWLockTable._aReader(self, key)
+
+	def gen_wlock(self, key: Hashable) -> "RWLockTable._aWriter":
+		"""Generate a writer lock of the key."""
+		return RWLockTable._aWriter(self, key)
+
+
+class _LockSet(LockableD):
+	"""Internal lock of several locks: they are acquired in order before a single deadline (all of them or none) and released in reverse order."""
+
+	__slots__ = ("c_locks", "c_is_writer", "c_time_source", "v_locked")
+
+	def __init__(self, p_locks: Tuple[Lockable, ...], p_is_writer: Tuple[bool, ...], p_time_source: Callable[[], float]) -> None:
+		"""Init."""
+		self.c_locks = p_locks
+		self.c_is_writer = p_is_writer
+		self.c_time_source = p_time_source
+		self.v_locked: bool = False
+
+	def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+		"""Acquire a lock."""
+		c_locks = self.c_locks
+		c_deadline: Optional[float] = _deadline(blocking, timeout, deadline, self.c_time_source)
+		c_blocking: bool = -math.inf != c_deadline
+		v_count: int = 0
+		try:
+			for c_lock in c_locks:
+				if not _acquire_lock(c_lock, c_blocking, -1, c_deadline if c_blocking else None, self.c_time_source): break
+				v_count += 1
+		finally:
+			if v_count != len(c_locks):  # Give back the ones already acquired.
+				for c_lock in reversed(c_locks[:v_count]):
+					c_lock.release()
+		self.v_locked = v_count == len(c_locks)
+		return self.v_locked
+
+	def downgrade(self) -> Lockable:
+		"""Downgrade the writer locks."""
+		if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+		result = _LockSet(tuple(cast(LockableD, c_lock).downgrade() if c_is_writer else c_lock for c_lock, c_is_writer in zip(self.c_locks, self.c_is_writer)), (False,) * len(self.c_locks), self.c_time_source)
+		result.v_locked = True
+		self.v_locked = False
+		return result
+
+	def release(self) -> None:
+		"""Release the lock."""
+		if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+		self.v_locked = False
+		for c_lock in reversed(self.c_locks):
+			c_lock.release()
+
+	def locked(self) -> bool:
+		"""Answer to 'is it currently locked?'."""
+		return self.v_locked
+
+
+def gen_lock_all(requests: Iterable[Tuple[RWLockable, str]], time_source: Callable[[], float] = time.perf_counter) -> _LockSet:
+	"""Generate a lock of several RW locks, each one requested in the mode "r" (reader) or "w" (writer).
+
+	Its acquire() locks them in a canonical global order (by identity) before a single deadline and gives back the ones already locked if one of them cannot be:
+	- Lock sets thereby never deadlock with each other, whatever the order in which their RW locks are listed.
+	- A RW lock requested more than once is locked once, as a writer if any of its requests is.
+	- The time source must be the one of the RW locks, the writer locks are downgraded if the RW locks are downgradable.
+	"""
+	c_requests: Dict[int, Tuple[RWLockable, bool]] = {}
+	for c_rw_lock, c_mode in requests:
+		if c_mode not in ("r", "w"): raise ValueError(f"unknown mode {c_mode!r}")
+		c_previous = c_requests.get(id(c_rw_lock))
+		c_requests[id(c_rw_lock)] = (c_rw_lock, "w" == c_mode or (c_previous is not None and c_previous[1]))
+	c_sorted = [c_requests[c_id] for c_id in sorted(c_requests)]
+	return _LockSet(tuple(c_rw_lock.gen_wlock() if c_is_writer else c_rw_lock.gen_rlock() for c_rw_lock, c_is_writer in c_sorted), tuple(c_is_writer for _, c_is_writer in c_sorted), time_source)
+
+
+def acquire_all(requests: Iterable[Tuple[RWLockable, str]], blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None, time_source: Callable[[], float] = time.perf_counter) -> Optional[_LockSet]:
+	"""Acquire several RW locks at once as per gen_lock_all(), answer the lock holding all of them (to release) or None if they could not all be acquired."""
+	result = gen_lock_all(requests, time_source)
+	return result if result.acquire(blocking, timeout, deadline) else None
+
+
+class StripedRWLock():
+	"""A Read/Write lock striped over several Read/Write locks: the lock of a key only locks the stripe the key hashes to.
+
+	- The locks of keys hashing to different stripes never contend, those of a same stripe follow its strategy.
+	- gen_rlock_all() and gen_wlock_all() lock all the stripes (e.g. to snapshot or to resize the whole collection), always in index order so that they never deadlock with each other.
+	"""
+
+	__slots__ = ("c_stripes", "c_time_source")
+
+	def __init__(self, n_stripes: int = 16, strategy: Callable[[], RWLockable] = RWLockFair, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init: the strategy (a RW lock type or any factory of RW lock) builds each stripe, the time source must be the one of the stripes."""
+		if n_stripes < 1: raise ValueError(f"n_stripes must be at least 1, not {n_stripes}")
+		self.c_stripes: Tuple[RWLockable, ...] = tuple(strategy() for _ in range(n_stripes))
+		self.c_time_source = time_source
+
+	def stripe(self, key: Hashable) -> RWLockable:
+		"""Get the stripe of the key."""
+		return self.c_stripes[hash(key) % len(self.c_stripes)]
+
+	def gen_rlock(self, key: Hashable) -> Lockable:
+		"""Generate a reader lock of the stripe of the key."""
+		return self.stripe(key).gen_rlock()
+
+	def gen_wlock(self, key: Hashable) -> Lockable:
+		"""Generate a writer lock of the stripe of the key."""
+		return self.stripe(key).gen_wlock()
+
+	def gen_rlock_all(self) -> "_LockSet":
+		"""Generate a reader lock of all the stripes."""
+		return _LockSet(tuple(c_stripe.gen_rlock() for c_stripe in self.c_stripes), (False,) * len(self.c_stripes), self.c_time_source)
+
+	def gen_wlock_all(self) -> "_LockSet":
+		"""Generate a writer lock of all the stripes."""
+		return _LockSet(tuple(c_stripe.gen_wlock() for c_stripe in self.c_stripes), (True,) * len(self.c_stripes), self.c_time_source)
+
+
+class DeadlockError(RuntimeError):
+	"""A lock request would close a cycle of threads waiting on each other.
+
+	cycle lists the (thread identifier, RW lock) pairs of the cycle: each thread waits for its RW lock, held by the thread of the next pair (the last one by the first one).
+	"""
+
+	def __init__(self, cycle: List[Tuple[int, RWLockable]]) -> None:
+		"""Init."""
+		c_names = {c_thread.ident: c_thread.name for c_thread in threading.enumerate()}
+		super().__init__("deadlock: " + " -> ".join(f"{c_names.get(c_ident, c_ident)} waits for {c_rw_lock!r}" for c_ident, c_rw_lock in cycle))
+		self.cycle = cycle
+
+
+class DeadlockDetector():
+	"""A wait-for graph over the RW locks it wraps, checked each time a lock request keeps blocking.
+
+	Only the RW locks returned by wrap() are tracked: a lock request which cannot be granted right away records which threads it waits for (the other holders of its RW lock in a conflicting mode: the writers for a reader, all of them for a writer), then if it is still not granted after grace seconds looks for a cycle back to itself: a lock request which only blocks briefly (e.g. on an internal lock) is never reported.
+	A found cycle raises DeadlockError from the blocking acquire(), or is given to on_deadlock (which may log it) and the acquire() then blocks as usual.
+	The deadline of a lock request is computed with time_source, which must be the one of the wrapped RW locks; the RW locks which are not wrapped pay nothing.
+	"""
+
+	__slots__ = ("c_lock", "c_waiting", "c_on_deadlock", "c_grace", "c_time_source")
+
+	def __init__(self, on_deadlock: Optional[Callable[[List[Tuple[int, RWLockable]]], None]] = None, grace: float = 0.01, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init."""
+		self.c_lock = threading.Lock()
+		self.c_waiting: Dict[int, Tuple[DeadlockDetector._RWLock, bool]] = {}
+		self.c_on_deadlock = on_deadlock
+		self.c_grace = grace
+		self.c_time_source = time_source
+
+	def _cycle(self, p_ident: int) -> Optional[List[Tuple[int, RWLockable]]]:
+		c_parents: Dict[int, Tuple[int, DeadlockDetector._RWLock]] = {}
+		c_stack = [p_ident]
+		while c_stack:
+			v_ident = c_stack.pop()
+			c_waiting = self.c_waiting.get(v_ident)
+			if c_waiting is None: continue
+			c_rw_lock, c_is_writer = c_waiting
+			for c_owner in [*c_rw_lock.v_writers, *c_rw_lock.v_readers] if c_is_writer else c_rw_lock.v_writers:
+				if c_owner == v_ident: continue  # Its own holds do not block it.
+				if c_owner == p_ident:
+					result = [(v_ident, c_rw_lock.c_rw_lock)]
+					while v_ident != p_ident:
+						v_ident, c_parent = c_parents[v_ident]
+						result.append((v_ident, c_parent.c_rw_lock))
+					result.reverse()
+					return result
+				if c_owner not in c_parents:
+					c_parents[c_owner] = (v_ident, c_rw_lock)
+					c_stack.append(c_owner)
+		return None
+
+	def _wait(self, p_ident: int, p_rw_lock: "DeadlockDetector._RWLock", p_is_writer: bool) -> None:
+		with self.c_lock:
+			self.c_waiting[p_ident] = (p_rw_lock, p_is_writer)
+
+	def _check(self, p_ident: int) -> None:
+		with self.c_lock:
+			c_cycle = self._cycle(p_ident)
+			if c_cycle is not None and self.c_on_deadlock is None: raise DeadlockError(c_cycle)
+		if c_cycle is not None:
+			cast(Callable[[List[Tuple[int, RWLockable]]], None], self.c_on_deadlock)(c_cycle)
+
+	def _done(self, p_ident: int, p_rw_lock: Optional["DeadlockDetector._RWLock"], p_is_writer: bool) -> None:
+		with self.c_lock:
+			del self.c_waiting[p_ident]
+			if p_rw_lock is not None:
+				c_owners = p_rw_lock.v_writers if p_is_writer else p_rw_lock.v_readers
+				c_owners[p_ident] = c_owners.get(p_ident, 0) + 1
+
+	def _own(self, p_ident: int, p_rw_lock: "DeadlockDetector._RWLock", p_is_writer: bool) -> None:
+		with self.c_lock:
+			c_owners = p_rw_lock.v_writers if p_is_writer else p_rw_lock.v_readers
+			c_owners[p_ident] = c_owners.get(p_ident, 0) + 1
+
+	def _disown(self, p_ident: int, p_rw_lock: "DeadlockDetector._RWLock", p_is_writer: bool) -> None:
+		with self.c_lock:
+			c_owners = p_rw_lock.v_writers if p_is_writer else p_rw_lock.v_readers
+			c_count = c_owners[p_ident] - 1
+			if c_count:
+				c_owners[p_ident] = c_count
+			else:
+				del c_owners[p_ident]
+
+	class _RWLock(RWLockableD):
+		__slots__ = ("c_detector", "c_rw_lock", "v_readers", "v_writers")
+
+		def __init__(self, p_detector: "DeadlockDetector", p_rw_lock: RWLockable) -> None:
+			self.c_detector = p_detector
+			self.c_rw_lock = p_rw_lock
+			self.v_readers: Dict[int, int] = {}  # Hold count of each thread holding a reader lock.
+			self.v_writers: Dict[int, int] = {}  # Hold count of each thread holding a writer lock.
+
+		def gen_rlock(self) -> "DeadlockDetector._aHandle":
+			"""Generate a reader lock."""
+			return DeadlockDetector._aHandle(self, self.c_rw_lock.gen_rlock(), False)
+
+		def gen_wlock(self) -> "DeadlockDetector._aHandle":
+			"""Generate a writer lock."""
+			return DeadlockDetector._aHandle(self, self.c_rw_lock.gen_wlock(), True)
+
+	class _aHandle(LockableD):
+		__slots__ = ("c_rw_lock", "c_lock", "c_is_writer", "v_owners")
+
+		def __init__(self, p_rw_lock: "DeadlockDetector._RWLock", p_lock: Lockable, p_is_writer: bool) -> None:
+			self.c_rw_lock = p_rw_lock
+			self.c_lock = p_lock
+			self.c_is_writer = p_is_writer
+			self.v_owners: List[int] = []
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_detector = c_rw_lock.c_detector
+			c_ident = threading.get_ident()
+			if self.c_lock.acquire(False):
+				c_detector._own(c_ident, c_rw_lock, self.c_is_writer)
+			else:
+				if not blocking: return False
+				c_deadline = _deadline(True, timeout, deadline, c_detector.c_time_source)
+				result = False
+				try:
+					c_detector._wait(c_ident, c_rw_lock, self.c_is_writer)
+					c_grace = c_detector.c_time_source() + c_detector.c_grace
+					c_persists = c_deadline is None or c_grace < c_deadline
+					result = _acquire_lock(self.c_lock, True, -1, c_grace if c_persists else c_deadline, c_detector.c_time_source)
+					if not result and c_persists:
+						c_detector._check(c_ident)
+						result = _acquire_lock(self.c_lock, True, -1, c_deadline, c_detector.c_time_source)
+				finally:
+					c_detector._done(c_ident, c_rw_lock if result else None, self.c_is_writer)
+				if not result: return False
+			self.v_owners.append(c_ident)
+			return True
+
+		def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			if not self.v_owners: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_rw_lock = self.c_rw_lock
+			result = DeadlockDetector._aHandle(c_rw_lock, cast(LockableD, self.c_lock).downgrade(), False)
+			c_ident = self.v_owners.pop()
+			c_rw_lock.c_detector._own(c_ident, c_rw_lock, False)
+			c_rw_lock.c_detector._disown(c_ident, c_rw_lock, True)
+			result.v_owners.append(c_ident)
+			return result
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_owners: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.c_rw_lock.c_detector._disown(self.v_owners.pop(), self.c_rw_lock, self.c_is_writer)
+			self.c_lock.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.c_lock.locked()
+
+	def wrap(self, rw_lock: RWLockable) -> "DeadlockDetector._RWLock":
+		"""Generate a RW lock tracked by the detector, its lock requests go through rw_lock."""
+		return DeadlockDetector._RWLock(self, rw_lock)
+
+
+class LockOrderWarning(RuntimeWarning):
+	"""Two classes of RW locks are nested in both orders: a latent deadlock."""
+
+
+class LockOrderValidator():
+	"""Records the order in which each thread nests the RW locks it wraps, per class of lock, and warns the first time two classes are nested in both orders.
+
+	The class of a wrapped RW lock is the given name, by default the name of its type: all the locks of a class share an identifier computed once by wrap().
+	A blocking lock request made while holding locks of other classes records an edge from each of them to its own class; an edge seen for the first time which closes a cycle (e.g. A then B here, B then A elsewhere) is an inversion, reported even if no deadlock happened: a LockOrderWarning is issued or the message is given to on_inversion.
+	Once an edge is known, recording it is a set lookup; the nesting of two locks of the same class is not checked (give them distinct names).
+	"""
+
+	__slots__ = ("c_lock", "c_ids", "c_names", "c_edges", "c_next", "c_held", "c_on_inversion")
+
+	def __init__(self, on_inversion: Optional[Callable[[str], None]] = None) -> None:
+		"""Init."""
+		self.c_lock = threading.Lock()
+		self.c_ids: Dict[str, int] = {}
+		self.c_names: List[str] = []
+		self.c_edges: Dict[int, str] = {}  # outer << 32 | inner: where the edge was first seen.
+		self.c_next: Dict[int, List[int]] = {}
+		self.c_held = LockOrderValidator._Held()
+		self.c_on_inversion = on_inversion
+
+	class _Held(threading.local):
+		def __init__(self) -> None:
+			self.v_ids: List[int] = []  # Classes of the locks held by the current thread, in acquisition order.
+
+	def _path(self, p_from: int, p_to: int) -> Optional[List[int]]:
+		c_parents: Dict[int, int] = {p_from: p_from}
+		c_stack = [p_from]
+		while c_stack:
+			v_id = c_stack.pop()
+			if p_to == v_id:
+				result = [v_id]
+				while v_id != p_from:
+					v_id = c_parents[v_id]
+					result.append(v_id)
+				result.reverse()
+				return result
+			for c_next in self.c_next.get(v_id, ()):
+				if c_next not in c_parents:
+					c_parents[c_next] = v_id
+					c_stack.append(c_next)
+		return None
+
+	def _add(self, p_outer: int, p_inner: int) -> None:
+		v_frame = sys._getframe(1)
+		while v_frame.f_back is not None and v_frame.f_code.co_filename == __file__:
+			v_frame = v_frame.f_back
+		c_file, c_line = v_frame.f_code.co_filename, v_frame.f_lineno
+		c_where = f"{c_file}:{c_line}"
+		with self.c_lock:
+			if p_outer << 32 | p_inner in self.c_edges: return
+			c_path = self._path(p_inner, p_outer)
+			self.c_edges[p_outer << 32 | p_inner] = c_where
+			self.c_next.setdefault(p_outer, []).append(p_inner)
+			if c_path is None: return
+			c_names = self.c_names
+			c_message = f"lock order inversion: {c_names[p_inner]} acquired while holding {c_names[p_outer]} at {c_where}, but " + ", ".join(f"{c_names[c_outer]} was held while acquiring {c_names[c_inner]} at {self.c_edges[c_outer << 32 | c_inner]}" for c_outer, c_inner in zip(c_path, c_path[1:]))
+		if self.c_on_inversion is None:
+			warnings.warn_explicit(c_message, LockOrderWarning, c_file, c_line)
+		else:
+			self.c_on_inversion(c_message)
+
+	class _RWLock(RWLockableD):
+		__slots__ = ("c_validator", "c_rw_lock", "c_id")
+
+		def __init__(self, p_validator: "LockOrderValidator", p_rw_lock: RWLockable, p_id: int) -> None:
+			self.c_validator = p_validator
+			self.c_rw_lock = p_rw_lock
+			self.c_id = p_id
+
+		def gen_rlock(self) -> "LockOrderValidator._aHandle":
+			"""Generate a reader lock."""
+			return LockOrderValidator._aHandle(self, self.c_rw_lock.gen_rlock())
+
+		def gen_wlock(self) -> "LockOrderValidator._aHandle":
+			"""Generate a writer lock."""
+			return LockOrderValidator._aHandle(self, self.c_rw_lock.gen_wlock())
+
+	class _aHandle(LockableD):
+		__slots__ = ("c_rw_lock", "c_lock", "v_held")
+
+		def __init__(self, p_rw_lock: "LockOrderValidator._RWLock", p_lock: Lockable) -> None:
+			self.c_rw_lock = p_rw_lock
+			self.c_lock = p_lock
+			self.v_held: List[List[int]] = []  # Held classes of the acquiring thread, per acquisition.
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_validator = c_rw_lock.c_validator
+			c_id = c_rw_lock.c_id
+			c_held = c_validator.c_held.v_ids
+			if blocking and c_held and c_id not in c_held:
+				c_edges = c_validator.c_edges
+				for c_outer in c_held:
+					if c_outer << 32 | c_id not in c_edges:
+						c_validator._add(c_outer, c_id)
+			if not _acquire_lock(self.c_lock, blocking, timeout, deadline): return False
+			c_held.append(c_id)
+			self.v_held.append(c_held)
+			return True
+
+		def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			if not self.v_held: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			result = LockOrderValidator._aHandle(self.c_rw_lock, cast(LockableD, self.c_lock).downgrade())
+			result.v_held.append(self.v_held.pop())
+			return result
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_held: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_held = self.v_held.pop()
+			c_id = self.c_rw_lock.c_id
+			if c_id == c_held[-1]:
+				c_held.pop()
+			else:
+				c_held.remove(c_id)
+			self.c_lock.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.c_lock.locked()
+
+	def wrap(self, rw_lock: RWLockable, name: Optional[str] = None) -> "LockOrderValidator._RWLock":
+		"""Generate a RW lock of the class name (by default the name of the type of rw_lock) validated by the validator, its lock requests go through rw_lock."""
+		c_name = type(rw_lock).__qualname__ if name is None else name
+		with self.c_lock:
+			c_id = self.c_ids.get(c_name)
+			if c_id is None:
+				c_id = self.c_ids[c_name] = len(self.c_names)
+				self.c_names.append(c_name)
+		return LockOrderValidator._RWLock(self, rw_lock, c_id)
+
+
+_STATS_BUCKETS: int = 32  # Bucket i of a duration histogram counts the durations of [2 ** (i - 1), 2 ** i) nanoseconds, the last one all the longer ones.
+_STATS_CONTENDED: int = 16  # A granted lock request which waited for [32.8, 65.5) us or longer counts as contended.
+
+
+def _bucket(p_duration: float) -> int:
+	"""Bucket of a duration (in seconds) in a duration histogram."""
+	return min(_STATS_BUCKETS - 1, int(p_duration * 1e9).bit_length())
+
+
+class RWLockStats(RWLockableD):
+	"""A RW lock keeping statistics about the lock requests it passes to rw_lock.
+
+	For the readers and for the writers: the number of acquisitions, of contended lock requests (which could not be granted or waited for at least bucket _STATS_CONTENDED), of timeouts (blocking lock requests which gave up), and the histograms of the wait times and of the hold times (see _STATS_BUCKETS).
+	Each lock request is passed once and as made (a FIFO lock keeps its order): being timed is how a granted one is told contended or not.
+	The memory used is constant, a RW lock which is not wrapped pays nothing.
+	"""
+
+	__slots__ = ("c_rw_lock", "c_time_source", "c_lock", "c_reader", "c_writer")
+
+	def __init__(self, rw_lock: RWLockable, time_source: Callable[[], float] = time.perf_counter, lock_factory: Callable[[], BaseLockable] = threading.Lock) -> None:
+		"""Init."""
+		self.c_rw_lock = rw_lock
+		self.c_time_source = time_source
+		self.c_lock = lock_factory()
+		self.c_reader = RWLockStats._Stats()
+		self.c_writer = RWLockStats._Stats()
+
+	class _Stats():
+		__slots__ = ("v_acquisitions", "v_contended", "v_timeouts", "c_wait", "c_hold")
+
+		def __init__(self) -> None:
+			self.v_acquisitions: int = 0
+			self.v_contended: int = 0
+			self.v_timeouts: int = 0
+			self.c_wait: List[int] = [0] * _STATS_BUCKETS
+			self.c_hold: List[int] = [0] * _STATS_BUCKETS
+
+		def snapshot(self) -> Dict[str, Any]:
+			return {"acquisitions": self.v_acquisitions, "contended": self.v_contended, "timeouts": self.v_timeouts, "wait": list(self.c_wait), "hold": list(self.c_hold)}
+
+	class _aHandle(LockableD):
+		__slots__ = ("c_rw_lock", "c_lock", "c_stats", "v_starts")
+
+		def __init__(self, p_rw_lock: "RWLockStats", p_lock: Lockable, p_stats: "RWLockStats._Stats") -> None:
+			self.c_rw_lock = p_rw_lock
+			self.c_lock = p_lock
+			self.c_stats = p_stats
+			self.v_starts: List[float] = []  # Acquisition time of each hold.
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_stats = self.c_stats
+			c_wait_start = c_rw_lock.c_time_source()
+			result = _acquire_lock(self.c_lock, blocking, timeout, deadline, c_rw_lock.c_time_source)  # The request as made: no barging ahead of the waiters.
+			c_start = c_rw_lock.c_time_source()
+			c_bucket = _bucket(c_start - c_wait_start)
+			with c_rw_lock.c_lock:
+				if not result or _STATS_CONTENDED <= c_bucket:
+					c_stats.v_contended += 1
+				if not result:
+					if blocking: c_stats.v_timeouts += 1
+					return False
+				c_stats.v_acquisitions += 1
+				c_stats.c_wait[c_bucket] += 1
+			self.v_starts.append(c_start)
+			return True
+
+		def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			if not self.v_starts: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_rw_lock = self.c_rw_lock
+			result = RWLockStats._aHandle(c_rw_lock, cast(LockableD, self.c_lock).downgrade(), c_rw_lock.c_reader)
+			c_start = c_rw_lock.c_time_source()
+			with c_rw_lock.c_lock:
+				self.c_stats.c_hold[_bucket(c_start - self.v_starts.pop())] += 1
+				c_rw_lock.c_reader.v_acquisitions += 1
+				c_rw_lock.c_reader.c_wait[0] += 1
+			result.v_starts.append(c_start)
+			return result
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_starts: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_rw_lock = self.c_rw_lock
+			c_hold = c_rw_lock.c_time_source() - self.v_starts.pop()
+			self.c_lock.release()
+			with c_rw_lock.c_lock:
+				self.c_stats.c_hold[_bucket(c_hold)] += 1
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.c_lock.locked()
+
+	def gen_rlock(self) -> "RWLockStats._aHandle":
+		"""Generate a reader lock."""
+		return RWLockStats._aHandle(self, self.c_rw_lock.gen_rlock(), self.c_reader)
+
+	def gen_wlock(self) -> "RWLockStats._aHandle":
+		"""Generate a writer lock."""
+		return RWLockStats._aHandle(self, self.c_rw_lock.gen_wlock(), self.c_writer)
+
+	def stats(self) -> Dict[str, Dict[str, Any]]:
+		"""Snapshot of the statistics: {"reader": ..., "writer": ...} each holding "acquisitions", "contended", "timeouts", "wait" and "hold" (histograms of _STATS_BUCKETS counts)."""
+		with self.c_lock:
+			return {"reader": self.c_reader.snapshot(), "writer": self.c_writer.snapshot()}
+
+
+class LongHold(NamedTuple):
+	"""A lock held for longer than its hold budget, as reported by HoldWatchdog."""
+
+	rw_lock: RWLockable
+	is_writer: bool
+	thread_ident: int
+	duration: float
+	stack: traceback.StackSummary
+
+
+class HoldWatchdog():
+	"""A watchdog thread reporting the locks of the RW locks it wraps which are held for longer than their hold budget.
+
+	Every interval (by default a quarter of the budget) the thread scans a copy of the current holds, without taking any of the inspected locks: the stack of the holder of a lock held for longer than its budget is captured with sys._current_frames() and given to on_long_hold, once per hold.
+	A scan costs one pass over the current holds, the stacks are only captured for the holds over budget.
+	"""
+
+	__slots__ = ("c_on_long_hold", "c_budget", "c_interval", "c_time_source", "c_holds", "c_stop", "v_thread")
+
+	def __init__(self, on_long_hold: Callable[[LongHold], None], budget: float = 1.0, interval: Optional[float] = None, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init."""
+		self.c_on_long_hold = on_long_hold
+		self.c_budget = budget
+		self.c_interval = budget / 4 if interval is None else interval
+		self.c_time_source = time_source
+		self.c_holds: Set[HoldWatchdog._Hold] = set()
+		self.c_stop = threading.Event()
+		self.v_thread: Optional[threading.Thread] = None
+
+	class _Hold():
+		__slots__ = ("c_rw_lock", "c_is_writer", "c_thread_ident", "c_start", "v_reported")
+
+		def __init__(self, p_rw_lock: "HoldWatchdog._RWLock", p_is_writer: bool, p_start: float) -> None:
+			self.c_rw_lock = p_rw_lock
+			self.c_is_writer = p_is_writer
+			self.c_thread_ident = threading.get_ident()
+			self.c_start = p_start
+			self.v_reported = False
+
+	class _RWLock(RWLockableD):
+		__slots__ = ("c_watchdog", "c_rw_lock", "c_budget")
+
+		def __init__(self, p_watchdog: "HoldWatchdog", p_rw_lock: RWLockable, p_budget: float) -> None:
+			self.c_watchdog = p_watchdog
+			self.c_rw_lock = p_rw_lock
+			self.c_budget = p_budget
+
+		def gen_rlock(self) -> "HoldWatchdog._aHandle":
+			"""Generate a reader lock."""
+			return HoldWatchdog._aHandle(self, self.c_rw_lock.gen_rlock(), False)
+
+		def gen_wlock(self) -> "HoldWatchdog._aHandle":
+			"""Generate a writer lock."""
+			return HoldWatchdog._aHandle(self, self.c_rw_lock.gen_wlock(), True)
+
+	class _aHandle(LockableD):
+		__slots__ = ("c_rw_lock", "c_lock", "c_is_writer", "v_holds")
+
+		def __init__(self, p_rw_lock: "HoldWatchdog._RWLock", p_lock: Lockable, p_is_writer: bool) -> None:
+			self.c_rw_lock = p_rw_lock
+			self.c_lock = p_lock
+			self.c_is_writer = p_is_writer
+			self.v_holds: List[HoldWatchdog._Hold] = []
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			if not _acquire_lock(self.c_lock, blocking, timeout, deadline, self.c_rw_lock.c_watchdog.c_time_source): return False
+			c_watchdog = self.c_rw_lock.c_watchdog
+			c_hold = HoldWatchdog._Hold(self.c_rw_lock, self.c_is_writer, c_watchdog.c_time_source())
+			c_watchdog.c_holds.add(c_hold)
+			self.v_holds.append(c_hold)
+			return True
+
+		def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			if not self.v_holds: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_holds = self.c_rw_lock.c_watchdog.c_holds
+			c_hold = self.v_holds.pop()
+			result = HoldWatchdog._aHandle(self.c_rw_lock, cast(LockableD, self.c_lock).downgrade(), False)
+			c_hold_r = HoldWatchdog._Hold(self.c_rw_lock, False, c_hold.c_start)
+			c_hold_r.v_reported = c_hold.v_reported  # Still the same hold.
+			c_holds.add(c_hold_r)
+			c_holds.discard(c_hold)
+			result.v_holds.append(c_hold_r)
+			return result
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_holds: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.c_rw_lock.c_watchdog.c_holds.discard(self.v_holds.pop())
+			self.c_lock.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.c_lock.locked()
+
+	def wrap(self, rw_lock: RWLockable, budget: Optional[float] = None) -> "HoldWatchdog._RWLock":
+		"""Generate a RW lock watched by the watchdog with the given hold budget (by default the one of the watchdog), its lock requests go through rw_lock."""
+		return HoldWatchdog._RWLock(self, rw_lock, self.c_budget if budget is None else budget)
+
+	def check(self) -> None:
+		"""Report the holds over budget which were not reported yet (done by the thread of the watchdog every interval)."""
+		c_now = self.c_time_source()
+		c_frames = None
+		for c_hold in self.c_holds.copy():
+			if c_hold.v_reported or c_now - c_hold.c_start <= c_hold.c_rw_lock.c_budget: continue
+			if c_hold not in self.c_holds: continue  # Released meanwhile.
+			c_hold.v_reported = True
+			if c_frames is None: c_frames = sys._current_frames()
+			c_frame = c_frames.get(c_hold.c_thread_ident)
+			c_stack = traceback.StackSummary() if c_frame is None else traceback.extract_stack(c_frame)
+			self.c_on_long_hold(LongHold(c_hold.c_rw_lock.c_rw_lock, c_hold.c_is_writer, c_hold.c_thread_ident, c_now - c_hold.c_start, c_stack))
+
+	def _run(self) -> None:
+		while not self.c_stop.wait(self.c_interval):
+			self.check()
+
+	def start(self) -> None:
+		"""Start the thread of the watchdog."""
+		if self.v_thread is not None: raise RuntimeError("the watchdog is already started")
+		self.c_stop.clear()
+		self.v_thread = threading.Thread(target=self._run, name="HoldWatchdog", daemon=True)
+		self.v_thread.start()
+
+	def stop(self) -> None:
+		"""Stop the thread of the watchdog."""
+		c_thread = self.v_thread
+		if c_thread is None: return
+		self.c_stop.set()
+		c_thread.join()
+		self.v_thread = None
+
+
+_TRACE_ACQUIRE: int = 0  # Kinds of the traced events, _TRACE_WRITER is added for the writer side.
+_TRACE_ACQUIRED: int = 1
+_TRACE_TIMEOUT: int = 2
+_TRACE_DOWNGRADE: int = 3
+_TRACE_RELEASE: int = 4
+_TRACE_WRITER: int = 8
+_TRACE_NONE: int = 255  # Empty slot of the ring buffer.
+
+
+class _TraceBuffer():
+	"""Internal ring buffer of the lock events of a LockTracer and their export to the Chrome trace event format.
+
+	An event is a slot of preallocated arrays (time, kind, lock identifier, thread or task identifier), the oldest events are overwritten once capacity events are recorded.
+	The sequence of a slot (its event index + 1) and then its kind are published last, the export only reads the slots: it skips the ones being written.
+	"""
+
+	__slots__ = ("c_capacity", "c_time_source", "c_times", "c_kinds", "c_locks", "c_idents", "c_seqs", "c_counter", "c_lock", "c_names")
+
+	def __init__(self, capacity: int = 65536, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init."""
+		if capacity < 1: raise ValueError("capacity must be positive")
+		self.c_capacity = capacity
+		self.c_time_source = time_source
+		self.c_times = array.array("d", bytes(8 * capacity))
+		self.c_kinds = array.array("B", bytes([_TRACE_NONE]) * capacity)
+		self.c_locks = array.array("I", bytes(4 * capacity))
+		self.c_idents = array.array("Q", bytes(8 * capacity))
+		self.c_seqs = array.array("Q", bytes(8 * capacity))
+		self.c_counter = itertools.count()
+		self.c_lock = threading.Lock()
+		self.c_names: List[str] = []
+
+	def _register(self, p_rw_lock: Any, p_name: Optional[str]) -> int:
+		with self.c_lock:
+			c_id = len(self.c_names)
+			self.c_names.append(f"{type(p_rw_lock).__qualname__}#{c_id}" if p_name is None else p_name)
+			return c_id
+
+	def _record(self, p_kind: int, p_lock: int, p_ident: int) -> None:
+		if _GIL_ENABLED:
+			c_index = next(self.c_counter)  # Atomic, unlike a += 1.
+		else:
+			with self.c_lock:  # Not atomic without the GIL.
+				c_index = next(self.c_counter)
+		c_slot = c_index % self.c_capacity
+		self.c_kinds[c_slot] = _TRACE_NONE  # Being written.
+		self.c_times[c_slot] = self.c_time_source()
+		self.c_locks[c_slot] = p_lock
+		self.c_idents[c_slot] = p_ident
+		self.c_seqs[c_slot] = c_index + 1
+		self.c_kinds[c_slot] = p_kind  # Published.
+
+	def trace(self) -> Dict[str, Any]:
+		"""Export the recorded events in the Chrome trace event format (chrome://tracing, ui.perfetto.dev): a slice per wait (flagged on timeout) and per hold of a lock, on the track of its thread or task."""
+		c_seqs = self.c_seqs
+		c_end = max(c_seqs)  # Write cursor: after the last published event.
+		c_capacity = self.c_capacity
+		c_pid = os.getpid()
+		c_names = self.c_names
+		c_waits: Dict[Tuple[int, int, int], List[float]] = collections.defaultdict(list)
+		c_holds: Dict[Tuple[int, int, int], List[float]] = collections.defaultdict(list)
+		c_events: List[Dict[str, Any]] = []
+
+		def add_slice(p_name: str, p_key: Tuple[int, int, int], p_start: float, p_end: float, p_args: Dict[str, Any]) -> None:
+			c_events.append({"name": f"{p_name} {'write' if p_key[2] else 'read'} {c_names[p_key[1]]}", "cat": "rwlock", "ph": "X", "ts": p_start * 1e6, "dur": (p_end - p_start) * 1e6, "pid": c_pid, "tid": p_key[0], "args": p_args})
+		for c_index in range(max(0, c_end - c_capacity), c_end):
+			c_slot = c_index % c_capacity
+			c_kind = self.c_kinds[c_slot]
+			if _TRACE_NONE == c_kind or c_index + 1 != c_seqs[c_slot]: continue  # Being written, or not written yet.
+			c_time = self.c_times[c_slot]
+			c_key = (self.c_idents[c_slot], self.c_locks[c_slot], c_kind & _TRACE_WRITER)
+			if c_kind != self.c_kinds[c_slot] or c_index + 1 != c_seqs[c_slot]: continue  # Overwritten while read.
+			c_kind &= ~_TRACE_WRITER
+			if _TRACE_ACQUIRE == c_kind:
+				c_waits[c_key].append(c_time)
+			elif _TRACE_ACQUIRED == c_kind or _TRACE_TIMEOUT == c_kind:
+				if c_waits[c_key]: add_slice("wait", c_key, c_waits[c_key].pop(), c_time, {"timeout": _TRACE_TIMEOUT == c_kind})
+				if _TRACE_ACQUIRED == c_kind: c_holds[c_key].append(c_time)
+			elif c_holds[c_key]:  # The start of the hold may have been overwritten.
+				add_slice("hold", c_key, c_holds[c_key].pop(), c_time, {"downgraded": _TRACE_DOWNGRADE == c_kind})
+				if _TRACE_DOWNGRADE == c_kind: c_holds[(c_key[0], c_key[1], 0)].append(c_time)
+		c_idents = {c_event["tid"] for c_event in c_events}
+		c_events.extend({"name": "thread_name", "ph": "M", "pid": c_pid, "tid": c_thread.ident, "args": {"name": c_thread.name}} for c_thread in threading.enumerate() if c_thread.ident in c_idents)
+		return {"traceEvents": c_events, "displayTimeUnit": "ms"}
+
+	def export(self, path: str) -> None:
+		"""Write the trace of the recorded events (see trace()) to the JSON file path."""
+		with open(path, "w", encoding="utf-8") as c_file:
+			json.dump(self.trace(), c_file)
+
+
+class LockTracer(_TraceBuffer):
+	"""A tracer recording the lock events of the RW locks it wraps: acquire start, acquire end, timeout, downgrade and release, with the thread and the name of the lock.
+
+	The events go to a ring buffer of preallocated arrays (the last capacity events are kept), trace() and export() turn them into the Chrome trace event format to see the waits and the holds of each thread on a timeline (e.g. lock convoys).
+	"""
+
+	__slots__ = ()
+
+	class _RWLock(RWLockableD):
+		__slots__ = ("c_tracer", "c_rw_lock", "c_id")
+
+		def __init__(self, p_tracer: "LockTracer", p_rw_lock: RWLockable, p_id: int) -> None:
+			self.c_tracer = p_tracer
+			self.c_rw_lock = p_rw_lock
+			self.c_id = p_id
+
+		def gen_rlock(self) -> "LockTracer._aReader":
+			"""Generate a reader lock."""
+			return LockTracer._aReader(self, self.c_rw_lock.gen_rlock())
+
+		def gen_wlock(self) -> "LockTracer._aWriter":
+			"""Generate a writer lock."""
+			return LockTracer._aWriter(self, self.c_rw_lock.gen_wlock())
+
+	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "c_lock", "v_idents")
+		_SIDE: int = 0
+
+		def __init__(self, p_rw_lock: "LockTracer._RWLock", p_lock: Lockable) -> None:
+			self.c_rw_lock = p_rw_lock
+			self.c_lock = p_lock
+			self.v_idents: List[int] = []  # Acquiring thread of each hold.
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_ident = threading.get_ident()
+			c_rw_lock.c_tracer._record(_TRACE_ACQUIRE | self._SIDE, c_rw_lock.c_id, c_ident)
+			locked: bool = False
+			try:
+				locked = _acquire_lock(self.c_lock, blocking, timeout, deadline, c_rw_lock.c_tracer.c_time_source)
+			finally:
+				c_rw_lock.c_tracer._record((_TRACE_ACQUIRED if locked else _TRACE_TIMEOUT) | self._SIDE, c_rw_lock.c_id, c_ident)
+			if locked: self.v_idents.append(c_ident)
+			return locked
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_idents: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.c_rw_lock.c_tracer._record(_TRACE_RELEASE | self._SIDE, self.c_rw_lock.c_id, self.v_idents.pop())
+			self.c_lock.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.c_lock.locked()
+
+	class _aWriter(_aReader, LockableD):
+		__slots__ = ()
+		_SIDE: int = _TRACE_WRITER
+
+		def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			if not self.v_idents: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_ident = self.v_idents.pop()
+			self.c_rw_lock.c_tracer._record(_TRACE_DOWNGRADE | _TRACE_WRITER, self.c_rw_lock.c_id, c_ident)
+			result = LockTracer._aReader(self.c_rw_lock, cast(LockableD, self.c_lock).downgrade())
+			result.v_idents.append(c_ident)
+			return result
+
+	def wrap(self, rw_lock: RWLockable, name: Optional[str] = None) -> "LockTracer._RWLock":
+		"""Generate a RW lock traced by the tracer under name (by default the name of the type of rw_lock and a number), its lock requests go through rw_lock."""
+		return LockTracer._RWLock(self, rw_lock, self._register(rw_lock, name))
@@ -4,22 +4,35 @@
 """Read Write Lock."""
 
 import asyncio
-import sys
+import collections
+import inspect
+import math
 import time
 
 from typing import Any
+from typing import Awaitable
 from typing import Callable
+from typing import cast
+from typing import Deque
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Type
 from typing import Union
 from types import TracebackType
 from typing_extensions import Protocol
 from typing_extensions import runtime_checkable
 
-try:
-	from asyncio import create_task as run_task
-except ImportError:  # pragma: no cover
-	from asyncio import ensure_future as run_task  # type: ignore [assignment]  # pragma: no cover
+from readerwriterlock.rwlock import _TRACE_ACQUIRE
+from readerwriterlock.rwlock import _TRACE_ACQUIRED
+from readerwriterlock.rwlock import _TRACE_DOWNGRADE
+from readerwriterlock.rwlock import _TRACE_RELEASE
+from readerwriterlock.rwlock import _TRACE_TIMEOUT
+from readerwriterlock.rwlock import _TRACE_WRITER
+from readerwriterlock.rwlock import _TraceBuffer
 
 RELEASE_ERR_MSG: str
 RELEASE_ERR_CLS: type
@@ -37,11 +50,13 @@ else:
 class Lockable(Protocol):
 	"""Lockable.  Compatible with threading.Lock interface."""
 
-	async def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
-		"""Acquire a lock."""
+	__slots__ = ()
+
+	def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> Awaitable[bool]:
+		"""Acquire a lock (a coroutine function, or a function returning an already completed awaitable when it does not need to wait)."""
 		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
 
-	async def release(self) -> None:
+	def release(self) -> Awaitable[None]:
 		"""Release the lock."""
 		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
 
@@ -64,17 +79,32 @@ class Lockable(Protocol):
 class LockableD(Lockable, Protocol):
 	"""Lockable Downgradable."""
 
+	__slots__ = ()
+
 	async def downgrade(self) -> Lockable:
 		"""Downgrade."""
 		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
 
 
+@runtime_checkable
+class LockableU(Lockable, Protocol):
+	"""Lockable Upgradable."""
+
+	__slots__ = ()
+
+	async def upgrade(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> Optional[LockableD]:
+		"""Upgrade, None if it could not before the deadline."""
+		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
+
+
 class _ThreadSafeInt():
 	"""Internal thread safe integer like object.
 
 	Implements only the bare minimum features for the RWLock implementation's need.
 	"""
 
+	__slots__ = ("__value_lock", "__value")
+
 	def __init__(self, initial_value: int, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock) -> None:
 		"""Init."""
 		self.__value_lock = lock_factory()
@@ -99,10 +129,114 @@ class _ThreadSafeInt():
 			self.__value -= 1
 
 
+async def _wait_condition(p_condition: asyncio.Condition, c_deadline: Optional[float], time_source: Callable[[], float]) -> bool:
+	"""Wait on a condition whose lock is held, return False if the deadline is expired."""
+	if c_deadline is None:
+		await p_condition.wait()
+		return True
+	c_remaining: float = c_deadline - time_source()
+	if c_remaining <= 0: return False
+	try:
+		await asyncio.wait_for(p_condition.wait(), timeout=c_remaining)
+	except asyncio.TimeoutError:
+		pass  # The condition lock is re-acquired, the caller re-evaluates its predicate.
+	return True
+
+
+def _deadline(blocking: bool, timeout: float, deadline: Optional[float], time_source: Callable[[], float]) -> Optional[float]:
+	"""Absolute deadline of an acquire (None if it can wait forever, -inf if it cannot wait), the clock is only read for a relative timeout."""
+	if not blocking: return -math.inf
+	if timeout < 0: return deadline
+	c_deadline: float = time_source() + timeout
+	return c_deadline if deadline is None or c_deadline < deadline else deadline
+
+
+def _timeout(timeout: float, deadline: Optional[float], time_source: Callable[[], float]) -> float:
+	"""Relative timeout of a blocking acquire bounded by its deadline (-1 if none, 0 if expired), the clock is only read for a deadline."""
+	if deadline is None: return timeout
+	c_remaining: float = max(0.0, deadline - time_source())
+	return c_remaining if timeout < 0 or c_remaining < timeout else timeout
+
+
+_TAKES_DEADLINE: Dict[type, bool] = {}
+
+
+def _takes_deadline(p_lock: Any) -> bool:
+	"""Answer to 'does the acquire of this lock take a deadline?' (a lock of another package may only take the documented blocking and timeout)."""
+	c_type = type(p_lock)
+	result: Optional[bool] = _TAKES_DEADLINE.get(c_type)
+	if result is None:
+		try:
+			result = "deadline" in inspect.signature(p_lock.acquire).parameters
+		except (TypeError, ValueError):  # No signature (e.g. a builtin lock).
+			result = False
+		_TAKES_DEADLINE[c_type] = result
+	return result
+
+
+def _acquire_lock(p_lock: Lockable, blocking: bool, timeout: float, deadline: Optional[float], time_source: Callable[[], float] = time.perf_counter) -> Awaitable[bool]:
+	"""Acquire a wrapped lock, the deadline is forwarded only when set and turned into the time left for a lock whose acquire does not take one."""
+	if deadline is None: return p_lock.acquire(blocking, timeout)
+	if _takes_deadline(p_lock): return p_lock.acquire(blocking, timeout, deadline=deadline)
+	return p_lock.acquire(True, _timeout(timeout, deadline, time_source)) if blocking else p_lock.acquire(False)
+
+
+class _Deadline():
+	"""Internal deadline of an acquire with a relative timeout, turned into an absolute deadline the first time it is needed."""
+
+	__slots__ = ("c_timeout", "c_deadline", "c_time_source", "v_at")
+
+	def __init__(self, p_timeout: float, p_deadline: Optional[float], p_time_source: Callable[[], float]) -> None:
+		"""Init."""
+		self.c_timeout = p_timeout
+		self.c_deadline = p_deadline
+		self.c_time_source = p_time_source
+		self.v_at: Optional[float] = None
+
+	def at(self) -> float:
+		"""Absolute deadline, the clock is read on the first call."""
+		if self.v_at is None:
+			c_at: float = self.c_time_source() + self.c_timeout
+			self.v_at = c_at if self.c_deadline is None or c_at < self.c_deadline else self.c_deadline
+		return self.v_at
+
+
+def _lazy_deadline(blocking: bool, timeout: float, deadline: Optional[float], time_source: Callable[[], float]) -> Union[None, float, _Deadline]:
+	"""Deadline of an acquire like _deadline(), except that a relative timeout only reads the clock once a lock is busy (see _acquire_before())."""
+	if not blocking: return -math.inf
+	if timeout < 0: return deadline
+	return _Deadline(timeout, deadline, time_source)
+
+
+async def _acquire_before(p_lock: Union[Lockable, asyncio.Lock], c_deadline: Union[None, float, _Deadline], time_source: Callable[[], float]) -> bool:
+	"""Acquire the lock before the deadline, a free lock is taken right away: the clock is only read (and asyncio.wait_for() only used) when the lock is busy."""
+	if c_deadline is None:
+		await p_lock.acquire()
+		return True
+	if not p_lock.locked():
+		c_acquire = p_lock.acquire()
+		if not asyncio.iscoroutine(c_acquire): return await c_acquire  # An already completed awaitable (see _RWLockM).
+		try:
+			c_acquire.send(None)  # Runs to completion unless the lock is being handed over to a waiter it woke up (not locked() yet).
+		except StopIteration:
+			return True
+		c_acquire.close()  # Leaves the queue of the lock, the handoff case waits before the deadline below.
+	if -math.inf == c_deadline: return False
+	c_remaining: float = (c_deadline.at() if isinstance(c_deadline, _Deadline) else c_deadline) - time_source()
+	if c_remaining <= 0: return False
+	try:
+		await asyncio.wait_for(p_lock.acquire(), timeout=c_remaining)
+	except asyncio.TimeoutError:
+		return False
+	return True
+
+
 @runtime_checkable
 class RWLockable(Protocol):
 	"""Read/write lock."""
 
+	__slots__ = ()
+
 	async def gen_rlock(self) -> Lockable:
 		"""Generate a reader lock."""
 		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
@@ -116,6 +250,23 @@ class RWLockable(Protocol):
 class RWLockableD(Protocol):
 	"""Read/write lock Downgradable."""
 
+	__slots__ = ()
+
+	async def gen_rlock(self) -> Lockable:
+		"""Generate a reader lock."""
+		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
+
+	async def gen_wlock(self) -> LockableD:
+		"""Generate a writer lock."""
+		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
+
+
+@runtime_checkable
+class RWLockableU(Protocol):
+	"""Read/write lock Upgradable."""
+
+	__slots__ = ()
+
 	async def gen_rlock(self) -> Lockable:
 		"""Generate a reader lock."""
 		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
@@ -124,10 +275,16 @@ class RWLockableD(Protocol):
 		"""Generate a writer lock."""
 		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
 
+	async def gen_ulock(self) -> LockableU:
+		"""Generate an upgradable reader lock."""
+		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
+
 
 class RWLockRead(RWLockable):
 	"""A Read/Write lock giving preference to Reader."""
 
+	__slots__ = ("v_read_count", "c_time_source", "c_resource", "c_lock_read_count")
+
 	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
 		"""Init."""
 		self.v_read_count: int = 0
@@ -136,23 +293,20 @@ class RWLockRead(RWLockable):
 		self.c_lock_read_count = lock_factory()
 
 	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockRead") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		async def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout: Optional[float] = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline: Optional[float] = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_read_count.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not await _acquire_before(self.c_rw_lock.c_lock_read_count, c_deadline, self.c_rw_lock.c_time_source):
 				return False
 			self.c_rw_lock.v_read_count += 1
 			if 1 == self.c_rw_lock.v_read_count:
-				try:
-					await asyncio.wait_for(self.c_rw_lock.c_resource.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-				except asyncio.TimeoutError:
+				if not await _acquire_before(self.c_rw_lock.c_resource, c_deadline, self.c_rw_lock.c_time_source):
 					self.c_rw_lock.v_read_count -= 1
 					self.c_rw_lock.c_lock_read_count.release()
 					return False
@@ -175,19 +329,16 @@ class RWLockRead(RWLockable):
 			return self.v_locked
 
 	class _aWriter(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockRead") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		async def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout: Optional[float] = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline: Optional[float] = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_resource.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-				locked: bool = True
-			except asyncio.TimeoutError:
-				locked = False
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			locked: bool = await _acquire_before(self.c_rw_lock.c_resource, c_deadline, self.c_rw_lock.c_time_source)
 			self.v_locked = locked
 			return locked
 
@@ -213,6 +364,8 @@ class RWLockRead(RWLockable):
 class RWLockWrite(RWLockable):
 	"""A Read/Write lock giving preference to Writer."""
 
+	__slots__ = ("v_read_count", "v_write_count", "c_time_source", "c_lock_read_count", "c_lock_write_count", "c_lock_read_entry", "c_lock_read_try", "c_resource")
+
 	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
 		"""Init."""
 		self.v_read_count: int = 0
@@ -225,34 +378,27 @@ class RWLockWrite(RWLockable):
 		self.c_resource = lock_factory()
 
 	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockWrite") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		async def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_read_entry.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not await _acquire_before(self.c_rw_lock.c_lock_read_entry, c_deadline, self.c_rw_lock.c_time_source):
 				return False
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_read_try.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			if not await _acquire_before(self.c_rw_lock.c_lock_read_try, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_read_entry.release()
 				return False
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_read_count.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			if not await _acquire_before(self.c_rw_lock.c_lock_read_count, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_read_try.release()
 				self.c_rw_lock.c_lock_read_entry.release()
 				return False
 			self.c_rw_lock.v_read_count += 1
 			if 1 == self.c_rw_lock.v_read_count:
-				try:
-					await asyncio.wait_for(self.c_rw_lock.c_resource.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-				except asyncio.TimeoutError:
+				if not await _acquire_before(self.c_rw_lock.c_resource, c_deadline, self.c_rw_lock.c_time_source):
 					self.c_rw_lock.c_lock_read_try.release()
 					self.c_rw_lock.c_lock_read_entry.release()
 					self.c_rw_lock.v_read_count -= 1
@@ -279,30 +425,25 @@ class RWLockWrite(RWLockable):
 			return self.v_locked
 
 	class _aWriter(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockWrite") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		async def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_write_count.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not await _acquire_before(self.c_rw_lock.c_lock_write_count, c_deadline, self.c_rw_lock.c_time_source):
 				return False
 			self.c_rw_lock.v_write_count += 1
 			if 1 == int(self.c_rw_lock.v_write_count):
-				try:
-					await asyncio.wait_for(self.c_rw_lock.c_lock_read_try.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-				except asyncio.TimeoutError:
+				if not await _acquire_before(self.c_rw_lock.c_lock_read_try, c_deadline, self.c_rw_lock.c_time_source):
 					self.c_rw_lock.v_write_count -= 1
 					self.c_rw_lock.c_lock_write_count.release()  # type: ignore [func-returns-value]
 					return False
 			self.c_rw_lock.c_lock_write_count.release()
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_resource.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			if not await _acquire_before(self.c_rw_lock.c_resource, c_deadline, self.c_rw_lock.c_time_source):
 				await self.c_rw_lock.c_lock_write_count.acquire()
 				self.c_rw_lock.v_write_count -= 1
 				if 0 == int(self.c_rw_lock.v_write_count):
@@ -339,6 +480,8 @@ class RWLockWrite(RWLockable):
 class RWLockFair(RWLockable):
 	"""A Read/Write lock giving fairness to both Reader and Writer."""
 
+	__slots__ = ("v_read_count", "c_time_source", "c_lock_read_count", "c_lock_read", "c_lock_write")
+
 	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
 		"""Init."""
 		self.v_read_count: int = 0
@@ -348,28 +491,23 @@ class RWLockFair(RWLockable):
 		self.c_lock_write = lock_factory()
 
 	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockFair") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		async def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_read.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not await _acquire_before(self.c_rw_lock.c_lock_read, c_deadline, self.c_rw_lock.c_time_source):
 				return False
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_read_count.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			if not await _acquire_before(self.c_rw_lock.c_lock_read_count, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_read.release()
 				return False
 			self.c_rw_lock.v_read_count += 1
 			if 1 == self.c_rw_lock.v_read_count:
-				try:
-					await asyncio.wait_for(self.c_rw_lock.c_lock_write.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-				except asyncio.TimeoutError:
+				if not await _acquire_before(self.c_rw_lock.c_lock_write, c_deadline, self.c_rw_lock.c_time_source):
 					self.c_rw_lock.v_read_count -= 1
 					self.c_rw_lock.c_lock_read_count.release()
 					self.c_rw_lock.c_lock_read.release()
@@ -394,21 +532,18 @@ class RWLockFair(RWLockable):
 			return self.v_locked
 
 	class _aWriter(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockFair") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		async def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_read.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not await _acquire_before(self.c_rw_lock.c_lock_read, c_deadline, self.c_rw_lock.c_time_source):
 				return False
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_write.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			if not await _acquire_before(self.c_rw_lock.c_lock_write, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_read.release()
 				return False
 			self.v_locked = True
@@ -435,37 +570,46 @@ class RWLockFair(RWLockable):
 
 
 class RWLockReadD(RWLockableD):
-	"""A Read/Write lock giving preference to Reader."""
+	"""A Read/Write lock giving preference to Reader.
+
+	Implemented as a single monitor so that a writer can be downgraded atomically: it turns directly into a reader within the lock state.
+	"""
+
+	__slots__ = ("v_read_count", "v_read_waiting", "v_write_count", "c_time_source", "c_lock_state", "c_cond_read", "c_cond_write")
 
 	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
 		"""Init."""
-		self.v_read_count: _ThreadSafeInt = _ThreadSafeInt(initial_value=0, lock_factory=lock_factory)
+		self.v_read_count: int = 0
+		self.v_read_waiting: int = 0
+		self.v_write_count: int = 0
 		self.c_time_source = time_source
-		self.c_resource = lock_factory()
-		self.c_lock_read_count = lock_factory()
+		self.c_lock_state = lock_factory()
+		self.c_cond_read = asyncio.Condition(self.c_lock_state)  # type: ignore [arg-type]
+		self.c_cond_write = asyncio.Condition(self.c_lock_state)  # type: ignore [arg-type]
 
 	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockReadD") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		async def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout: Optional[float] = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline: Optional[float] = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_read_count.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
-				return False
-			await self.c_rw_lock.v_read_count.increment()
-			if 1 == int(self.c_rw_lock.v_read_count):
-				try:
-					await asyncio.wait_for(self.c_rw_lock.c_resource.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-				except asyncio.TimeoutError:
-					await self.c_rw_lock.v_read_count.decrement()
-					self.c_rw_lock.c_lock_read_count.release()
-					return False
-			self.c_rw_lock.c_lock_read_count.release()
+			c_rw_lock = self.c_rw_lock
+			async with c_rw_lock.c_lock_state:
+				if c_rw_lock.v_write_count:
+					if not blocking: return False
+					c_deadline: Optional[float] = _deadline(True, timeout, deadline, c_rw_lock.c_time_source)
+					c_rw_lock.v_read_waiting += 1
+					while c_rw_lock.v_write_count:
+						if not await _wait_condition(c_rw_lock.c_cond_read, c_deadline, c_rw_lock.c_time_source):
+							c_rw_lock.v_read_waiting -= 1
+							if 0 == c_rw_lock.v_read_waiting and 0 == c_rw_lock.v_write_count and 0 == c_rw_lock.v_read_count:
+								c_rw_lock.c_cond_write.notify()  # Writers were only held back by this waiting reader.
+							return False
+					c_rw_lock.v_read_waiting -= 1
+				c_rw_lock.v_read_count += 1
 			self.v_locked = True
 			return True
 
@@ -473,65 +617,62 @@ class RWLockReadD(RWLockableD):
 			"""Release the lock."""
 			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
 			self.v_locked = False
-			await self.c_rw_lock.c_lock_read_count.acquire()
-			await self.c_rw_lock.v_read_count.decrement()
-			if 0 == int(self.c_rw_lock.v_read_count):
-				self.c_rw_lock.c_resource.release()
-			self.c_rw_lock.c_lock_read_count.release()
+			c_rw_lock = self.c_rw_lock
+			async with c_rw_lock.c_lock_state:
+				c_rw_lock.v_read_count -= 1
+				if 0 == c_rw_lock.v_read_count and 0 == c_rw_lock.v_read_waiting:
+					c_rw_lock.c_cond_write.notify()
 
 		def locked(self) -> bool:
 			"""Answer to 'is it currently locked?'."""
 			return self.v_locked
 
 	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockReadD") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		async def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout: Optional[float] = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline: Optional[float] = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_resource.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-				locked: bool = True
-			except asyncio.TimeoutError:
-				locked = False
-
-			self.v_locked = locked
-			return locked
+			c_rw_lock = self.c_rw_lock
+			async with c_rw_lock.c_lock_state:
+				if c_rw_lock.v_write_count or c_rw_lock.v_read_count or c_rw_lock.v_read_waiting:
+					if not blocking: return False
+					c_deadline: Optional[float] = _deadline(True, timeout, deadline, c_rw_lock.c_time_source)
+					while c_rw_lock.v_write_count or c_rw_lock.v_read_count or c_rw_lock.v_read_waiting:
+						if not await _wait_condition(c_rw_lock.c_cond_write, c_deadline, c_rw_lock.c_time_source): return False
+				c_rw_lock.v_write_count = 1
+			self.v_locked = True
+			return True
 
 		async def downgrade(self) -> Lockable:
 			"""Downgrade."""
 			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_rw_lock = self.c_rw_lock
+			async with c_rw_lock.c_lock_state:
+				c_rw_lock.v_write_count = 0
+				c_rw_lock.v_read_count += 1
+				if c_rw_lock.v_read_waiting:
+					c_rw_lock.c_cond_read.notify_all()
+			self.v_locked = False
 
-			result = await self.c_rw_lock.gen_rlock()
-
-			wait_blocking = asyncio.Event()
-
-			async def lock_result() -> None:
-				wait_blocking.set()
-				await result.acquire()  # This is a blocking action
-				wait_blocking.set()
-
-			run_task(lock_result())
-
-			await wait_blocking.wait()  # Wait for the thread to be almost in its blocking state.
-			wait_blocking.clear()
-
-			for _ in range(123):
-				await asyncio.sleep(sys.float_info.min)  # Heuristic sleep delay to leave some extra time for the thread to block.
-
-			await self.release()  # Open the gate! the current RW lock strategy gives priority to reader, therefore the result will acquire lock before any other writer lock.
-
-			await wait_blocking.wait()  # Wait for the lock to be acquired
+			result = c_rw_lock._aReader(p_RWLock=c_rw_lock)
+			result.v_locked = True
 			return result
 
 		async def release(self) -> None:
 			"""Release the lock."""
 			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
 			self.v_locked = False
-			self.c_rw_lock.c_resource.release()
+			c_rw_lock = self.c_rw_lock
+			async with c_rw_lock.c_lock_state:
+				c_rw_lock.v_write_count = 0
+				if c_rw_lock.v_read_waiting:
+					c_rw_lock.c_cond_read.notify_all()
+				else:
+					c_rw_lock.c_cond_write.notify()
 
 		def locked(self) -> bool:
 			"""Answer to 'is it currently locked?'."""
@@ -549,6 +690,8 @@ class RWLockReadD(RWLockableD):
 class RWLockWriteD(RWLockableD):
 	"""A Read/Write lock giving preference to Writer."""
 
+	__slots__ = ("v_read_count", "v_write_count", "c_time_source", "c_lock_read_count", "c_lock_write_count", "c_lock_read_entry", "c_lock_read_try", "c_resource")
+
 	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
 		"""Init."""
 		self.v_read_count: _ThreadSafeInt = _ThreadSafeInt(lock_factory=lock_factory, initial_value=0)
@@ -561,34 +704,27 @@ class RWLockWriteD(RWLockableD):
 		self.c_resource = lock_factory()
 
 	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockWriteD") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		async def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_read_entry.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not await _acquire_before(self.c_rw_lock.c_lock_read_entry, c_deadline, self.c_rw_lock.c_time_source):
 				return False
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_read_try.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			if not await _acquire_before(self.c_rw_lock.c_lock_read_try, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_read_entry.release()
 				return False
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_read_count.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			if not await _acquire_before(self.c_rw_lock.c_lock_read_count, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_read_try.release()
 				self.c_rw_lock.c_lock_read_entry.release()
 				return False
 			await self.c_rw_lock.v_read_count.increment()
 			if 1 == int(self.c_rw_lock.v_read_count):
-				try:
-					await asyncio.wait_for(self.c_rw_lock.c_resource.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-				except asyncio.TimeoutError:
+				if not await _acquire_before(self.c_rw_lock.c_resource, c_deadline, self.c_rw_lock.c_time_source):
 					self.c_rw_lock.c_lock_read_try.release()
 					self.c_rw_lock.c_lock_read_entry.release()
 					await self.c_rw_lock.v_read_count.decrement()
@@ -615,30 +751,25 @@ class RWLockWriteD(RWLockableD):
 			return self.v_locked
 
 	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockWriteD") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		async def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_write_count.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not await _acquire_before(self.c_rw_lock.c_lock_write_count, c_deadline, self.c_rw_lock.c_time_source):
 				return False
 			self.c_rw_lock.v_write_count += 1
 			if 1 == self.c_rw_lock.v_write_count:
-				try:
-					await asyncio.wait_for(self.c_rw_lock.c_lock_read_try.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-				except asyncio.TimeoutError:
+				if not await _acquire_before(self.c_rw_lock.c_lock_read_try, c_deadline, self.c_rw_lock.c_time_source):
 					self.c_rw_lock.v_write_count -= 1
 					self.c_rw_lock.c_lock_write_count.release()
 					return False
 			self.c_rw_lock.c_lock_write_count.release()
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_resource.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			if not await _acquire_before(self.c_rw_lock.c_resource, c_deadline, self.c_rw_lock.c_time_source):
 				await self.c_rw_lock.c_lock_write_count.acquire()
 				self.c_rw_lock.v_write_count -= 1
 				if 0 == self.c_rw_lock.v_write_count:
@@ -691,6 +822,8 @@ class RWLockWriteD(RWLockableD):
 class RWLockFairD(RWLockableD):
 	"""A Read/Write lock giving fairness to both Reader and Writer."""
 
+	__slots__ = ("v_read_count", "c_time_source", "c_lock_read_count", "c_lock_read", "c_lock_write")
+
 	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
 		"""Init."""
 		self.v_read_count: int = 0
@@ -700,28 +833,23 @@ class RWLockFairD(RWLockableD):
 		self.c_lock_write = lock_factory()
 
 	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockFairD") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		async def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_read.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not await _acquire_before(self.c_rw_lock.c_lock_read, c_deadline, self.c_rw_lock.c_time_source):
 				return False
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_read_count.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			if not await _acquire_before(self.c_rw_lock.c_lock_read_count, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_read.release()
 				return False
 			self.c_rw_lock.v_read_count += 1
 			if 1 == self.c_rw_lock.v_read_count:
-				try:
-					await asyncio.wait_for(self.c_rw_lock.c_lock_write.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-				except asyncio.TimeoutError:
+				if not await _acquire_before(self.c_rw_lock.c_lock_write, c_deadline, self.c_rw_lock.c_time_source):
 					self.c_rw_lock.v_read_count -= 1
 					self.c_rw_lock.c_lock_read_count.release()
 					self.c_rw_lock.c_lock_read.release()
@@ -746,21 +874,18 @@ class RWLockFairD(RWLockableD):
 			return self.v_locked
 
 	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "v_locked")
+
 		def __init__(self, p_RWLock: "RWLockFairD") -> None:
 			self.c_rw_lock = p_RWLock
 			self.v_locked: bool = False
 
-		async def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
 			"""Acquire a lock."""
-			p_timeout = None if (blocking and timeout < 0) else (timeout if blocking else 0)
-			c_deadline = None if p_timeout is None else (self.c_rw_lock.c_time_source() + p_timeout)
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_read.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_rw_lock.c_time_source)
+			if not await _acquire_before(self.c_rw_lock.c_lock_read, c_deadline, self.c_rw_lock.c_time_source):
 				return False
-			try:
-				await asyncio.wait_for(self.c_rw_lock.c_lock_write.acquire(), timeout=(None if c_deadline is None else max(sys.float_info.min, c_deadline - self.c_rw_lock.c_time_source())))
-			except asyncio.TimeoutError:
+			if not await _acquire_before(self.c_rw_lock.c_lock_write, c_deadline, self.c_rw_lock.c_time_source):
 				self.c_rw_lock.c_lock_read.release()
 				return False
 			self.v_locked = True
@@ -796,3 +921,1187 @@ class RWLockFairD(RWLockableD):
 	async def gen_wlock(self) -> "RWLockFairD._aWriter":
 		"""Generate a writer lock."""
 		return RWLockFairD._aWriter(self)
+
+
+class _RWLockM(RWLockableD):
+	"""Internal event loop native Read/Write lock engine.
+
+	The whole lock state lives in this object and is only mutated from the event loop thread, so no sub-lock is needed:
+	- An acquire which can be granted right away completes without suspending: it is a plain function returning an already completed loop future (no coroutine is even created), like the releases.
+	- Otherwise the waiter parks on a loop future queued in the FIFO of its kind (readers or writers, their arrival order is kept across both), with at most one loop.call_at timer armed for its timeout.
+	- Releases hand the lock over to the waiters by resolving their futures, a waiter which gives up is only flagged and dropped once it reaches the head of its FIFO.
+	"""
+
+	__slots__ = ("v_read_count", "v_read_waiting", "v_write_count", "v_write_waiting", "c_time_source", "c_read_waiters", "c_write_waiters", "v_seq", "v_done")
+
+	class _Waiter():
+		"""A queued lock request."""
+
+		__slots__ = ("c_future", "c_is_writer", "c_seq", "v_queued")
+
+		def __init__(self, p_future: "asyncio.Future[bool]", p_is_writer: bool, p_seq: int) -> None:
+			"""Init."""
+			self.c_future = p_future
+			self.c_is_writer = p_is_writer
+			self.c_seq = p_seq  # Arrival order.
+			self.v_queued: bool = True
+
+	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init (lock_factory is unused, it is accepted for interface compatibility)."""
+		self.v_read_count: int = 0
+		self.v_read_waiting: int = 0
+		self.v_write_count: int = 0
+		self.v_write_waiting: int = 0
+		self.c_time_source = time_source
+		self.c_read_waiters: Deque[_RWLockM._Waiter] = collections.deque()
+		self.c_write_waiters: Deque[_RWLockM._Waiter] = collections.deque()
+		self.v_seq: int = 0
+		self.v_done: Optional[Tuple["asyncio.Future[bool]", "asyncio.Future[bool]", "asyncio.Future[None]"]] = None
+
+	def _completed(self) -> Tuple["asyncio.Future[bool]", "asyncio.Future[bool]", "asyncio.Future[None]"]:
+		"""Already completed futures returned by the fast paths (acquired, not acquired, released), bound to the running loop like an asyncio.Lock is."""
+		c_loop = asyncio.get_running_loop()
+		c_acquired: "asyncio.Future[bool]" = c_loop.create_future()
+		c_acquired.set_result(True)
+		c_not_acquired: "asyncio.Future[bool]" = c_loop.create_future()
+		c_not_acquired.set_result(False)
+		c_released: "asyncio.Future[None]" = c_loop.create_future()
+		c_released.set_result(None)
+		self.v_done = (c_acquired, c_not_acquired, c_released)
+		return self.v_done
+
+	def _can_read(self) -> bool:
+		"""Answer to 'can a new reader get the lock right away?'."""
+		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
+
+	def _can_write(self) -> bool:
+		"""Answer to 'can a new writer get the lock right away?'."""
+		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
+
+	def _wake(self) -> None:
+		"""Hand the lock over to the waiters which can now get it."""
+		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
+
+	def _wake_write_end(self) -> None:
+		"""Hand the lock over to the waiters which can now get it, once a writer gave it back."""
+		self._wake()
+
+	@staticmethod
+	def _head(p_waiters: "Deque[_RWLockM._Waiter]") -> "Optional[_RWLockM._Waiter]":
+		"""First waiter still queued in the FIFO (dropping the ones which gave up)."""
+		while p_waiters and not p_waiters[0].v_queued:
+			p_waiters.popleft()
+		return p_waiters[0] if p_waiters else None
+
+	def _grant(self, p_is_writer: bool) -> None:
+		"""Remove the first waiter of the kind from its FIFO and give it the lock (unless it is already cancelled)."""
+		c_waiters = self.c_write_waiters if p_is_writer else self.c_read_waiters
+		c_waiter = c_waiters.popleft()
+		while not c_waiter.v_queued:
+			c_waiter = c_waiters.popleft()
+		c_waiter.v_queued = False
+		if p_is_writer:
+			self.v_write_waiting -= 1
+		else:
+			self.v_read_waiting -= 1
+		if c_waiter.c_future.done(): return
+		if p_is_writer:
+			self.v_write_count += 1
+		else:
+			self.v_read_count += 1
+		c_waiter.c_future.set_result(True)
+
+	def _discard(self, p_waiter: "_RWLockM._Waiter") -> bool:
+		"""Take the waiter out of its FIFO, return False if it was not waiting anymore."""
+		if not p_waiter.v_queued: return False
+		p_waiter.v_queued = False
+		if p_waiter.c_is_writer:
+			self.v_write_waiting -= 1
+			c_waiters, c_waiting = self.c_write_waiters, self.v_write_waiting
+		else:
+			self.v_read_waiting -= 1
+			c_waiters, c_waiting = self.c_read_waiters, self.v_read_waiting
+		self._head(c_waiters)
+		if len(c_waiters) > 2 * c_waiting:  # Mostly waiters which gave up: compact the FIFO (amortized O(1)).
+			c_queued = [c_waiter for c_waiter in c_waiters if c_waiter.v_queued]
+			c_waiters.clear()
+			c_waiters.extend(c_queued)
+		return True
+
+	def _timeout(self, p_waiter: "_RWLockM._Waiter") -> None:
+		"""Give up on a waiter whose deadline expired."""
+		if self._discard(p_waiter):
+			if not p_waiter.c_future.done():  # Unless already cancelled.
+				p_waiter.c_future.set_result(False)
+			self._wake()  # The waiter may have been holding back the ones behind it.
+
+	async def _wait(self, p_is_writer: bool, timeout: float) -> bool:
+		"""Park the current task in the FIFO until it is given the lock or its deadline expires."""
+		c_loop = asyncio.get_event_loop()
+		c_future: "asyncio.Future[bool]" = c_loop.create_future()
+		c_waiter = _RWLockM._Waiter(c_future, p_is_writer, self.v_seq)
+		self.v_seq += 1
+		if p_is_writer:
+			self.c_write_waiters.append(c_waiter)
+			self.v_write_waiting += 1
+		else:
+			self.c_read_waiters.append(c_waiter)
+			self.v_read_waiting += 1
+		c_timer: Optional[asyncio.TimerHandle] = None if timeout < 0 else c_loop.call_at(c_loop.time() + timeout, self._timeout, c_waiter)
+		try:
+			return await c_future
+		except asyncio.CancelledError:
+			if self._discard(c_waiter):
+				self._wake()
+			elif c_future.done() and not c_future.cancelled() and c_future.result():
+				# The lock was handed over right before the cancellation: give it back.
+				if p_is_writer:
+					self.v_write_count -= 1
+					self._wake_write_end()
+				else:
+					self.v_read_count -= 1
+					self._wake()
+			raise
+		finally:
+			if c_timer is not None:
+				c_timer.cancel()
+
+	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "_RWLockM") -> None:
+			self.c_rw_lock = p_RWLock
+			self.v_locked: bool = False
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> Awaitable[bool]:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_done = c_rw_lock.v_done or c_rw_lock._completed()
+			if c_rw_lock._can_read():
+				c_rw_lock.v_read_count += 1
+				self.v_locked = True
+				return c_done[0]
+			if not blocking: return c_done[1]
+			timeout = _timeout(timeout, deadline, c_rw_lock.c_time_source)
+			if 0 == timeout: return c_done[1]
+			return self._wait(timeout)
+
+		async def _wait(self, timeout: float) -> bool:
+			"""Wait for the lock."""
+			self.v_locked = await self.c_rw_lock._wait(False, timeout)
+			return self.v_locked
+
+		def release(self) -> Awaitable[None]:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.v_read_count -= 1
+			if 0 == c_rw_lock.v_read_count and (c_rw_lock.v_read_waiting or c_rw_lock.v_write_waiting):
+				c_rw_lock._wake()
+			return (c_rw_lock.v_done or c_rw_lock._completed())[2]
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "_RWLockM") -> None:
+			self.c_rw_lock = p_RWLock
+			self.v_locked: bool = False
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> Awaitable[bool]:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_done = c_rw_lock.v_done or c_rw_lock._completed()
+			if c_rw_lock._can_write():
+				c_rw_lock.v_write_count += 1
+				self.v_locked = True
+				return c_done[0]
+			if not blocking: return c_done[1]
+			timeout = _timeout(timeout, deadline, c_rw_lock.c_time_source)
+			if 0 == timeout: return c_done[1]
+			return self._wait(timeout)
+
+		async def _wait(self, timeout: float) -> bool:
+			"""Wait for the lock."""
+			self.v_locked = await self.c_rw_lock._wait(True, timeout)
+			return self.v_locked
+
+		async def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.v_write_count -= 1
+			c_rw_lock.v_read_count += 1
+			if c_rw_lock.v_read_waiting or c_rw_lock.v_write_waiting:
+				c_rw_lock._wake_write_end()
+
+			result = c_rw_lock._aReader(p_RWLock=c_rw_lock)
+			result.v_locked = True
+			return result
+
+		def release(self) -> Awaitable[None]:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock.v_write_count -= 1
+			if c_rw_lock.v_read_waiting or c_rw_lock.v_write_waiting:
+				c_rw_lock._wake_write_end()
+			return (c_rw_lock.v_done or c_rw_lock._completed())[2]
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	async def gen_rlock(self) -> "_RWLockM._aReader":
+		"""Generate a reader lock."""
+		return _RWLockM._aReader(self)
+
+	async def gen_wlock(self) -> "_RWLockM._aWriter":
+		"""Generate a writer lock."""
+		return _RWLockM._aWriter(self)
+
+
+class RWLockReadM(_RWLockM):
+	"""A Read/Write lock giving preference to Reader (Event loop native engine, downgradable)."""
+
+	__slots__ = ()
+
+	def _can_read(self) -> bool:
+		"""Answer to 'can a new reader get the lock right away?'."""
+		return 0 == self.v_write_count
+
+	def _can_write(self) -> bool:
+		"""Answer to 'can a new writer get the lock right away?'."""
+		return 0 == self.v_write_count and 0 == self.v_read_count and 0 == self.v_read_waiting
+
+	def _wake(self) -> None:
+		"""Hand the lock over to the waiters which can now get it."""
+		if self.v_write_count: return
+		while self.v_read_waiting:
+			self._grant(False)
+		while self.v_write_waiting and 0 == self.v_read_count and 0 == self.v_write_count:
+			self._grant(True)
+
+
+class RWLockWriteM(_RWLockM):
+	"""A Read/Write lock giving preference to Writer (Event loop native engine, downgradable)."""
+
+	__slots__ = ()
+
+	def _can_read(self) -> bool:
+		"""Answer to 'can a new reader get the lock right away?'."""
+		return 0 == self.v_write_count and 0 == self.v_write_waiting
+
+	def _can_write(self) -> bool:
+		"""Answer to 'can a new writer get the lock right away?'."""
+		return 0 == self.v_write_count and 0 == self.v_read_count
+
+	def _wake(self) -> None:
+		"""Hand the lock over to the waiters which can now get it."""
+		if self.v_write_count: return
+		while self.v_write_waiting:
+			if self.v_read_count: return
+			self._grant(True)
+			if self.v_write_count: return
+		while self.v_read_waiting:
+			self._grant(False)
+
+
+class RWLockFairM(_RWLockM):
+	"""A Read/Write lock giving fairness to both Reader and Writer (Event loop native engine, downgradable).
+
+	The lock is handed over in strict FIFO order, a group of consecutive readers being admitted together.
+	"""
+
+	__slots__ = ()
+
+	def _can_read(self) -> bool:
+		"""Answer to 'can a new reader get the lock right away?'."""
+		return 0 == self.v_write_count and 0 == self.v_read_waiting and 0 == self.v_write_waiting
+
+	def _can_write(self) -> bool:
+		"""Answer to 'can a new writer get the lock right away?'."""
+		return 0 == self.v_write_count and 0 == self.v_read_count and 0 == self.v_read_waiting and 0 == self.v_write_waiting
+
+	def _wake(self) -> None:
+		"""Hand the lock over to the waiters which can now get it."""
+		while (self.v_read_waiting or self.v_write_waiting) and 0 == self.v_write_count:
+			c_reader = self._head(self.c_read_waiters)
+			c_writer = self._head(self.c_write_waiters)
+			if c_writer is not None and (c_reader is None or c_writer.c_seq < c_reader.c_seq):
+				if self.v_read_count and not c_writer.c_future.done(): return
+				self._grant(True)
+			else:
+				self._grant(False)
+
+
+class RWLockPhaseFair(_RWLockM):
+	"""A Read/Write lock alternating read phases and write phases (Event loop native engine, downgradable).
+
+	- A reader gets in right away unless a writer holds or waits for the lock, it then waits for the end of the next write phase.
+	- When a writer gives back the lock, all the waiting readers are admitted together (as one read phase) before the next writer.
+	- A writer waits for the readers of the current read phase to drain.
+	"""
+
+	__slots__ = ("v_read_turn",)
+
+	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init."""
+		super().__init__(lock_factory=lock_factory, time_source=time_source)
+		self.v_read_turn: bool = False
+
+	def _can_read(self) -> bool:
+		"""Answer to 'can a new reader get the lock right away?'."""
+		return 0 == self.v_write_count and 0 == self.v_write_waiting
+
+	def _can_write(self) -> bool:
+		"""Answer to 'can a new writer get the lock right away?'."""
+		return 0 == self.v_write_count and 0 == self.v_read_count and 0 == self.v_read_waiting and 0 == self.v_write_waiting
+
+	def _wake_write_end(self) -> None:
+		"""Hand the lock over to the waiters which can now get it, once a writer gave it back."""
+		self.v_read_turn = True
+		self._wake()
+
+	def _wake(self) -> None:
+		"""Hand the lock over to the waiters which can now get it."""
+		if self.v_write_count: return
+		if self.v_read_turn or 0 == self.v_write_waiting:
+			while self.v_read_waiting:
+				self._grant(False)
+		self.v_read_turn = False
+		while self.v_write_waiting and 0 == self.v_read_count and 0 == self.v_write_count:
+			self._grant(True)
+
+
+class _RWLockR(RWLockable):
+	"""Internal reentrant Read/Write lock.
+
+	Wraps a downgradable engine and keeps the hold counts of each task:
+	- Only the outermost acquire of a task goes through the engine, a nested one (read in read, read in write, write in write) is a counter bump on the task state.
+	- Releasing the outermost writer lock while reader locks are still held atomically downgrades the engine lock.
+	- Acquiring a writer lock while only holding reader locks is refused since it would deadlock.
+
+	The hold counts belong to the current task: a child task (e.g.: asyncio.gather) does not inherit them.
+	"""
+
+	__slots__ = ("c_engine", "c_states")
+
+	class _TaskState():
+		"""Hold counts of a task."""
+
+		__slots__ = ("v_read_count", "v_write_count", "c_lock_r", "c_lock_w")
+
+		def __init__(self) -> None:
+			"""Init."""
+			self.v_read_count: int = 0
+			self.v_write_count: int = 0
+			self.c_lock_r: Optional[Lockable] = None
+			self.c_lock_w: Optional[LockableD] = None
+
+	def __init__(self, p_engine: RWLockableD) -> None:
+		"""Init."""
+		self.c_engine = p_engine
+		self.c_states: Dict[Optional["asyncio.Task[Any]"], _RWLockR._TaskState] = {}
+
+	def _state(self) -> "_RWLockR._TaskState":
+		"""Get the state of the current task."""
+		c_task = asyncio.current_task()
+		c_state = self.c_states.get(c_task)
+		if c_state is None:
+			c_state = self.c_states[c_task] = _RWLockR._TaskState()
+		return c_state
+
+	def _forget(self) -> None:
+		"""Drop the state of the current task once it holds nothing anymore."""
+		del self.c_states[asyncio.current_task()]
+
+	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "_RWLockR") -> None:
+			self.c_rw_lock = p_RWLock
+			self.v_locked: int = 0
+
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_state = self.c_rw_lock._state()
+			if 0 == c_state.v_read_count and 0 == c_state.v_write_count:
+				c_lock = await self.c_rw_lock.c_engine.gen_rlock()
+				try:
+					if not await c_lock.acquire(blocking, timeout, deadline=deadline):
+						self.c_rw_lock._forget()
+						return False
+				except BaseException:
+					self.c_rw_lock._forget()
+					raise
+				c_state.c_lock_r = c_lock
+			c_state.v_read_count += 1
+			self.v_locked += 1
+			return True
+
+		async def release(self) -> None:
+			"""Release the lock."""
+			c_state = self.c_rw_lock.c_states.get(asyncio.current_task())
+			if 0 == self.v_locked or c_state is None or 0 == c_state.v_read_count: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked -= 1
+			c_state.v_read_count -= 1
+			if 0 == c_state.v_read_count and c_state.c_lock_r is not None:
+				c_lock = c_state.c_lock_r
+				c_state.c_lock_r = None
+				self.c_rw_lock._forget()
+				await c_lock.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return 0 != self.v_locked
+
+	class _aWriter(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "_RWLockR") -> None:
+			self.c_rw_lock = p_RWLock
+			self.v_locked: int = 0
+
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_state = self.c_rw_lock._state()
+			if 0 == c_state.v_write_count:
+				if c_state.v_read_count: raise RuntimeError("cannot acquire a writer lock while holding a reader lock")
+				c_lock = await self.c_rw_lock.c_engine.gen_wlock()
+				try:
+					if not await c_lock.acquire(blocking, timeout, deadline=deadline):
+						self.c_rw_lock._forget()
+						return False
+				except BaseException:
+					self.c_rw_lock._forget()
+					raise
+				c_state.c_lock_w = c_lock
+			c_state.v_write_count += 1
+			self.v_locked += 1
+			return True
+
+		async def release(self) -> None:
+			"""Release the lock."""
+			c_state = self.c_rw_lock.c_states.get(asyncio.current_task())
+			if 0 == self.v_locked or c_state is None or 0 == c_state.v_write_count: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked -= 1
+			c_state.v_write_count -= 1
+			if 0 == c_state.v_write_count:
+				c_lock = cast(LockableD, c_state.c_lock_w)
+				c_state.c_lock_w = None
+				if c_state.v_read_count:
+					c_state.c_lock_r = await c_lock.downgrade()
+				else:
+					self.c_rw_lock._forget()
+					await c_lock.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return 0 != self.v_locked
+
+	async def gen_rlock(self) -> "_RWLockR._aReader":
+		"""Generate a reader lock."""
+		return _RWLockR._aReader(self)
+
+	async def gen_wlock(self) -> "_RWLockR._aWriter":
+		"""Generate a writer lock."""
+		return _RWLockR._aWriter(self)
+
+
+class RWLockReadR(_RWLockR):
+	"""A reentrant Read/Write lock giving preference to Reader."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init."""
+		super().__init__(RWLockReadM(lock_factory=lock_factory, time_source=time_source))
+
+
+class RWLockWriteR(_RWLockR):
+	"""A reentrant Read/Write lock giving preference to Writer."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init."""
+		super().__init__(RWLockWriteM(lock_factory=lock_factory, time_source=time_source))
+
+
+class RWLockFairR(_RWLockR):
+	"""A reentrant Read/Write lock giving fairness to both Reader and Writer."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init."""
+		super().__init__(RWLockFairM(lock_factory=lock_factory, time_source=time_source))
+
+
+class _RWLockU(RWLockableU):
+	"""Internal upgradable Read/Write lock.
+
+	Wraps a downgradable engine with an intent lock held by the upgradable reader and by the writer:
+	- A reader goes straight to the engine, it coexists with the upgradable reader.
+	- The upgradable reader excludes the writers and the other upgradable readers while it reads.
+	- Since no writer can get in while it holds the intent lock, its upgrade only waits for the current readers to drain.
+	- The upgrade holds a gate from its start: the new readers wait for it instead of starving it (even with a reader preference engine).
+	"""
+
+	__slots__ = ("c_engine", "c_time_source", "c_lock_intent", "c_lock_gate", "v_upgrading")
+
+	def __init__(self, p_engine: RWLockableD, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]], time_source: Callable[[], float]) -> None:
+		"""Init."""
+		self.c_engine = p_engine
+		self.c_time_source = time_source
+		self.c_lock_intent = lock_factory()
+		self.c_lock_gate = lock_factory()
+		self.v_upgrading: bool = False
+
+	@staticmethod
+	async def _acquire_engine(p_lock: Lockable, blocking: bool, c_deadline: Union[None, float, _Deadline]) -> bool:
+		"""Acquire the given engine lock before the deadline."""
+		if isinstance(c_deadline, _Deadline):  # The engine lock reads the clock itself if it is busy, unless a gate already did.
+			return await (p_lock.acquire(True, c_deadline.c_timeout, deadline=c_deadline.c_deadline) if c_deadline.v_at is None else p_lock.acquire(True, -1, deadline=c_deadline.v_at))
+		return await p_lock.acquire(blocking, -1, deadline=c_deadline)
+
+	async def _acquire(self, p_lock: Lockable, blocking: bool, timeout: float, deadline: Optional[float]) -> bool:
+		"""Acquire the intent lock then the given engine lock before the same deadline."""
+		c_deadline = _lazy_deadline(blocking, timeout, deadline, self.c_time_source)
+		if not await _acquire_before(self.c_lock_intent, c_deadline, self.c_time_source): return False
+		try:
+			if await self._acquire_engine(p_lock, blocking, c_deadline): return True
+		except BaseException:
+			self.c_lock_intent.release()
+			raise
+		self.c_lock_intent.release()
+		return False
+
+	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "c_lock")
+
+		def __init__(self, p_RWLock: "_RWLockU", p_lock: Lockable) -> None:
+			self.c_rw_lock = p_RWLock
+			self.c_lock = p_lock
+
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			if not c_rw_lock.v_upgrading: return await self.c_lock.acquire(blocking, timeout, deadline=deadline)
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, c_rw_lock.c_time_source)
+			if not await _acquire_before(c_rw_lock.c_lock_gate, c_deadline, c_rw_lock.c_time_source): return False  # Let the upgrade in progress through first.
+			c_rw_lock.c_lock_gate.release()
+			return await c_rw_lock._acquire_engine(self.c_lock, blocking, c_deadline)
+
+		async def release(self) -> None:
+			"""Release the lock."""
+			await self.c_lock.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.c_lock.locked()
+
+	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "c_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "_RWLockU", p_lock: LockableD) -> None:
+			self.c_rw_lock = p_RWLock
+			self.c_lock = p_lock
+			self.v_locked: bool = False
+
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			self.v_locked = await self.c_rw_lock._acquire(self.c_lock, blocking, timeout, deadline)
+			return self.v_locked
+
+		async def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			result = await self.c_lock.downgrade()
+			self.c_rw_lock.c_lock_intent.release()
+			return result
+
+		async def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			await self.c_lock.release()
+			self.c_rw_lock.c_lock_intent.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	class _aUpgrader(LockableU):
+		__slots__ = ("c_rw_lock", "c_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "_RWLockU", p_lock: Lockable) -> None:
+			self.c_rw_lock = p_RWLock
+			self.c_lock = p_lock
+			self.v_locked: bool = False
+
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			self.v_locked = await self.c_rw_lock._acquire(self.c_lock, blocking, timeout, deadline)
+			return self.v_locked
+
+		async def upgrade(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> Optional[LockableD]:
+			"""Upgrade, None if it could not before the deadline (the upgradable reader lock is then still held)."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_rw_lock = self.c_rw_lock
+			c_deadline = _lazy_deadline(blocking, timeout, deadline, c_rw_lock.c_time_source)
+			if not await _acquire_before(c_rw_lock.c_lock_gate, c_deadline, c_rw_lock.c_time_source): return None
+			c_rw_lock.v_upgrading = True  # From now on the new readers wait for the upgrade.
+			try:
+				result = await c_rw_lock.gen_wlock()
+				await self.c_lock.release()
+				try:
+					locked = await c_rw_lock._acquire_engine(result.c_lock, blocking, c_deadline)  # The intent lock is kept: only the current readers are left to wait for.
+				except BaseException:
+					self.v_locked = False
+					c_rw_lock.c_lock_intent.release()
+					raise
+				if not locked:
+					await self.c_lock.acquire()  # Granted right away: the intent lock keeps the writers out.
+					return None
+			finally:
+				c_rw_lock.v_upgrading = False
+				c_rw_lock.c_lock_gate.release()
+			self.v_locked = False
+			result.v_locked = True
+			return result
+
+		async def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			await self.c_lock.release()
+			self.c_rw_lock.c_lock_intent.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	async def gen_rlock(self) -> "_RWLockU._aReader":
+		"""Generate a reader lock."""
+		return _RWLockU._aReader(self, await self.c_engine.gen_rlock())
+
+	async def gen_wlock(self) -> "_RWLockU._aWriter":
+		"""Generate a writer lock."""
+		return _RWLockU._aWriter(self, await self.c_engine.gen_wlock())
+
+	async def gen_ulock(self) -> "_RWLockU._aUpgrader":
+		"""Generate an upgradable reader lock."""
+		return _RWLockU._aUpgrader(self, await self.c_engine.gen_rlock())
+
+
+class RWLockReadU(_RWLockU):
+	"""An upgradable Read/Write lock giving preference to Reader."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init."""
+		super().__init__(RWLockReadM(lock_factory=lock_factory, time_source=time_source), lock_factory=lock_factory, time_source=time_source)
+
+
+class RWLockWriteU(_RWLockU):
+	"""An upgradable Read/Write lock giving preference to Writer."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init."""
+		super().__init__(RWLockWriteM(lock_factory=lock_factory, time_source=time_source), lock_factory=lock_factory, time_source=time_source)
+
+
+class RWLockFairU(_RWLockU):
+	"""An upgradable Read/Write lock giving fairness to both Reader and Writer."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init."""
+		super().__init__(RWLockFairM(lock_factory=lock_factory, time_source=time_source), lock_factory=lock_factory, time_source=time_source)
+
+
+class _RWLockS(RWLockableD):
+	"""Internal Read/Write lock providing optimistic reads.
+
+	Wraps a downgradable engine with a version counter bumped by the writers when they get and when they give back the lock (it is odd while a writer holds the lock):
+	- try_optimistic_read() returns a stamp without locking anything, 0 if a writer holds the lock.
+	- validate(stamp) answers to 'did no writer get the lock since the stamp was taken?', when it did the reader falls back to a reader lock.
+	"""
+
+	__slots__ = ("c_engine", "v_version")
+
+	def __init__(self, p_engine: RWLockableD) -> None:
+		"""Init."""
+		self.c_engine = p_engine
+		self.v_version: int = 2  # 0 is reserved for the invalid stamp.
+
+	def try_optimistic_read(self) -> int:
+		"""Get a stamp to later validate an optimistic read, 0 if a writer holds the lock."""
+		c_version = self.v_version
+		return 0 if c_version & 1 else c_version
+
+	def validate(self, p_stamp: int) -> bool:
+		"""Answer to 'did no writer get the lock since the stamp was taken?'."""
+		return 0 != p_stamp and p_stamp == self.v_version
+
+	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "c_lock")
+
+		def __init__(self, p_RWLock: "_RWLockS", p_lock: LockableD) -> None:
+			self.c_rw_lock = p_RWLock
+			self.c_lock = p_lock
+
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			if not await self.c_lock.acquire(blocking, timeout, deadline=deadline): return False
+			self.c_rw_lock.v_version += 1
+			return True
+
+		async def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			if not self.c_lock.locked(): raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.c_rw_lock.v_version += 1
+			return await self.c_lock.downgrade()
+
+		async def release(self) -> None:
+			"""Release the lock."""
+			if not self.c_lock.locked(): raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.c_rw_lock.v_version += 1
+			await self.c_lock.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.c_lock.locked()
+
+	async def gen_rlock(self) -> Lockable:
+		"""Generate a reader lock."""
+		return await self.c_engine.gen_rlock()
+
+	async def gen_wlock(self) -> "_RWLockS._aWriter":
+		"""Generate a writer lock."""
+		return _RWLockS._aWriter(self, await self.c_engine.gen_wlock())
+
+
+class RWLockReadS(_RWLockS):
+	"""A Read/Write lock giving preference to Reader and providing optimistic reads."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init."""
+		super().__init__(RWLockReadM(lock_factory=lock_factory, time_source=time_source))
+
+
+class RWLockWriteS(_RWLockS):
+	"""A Read/Write lock giving preference to Writer and providing optimistic reads."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init."""
+		super().__init__(RWLockWriteM(lock_factory=lock_factory, time_source=time_source))
+
+
+class RWLockFairS(_RWLockS):
+	"""A Read/Write lock giving fairness to both Reader and Writer and providing optimistic reads."""
+
+	__slots__ = ()
+
+	def __init__(self, lock_factory: Union[Callable[[], Lockable], Type[asyncio.Lock]] = asyncio.Lock, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init."""
+		super().__init__(RWLockFairM(lock_factory=lock_factory, time_source=time_source))
+
+
+class RWLockTable():
+	"""A table of Read/Write locks, one per key, each created on demand and dropped once nobody holds nor waits for it.
+
+	The lock of a key is built by the strategy (a RW lock type or any factory of RW lock) when a first handle of the key acquires it:
+	- The table counts the handles holding or waiting for the lock of each key, it drops the lock once that count falls back to 0.
+	- The memory is thereby proportional to the number of keys in use, whatever the number of keys ever used.
+	The table itself needs no lock since its entries are only updated between two awaits. A writer handle is downgradable when the strategy is.
+	"""
+
+	__slots__ = ("c_strategy", "c_entries")
+
+	class _Entry():
+		"""The lock of a key in use."""
+
+		__slots__ = ("c_rw_lock", "v_users")
+
+		def __init__(self, p_rw_lock: RWLockable) -> None:
+			"""Init."""
+			self.c_rw_lock = p_rw_lock
+			self.v_users: int = 0  # Handles holding or waiting for the lock.
+
+	def __init__(self, strategy: Callable[[], RWLockable] = RWLockFair) -> None:
+		"""Init."""
+		self.c_strategy = strategy
+		self.c_entries: Dict[Hashable, RWLockTable._Entry] = {}
+
+	def _use(self, p_key: Hashable) -> RWLockable:
+		"""Get the lock of the key, created if needed, for a handle about to acquire it."""
+		c_entry = self.c_entries.get(p_key)
+		if c_entry is None:
+			c_entry = self.c_entries[p_key] = RWLockTable._Entry(self.c_strategy())
+		c_entry.v_users += 1
+		return c_entry.c_rw_lock
+
+	def _unuse(self, p_key: Hashable) -> None:
+		"""Forget a handle which released the lock of the key or gave up acquiring it, drop the lock if it was the last one."""
+		c_entry = self.c_entries[p_key]
+		c_entry.v_users -= 1
+		if 0 == c_entry.v_users:
+			del self.c_entries[p_key]
+
+	class _aReader(Lockable):
+		__slots__ = ("c_table", "c_key", "v_lock")
+
+		def __init__(self, p_table: "RWLockTable", p_key: Hashable) -> None:
+			self.c_table = p_table
+			self.c_key = p_key
+			self.v_lock: Optional[Lockable] = None
+
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_table._use(self.c_key)
+			locked: bool = False
+			try:
+				c_lock = await c_rw_lock.gen_rlock()
+				locked = await _acquire_lock(c_lock, blocking, timeout, deadline)
+			finally:
+				if not locked: self.c_table._unuse(self.c_key)
+			if locked: self.v_lock = c_lock
+			return locked
+
+		async def release(self) -> None:
+			"""Release the lock."""
+			c_lock = self.v_lock
+			if c_lock is None: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_lock = None
+			try:
+				await c_lock.release()
+			finally:
+				self.c_table._unuse(self.c_key)
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_lock is not None
+
+	class _aWriter(LockableD):
+		__slots__ = ("c_table", "c_key", "v_lock")
+
+		def __init__(self, p_table: "RWLockTable", p_key: Hashable) -> None:
+			self.c_table = p_table
+			self.c_key = p_key
+			self.v_lock: Optional[Lockable] = None
+
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_table._use(self.c_key)
+			locked: bool = False
+			try:
+				c_lock = await c_rw_lock.gen_wlock()
+				locked = await _acquire_lock(c_lock, blocking, timeout, deadline)
+			finally:
+				if not locked: self.c_table._unuse(self.c_key)
+			if locked: self.v_lock = c_lock
+			return locked
+
+		async def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			c_lock = self.v_lock
+			if c_lock is None: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			result = RWLockTable._aReader(self.c_table, self.c_key)
+			result.v_lock = await cast(LockableD, c_lock).downgrade()
+			self.v_lock = None
+			return result
+
+		async def release(self) -> None:
+			"""Release the lock."""
+			c_lock = self.v_lock
+			if c_lock is None: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_lock = None
+			try:
+				await c_lock.release()
+			finally:
+				self.c_table._unuse(self.c_key)
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_lock is not None
+
+	async def gen_rlock(self, key: Hashable) -> "RWLockTable._aReader":
+		"""Generate a reader lock of the key."""
+		return RWLockTable._aReader(self, key)
+
+	async def gen_wlock(self, key: Hashable) -> "RWLockTable._aWriter":
+		"""Generate a writer lock of the key."""
+		return RWLockTable._aWriter(self, key)
+
+
+class _LockSet(LockableD):
+	"""Internal lock of several locks: they are acquired in order before a single deadline (all of them or none) and released in reverse order."""
+
+	__slots__ = ("c_locks", "c_is_writer", "c_time_source", "v_locked")
+
+	def __init__(self, p_locks: Tuple[Lockable, ...], p_is_writer: Tuple[bool, ...], p_time_source: Callable[[], float]) -> None:
+		"""Init."""
+		self.c_locks = p_locks
+		self.c_is_writer = p_is_writer
+		self.c_time_source = p_time_source
+		self.v_locked: bool = False
+
+	async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+		"""Acquire a lock."""
+		c_locks = self.c_locks
+		c_deadline: Optional[float] = _deadline(blocking, timeout, deadline, self.c_time_source)
+		c_blocking: bool = -math.inf != c_deadline
+		v_count: int = 0
+		try:
+			for c_lock in c_locks:
+				if not await _acquire_lock(c_lock, c_blocking, -1, c_deadline if c_blocking else None, self.c_time_source): break
+				v_count += 1
+		finally:
+			if v_count != len(c_locks):  # Give back the ones already acquired (also when cancelled).
+				for c_lock in reversed(c_locks[:v_count]):
+					await c_lock.release()
+		self.v_locked = v_count == len(c_locks)
+		return self.v_locked
+
+	async def downgrade(self) -> Lockable:
+		"""Downgrade the writer locks."""
+		if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+		c_locks: List[Lockable] = []
+		for c_lock, c_is_writer in zip(self.c_locks, self.c_is_writer):
+			c_locks.append(await cast(LockableD, c_lock).downgrade() if c_is_writer else c_lock)
+		result = _LockSet(tuple(c_locks), (False,) * len(c_locks), self.c_time_source)
+		result.v_locked = True
+		self.v_locked = False
+		return result
+
+	async def release(self) -> None:
+		"""Release the lock."""
+		if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+		self.v_locked = False
+		for c_lock in reversed(self.c_locks):
+			await c_lock.release()
+
+	def locked(self) -> bool:
+		"""Answer to 'is it currently locked?'."""
+		return self.v_locked
+
+
+async def gen_lock_all(requests: Iterable[Tuple[RWLockable, str]], time_source: Callable[[], float] = time.perf_counter) -> _LockSet:
+	"""Generate a lock of several RW locks, each one requested in the mode "r" (reader) or "w" (writer).
+
+	Its acquire() locks them in a canonical global order (by identity) before a single deadline and gives back the ones already locked if one of them cannot be:
+	- Lock sets thereby never deadlock with each other, whatever the order in which their RW locks are listed.
+	- A RW lock requested more than once is locked once, as a writer if any of its requests is.
+	- The time source must be the one of the RW locks, the writer locks are downgraded if the RW locks are downgradable.
+	"""
+	c_requests: Dict[int, Tuple[RWLockable, bool]] = {}
+	for c_rw_lock, c_mode in requests:
+		if c_mode not in ("r", "w"): raise ValueError(f"unknown mode {c_mode!r}")
+		c_previous = c_requests.get(id(c_rw_lock))
+		c_requests[id(c_rw_lock)] = (c_rw_lock, "w" == c_mode or (c_previous is not None and c_previous[1]))
+	c_locks: List[Lockable] = []
+	c_is_writer: List[bool] = []
+	for c_id in sorted(c_requests):
+		c_rw_lock, c_writer = c_requests[c_id]
+		c_locks.append(await c_rw_lock.gen_wlock() if c_writer else await c_rw_lock.gen_rlock())
+		c_is_writer.append(c_writer)
+	return _LockSet(tuple(c_locks), tuple(c_is_writer), time_source)
+
+
+async def acquire_all(requests: Iterable[Tuple[RWLockable, str]], blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None, time_source: Callable[[], float] = time.perf_counter) -> Optional[_LockSet]:
+	"""Acquire several RW locks at once as per gen_lock_all(), answer the lock holding all of them (to release) or None if they could not all be acquired."""
+	result = await gen_lock_all(requests, time_source)
+	return result if await result.acquire(blocking, timeout, deadline) else None
+
+
+_STATS_BUCKETS: int = 32  # Bucket i of a duration histogram counts the durations of [2 ** (i - 1), 2 ** i) nanoseconds, the last one all the longer ones.
+_STATS_CONTENDED: int = 16  # A granted lock request which waited for [32.8, 65.5) us or longer counts as contended.
+
+
+def _bucket(p_duration: float) -> int:
+	"""Bucket of a duration (in seconds) in a duration histogram."""
+	return min(_STATS_BUCKETS - 1, int(p_duration * 1e9).bit_length())
+
+
+class RWLockStats(RWLockableD):
+	"""A RW lock keeping statistics about the lock requests it passes to rw_lock.
+
+	For the readers and for the writers: the number of acquisitions, of contended lock requests (which could not be granted or waited for at least bucket _STATS_CONTENDED), of timeouts (blocking lock requests which gave up), and the histograms of the wait times and of the hold times (see _STATS_BUCKETS).
+	Each lock request is passed once and as made (a FIFO lock keeps its order): being timed is how a granted one is told contended or not.
+	The memory used is constant, a RW lock which is not wrapped pays nothing.
+	"""
+
+	__slots__ = ("c_rw_lock", "c_time_source", "c_reader", "c_writer")
+
+	def __init__(self, rw_lock: RWLockable, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init."""
+		self.c_rw_lock = rw_lock
+		self.c_time_source = time_source
+		self.c_reader = RWLockStats._Stats()
+		self.c_writer = RWLockStats._Stats()
+
+	class _Stats():
+		__slots__ = ("v_acquisitions", "v_contended", "v_timeouts", "c_wait", "c_hold")
+
+		def __init__(self) -> None:
+			self.v_acquisitions: int = 0
+			self.v_contended: int = 0
+			self.v_timeouts: int = 0
+			self.c_wait: List[int] = [0] * _STATS_BUCKETS
+			self.c_hold: List[int] = [0] * _STATS_BUCKETS
+
+		def snapshot(self) -> Dict[str, Any]:
+			return {"acquisitions": self.v_acquisitions, "contended": self.v_contended, "timeouts": self.v_timeouts, "wait": list(self.c_wait), "hold": list(self.c_hold)}
+
+	class _aHandle(LockableD):
+		__slots__ = ("c_rw_lock", "c_lock", "c_stats", "v_starts")
+
+		def __init__(self, p_rw_lock: "RWLockStats", p_lock: Lockable, p_stats: "RWLockStats._Stats") -> None:
+			self.c_rw_lock = p_rw_lock
+			self.c_lock = p_lock
+			self.c_stats = p_stats
+			self.v_starts: List[float] = []  # Acquisition time of each hold.
+
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_stats = self.c_stats
+			c_wait_start = c_rw_lock.c_time_source()
+			result = await _acquire_lock(self.c_lock, blocking, timeout, deadline, c_rw_lock.c_time_source)  # The request as made: no barging ahead of the waiters.
+			c_start = c_rw_lock.c_time_source()
+			c_bucket = _bucket(c_start - c_wait_start)
+			if not result or _STATS_CONTENDED <= c_bucket:
+				c_stats.v_contended += 1
+			if not result:
+				if blocking: c_stats.v_timeouts += 1
+				return False
+			c_stats.v_acquisitions += 1
+			c_stats.c_wait[c_bucket] += 1
+			self.v_starts.append(c_start)
+			return True
+
+		async def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			if not self.v_starts: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_rw_lock = self.c_rw_lock
+			result = RWLockStats._aHandle(c_rw_lock, await cast(LockableD, self.c_lock).downgrade(), c_rw_lock.c_reader)
+			c_start = c_rw_lock.c_time_source()
+			self.c_stats.c_hold[_bucket(c_start - self.v_starts.pop())] += 1
+			c_rw_lock.c_reader.v_acquisitions += 1
+			c_rw_lock.c_reader.c_wait[0] += 1
+			result.v_starts.append(c_start)
+			return result
+
+		async def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_starts: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.c_stats.c_hold[_bucket(self.c_rw_lock.c_time_source() - self.v_starts.pop())] += 1
+			await self.c_lock.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.c_lock.locked()
+
+	async def gen_rlock(self) -> "RWLockStats._aHandle":
+		"""Generate a reader lock."""
+		return RWLockStats._aHandle(self, await self.c_rw_lock.gen_rlock(), self.c_reader)
+
+	async def gen_wlock(self) -> "RWLockStats._aHandle":
+		"""Generate a writer lock."""
+		return RWLockStats._aHandle(self, await self.c_rw_lock.gen_wlock(), self.c_writer)
+
+	def stats(self) -> Dict[str, Dict[str, Any]]:
+		"""Snapshot of the statistics: {"reader": ..., "writer": ...} each holding "acquisitions", "contended", "timeouts", "wait" and "hold" (histograms of _STATS_BUCKETS counts)."""
+		return {"reader": self.c_reader.snapshot(), "writer": self.c_writer.snapshot()}
+
+
+class LockTracer(_TraceBuffer):
+	"""A tracer recording the lock events of the RW locks it wraps: acquire start, acquire end, timeout, downgrade and release, with the task and the name of the lock.
+
+	The events go to a ring buffer of preallocated arrays (the last capacity events are kept), trace() and export() turn them into the Chrome trace event format to see the waits and the holds of each task on a timeline (e.g. lock convoys).
+	"""
+
+	__slots__ = ()
+
+	class _RWLock(RWLockableD):
+		__slots__ = ("c_tracer", "c_rw_lock", "c_id")
+
+		def __init__(self, p_tracer: "LockTracer", p_rw_lock: RWLockable, p_id: int) -> None:
+			self.c_tracer = p_tracer
+			self.c_rw_lock = p_rw_lock
+			self.c_id = p_id
+
+		async def gen_rlock(self) -> "LockTracer._aReader":
+			"""Generate a reader lock."""
+			return LockTracer._aReader(self, await self.c_rw_lock.gen_rlock())
+
+		async def gen_wlock(self) -> "LockTracer._aWriter":
+			"""Generate a writer lock."""
+			return LockTracer._aWriter(self, await self.c_rw_lock.gen_wlock())
+
+	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "c_lock", "v_idents")
+		_SIDE: int = 0
+
+		def __init__(self, p_rw_lock: "LockTracer._RWLock", p_lock: Lockable) -> None:
+			self.c_rw_lock = p_rw_lock
+			self.c_lock = p_lock
+			self.v_idents: List[int] = []  # Acquiring task of each hold.
+
+		async def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_ident = id(asyncio.current_task())
+			c_rw_lock.c_tracer._record(_TRACE_ACQUIRE | self._SIDE, c_rw_lock.c_id, c_ident)
+			locked: bool = False
+			try:
+				locked = await _acquire_lock(self.c_lock, blocking, timeout, deadline, c_rw_lock.c_tracer.c_time_source)
+			finally:
+				c_rw_lock.c_tracer._record((_TRACE_ACQUIRED if locked else _TRACE_TIMEOUT) | self._SIDE, c_rw_lock.c_id, c_ident)
+			if locked: self.v_idents.append(c_ident)
+			return locked
+
+		async def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_idents: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.c_rw_lock.c_tracer._record(_TRACE_RELEASE | self._SIDE, self.c_rw_lock.c_id, self.v_idents.pop())
+			await self.c_lock.release()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.c_lock.locked()
+
+	class _aWriter(_aReader, LockableD):
+		__slots__ = ()
+		_SIDE: int = _TRACE_WRITER
+
+		async def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			if not self.v_idents: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			c_ident = self.v_idents.pop()
+			self.c_rw_lock.c_tracer._record(_TRACE_DOWNGRADE | _TRACE_WRITER, self.c_rw_lock.c_id, c_ident)
+			result = LockTracer._aReader(self.c_rw_lock, await cast(LockableD, self.c_lock).downgrade())
+			result.v_idents.append(c_ident)
+			return result
+
+	def wrap(self, rw_lock: RWLockable, name: Optional[str] = None) -> "LockTracer._RWLock":
+		"""Generate a RW lock traced by the tracer under name (by default the name of the type of rw_lock and a number), its lock requests go through rw_lock."""
+		return LockTracer._RWLock(self, rw_lock, self._register(rw_lock, name))
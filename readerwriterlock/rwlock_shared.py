@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Read Write Locks shared between processes (POSIX only, python 3.8+).
+
+A lock request which cannot be granted right away polls with an exponential backoff until it is granted or its timeout expires.
+"""
+
+import errno
+import fcntl
+import os
+import struct
+import threading
+import time
+
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+from typing import Any
+from typing import Callable
+from typing import cast
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from readerwriterlock.rwlock import _acquire_before
+from readerwriterlock.rwlock import _deadline
+from readerwriterlock.rwlock import Lockable
+from readerwriterlock.rwlock import LockableD
+from readerwriterlock.rwlock import RELEASE_ERR_CLS
+from readerwriterlock.rwlock import RELEASE_ERR_MSG
+from readerwriterlock.rwlock import RWLockable
+from readerwriterlock.rwlock import RWLockableD
+
+_MAGIC: int = 0x52574C4B  # "RWLK"
+_MAGIC_I, _STRATEGY_I, _READ_I, _WRITE_I, _WRITE_WAITING_I, _READ_WAITING_I, _PHASE_I = range(7)
+_SIZE: int = 7 * 8
+
+_s_locks: Dict[str, threading.Lock] = {}  # Process wide thread lock of each segment: fcntl record locks are owned by the process, not by the thread.
+
+
+def _reset_locks() -> None:
+	"""Forget the thread locks of the parent, the child process does not hold any of them."""
+	for c_name in _s_locks:
+		_s_locks[c_name] = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+	os.register_at_fork(after_in_child=_reset_locks)
+
+
+def _poll(p_step: Callable[[bool], Optional[bool]], time_source: Callable[[], float], timeout: float, deadline: Optional[float]) -> bool:
+	"""Call the step until it answers, with an exponential backoff, its argument tells if the timeout is expired."""
+	c_deadline: Optional[float] = deadline
+	if 0 <= timeout:
+		c_deadline = time_source() + timeout if deadline is None else min(deadline, time_source() + timeout)
+	v_sleep: float = 0.00005
+	while True:
+		c_remaining: Optional[float] = None if c_deadline is None else c_deadline - time_source()
+		if c_remaining is None or 0 < c_remaining:
+			time.sleep(v_sleep if c_remaining is None else min(v_sleep, c_remaining))
+		v_sleep = min(v_sleep * 2, 0.005)
+		result = p_step(c_deadline is not None and c_deadline <= time_source())
+		if result is not None: return result
+
+
+class _RWLockShared(RWLockable):
+	"""Internal Read/Write lock shared between processes.
+
+	The whole lock state lives in a named shared memory segment which any process can attach to by name:
+	- The state is only mutated under a mutex made of a process wide thread lock and of a fcntl record lock on the segment.
+	- The segment outlives the processes until one of them unlink() it, a process dying while holding the lock leaves it held.
+	The strategy is defined by the subclass with _can_read() and _can_write(), both called with the mutex held.
+	"""
+
+	__slots__ = ("c_shm", "c_state", "c_time_source")
+
+	_STRATEGY: int = 0
+
+	def __init__(self, name: Optional[str] = None, create: bool = False, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init: create a new segment (if name is None or create) or attach to the existing segment with the given name."""
+		self.c_time_source = time_source
+		if name is None or create:
+			self.c_shm = shared_memory.SharedMemory(name=name, create=True, size=_SIZE)
+			self._untrack()
+			self.c_state = cast(memoryview, self.c_shm.buf)[:_SIZE].cast("q")
+			self.c_state[_STRATEGY_I] = self._STRATEGY
+			self.c_state[_MAGIC_I] = _MAGIC
+		else:
+			self.c_shm = shared_memory.SharedMemory(name=name)
+			self.c_state = cast(memoryview, self.c_shm.buf)[:_SIZE].cast("q")
+			if _MAGIC != self.c_state[_MAGIC_I] or self._STRATEGY != self.c_state[_STRATEGY_I]:
+				self.close()
+				raise ValueError(f"{name!r} is not a shared {type(self).__name__}")
+			self._untrack()
+		_s_locks.setdefault(self.c_shm.name, threading.Lock())
+
+	def _untrack(self) -> None:
+		"""Keep the resource tracker from destroying the segment when this process ends, it lives until unlink()."""
+		resource_tracker.unregister(getattr(self.c_shm, "_name"), "shared_memory")
+
+	def __reduce__(self) -> Tuple[Any, ...]:
+		"""Pickle as an attachment by name."""
+		return (type(self), (self.name,))
+
+	@property
+	def name(self) -> str:
+		"""Name of the shared memory segment."""
+		return self.c_shm.name
+
+	def close(self) -> None:
+		"""Detach from the segment, the lock must not be used anymore in this process."""
+		self.c_state.release()
+		self.c_shm.close()
+
+	def unlink(self) -> None:
+		"""Destroy the segment once all the processes detached from it."""
+		resource_tracker.register(getattr(self.c_shm, "_name"), "shared_memory")  # Unregistered again by unlink().
+		self.c_shm.unlink()
+
+	def _lock(self) -> None:
+		"""Acquire the mutex of the state."""
+		_s_locks[self.c_shm.name].acquire()
+		fcntl.lockf(getattr(self.c_shm, "_fd"), fcntl.LOCK_EX, _SIZE, 0)
+
+	def _unlock(self) -> None:
+		"""Release the mutex of the state."""
+		fcntl.lockf(getattr(self.c_shm, "_fd"), fcntl.LOCK_UN, _SIZE, 0)
+		_s_locks[self.c_shm.name].release()
+
+	def _can_read(self) -> bool:
+		"""Answer to 'can a reader get the lock right away?'."""
+		raise AssertionError("Should be overriden")  # Will be overriden.  # pragma: no cover
+
+	def _can_write(self) -> bool:
+		"""Answer to 'can a writer get the lock right away?'."""
+		c_state = self.c_state
+		return 0 == c_state[_WRITE_I] and 0 == c_state[_READ_I]
+
+	def _start_read_phase(self) -> None:
+		"""Admit all the waiting readers together (the mutex must be held)."""
+		c_state = self.c_state
+		c_state[_READ_I] += c_state[_READ_WAITING_I]
+		c_state[_READ_WAITING_I] = 0
+		c_state[_PHASE_I] += 1
+
+	def _leave_write_queue(self) -> None:
+		"""Take a waiting writer out of the queue (the mutex must be held)."""
+		c_state = self.c_state
+		c_state[_WRITE_WAITING_I] -= 1
+		if 0 == c_state[_WRITE_WAITING_I] and 0 == c_state[_WRITE_I] and c_state[_READ_WAITING_I]:
+			self._start_read_phase()  # Readers were only held back by this waiting writer.
+
+	def _poll(self, p_step: Callable[[bool], Optional[bool]], timeout: float, deadline: Optional[float]) -> bool:
+		"""Call the step with the mutex held until it answers, with an exponential backoff, its argument tells if the timeout is expired."""
+		def step(p_expired: bool) -> Optional[bool]:
+			self._lock()
+			try:
+				return p_step(p_expired)
+			finally:
+				self._unlock()
+		return _poll(step, self.c_time_source, timeout, deadline)
+
+	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "_RWLockShared") -> None:
+			self.c_rw_lock = p_RWLock
+			self.v_locked: bool = False
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_state = c_rw_lock.c_state
+			c_rw_lock._lock()
+			try:
+				if c_rw_lock._can_read():
+					c_state[_READ_I] += 1
+					self.v_locked = True
+					return True
+				if not blocking: return False
+				c_phase: int = c_state[_PHASE_I]
+				c_state[_READ_WAITING_I] += 1
+			finally:
+				c_rw_lock._unlock()
+
+			def step(p_expired: bool) -> Optional[bool]:
+				if c_phase != c_state[_PHASE_I]:  # Admitted (and counted) along with its read phase.
+					self.v_locked = True
+					return True
+				if c_rw_lock._can_read():
+					c_state[_READ_WAITING_I] -= 1
+					c_state[_READ_I] += 1
+					self.v_locked = True
+					return True
+				if p_expired:
+					c_state[_READ_WAITING_I] -= 1
+					return False
+				return None
+			try:
+				self.v_locked = c_rw_lock._poll(step, timeout, deadline)
+			except BaseException:  # E.g.: KeyboardInterrupt while sleeping, leave the queue or give the lock back.
+				if self.v_locked:
+					self.release()
+				else:
+					c_rw_lock._lock()
+					try:
+						c_state[_READ_I if c_phase != c_state[_PHASE_I] else _READ_WAITING_I] -= 1
+					finally:
+						c_rw_lock._unlock()
+				raise
+			return self.v_locked
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock._lock()
+			try:
+				c_rw_lock.c_state[_READ_I] -= 1
+			finally:
+				c_rw_lock._unlock()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	class _aWriter(Lockable):
+		__slots__ = ("c_rw_lock", "v_locked")
+
+		def __init__(self, p_RWLock: "_RWLockShared") -> None:
+			self.c_rw_lock = p_RWLock
+			self.v_locked: bool = False
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			c_rw_lock = self.c_rw_lock
+			c_state = c_rw_lock.c_state
+			c_rw_lock._lock()
+			try:
+				if c_rw_lock._can_write():
+					c_state[_WRITE_I] = 1
+					self.v_locked = True
+					return True
+				if not blocking: return False
+				c_state[_WRITE_WAITING_I] += 1
+			finally:
+				c_rw_lock._unlock()
+
+			def step(p_expired: bool) -> Optional[bool]:
+				if c_rw_lock._can_write():
+					c_state[_WRITE_WAITING_I] -= 1
+					c_state[_WRITE_I] = 1
+					self.v_locked = True
+					return True
+				if p_expired:
+					c_rw_lock._leave_write_queue()
+					return False
+				return None
+			try:
+				self.v_locked = c_rw_lock._poll(step, timeout, deadline)
+			except BaseException:  # E.g.: KeyboardInterrupt while sleeping, leave the queue or give the lock back.
+				if self.v_locked:
+					self.release()
+				else:
+					c_rw_lock._lock()
+					try:
+						c_rw_lock._leave_write_queue()
+					finally:
+						c_rw_lock._unlock()
+				raise
+			return self.v_locked
+
+		def release(self) -> None:
+			"""Release the lock."""
+			if not self.v_locked: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			self.v_locked = False
+			c_rw_lock = self.c_rw_lock
+			c_rw_lock._lock()
+			try:
+				c_rw_lock.c_state[_WRITE_I] = 0
+				if c_rw_lock.c_state[_READ_WAITING_I]:
+					c_rw_lock._start_read_phase()
+			finally:
+				c_rw_lock._unlock()
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_locked
+
+	def gen_rlock(self) -> "_RWLockShared._aReader":
+		"""Generate a reader lock."""
+		return _RWLockShared._aReader(self)
+
+	def gen_wlock(self) -> "_RWLockShared._aWriter":
+		"""Generate a writer lock."""
+		return _RWLockShared._aWriter(self)
+
+
+class RWLockRead(_RWLockShared):
+	"""A Read/Write lock shared between processes giving preference to Reader."""
+
+	__slots__ = ()
+
+	_STRATEGY = 1
+
+	def _can_read(self) -> bool:
+		"""Answer to 'can a reader get the lock right away?'."""
+		return 0 == self.c_state[_WRITE_I]
+
+
+class RWLockWrite(_RWLockShared):
+	"""A Read/Write lock shared between processes giving preference to Writer."""
+
+	__slots__ = ()
+
+	_STRATEGY = 2
+
+	def _can_read(self) -> bool:
+		"""Answer to 'can a reader get the lock right away?'."""
+		c_state = self.c_state
+		return 0 == c_state[_WRITE_I] and 0 == c_state[_WRITE_WAITING_I]
+
+	def _start_read_phase(self) -> None:
+		"""Keep the waiting readers waiting: they get in once no writer waits anymore."""
+
+
+class RWLockFair(_RWLockShared):
+	"""A Read/Write lock shared between processes giving fairness to both Reader and Writer.
+
+	Read phases and write phases alternate: a waiting writer holds back the new readers, when a writer gives back the lock all the waiting readers are admitted together before the next writer.
+	"""
+
+	__slots__ = ()
+
+	_STRATEGY = 3
+
+	def _can_read(self) -> bool:
+		"""Answer to 'can a reader get the lock right away?'."""
+		c_state = self.c_state
+		return 0 == c_state[_WRITE_I] and 0 == c_state[_WRITE_WAITING_I]
+
+
+_OFD: bool = hasattr(fcntl, "F_OFD_SETLK")  # Open file description locks (Linux): owned by the descriptor instead of by the process.
+_s_file_locks: Dict[str, threading.Lock] = {}  # Process wide thread lock of each file, without open file description locks.
+
+
+def _set_file_lock(p_fd: int, p_exclusive: bool, p_start: int, p_length: int) -> bool:
+	"""Set (or convert) the record lock of the descriptor without waiting, answer to 'is it set?'."""
+	try:
+		if _OFD:
+			fcntl.fcntl(p_fd, fcntl.F_OFD_SETLK, struct.pack("hhqqi", fcntl.F_WRLCK if p_exclusive else fcntl.F_RDLCK, os.SEEK_SET, p_start, p_length, 0))
+		else:
+			fcntl.lockf(p_fd, (fcntl.LOCK_EX if p_exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB, p_length, p_start, os.SEEK_SET)
+	except OSError as exc:
+		if exc.errno in (errno.EACCES, errno.EAGAIN): return False
+		raise
+	return True
+
+
+class RWLockFile(RWLockableD):
+	"""A Read/Write lock on a file shared with any process, backed by fcntl advisory record locks.
+
+	A reader lock is a shared record lock and a writer lock an exclusive one, over a byte range of the file (0 long: up to its end, however long it grows):
+	- Each locked handle owns a descriptor of the file, closed by its release().
+	- The locks only conflict when their ranges overlap and there is no priority: a writer may wait as long as overlapping readers keep coming.
+	- A writer lock is downgraded atomically by converting its record lock.
+	- Without open file description locks (Linux only) the record locks are owned by the process: the locked handles of a process exclude each other whatever their range, and closing any other descriptor of the file in the process releases them.
+	"""
+
+	__slots__ = ("c_path", "c_start", "c_length", "c_time_source")
+
+	def __init__(self, path: str, start: int = 0, length: int = 0, time_source: Callable[[], float] = time.perf_counter) -> None:
+		"""Init: the file is created on the first acquire if needed, start and length give the default byte range of the locks."""
+		self.c_path = path
+		self.c_start = start
+		self.c_length = length
+		self.c_time_source = time_source
+
+	def __reduce__(self) -> Tuple[Any, ...]:
+		"""Pickle."""
+		return (type(self), (self.c_path, self.c_start, self.c_length))
+
+	def _acquire(self, p_handle: Any, p_exclusive: bool, blocking: bool, timeout: float, deadline: Optional[float]) -> bool:
+		"""Open the file then set the record lock of the handle before the deadline."""
+		if p_handle.v_fd is not None: return False  # Already held by this handle.
+		c_deadline: Optional[float] = _deadline(blocking, timeout, deadline, self.c_time_source)
+		c_flags: int = (os.O_RDWR if p_exclusive else os.O_RDONLY) | os.O_CREAT
+		c_guard: Optional[threading.Lock] = None
+		if not _OFD:  # Taken before opening the file: closing a descriptor of the file on failure would release the locks of the other handles.
+			c_guard = _s_file_locks.setdefault(os.path.realpath(self.c_path), threading.Lock())
+			if not _acquire_before(c_guard, c_deadline, self.c_time_source): return False
+		result: bool = False
+		c_fd: int = os.open(self.c_path, c_flags, 0o666)
+		try:
+			result = _set_file_lock(c_fd, p_exclusive, p_handle.c_start, p_handle.c_length)
+			if not result and blocking:
+				result = _poll(lambda p_expired: True if _set_file_lock(c_fd, p_exclusive, p_handle.c_start, p_handle.c_length) else (False if p_expired else None), self.c_time_source, -1, c_deadline)
+		finally:
+			if not result:
+				os.close(c_fd)
+				if c_guard is not None: c_guard.release()
+		if result:
+			p_handle.v_fd = c_fd
+			p_handle.v_guard = c_guard
+		return result
+
+	@staticmethod
+	def _release(p_handle: Any) -> None:
+		"""Close the descriptor of the handle which releases its record lock."""
+		c_fd: Optional[int] = p_handle.v_fd
+		if c_fd is None: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+		c_guard: Optional[threading.Lock] = p_handle.v_guard
+		p_handle.v_fd = None
+		p_handle.v_guard = None
+		os.close(c_fd)
+		if c_guard is not None: c_guard.release()
+
+	class _aReader(Lockable):
+		__slots__ = ("c_rw_lock", "c_start", "c_length", "v_fd", "v_guard")
+
+		def __init__(self, p_RWLock: "RWLockFile", p_start: int, p_length: int) -> None:
+			self.c_rw_lock = p_RWLock
+			self.c_start = p_start
+			self.c_length = p_length
+			self.v_fd: Optional[int] = None
+			self.v_guard: Optional[threading.Lock] = None
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			return self.c_rw_lock._acquire(self, False, blocking, timeout, deadline)
+
+		def release(self) -> None:
+			"""Release the lock."""
+			self.c_rw_lock._release(self)
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_fd is not None
+
+	class _aWriter(LockableD):
+		__slots__ = ("c_rw_lock", "c_start", "c_length", "v_fd", "v_guard")
+
+		def __init__(self, p_RWLock: "RWLockFile", p_start: int, p_length: int) -> None:
+			self.c_rw_lock = p_RWLock
+			self.c_start = p_start
+			self.c_length = p_length
+			self.v_fd: Optional[int] = None
+			self.v_guard: Optional[threading.Lock] = None
+
+		def acquire(self, blocking: bool = True, timeout: float = -1, deadline: Optional[float] = None) -> bool:
+			"""Acquire a lock."""
+			return self.c_rw_lock._acquire(self, True, blocking, timeout, deadline)
+
+		def downgrade(self) -> Lockable:
+			"""Downgrade."""
+			c_fd: Optional[int] = self.v_fd
+			if c_fd is None: raise RELEASE_ERR_CLS(RELEASE_ERR_MSG)
+			_set_file_lock(c_fd, False, self.c_start, self.c_length)  # Converting its own lock never conflicts.
+
+			result = RWLockFile._aReader(self.c_rw_lock, self.c_start, self.c_length)
+			result.v_fd = c_fd
+			result.v_guard = self.v_guard
+			self.v_fd = None
+			self.v_guard = None
+			return result
+
+		def release(self) -> None:
+			"""Release the lock."""
+			self.c_rw_lock._release(self)
+
+		def locked(self) -> bool:
+			"""Answer to 'is it currently locked?'."""
+			return self.v_fd is not None
+
+	def gen_rlock(self, start: Optional[int] = None, length: Optional[int] = None) -> "RWLockFile._aReader":
+		"""Generate a reader lock, over the default byte range unless given."""
+		return RWLockFile._aReader(self, self.c_start if start is None else start, self.c_length if length is None else length)
+
+	def gen_wlock(self, start: Optional[int] = None, length: Optional[int] = None) -> "RWLockFile._aWriter":
+		"""Generate a writer lock, over the default byte range unless given."""
+		return RWLockFile._aWriter(self, self.c_start if start is None else start, self.c_length if length is None else length)
@@ -3,13 +3,20 @@
 
 """Unit tests for rwlock."""
 
+import gc
+import json
+import os
+import random
 import unittest
 import sys
+import tempfile
 import threading
 import time
 
 from typing import Any
+from typing import cast
 from typing import List
+from typing import Tuple
 from typing import Union
 
 from readerwriterlock import rwlock
@@ -20,8 +27,10 @@ class TestRWLock(unittest.TestCase):
 
 	def setUp(self) -> None:
 		"""Test setup."""
-		self.c_rwlock_type_downgradable = (rwlock.RWLockReadD, rwlock.RWLockWriteD, rwlock.RWLockFairD)
-		self.c_rwlock_type = (rwlock.RWLockRead, rwlock.RWLockWrite, rwlock.RWLockFair) + self.c_rwlock_type_downgradable
+		self.c_rwlock_type_downgradable = (rwlock.RWLockReadD, rwlock.RWLockWriteD, rwlock.RWLockFairD, rwlock.RWLockWriteM, rwlock.RWLockWriteB, rwlock.RWLockFairU, rwlock.RWLockFairS, rwlock.RWLockPhaseFair, rwlock.RWLockFairQ, rwlock.RWLockFairRange, rwlock.RWLockFairHierarchy)
+		self.c_rwlock_type_reentrant = (rwlock.RWLockFairR,)
+		self.c_rwlock_type = (rwlock.RWLockRead, rwlock.RWLockWrite, rwlock.RWLockFair) + self.c_rwlock_type_downgradable + self.c_rwlock_type_reentrant
+		self.c_rwlock_type_short = self.c_rwlock_type[6:]  # One per engine family added later, their targeted tests cover the other variants.
 
 	def test_multi_thread(self) -> None:
 		"""
@@ -32,13 +41,15 @@ class TestRWLock(unittest.TestCase):
 		# Then: the locks shall not deadlock.
 		"""
 		s_period_sec: int = 30
-		print(f"test_MultiThread {s_period_sec * len(self.c_rwlock_type)} sec…", flush=True)
+		s_period_sec_short: int = 5
+		print(f"test_MultiThread {s_period_sec * (len(self.c_rwlock_type) - len(self.c_rwlock_type_short)) + s_period_sec_short * len(self.c_rwlock_type_short)} sec…", flush=True)
 		exception_occured: bool = False
 		for c_curr_lock_type in self.c_rwlock_type:
 			with self.subTest(c_curr_lock_type):
 				print(f"    {c_curr_lock_type} …", end="", flush=True)
 				c_curr_rw_lock: Union[rwlock.RWLockable, rwlock.RWLockableD] = c_curr_lock_type()
 				v_value: int = 0
+				c_period_sec: int = s_period_sec_short if c_curr_lock_type in self.c_rwlock_type_short else s_period_sec
 
 				def downgrader1() -> None:
 					"""Downgrader using a timeout blocking acquire strategy."""
@@ -46,7 +57,7 @@ class TestRWLock(unittest.TestCase):
 					try:
 						nonlocal v_value
 						c_enter_time: float = time.time()
-						while time.time() - c_enter_time <= s_period_sec:
+						while time.time() - c_enter_time <= c_period_sec:
 							c_lock_w1: Union[rwlock.Lockable, rwlock.LockableD] = c_curr_rw_lock.gen_wlock()
 							assert isinstance(c_lock_w1, rwlock.LockableD), type(c_lock_w1)
 							time.sleep(sys.float_info.min)
@@ -81,7 +92,7 @@ class TestRWLock(unittest.TestCase):
 						nonlocal v_value
 						c_enter_time: float = time.time()
 						c_lock_w1 = c_curr_rw_lock.gen_wlock()
-						while time.time() - c_enter_time <= s_period_sec:
+						while time.time() - c_enter_time <= c_period_sec:
 							time.sleep(sys.float_info.min)
 							with c_lock_w1:
 								v_temp = v_value
@@ -99,7 +110,7 @@ class TestRWLock(unittest.TestCase):
 						nonlocal v_value
 						c_enter_time: float = time.time()
 						c_lock_w1 = c_curr_rw_lock.gen_wlock()
-						while time.time() - c_enter_time <= s_period_sec:
+						while time.time() - c_enter_time <= c_period_sec:
 							time.sleep(sys.float_info.min)
 							locked: bool
 							try:
@@ -123,7 +134,7 @@ class TestRWLock(unittest.TestCase):
 						nonlocal v_value
 						c_enter_time: float = time.time()
 						c_lock_r1 = c_curr_rw_lock.gen_rlock()
-						while time.time() - c_enter_time <= s_period_sec:
+						while time.time() - c_enter_time <= c_period_sec:
 							time.sleep(sys.float_info.min)
 							with c_lock_r1:
 								vv_value: int = v_value
@@ -140,7 +151,7 @@ class TestRWLock(unittest.TestCase):
 						nonlocal v_value
 						c_enter_time = time.time()
 						c_lock_r2 = c_curr_rw_lock.gen_rlock()
-						while time.time() - c_enter_time <= s_period_sec:
+						while time.time() - c_enter_time <= c_period_sec:
 							time.sleep(sys.float_info.min)
 							locked: bool = False
 							try:
@@ -179,7 +190,7 @@ class TestRWLockSpecificCase(unittest.TestCase):
 
 	def setUp(self) -> None:
 		"""Test setup."""
-		self.c_rwlock_type_downgradable = (rwlock.RWLockWriteD, rwlock.RWLockFairD, rwlock.RWLockReadD)
+		self.c_rwlock_type_downgradable = (rwlock.RWLockWriteD, rwlock.RWLockFairD, rwlock.RWLockReadD, rwlock.RWLockWriteM, rwlock.RWLockWriteB, rwlock.RWLockReadU, rwlock.RWLockWriteU, rwlock.RWLockFairU, rwlock.RWLockReadS, rwlock.RWLockWriteS, rwlock.RWLockFairS, rwlock.RWLockPhaseFair, rwlock.RWLockFairQ, rwlock.RWLockReadRange, rwlock.RWLockWriteRange, rwlock.RWLockFairRange, rwlock.RWLockReadHierarchy, rwlock.RWLockWriteHierarchy, rwlock.RWLockFairHierarchy)
 		self.c_rwlock_type = (rwlock.RWLockRead, rwlock.RWLockWrite, rwlock.RWLockFair) + self.c_rwlock_type_downgradable
 
 	def test_write_req00(self) -> None:
@@ -521,9 +532,10 @@ class TestWhiteBoxRWLockReadD(unittest.TestCase):
 		c_rwlock_2 = rwlock.RWLockReadD()
 
 		def assert_internal_state() -> None:
-			self.assertEqual(int(c_rwlock_1.v_read_count), int(c_rwlock_2.v_read_count))
-			self.assertEqual(bool(c_rwlock_1.c_resource.locked()), bool(c_rwlock_2.c_resource.locked()))
-			self.assertEqual(bool(c_rwlock_1.c_lock_read_count.locked()), bool(c_rwlock_2.c_lock_read_count.locked()))
+			self.assertEqual(c_rwlock_1.v_read_count, c_rwlock_2.v_read_count)
+			self.assertEqual(c_rwlock_1.v_read_waiting, c_rwlock_2.v_read_waiting)
+			self.assertEqual(c_rwlock_1.v_write_count, c_rwlock_2.v_write_count)
+			self.assertEqual(bool(c_rwlock_1.c_lock_state.locked()), bool(c_rwlock_2.c_lock_state.locked()))
 		# ## Assume
 		assert_internal_state()
 
@@ -617,5 +629,2074 @@ class TestWhiteBoxRWLockReadD(unittest.TestCase):
 		assert_internal_state()
 
 
+class TestWhiteBoxRWLockWriteM(unittest.TestCase):
+	"""Test RWLockWriteM internal specifity."""
+
+	def test_read_vs_downgrade(self) -> None:
+		"""
+		# Given: Instance of RWLockWriteM.
+
+		# When: A reader lock is acquired OR A writer lock is downgraded.
+
+		# Then: The internal state should be the same.
+		"""
+		# ## Arrange
+		c_rwlock_1 = rwlock.RWLockWriteM()
+		c_rwlock_2 = rwlock.RWLockWriteM()
+
+		def assert_internal_state() -> None:
+			"""Assert internal."""
+			self.assertEqual(c_rwlock_1.v_read_count, c_rwlock_2.v_read_count)
+			self.assertEqual(c_rwlock_1.v_write_count, c_rwlock_2.v_write_count)
+			self.assertEqual(c_rwlock_1.v_write_waiting, c_rwlock_2.v_write_waiting)
+			self.assertEqual(bool(c_rwlock_1.c_lock_state.locked()), bool(c_rwlock_2.c_lock_state.locked()))
+
+		# ## Assume
+		assert_internal_state()
+
+		# ## Act
+		a_read_lock = c_rwlock_1.gen_rlock()
+		a_read_lock.acquire()
+		a_downgrade_lock: Union[rwlock.LockableD, rwlock.Lockable] = c_rwlock_2.gen_wlock()
+		a_downgrade_lock.acquire()
+		assert isinstance(a_downgrade_lock, rwlock.LockableD)
+		a_downgrade_lock = a_downgrade_lock.downgrade()
+		# ## Assert
+		assert_internal_state()
+
+		a_read_lock.release()
+		a_downgrade_lock.release()
+		assert_internal_state()
+
+	def test_waiting_writer_blocks_new_reader(self) -> None:
+		"""
+		# Given: Instance of RWLockWriteM locked by a reader.
+
+		# When: A writer is waiting for the lock.
+
+		# Then: New readers are held back until the writer gave up.
+		"""
+		# ## Arrange
+		c_rwlock = rwlock.RWLockWriteM()
+		c_lock_r1 = c_rwlock.gen_rlock()
+		c_lock_r2 = c_rwlock.gen_rlock()
+		c_lock_w = c_rwlock.gen_wlock()
+		self.assertTrue(c_lock_r1.acquire())
+		c_thread = threading.Thread(target=lambda: c_lock_w.acquire(timeout=0.75))
+		c_thread.start()
+		while not c_rwlock.v_write_waiting:
+			time.sleep(sys.float_info.min)
+		# ## Act
+		result = c_lock_r2.acquire(blocking=False)
+		c_thread.join()
+		# ## Assert
+		self.assertFalse(result)
+		self.assertFalse(c_lock_w.locked())
+		self.assertEqual(0, c_rwlock.v_write_waiting)
+		self.assertTrue(c_lock_r2.acquire(blocking=False))
+		c_lock_r2.release()
+		c_lock_r1.release()
+
+
+class TestWhiteBoxRWLockWriteB(unittest.TestCase):
+	"""Test RWLockWriteB internal specifity."""
+
+	def test_reader_slots(self) -> None:
+		"""
+		# Given: Instance of RWLockWriteB.
+
+		# When: Reader locks are acquired from different threads.
+
+		# Then: Each thread counts its readers in its own slot and the slot vanishes along with its thread.
+		"""
+		# ## Arrange
+		c_rwlock = rwlock.RWLockWriteB()
+		c_lock_r1 = c_rwlock.gen_rlock()
+		c_lock_r2 = c_rwlock.gen_rlock()
+		c_locked = threading.Event()
+		c_done = threading.Event()
+
+		def reader() -> None:
+			with c_rwlock.gen_rlock():
+				c_locked.set()
+				c_done.wait()
+		# ## Act
+		c_lock_r1.acquire()
+		c_lock_r2.acquire()
+		c_thread = threading.Thread(target=reader)
+		c_thread.start()
+		c_locked.wait()
+		# ## Assert
+		self.assertEqual([1, 2], sorted(c_slot.v_count for c_slot in c_rwlock.c_slots))
+		self.assertFalse(c_rwlock.gen_wlock().acquire(blocking=False))
+		c_lock_r1.release()
+		c_lock_r2.release()
+		c_done.set()
+		c_thread.join()
+		self.assertTrue(c_rwlock._drained())
+		del c_thread
+		gc.collect()
+		self.assertEqual(1, len(c_rwlock.c_slots))
+
+	def test_release_from_other_thread(self) -> None:
+		"""
+		# Given: Instance of RWLockWriteB whose reader lock is held by a thread.
+
+		# When: another thread releases it.
+
+		# Then: the release is refused without touching the slot of the holder, which still holds the lock.
+		"""
+		# ## Arrange
+		c_rwlock = rwlock.RWLockWriteB()
+		c_lock_r = c_rwlock.gen_rlock()
+		c_lock_r.acquire()
+		c_result: List[BaseException] = []
+
+		def target() -> None:
+			try:
+				c_lock_r.release()
+			except BaseException as exc:  # pylint: disable=broad-except
+				c_result.append(exc)
+		# ## Act
+		c_thread = threading.Thread(target=target)
+		c_thread.start()
+		c_thread.join()
+		# ## Assert
+		self.assertIsInstance(c_result[0], rwlock.RELEASE_ERR_CLS)
+		self.assertTrue(c_lock_r.locked())
+		self.assertEqual([1], [c_slot.v_count for c_slot in c_rwlock.c_slots])
+		self.assertFalse(c_rwlock.gen_wlock().acquire(blocking=False))
+		c_lock_r.release()
+		self.assertTrue(c_rwlock.gen_wlock().acquire(blocking=False))
+
+	def test_waiting_writer_blocks_new_reader(self) -> None:
+		"""
+		# Given: Instance of RWLockWriteB locked by a reader.
+
+		# When: A writer is waiting for the lock.
+
+		# Then: New readers are held back until the writer gave up.
+		"""
+		# ## Arrange
+		c_rwlock = rwlock.RWLockWriteB()
+		c_lock_r1 = c_rwlock.gen_rlock()
+		c_lock_r2 = c_rwlock.gen_rlock()
+		c_lock_w = c_rwlock.gen_wlock()
+		self.assertTrue(c_lock_r1.acquire())
+		c_thread = threading.Thread(target=lambda: c_lock_w.acquire(timeout=0.75))
+		c_thread.start()
+		while not c_rwlock.v_writer:
+			time.sleep(sys.float_info.min)
+		# ## Act
+		result = c_lock_r2.acquire(blocking=False)
+		c_thread.join()
+		# ## Assert
+		self.assertFalse(result)
+		self.assertFalse(c_lock_w.locked())
+		self.assertFalse(c_rwlock.v_writer)
+		self.assertTrue(c_lock_r2.acquire(blocking=False))
+		c_lock_r2.release()
+		c_lock_r1.release()
+
+	def test_without_gil(self) -> None:
+		"""
+		# Given: Instance of RWLockWriteB used as on a free-threaded build running without the GIL.
+
+		# When: Reader threads and a writer thread hammer the lock.
+
+		# Then: The slots go through their own lock and the writer never overlaps a reader.
+		"""
+		# ## Arrange
+		self.addCleanup(setattr, rwlock, "_GIL_ENABLED", rwlock._GIL_ENABLED)
+		rwlock._GIL_ENABLED = False
+		c_rwlock = rwlock.RWLockWriteB()
+		c_inside: List[int] = [0, 0]  # [readers, writers]
+		c_errors: List[str] = []
+		c_barrier = threading.Barrier(5)
+		c_end = time.perf_counter() + 0.5
+
+		def reader() -> None:
+			c_lock = c_rwlock.gen_rlock()
+			c_rwlock.c_local.c_slot  # pylint: disable=pointless-statement  # Registered before the writer scans the slots.
+			c_barrier.wait()
+			while time.perf_counter() < c_end:
+				with c_lock:
+					if c_inside[1]: c_errors.append("reader with writer")
+			c_slot = c_rwlock.c_local.c_slot
+			self.assertFalse(c_slot.c_lock.locked())
+			self.assertEqual(0, c_slot.count())
+
+		def writer() -> None:
+			c_lock = c_rwlock.gen_wlock()
+			c_barrier.wait()
+			while time.perf_counter() < c_end:
+				with c_lock:
+					c_inside[1] += 1
+					if any(c_slot.count() for c_slot in c_rwlock.c_slots): c_errors.append("writer with reader")
+					time.sleep(0)
+					c_inside[1] -= 1
+		c_threads = [threading.Thread(target=reader) for _ in range(4)] + [threading.Thread(target=writer)]
+		# ## Act
+		for c_thread in c_threads:
+			c_thread.start()
+		for c_thread in c_threads:
+			c_thread.join()
+		# ## Assert
+		self.assertEqual([], c_errors)
+		self.assertTrue(c_rwlock._drained())
+
+
+class TestWhiteBoxRWLockPhaseFair(unittest.TestCase):
+	"""Test RWLockPhaseFair internal specifity."""
+
+	def test_phases(self) -> None:
+		"""
+		# Given: Instance of RWLockPhaseFair locked by a writer, with readers then a writer waiting for it.
+
+		# When: The writer releases the lock while another reader comes in.
+
+		# Then: The waiting readers are admitted together, the late reader waits for the next write phase.
+		"""
+		# ## Arrange
+		c_rwlock = rwlock.RWLockPhaseFair()
+		c_lock_w1 = c_rwlock.gen_wlock()
+		c_lock_w2 = c_rwlock.gen_wlock()
+		c_locks_r = [c_rwlock.gen_rlock() for _ in range(3)]
+		c_lock_w1.acquire()
+		c_threads = [threading.Thread(target=c_lock.acquire) for c_lock in c_locks_r[:2]]
+		for c_thread in c_threads:
+			c_thread.start()
+		while 2 != c_rwlock.v_read_waiting:
+			time.sleep(sys.float_info.min)
+		c_thread_w2 = threading.Thread(target=c_lock_w2.acquire)
+		c_thread_w2.start()
+		while not c_rwlock.v_write_waiting:
+			time.sleep(sys.float_info.min)
+		# ## Act
+		c_lock_w1.release()
+		for c_thread in c_threads:
+			c_thread.join()
+		# ## Assert
+		self.assertEqual(2, c_rwlock.v_read_count)
+		self.assertFalse(c_lock_w2.locked())
+		self.assertFalse(c_locks_r[2].acquire(blocking=False))
+		c_thread_r3 = threading.Thread(target=c_locks_r[2].acquire)
+		c_thread_r3.start()
+		while not c_rwlock.v_read_waiting:
+			time.sleep(sys.float_info.min)
+		for c_lock in c_locks_r[:2]:
+			c_lock.release()
+		c_thread_w2.join()
+		self.assertTrue(c_lock_w2.locked())
+		self.assertFalse(c_locks_r[2].locked())
+		c_lock_w2.release()
+		c_thread_r3.join()
+		self.assertTrue(c_locks_r[2].locked())
+		c_locks_r[2].release()
+		self.assertEqual(0, c_rwlock.v_read_count + c_rwlock.v_read_waiting + c_rwlock.v_write_count + c_rwlock.v_write_waiting)
+
+
+class TestWhiteBoxRWLockFairQ(unittest.TestCase):
+	"""Test RWLockFairQ internal specifity."""
+
+	def test_fifo_handoff(self) -> None:
+		"""
+		# Given: Instance of RWLockFairQ locked by a writer, with a reader, a writer then two readers queued.
+
+		# When: The lock holders release it one after the other.
+
+		# Then: The lock is handed over in arrival order, the adjacent readers together.
+		"""
+		# ## Arrange
+		c_rwlock = rwlock.RWLockFairQ()
+		c_lock_w = c_rwlock.gen_wlock()
+		c_lock_w.acquire()
+		c_locks: List[rwlock.Lockable] = [c_rwlock.gen_rlock(), c_rwlock.gen_wlock(), c_rwlock.gen_rlock(), c_rwlock.gen_rlock()]
+		c_threads: List[threading.Thread] = []
+		for c_lock in c_locks:
+			c_threads.append(threading.Thread(target=c_lock.acquire))
+			c_threads[-1].start()
+			while len(c_threads) != len(c_rwlock.c_waiters):
+				time.sleep(sys.float_info.min)
+		# ## Act
+		c_lock_w.release()
+		c_threads[0].join()
+		# ## Assert
+		self.assertEqual([True, False, False, False], [c_lock.locked() for c_lock in c_locks])
+		self.assertFalse(c_rwlock.gen_rlock().acquire(blocking=False))  # Would jump the queue.
+		c_locks[0].release()
+		c_threads[1].join()
+		self.assertEqual([False, True, False, False], [c_lock.locked() for c_lock in c_locks])
+		c_locks[1].release()
+		c_threads[2].join()
+		c_threads[3].join()
+		self.assertEqual([False, False, True, True], [c_lock.locked() for c_lock in c_locks])
+		self.assertEqual(2, c_rwlock.v_read_count)
+		c_locks[2].release()
+		c_locks[3].release()
+		self.assertEqual(0, c_rwlock.v_read_count + c_rwlock.v_write_count + len(c_rwlock.c_waiters))
+
+	def test_timeout_in_queue(self) -> None:
+		"""
+		# Given: Instance of RWLockFairQ locked by a reader, with a writer then a reader queued.
+
+		# When: The queued writer times out.
+
+		# Then: The reader behind it is handed the lock.
+		"""
+		# ## Arrange
+		c_rwlock = rwlock.RWLockFairQ()
+		c_lock_r1 = c_rwlock.gen_rlock()
+		c_lock_r2 = c_rwlock.gen_rlock()
+		c_lock_w = c_rwlock.gen_wlock()
+		c_lock_r1.acquire()
+		c_thread_w = threading.Thread(target=lambda: c_lock_w.acquire(timeout=0.5))
+		c_thread_w.start()
+		while not c_rwlock.c_waiters:
+			time.sleep(sys.float_info.min)
+		# ## Act
+		result = c_lock_r2.acquire(timeout=5)
+		# ## Assert
+		self.assertTrue(result)
+		c_thread_w.join()
+		self.assertFalse(c_lock_w.locked())
+		self.assertEqual(2, c_rwlock.v_read_count)
+		c_lock_r1.release()
+		c_lock_r2.release()
+
+
+class TestWaitPolicy(unittest.TestCase):
+	"""Test the wait policies."""
+
+	def setUp(self) -> None:
+		"""Test setup."""
+		self.c_rwlock_type = (rwlock.RWLockRead, rwlock.RWLockWrite, rwlock.RWLockFair, rwlock.RWLockReadD, rwlock.RWLockWriteD, rwlock.RWLockFairD, rwlock.RWLockWriteM, rwlock.RWLockPhaseFair, rwlock.RWLockFairQ, rwlock.RWLockWriteB, rwlock.RWLockReadR, rwlock.RWLockWriteR, rwlock.RWLockFairR, rwlock.RWLockReadU, rwlock.RWLockWriteU, rwlock.RWLockFairU, rwlock.RWLockReadS, rwlock.RWLockWriteS, rwlock.RWLockFairS, rwlock.RWLockReadRange, rwlock.RWLockWriteRange, rwlock.RWLockFairRange, rwlock.RWLockReadHierarchy, rwlock.RWLockWriteHierarchy, rwlock.RWLockFairHierarchy)
+
+	def test_rwlock(self) -> None:
+		"""
+		# Given: a RW lock type.
+
+		# When: instantiating it with the spin then park wait policy.
+
+		# Then: a writer holding the lock for a short while excludes a reader which then gets the lock.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type(wait_policy=rwlock.SpinThenPark())
+				c_lock_w = current_rw_lock.gen_wlock()
+				c_lock_r = current_rw_lock.gen_rlock()
+				c_locked = threading.Event()
+
+				def writer() -> None:
+					with c_lock_w:  # pylint: disable=cell-var-from-loop
+						c_locked.set()  # pylint: disable=cell-var-from-loop
+						time.sleep(0.01)
+				c_thread = threading.Thread(target=writer)
+				c_thread.start()
+				c_locked.wait()
+				# ## Act
+				self.assertFalse(c_lock_r.acquire(blocking=False))
+				result = c_lock_r.acquire(timeout=5)
+				# ## Assert
+				self.assertTrue(result)
+				self.assertFalse(c_lock_w.locked())
+				c_lock_r.release()
+				c_thread.join()
+
+	def test_spin_then_park(self) -> None:
+		"""
+		# Given: a lock produced by the spin then park wait policy.
+
+		# When: it is acquired while held for a short while, then while held for a long while.
+
+		# Then: the short hold is waited by polling, the long hold makes it park sooner and the timeout is respected.
+		"""
+		# ## Arrange
+		c_lock = rwlock.SpinThenPark._aLock(threading.Lock(), rwlock.SpinThenPark(max_spin=64))
+		self.assertTrue(c_lock.acquire())
+		self.assertFalse(c_lock.acquire(blocking=False))
+		self.assertFalse(c_lock.acquire(timeout=0))
+		c_spin_avg: float = c_lock.v_spin_avg
+
+		def holder() -> None:
+			time.sleep(0)
+			c_lock.release()
+		c_thread = threading.Thread(target=holder)
+		c_thread.start()
+		# ## Act
+		result = c_lock.acquire()
+		c_thread.join()
+		# ## Assert
+		self.assertTrue(result)
+		self.assertTrue(c_lock.locked())
+		self.assertLess(c_lock.v_spin_avg, c_spin_avg)
+		c_spin_avg = c_lock.v_spin_avg
+		c_start = time.perf_counter()
+		self.assertFalse(c_lock.acquire(timeout=0.1))
+		self.assertLessEqual(0.1, time.perf_counter() - c_start)
+		self.assertGreater(c_spin_avg, c_lock.v_spin_avg)
+		c_lock.release()
+		self.assertFalse(c_lock.locked())
+
+
+class TestRWLockReentrant(unittest.TestCase):
+	"""Test reentrant RW Locks specificity."""
+
+	def setUp(self) -> None:
+		"""Test setup."""
+		self.c_rwlock_type = (rwlock.RWLockReadR, rwlock.RWLockWriteR, rwlock.RWLockFairR)
+
+	def try_acquire_in_thread(self, p_lock: rwlock.Lockable) -> bool:
+		"""Try to acquire (non blocking) the given lock from another thread, release it if successful."""
+		c_result: List[bool] = []
+
+		def target() -> None:
+			c_result.append(p_lock.acquire(blocking=False))
+			if c_result[0]:
+				p_lock.release()
+		c_thread = threading.Thread(target=target)
+		c_thread.start()
+		c_thread.join()
+		return c_result[0]
+
+	def test_nested(self) -> None:
+		"""
+		# Given: a reentrant RW lock.
+
+		# When: a thread nests read in read, read in write and write in write.
+
+		# Then: every nested acquire succeeds and other threads remain excluded until the outermost release.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type()
+				# ## Act
+				with current_rw_lock.gen_rlock():
+					with current_rw_lock.gen_rlock():
+						# ## Assert
+						self.assertTrue(self.try_acquire_in_thread(current_rw_lock.gen_rlock()))
+						self.assertFalse(self.try_acquire_in_thread(current_rw_lock.gen_wlock()))
+				with current_rw_lock.gen_wlock():
+					with current_rw_lock.gen_wlock():
+						with current_rw_lock.gen_rlock():
+							self.assertFalse(self.try_acquire_in_thread(current_rw_lock.gen_rlock()))
+					self.assertFalse(self.try_acquire_in_thread(current_rw_lock.gen_wlock()))
+				self.assertTrue(self.try_acquire_in_thread(current_rw_lock.gen_wlock()))
+
+	def test_release_writer_while_reading(self) -> None:
+		"""
+		# Given: a reentrant RW lock locked by a writer and a nested reader.
+
+		# When: the writer lock is released first.
+
+		# Then: the thread is left holding a reader lock.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type()
+				c_lock_w = current_rw_lock.gen_wlock()
+				c_lock_r = current_rw_lock.gen_rlock()
+				c_lock_w.acquire()
+				c_lock_r.acquire()
+				# ## Act
+				c_lock_w.release()
+				# ## Assert
+				self.assertTrue(self.try_acquire_in_thread(current_rw_lock.gen_rlock()))
+				self.assertFalse(self.try_acquire_in_thread(current_rw_lock.gen_wlock()))
+				c_lock_r.release()
+				self.assertTrue(self.try_acquire_in_thread(current_rw_lock.gen_wlock()))
+
+	def test_write_in_read(self) -> None:
+		"""
+		# Given: a reentrant RW lock locked by a reader.
+
+		# When: the same thread requests a writer lock.
+
+		# Then: it is refused instead of deadlocking.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type()
+				with current_rw_lock.gen_rlock():
+					# ## Act
+					# ## Assert
+					with self.assertRaises(RuntimeError):
+						current_rw_lock.gen_wlock().acquire()
+				self.assertTrue(self.try_acquire_in_thread(current_rw_lock.gen_wlock()))
+
+	def test_release_from_other_thread(self) -> None:
+		"""
+		# Given: a reentrant RW lock locked by a thread.
+
+		# When: another thread releases it.
+
+		# Then: the release is refused.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type()
+				for c_lock in (current_rw_lock.gen_rlock(), current_rw_lock.gen_wlock()):
+					c_lock.acquire()
+					c_result: List[BaseException] = []
+
+					def target() -> None:
+						try:
+							c_lock.release()  # pylint: disable=cell-var-from-loop
+						except BaseException as exc:  # pylint: disable=broad-except
+							c_result.append(exc)
+					# ## Act
+					c_thread = threading.Thread(target=target)
+					c_thread.start()
+					c_thread.join()
+					# ## Assert
+					self.assertIsInstance(c_result[0], rwlock.RELEASE_ERR_CLS)
+					self.assertTrue(c_lock.locked())
+					c_lock.release()
+					self.assertFalse(c_lock.locked())
+
+
+class TestRWLockUpgradable(unittest.TestCase):
+	"""Test upgradable RW Locks specificity."""
+
+	def setUp(self) -> None:
+		"""Test setup."""
+		self.c_rwlock_type = (rwlock.RWLockReadU, rwlock.RWLockWriteU, rwlock.RWLockFairU)
+
+	def test_exclusion(self) -> None:
+		"""
+		# Given: an upgradable RW lock locked by an upgradable reader.
+
+		# When: other lock requests are made.
+
+		# Then: readers get in while writers and other upgradable readers do not.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type()
+				with current_rw_lock.gen_ulock():
+					# ## Act
+					# ## Assert
+					with current_rw_lock.gen_rlock():
+						self.assertFalse(current_rw_lock.gen_wlock().acquire(blocking=False))
+						self.assertFalse(current_rw_lock.gen_ulock().acquire(blocking=False))
+						self.assertFalse(current_rw_lock.gen_ulock().acquire(blocking=True, timeout=0.01))
+				with current_rw_lock.gen_wlock():
+					self.assertFalse(current_rw_lock.gen_ulock().acquire(blocking=False))
+				self.assertIsInstance(current_rw_lock.gen_ulock(), rwlock.LockableU)
+
+	def test_upgrade(self) -> None:
+		"""
+		# Given: an upgradable RW lock locked by an upgradable reader and a reader, and a writer waiting for it.
+
+		# When: upgrading.
+
+		# Then: the upgrade waits for the reader and gets the lock before the waiting writer.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type()
+				c_order: List[str] = []
+				c_lock_u = current_rw_lock.gen_ulock()
+				c_lock_r: rwlock.Lockable = current_rw_lock.gen_rlock()
+				c_lock_u.acquire()
+				c_lock_r.acquire()
+
+				def writer() -> None:
+					with current_rw_lock.gen_wlock():  # pylint: disable=cell-var-from-loop
+						c_order.append("writer")  # pylint: disable=cell-var-from-loop
+
+				def reader() -> None:
+					time.sleep(0.1)
+					c_order.append("reader")  # pylint: disable=cell-var-from-loop
+					c_lock_r.release()  # pylint: disable=cell-var-from-loop
+				c_threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+				for c_thread in c_threads:
+					c_thread.start()
+				# ## Act
+				c_lock_w = cast(rwlock.LockableD, c_lock_u.upgrade())
+				c_order.append("upgrade")
+				# ## Assert
+				self.assertFalse(c_lock_u.locked())
+				self.assertTrue(c_lock_w.locked())
+				self.assertFalse(current_rw_lock.gen_rlock().acquire(blocking=False))
+				c_lock_r = c_lock_w.downgrade()
+				c_lock_r.release()
+				for c_thread in c_threads:
+					c_thread.join()
+				self.assertEqual(["reader", "upgrade", "writer"], c_order)
+				with self.assertRaises(rwlock.RELEASE_ERR_CLS):
+					c_lock_u.upgrade()
+
+	def test_upgrade_timeout(self) -> None:
+		"""
+		# Given: an upgradable RW lock locked by an upgradable reader and a reader which does not release it.
+
+		# When: upgrading without blocking, with a timeout and with a deadline.
+
+		# Then: the upgrade gives up, the upgradable reader lock is still held and the readers are let in again.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type()
+				c_lock_u = current_rw_lock.gen_ulock()
+				c_lock_r = current_rw_lock.gen_rlock()
+				c_lock_u.acquire()
+				c_lock_r.acquire()
+				# ## Act
+				c_start = time.perf_counter()
+				result = [c_lock_u.upgrade(blocking=False), c_lock_u.upgrade(timeout=0.05), c_lock_u.upgrade(deadline=time.perf_counter() + 0.05)]
+				# ## Assert
+				self.assertEqual([None, None, None], result)
+				self.assertLessEqual(0.09, time.perf_counter() - c_start)
+				self.assertTrue(c_lock_u.locked())
+				c_lock_r2 = current_rw_lock.gen_rlock()
+				self.assertTrue(c_lock_r2.acquire(blocking=False))
+				c_lock_r2.release()
+				self.assertFalse(current_rw_lock.gen_wlock().acquire(blocking=False))
+				c_lock_r.release()
+				c_lock_w = c_lock_u.upgrade(timeout=1)
+				self.assertIsNotNone(c_lock_w)
+				cast(rwlock.LockableD, c_lock_w).release()
+
+	def test_upgrade_starvation(self) -> None:
+		"""
+		# Given: a RWLockReadU locked by an upgradable reader, with reader threads keeping overlapping reader locks.
+
+		# When: upgrading.
+
+		# Then: the new readers wait for the upgrade which gets the lock once the current readers drained.
+		"""
+		# ## Arrange
+		current_rw_lock = rwlock.RWLockReadU()
+		c_lock_u = current_rw_lock.gen_ulock()
+		c_lock_u.acquire()
+		c_end = time.perf_counter() + 5
+		c_reading = threading.Semaphore(0)
+
+		def reader() -> None:
+			c_lock_r = current_rw_lock.gen_rlock()
+			while time.perf_counter() < c_end:
+				with c_lock_r:
+					c_reading.release()
+					time.sleep(0.005)
+		c_threads = [threading.Thread(target=reader) for _ in range(4)]
+		for c_thread in c_threads:
+			c_thread.start()
+		for _ in range(20):
+			c_reading.acquire()
+		# ## Act
+		c_lock_w = c_lock_u.upgrade(timeout=2)
+		# ## Assert
+		self.assertIsNotNone(c_lock_w)
+		cast(rwlock.LockableD, c_lock_w).release()
+		c_end = time.perf_counter()
+		for c_thread in c_threads:
+			c_thread.join()
+
+
+class TestRWLockOptimistic(unittest.TestCase):
+	"""Test optimistic read RW Locks specificity."""
+
+	def setUp(self) -> None:
+		"""Test setup."""
+		self.c_rwlock_type = (rwlock.RWLockReadS, rwlock.RWLockWriteS, rwlock.RWLockFairS)
+
+	def test_stamp(self) -> None:
+		"""
+		# Given: a RW lock providing optimistic reads.
+
+		# When: stamps are taken around readers and writers.
+
+		# Then: a stamp only remains valid as long as no writer got the lock.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type()
+				# ## Act
+				c_stamp = current_rw_lock.try_optimistic_read()
+				# ## Assert
+				self.assertNotEqual(0, c_stamp)
+				with current_rw_lock.gen_rlock():
+					self.assertEqual(c_stamp, current_rw_lock.try_optimistic_read())
+				self.assertTrue(current_rw_lock.validate(c_stamp))
+				with current_rw_lock.gen_wlock():
+					self.assertEqual(0, current_rw_lock.try_optimistic_read())
+					self.assertFalse(current_rw_lock.validate(0))
+				self.assertFalse(current_rw_lock.validate(c_stamp))
+				c_stamp = current_rw_lock.try_optimistic_read()
+				c_lock = current_rw_lock.gen_wlock()
+				c_lock.acquire()
+				c_lock.downgrade().release()
+				self.assertFalse(current_rw_lock.validate(c_stamp))
+				self.assertNotEqual(0, current_rw_lock.try_optimistic_read())
+
+	def test_consistency(self) -> None:
+		"""
+		# Given: a RW lock providing optimistic reads protecting two values which a writer thread keeps equal.
+
+		# When: reading both values optimistically while the writer is running.
+
+		# Then: every validated read is consistent.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type()
+				c_values: List[int] = [0, 0]
+				c_end = time.perf_counter() + 0.5
+
+				def writer() -> None:
+					c_lock = current_rw_lock.gen_wlock()  # pylint: disable=cell-var-from-loop
+					while time.perf_counter() < c_end:  # pylint: disable=cell-var-from-loop
+						with c_lock:
+							c_values[0] += 1  # pylint: disable=cell-var-from-loop
+							time.sleep(sys.float_info.min)
+							c_values[1] += 1  # pylint: disable=cell-var-from-loop
+				c_thread = threading.Thread(target=writer)
+				c_thread.start()
+				v_validated: int = 0
+				v_fallback: int = 0
+				# ## Act
+				while time.perf_counter() < c_end:
+					c_stamp = current_rw_lock.try_optimistic_read()
+					c_read = (c_values[0], c_values[1])
+					if current_rw_lock.validate(c_stamp):
+						v_validated += 1
+					else:
+						v_fallback += 1
+						with current_rw_lock.gen_rlock():
+							c_read = (c_values[0], c_values[1])
+					# ## Assert
+					self.assertEqual(c_read[0], c_read[1])
+				c_thread.join()
+				self.assertLess(0, v_validated + v_fallback)
+
+
+class TestRWLockRange(unittest.TestCase):
+	"""Test the RW locks over ranges."""
+
+	def setUp(self) -> None:
+		"""Test setup."""
+		self.c_rwlock_type = (rwlock.RWLockReadRange, rwlock.RWLockWriteRange, rwlock.RWLockFairRange)
+
+	def test_overlap(self) -> None:
+		"""
+		# Given: a RW lock over ranges whose writer lock is held over [10, 20).
+
+		# When: locking other ranges.
+
+		# Then: only the overlapping ranges conflict, the ranges are half open and an empty range is refused.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type()
+				c_lock_w = current_rw_lock.gen_wlock(10, 20)
+				self.assertTrue(c_lock_w.acquire())
+				# ## Act
+				c_locks = [current_rw_lock.gen_rlock(), current_rw_lock.gen_rlock(19, 30), current_rw_lock.gen_wlock(0, 11), current_rw_lock.gen_rlock(0, 10), current_rw_lock.gen_wlock(20, 1_000_000)]
+				result = [c_lock.acquire(blocking=False) for c_lock in c_locks]
+				# ## Assert
+				self.assertEqual([False, False, False, True, True], result)
+				self.assertFalse(current_rw_lock.gen_wlock(5, 6).acquire(blocking=False))
+				c_lock_r = c_lock_w.downgrade()
+				self.assertTrue(current_rw_lock.gen_rlock(15, 16).acquire(blocking=False))
+				c_lock_r.release()
+				self.assertRaises(ValueError, current_rw_lock.gen_rlock, 5, 5)
+				self.assertRaises(ValueError, current_rw_lock.gen_wlock, 5, 4)
+
+	def test_priority(self) -> None:
+		"""
+		# Given: a RW lock over ranges held by a reader over [0, 10), with a writer queued over [5, 15).
+
+		# When: a reader over [0, 5), a reader over [8, 9) then a writer over [12, 20) come in.
+
+		# Then: the first reader always gets in, the second one only with the reader priority, the writer unless the lock is fair (it comes after the queued writer).
+		"""
+		for current_rw_lock_type, c_expected in ((rwlock.RWLockReadRange, [True, True, True]), (rwlock.RWLockWriteRange, [True, False, True]), (rwlock.RWLockFairRange, [True, False, False])):
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type()
+				c_lock_r = current_rw_lock.gen_rlock(0, 10)
+				c_lock_w = current_rw_lock.gen_wlock(5, 15)
+				self.assertTrue(c_lock_r.acquire())
+				c_thread_w = threading.Thread(target=c_lock_w.acquire)
+				c_thread_w.start()
+				while current_rw_lock.c_queued_w.v_root is None:
+					time.sleep(sys.float_info.min)
+				# ## Act
+				c_locks = [current_rw_lock.gen_rlock(0, 5), current_rw_lock.gen_rlock(8, 9), current_rw_lock.gen_wlock(12, 20)]
+				result = [c_lock.acquire(blocking=False) for c_lock in c_locks]
+				# ## Assert
+				self.assertEqual(c_expected, result)
+				for c_lock in c_locks:
+					if c_lock.locked(): c_lock.release()
+				c_lock_r.release()
+				c_thread_w.join()
+				self.assertTrue(c_lock_w.locked())
+				c_lock_w.release()
+				self.assertEqual([None] * 4, [c_tree.v_root for c_tree in (current_rw_lock.c_granted_r, current_rw_lock.c_granted_w, current_rw_lock.c_queued_r, current_rw_lock.c_queued_w)])
+
+	def test_timeout_in_queue(self) -> None:
+		"""
+		# Given: a fair RW lock over ranges held by a reader over [0, 10), with a writer queued over [5, 15) then a reader queued over [12, 20).
+
+		# When: the queued writer times out.
+
+		# Then: the reader behind it is handed the lock.
+		"""
+		# ## Arrange
+		current_rw_lock = rwlock.RWLockFairRange()
+		c_lock_r1 = current_rw_lock.gen_rlock(0, 10)
+		c_lock_w = current_rw_lock.gen_wlock(5, 15)
+		c_lock_r2 = current_rw_lock.gen_rlock(12, 20)
+		self.assertTrue(c_lock_r1.acquire())
+		c_thread_w = threading.Thread(target=lambda: c_lock_w.acquire(timeout=0.2))
+		c_thread_w.start()
+		while current_rw_lock.c_queued_w.v_root is None:
+			time.sleep(sys.float_info.min)
+		self.assertFalse(c_lock_r2.acquire(blocking=False))
+		# ## Act
+		result = c_lock_r2.acquire(timeout=5)
+		# ## Assert
+		self.assertTrue(result)
+		c_thread_w.join()
+		self.assertFalse(c_lock_w.locked())
+		c_lock_r1.release()
+		c_lock_r2.release()
+
+	def test_many_ranges(self) -> None:
+		"""
+		# Given: a RW lock over ranges with thousands of random ranges locked and unlocked.
+
+		# When: locking ranges without blocking.
+
+		# Then: a lock is granted exactly when it does not conflict with the overlapping held ranges.
+		"""
+		# ## Arrange
+		c_random = random.Random(0)
+		current_rw_lock = rwlock.RWLockReadRange()
+		c_held: List[Any] = []
+		for _ in range(5000):
+			if c_held and c_random.random() < 0.3:
+				c_held.pop(c_random.randrange(len(c_held))).release()
+				continue
+			c_start = c_random.randrange(100_000)
+			c_end = c_start + c_random.randrange(1, 100)
+			c_is_writer = c_random.random() < 0.2
+			c_lock = current_rw_lock.gen_wlock(c_start, c_end) if c_is_writer else current_rw_lock.gen_rlock(c_start, c_end)
+			c_expected = not any(c_other.c_start < c_end and c_start < c_other.c_end and (c_is_writer or isinstance(c_other, rwlock.LockableD)) for c_other in c_held)
+			# ## Act
+			result = c_lock.acquire(blocking=False)
+			# ## Assert
+			self.assertEqual(c_expected, result)
+			if result: c_held.append(c_lock)
+
+
+class TestRWLockHierarchy(unittest.TestCase):
+	"""Test the hierarchical RW locks."""
+
+	def setUp(self) -> None:
+		"""Test setup."""
+		self.c_rwlock_type = (rwlock.RWLockReadHierarchy, rwlock.RWLockWriteHierarchy, rwlock.RWLockFairHierarchy)
+
+	def test_compatibility(self) -> None:
+		"""
+		# Given: a hierarchical RW lock whose table is locked in a mode.
+
+		# When: locking the same table in another mode.
+
+		# Then: the modes follow the multiple granularity compatibility matrix, an unknown mode is refused.
+		"""
+		c_compatible = {("IS", "IS"), ("IS", "IX"), ("IS", "S"), ("IS", "SIX"), ("IX", "IX"), ("S", "S")}
+		for current_rw_lock_type in self.c_rwlock_type:
+			for c_mode_held in ("IS", "IX", "S", "SIX", "X"):
+				for c_mode in ("IS", "IX", "S", "SIX", "X"):
+					with self.subTest((current_rw_lock_type, c_mode_held, c_mode)):
+						# ## Arrange
+						current_rw_lock = current_rw_lock_type()
+						self.assertTrue(current_rw_lock.gen_lock(("db", "users"), c_mode_held).acquire())
+						# ## Act
+						result = current_rw_lock.gen_lock(("db", "users"), c_mode).acquire(blocking=False)
+						# ## Assert
+						self.assertEqual((c_mode_held, c_mode) in c_compatible or (c_mode, c_mode_held) in c_compatible, result)
+			self.assertRaises(ValueError, current_rw_lock_type().gen_lock, ("db",), "Z")
+
+	def test_granularity(self) -> None:
+		"""
+		# Given: a hierarchical RW lock with a row of a table read and another row written.
+
+		# When: locking the table and another table.
+
+		# Then: the rows are locked in parallel, the table can neither be read nor written until the row writer is done, the other table is free.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type()
+				c_lock_r = current_rw_lock.gen_rlock(("db", "users", 1))
+				c_lock_w = current_rw_lock.gen_wlock(("db", "users", 2))
+				# ## Act
+				result = [c_lock_r.acquire(blocking=False), c_lock_w.acquire(blocking=False)]
+				# ## Assert
+				self.assertEqual([True, True], result)
+				self.assertFalse(current_rw_lock.gen_wlock(("db", "users")).acquire(timeout=0.01))
+				self.assertFalse(current_rw_lock.gen_rlock(("db", "users")).acquire(blocking=False))
+				self.assertFalse(current_rw_lock.gen_wlock(("db", "users", 2)).acquire(blocking=False))
+				c_lock_other = current_rw_lock.gen_wlock(("db", "orders"))
+				self.assertTrue(c_lock_other.acquire(blocking=False))
+				c_lock_other.release()
+				c_lock_w.release()
+				c_lock_table = current_rw_lock.gen_rlock(("db", "users"))
+				self.assertTrue(c_lock_table.acquire(blocking=False))
+				c_lock_table.release()
+				c_lock_r.release()
+				c_lock_table = current_rw_lock.gen_wlock(("db", "users"))
+				self.assertTrue(c_lock_table.acquire(blocking=False))
+				c_lock_table.release()
+				self.assertEqual({}, current_rw_lock.c_nodes)
+
+	def test_priority(self) -> None:
+		"""
+		# Given: a hierarchical RW lock with a table read and a table writer queued, then a row written and a table reader queued.
+
+		# When: a row reader then a row writer come in.
+
+		# Then: the row reader gets in only with the reader priority, the row writer unless the lock is fair (it comes after the queued reader).
+		"""
+		for current_rw_lock_type, c_expected in ((rwlock.RWLockReadHierarchy, [True, True]), (rwlock.RWLockWriteHierarchy, [False, True]), (rwlock.RWLockFairHierarchy, [False, False])):
+			with self.subTest(current_rw_lock_type):
+				result: List[bool] = []
+				for c_lock_held, c_lock_queued, c_lock in (("S", "X", "IS"), ("IX", "S", "IX")):
+					# ## Arrange
+					current_rw_lock = current_rw_lock_type()
+					c_key = ("db", "users")
+					self.assertTrue(current_rw_lock.gen_lock(c_key, c_lock_held).acquire())
+					c_thread = threading.Thread(target=current_rw_lock.gen_lock(c_key, c_lock_queued).acquire, kwargs={"timeout": 0.5})
+					c_thread.start()
+					while not (c_key in current_rw_lock.c_nodes and current_rw_lock.c_nodes[c_key].c_queue):
+						time.sleep(sys.float_info.min)
+					# ## Act
+					result.append(current_rw_lock.gen_lock(c_key, c_lock).acquire(blocking=False))
+					c_thread.join()
+				# ## Assert
+				self.assertEqual(c_expected, result)
+
+	def test_timeout(self) -> None:
+		"""
+		# Given: a hierarchical RW lock with a row written by another thread.
+
+		# When: a table writer gives up waiting.
+
+		# Then: the locks it got on the ancestors are released, the resources are forgotten once unused.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type()
+				c_lock_row = current_rw_lock.gen_wlock(("db", "users", 1))
+				self.assertTrue(c_lock_row.acquire())
+				# ## Act
+				c_start = time.perf_counter()
+				result = current_rw_lock.gen_wlock(("db", "users")).acquire(timeout=0.05)
+				# ## Assert
+				self.assertFalse(result)
+				self.assertLessEqual(0.045, time.perf_counter() - c_start)
+				self.assertEqual([(), ("db",), ("db", "users"), ("db", "users", 1)], sorted(current_rw_lock.c_nodes, key=len))
+				self.assertEqual([1, 1, 1, 1], [c_node.v_users for c_node in current_rw_lock.c_nodes.values()])
+				c_lock_row.release()
+				self.assertEqual({}, current_rw_lock.c_nodes)
+
+	def test_downgrade(self) -> None:
+		"""
+		# Given: a hierarchical RW lock with a table written.
+
+		# When: downgrading its writer lock.
+
+		# Then: the table is read instead (S under IS), the other readers of the table and of its rows get in but not its writers.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type()
+				c_lock_w = current_rw_lock.gen_wlock(("db", "users"))
+				self.assertTrue(c_lock_w.acquire())
+				# ## Act
+				c_lock_r = c_lock_w.downgrade()
+				# ## Assert
+				self.assertFalse(c_lock_w.locked())
+				self.assertEqual([1, 0, 0, 0, 0], current_rw_lock.c_nodes[("db",)].v_granted)
+				self.assertEqual([0, 0, 1, 0, 0], current_rw_lock.c_nodes[("db", "users")].v_granted)
+				c_locks = [current_rw_lock.gen_rlock(("db", "users")), current_rw_lock.gen_rlock(("db", "users", 1))]
+				self.assertEqual([True, True], [c_lock.acquire(blocking=False) for c_lock in c_locks])
+				self.assertFalse(current_rw_lock.gen_wlock(("db", "users", 1)).acquire(blocking=False))
+				for c_lock in c_locks + [c_lock_r]:
+					c_lock.release()
+				self.assertEqual({}, current_rw_lock.c_nodes)
+
+
+class TestDeadline(unittest.TestCase):
+	"""Test acquiring before an absolute deadline."""
+
+	def setUp(self) -> None:
+		"""Test setup."""
+		self.c_rwlock_type = (rwlock.RWLockRead, rwlock.RWLockWrite, rwlock.RWLockFair, rwlock.RWLockReadD, rwlock.RWLockWriteD, rwlock.RWLockFairD, rwlock.RWLockWriteM, rwlock.RWLockPhaseFair, rwlock.RWLockFairQ, rwlock.RWLockWriteB, rwlock.RWLockReadR, rwlock.RWLockWriteR, rwlock.RWLockFairR, rwlock.RWLockReadU, rwlock.RWLockWriteU, rwlock.RWLockFairU, rwlock.RWLockReadS, rwlock.RWLockWriteS, rwlock.RWLockFairS, rwlock.RWLockReadRange, rwlock.RWLockWriteRange, rwlock.RWLockFairRange, rwlock.RWLockReadHierarchy, rwlock.RWLockWriteHierarchy, rwlock.RWLockFairHierarchy)
+
+	def test_deadline(self) -> None:
+		"""
+		# Given: a RW lock whose writer lock is held by another thread.
+
+		# When: acquiring its reader and writer locks before a deadline.
+
+		# Then: they fail once the deadline is reached, the earliest of the deadline and the timeout applies, and they succeed once the lock is free even if the deadline is over.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type()
+				c_lock: Any
+				c_locked = threading.Event()
+				c_done = threading.Event()
+
+				def writer() -> None:
+					with current_rw_lock.gen_wlock():  # pylint: disable=cell-var-from-loop
+						c_locked.set()  # pylint: disable=cell-var-from-loop
+						c_done.wait()  # pylint: disable=cell-var-from-loop
+				c_thread = threading.Thread(target=writer)
+				c_thread.start()
+				c_locked.wait()
+				for c_lock in (current_rw_lock.gen_rlock(), current_rw_lock.gen_wlock(), rwlock.HandlePool(current_rw_lock).gen_rlock()):
+					# ## Act
+					c_deadline = time.perf_counter() + 0.05
+					result = c_lock.acquire(deadline=c_deadline)
+					# ## Assert
+					self.assertFalse(result)
+					self.assertLessEqual(c_deadline - 0.01, time.perf_counter())
+					c_start = time.perf_counter()
+					self.assertFalse(c_lock.acquire(timeout=5, deadline=c_start - 1))
+					self.assertFalse(c_lock.acquire(blocking=False, deadline=c_start + 5))
+					self.assertFalse(c_lock.acquire(timeout=0.01, deadline=c_start + 5))
+					self.assertGreater(1, time.perf_counter() - c_start)
+					self.assertFalse(c_lock.locked())
+				c_done.set()
+				c_thread.join()
+				for c_lock in (current_rw_lock.gen_rlock(), current_rw_lock.gen_wlock()):
+					self.assertTrue(c_lock.acquire(deadline=time.perf_counter() - 1))
+					c_lock.release()
+
+	def test_clock(self) -> None:
+		"""
+		# Given: a RW lock with a time source counting its calls.
+
+		# When: acquiring its free reader and writer locks with a timeout, with or without a deadline.
+
+		# Then: the clock is never read, only a lock request about to block needs it.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				c_reads = [0]
+
+				def time_source() -> float:
+					c_reads[0] += 1  # pylint: disable=cell-var-from-loop
+					return time.perf_counter()
+				current_rw_lock = current_rw_lock_type(time_source=time_source)
+				c_lock: Any
+				for c_lock in (current_rw_lock.gen_rlock(), current_rw_lock.gen_wlock()):
+					for c_deadline in (None, time.perf_counter() + 5):
+						# ## Act
+						result = c_lock.acquire(timeout=1, deadline=c_deadline)
+						c_lock.release()
+						# ## Assert
+						self.assertTrue(result)
+						self.assertEqual([0], c_reads)
+
+	def test_nested(self) -> None:
+		"""
+		# Given: two RW locks, the second one being held by another thread.
+
+		# When: acquiring both of them before the same deadline.
+
+		# Then: the first one is acquired and the whole acquisition gives up at the deadline.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				c_lock_outer: Any = current_rw_lock_type().gen_rlock()
+				c_lock_inner: Any = current_rw_lock_type().gen_wlock()
+				c_locked = threading.Event()
+				c_done = threading.Event()
+
+				def reader() -> None:
+					with c_lock_inner.c_rw_lock.gen_rlock():  # pylint: disable=cell-var-from-loop
+						c_locked.set()  # pylint: disable=cell-var-from-loop
+						c_done.wait()  # pylint: disable=cell-var-from-loop
+				c_thread = threading.Thread(target=reader)
+				c_thread.start()
+				c_locked.wait()
+				c_deadline = time.perf_counter() + 0.05
+				# ## Act
+				result = [c_lock_outer.acquire(deadline=c_deadline), c_lock_inner.acquire(deadline=c_deadline)]
+				# ## Assert
+				self.assertEqual([True, False], result)
+				self.assertLessEqual(c_deadline - 0.01, time.perf_counter())
+				self.assertGreater(c_deadline + 1, time.perf_counter())
+				c_lock_outer.release()
+				c_done.set()
+				c_thread.join()
+
+	def test_other_lock(self) -> None:
+		"""
+		# Given: a RW lock of another package, its acquire only takes blocking and timeout, wrapped by the wrappers of this package.
+
+		# When: acquiring the wrapped locks (or the lock with acquire_all()) before a deadline, while the lock is held then while it is free.
+
+		# Then: the deadline is turned into a timeout: they fail once the deadline is reached and succeed once the lock is free.
+		"""
+		class OtherLock():
+			def __init__(self, p_lock: Any) -> None:
+				self.c_lock = p_lock
+
+			def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+				return cast(bool, self.c_lock.acquire(blocking, timeout))
+
+			def release(self) -> None:
+				self.c_lock.release()
+
+			def locked(self) -> bool:
+				return cast(bool, self.c_lock.locked())
+
+		class OtherRWLock():
+			def __init__(self) -> None:
+				self.c_lock = threading.Lock()
+
+			def gen_rlock(self) -> OtherLock:
+				return OtherLock(self.c_lock)
+
+			def gen_wlock(self) -> OtherLock:
+				return OtherLock(self.c_lock)
+		c_other = cast(rwlock.RWLockableD, OtherRWLock())
+		c_wrapped: Tuple[Any, ...] = (rwlock.HandlePool(c_other), rwlock.RWLockStats(c_other), rwlock.DeadlockDetector().wrap(c_other), rwlock.LockOrderValidator().wrap(c_other), rwlock.HoldWatchdog(lambda p_hold: None).wrap(c_other), rwlock.LockTracer().wrap(c_other))
+		c_table = rwlock.RWLockTable(strategy=lambda: c_other)
+		c_pairs = [(c_rw_lock.gen_rlock(), c_rw_lock.gen_wlock()) for c_rw_lock in c_wrapped] + [(c_table.gen_rlock("a"), c_table.gen_wlock("a"))]
+		for c_pair in c_pairs:
+			with self.subTest(type(c_pair[0])):
+				for c_lock in c_pair:
+					# ## Arrange
+					c_other.c_lock.acquire()  # type: ignore [attr-defined]
+					c_deadline = time.perf_counter() + 0.05
+					# ## Act
+					try:
+						result = [c_lock.acquire(deadline=c_deadline), c_lock.acquire(blocking=False, deadline=c_deadline + 5)]
+					finally:
+						c_other.c_lock.release()  # type: ignore [attr-defined]
+					result.append(c_lock.acquire(deadline=time.perf_counter() + 5))
+					c_lock.release()
+					# ## Assert
+					self.assertEqual([False, False, True], result)
+					self.assertLessEqual(c_deadline - 0.01, time.perf_counter())
+					self.assertFalse(c_lock.locked())
+		with self.subTest(rwlock.acquire_all):
+			# ## Arrange
+			c_other.c_lock.acquire()  # type: ignore [attr-defined]
+			c_deadline = time.perf_counter() + 0.05
+			# ## Act
+			try:
+				result_all = [rwlock.acquire_all([(c_other, "w")], timeout=0.05), rwlock.acquire_all([(c_other, "r")], deadline=c_deadline)]
+			finally:
+				c_other.c_lock.release()  # type: ignore [attr-defined]
+			c_lock_all = rwlock.acquire_all([(c_other, "r")], deadline=time.perf_counter() + 5)
+			# ## Assert
+			self.assertEqual([None, None], result_all)
+			self.assertLessEqual(c_deadline - 0.01, time.perf_counter())
+			assert c_lock_all is not None
+			c_lock_all.release()
+			self.assertFalse(c_other.c_lock.locked())  # type: ignore [attr-defined]
+
+
+class TestHandlePool(unittest.TestCase):
+	"""Test the pool of reusable handles."""
+
+	def setUp(self) -> None:
+		"""Test setup."""
+		self.c_rwlock_type_downgradable = (rwlock.RWLockReadD, rwlock.RWLockWriteD, rwlock.RWLockFairD, rwlock.RWLockWriteM, rwlock.RWLockWriteB, rwlock.RWLockPhaseFair, rwlock.RWLockFairQ, rwlock.RWLockReadU, rwlock.RWLockWriteU, rwlock.RWLockFairU, rwlock.RWLockReadS, rwlock.RWLockWriteS, rwlock.RWLockFairS)
+		self.c_rwlock_type = (rwlock.RWLockRead, rwlock.RWLockWrite, rwlock.RWLockFair, rwlock.RWLockReadR, rwlock.RWLockWriteR, rwlock.RWLockFairR) + self.c_rwlock_type_downgradable
+
+	def test_slots(self) -> None:
+		"""
+		# Given: a RW lock and its handles.
+
+		# When: looking for their instance dictionary.
+
+		# Then: there is none since all the classes declare their __slots__.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = current_rw_lock_type()
+				# ## Act
+				c_objects = (current_rw_lock, current_rw_lock.gen_rlock(), current_rw_lock.gen_wlock(), rwlock.HandlePool(current_rw_lock).gen_rlock())
+				# ## Assert
+				for c_object in c_objects:
+					self.assertFalse(hasattr(c_object, "__dict__"), c_object)
+
+	def test_reuse(self) -> None:
+		"""
+		# Given: a pool of handles over a RW lock.
+
+		# When: handles are generated, acquired and released.
+
+		# Then: a released handle is handed out again while a handle still owned is never handed out twice.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_pool = rwlock.HandlePool(current_rw_lock_type())
+				c_lock_r1 = current_pool.gen_rlock()
+				self.assertTrue(c_lock_r1.acquire())
+				# ## Act
+				c_lock_r2 = current_pool.gen_rlock()
+				self.assertTrue(c_lock_r2.acquire())
+				c_lock_r2.release()
+				c_lock_r1.release()
+				# ## Assert
+				self.assertIsNot(c_lock_r1, c_lock_r2)
+				self.assertIs(c_lock_r1, current_pool.gen_rlock())
+				self.assertIs(c_lock_r2, current_pool.gen_rlock())
+				self.assertIsNot(c_lock_r1, current_pool.gen_rlock())
+				c_lock_w = current_pool.gen_wlock()
+				with c_lock_w:
+					self.assertTrue(c_lock_w.locked())
+				self.assertFalse(c_lock_w.locked())
+				self.assertIs(c_lock_w, current_pool.gen_wlock())
+				with self.assertRaises(rwlock.RELEASE_ERR_CLS):
+					c_lock_w.release()
+
+	def test_recycled(self) -> None:
+		"""
+		# Given: a pool of handles over a RW lock.
+
+		# When: a pooled handle is reused across with blocks, before and after being handed out again.
+
+		# Then: acquiring it once it went back to the pool raises, it is usable again once handed out.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_pool = rwlock.HandlePool(current_rw_lock_type())
+				c_lock_w = current_pool.gen_wlock()
+				with c_lock_w:
+					pass
+				# ## Act
+				with self.assertRaises(RuntimeError):
+					with c_lock_w:
+						pass
+				# ## Assert
+				self.assertFalse(c_lock_w.locked())
+				self.assertIs(c_lock_w, current_pool.gen_wlock())
+				with c_lock_w:
+					self.assertTrue(c_lock_w.locked())
+
+	def test_downgrade(self) -> None:
+		"""
+		# Given: a pool of handles over a downgradable RW lock.
+
+		# When: a pooled writer lock is downgraded.
+
+		# Then: the writer handle goes back to the pool and the reader lock excludes writers.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type_downgradable:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_pool = rwlock.HandlePool(current_rw_lock_type())
+				c_lock_w = current_pool.gen_wlock()
+				self.assertTrue(c_lock_w.acquire())
+				# ## Act
+				c_lock_r = c_lock_w.downgrade()
+				# ## Assert
+				self.assertTrue(c_lock_r.locked())
+				c_lock_w2 = current_pool.gen_wlock()
+				self.assertIs(c_lock_w, c_lock_w2)
+				self.assertFalse(c_lock_w2.acquire(blocking=False))
+				c_lock_r.release()
+				self.assertTrue(c_lock_w2.acquire(blocking=False))
+				c_lock_w2.release()
+
+	def test_per_thread(self) -> None:
+		"""
+		# Given: a pool of handles over a RW lock.
+
+		# When: a handle released by a thread is requested by another thread.
+
+		# Then: each thread gets handles from its own pool.
+		"""
+		# ## Arrange
+		current_pool = rwlock.HandlePool(rwlock.RWLockFair())
+		c_lock_r = current_pool.gen_rlock()
+		with c_lock_r:
+			pass
+		c_result: List[rwlock.Lockable] = []
+		# ## Act
+		c_thread = threading.Thread(target=lambda: c_result.append(current_pool.gen_rlock()))
+		c_thread.start()
+		c_thread.join()
+		# ## Assert
+		self.assertIsNot(c_lock_r, c_result[0])
+		self.assertIs(c_lock_r, current_pool.gen_rlock())
+
+	def test_reentrant(self) -> None:
+		"""
+		# Given: a pool of handles over a reentrant RW lock.
+
+		# When: a pooled handle acquired twice is released once.
+
+		# Then: it only goes back to the pool once fully released.
+		"""
+		# ## Arrange
+		current_pool = rwlock.HandlePool(rwlock.RWLockFairR())
+		c_lock_r = current_pool.gen_rlock()
+		self.assertTrue(c_lock_r.acquire())
+		self.assertTrue(c_lock_r.acquire())
+		# ## Act
+		c_lock_r.release()
+		# ## Assert
+		self.assertIsNot(c_lock_r, current_pool.gen_rlock())
+		c_lock_r.release()
+		self.assertIs(c_lock_r, current_pool.gen_rlock())
+
+
+class TestRWLockTable(unittest.TestCase):
+	"""Test the table of RW locks."""
+
+	def test_keys(self) -> None:
+		"""
+		# Given: a table of RW locks with a key written.
+
+		# When: locking the same key and another key.
+
+		# Then: only the locks of the same key conflict.
+		"""
+		# ## Arrange
+		current_table = rwlock.RWLockTable()
+		c_lock_w = current_table.gen_wlock("a")
+		self.assertTrue(c_lock_w.acquire())
+		# ## Act
+		result = [current_table.gen_rlock("a").acquire(blocking=False), current_table.gen_wlock("a").acquire(timeout=0.01)]
+		c_lock_b = [current_table.gen_wlock("b"), current_table.gen_rlock(("b",))]
+		# ## Assert
+		self.assertEqual([False, False], result)
+		self.assertEqual([True, True], [c_lock.acquire(blocking=False) for c_lock in c_lock_b])
+		for c_lock in c_lock_b:
+			c_lock.release()
+		c_lock_w.release()
+		self.assertFalse(c_lock_w.locked())
+		self.assertRaises(rwlock.RELEASE_ERR_CLS, c_lock_w.release)
+
+	def test_eviction(self) -> None:
+		"""
+		# Given: a table of RW locks.
+
+		# When: its keys are locked, waited for, given up and released.
+
+		# Then: the lock of a key lives as long as a handle holds or waits for it, and only then.
+		"""
+		# ## Arrange
+		current_table = rwlock.RWLockTable()
+		c_lock_r1 = current_table.gen_rlock("a")
+		c_lock_r2 = current_table.gen_rlock("a")
+		c_lock_w = current_table.gen_wlock("a")
+		# ## Act
+		self.assertTrue(c_lock_r1.acquire())
+		c_rw_lock = current_table.c_entries["a"].c_rw_lock
+		self.assertTrue(c_lock_r2.acquire())
+		self.assertFalse(c_lock_w.acquire(blocking=False))
+		c_thread = threading.Thread(target=c_lock_w.acquire)
+		c_thread.start()
+		while 3 != current_table.c_entries["a"].v_users:
+			time.sleep(sys.float_info.min)
+		c_lock_r1.release()
+		c_lock_r2.release()
+		c_thread.join()
+		# ## Assert
+		self.assertIs(c_rw_lock, current_table.c_entries["a"].c_rw_lock)
+		self.assertEqual(1, current_table.c_entries["a"].v_users)
+		c_lock_w.release()
+		self.assertEqual({}, current_table.c_entries)
+		for _ in range(1000):
+			with current_table.gen_wlock(object()):
+				pass
+		self.assertEqual({}, current_table.c_entries)
+
+	def test_strategy(self) -> None:
+		"""
+		# Given: tables of RW locks built with downgradable strategies.
+
+		# When: downgrading a writer lock of a key.
+
+		# Then: the key is then read without ever being released.
+		"""
+		for current_strategy in (rwlock.RWLockFairD, rwlock.RWLockWriteM, rwlock.RWLockFairQ, lambda: rwlock.RWLockFairD(wait_policy=rwlock.SpinThenPark())):
+			with self.subTest(current_strategy):
+				# ## Arrange
+				current_table = rwlock.RWLockTable(strategy=current_strategy)
+				c_lock_w = current_table.gen_wlock("a")
+				self.assertTrue(c_lock_w.acquire())
+				# ## Act
+				c_lock_r = c_lock_w.downgrade()
+				# ## Assert
+				self.assertFalse(c_lock_w.locked())
+				self.assertTrue(c_lock_r.locked())
+				self.assertEqual(1, current_table.c_entries["a"].v_users)
+				self.assertTrue(current_table.gen_rlock("a").acquire(blocking=False))
+				self.assertFalse(current_table.gen_wlock("a").acquire(blocking=False))
+
+
+class TestStripedRWLock(unittest.TestCase):
+	"""Test the striped RW lock."""
+
+	def test_stripes(self) -> None:
+		"""
+		# Given: a striped RW lock with a key written.
+
+		# When: locking keys of the same stripe and of other stripes.
+
+		# Then: only the locks of the same stripe conflict, at least one stripe is required.
+		"""
+		# ## Arrange
+		current_rw_lock = rwlock.StripedRWLock(4)
+		c_lock_w = current_rw_lock.gen_wlock(0)
+		self.assertTrue(c_lock_w.acquire())
+		# ## Act
+		result = [current_rw_lock.gen_rlock(c_key).acquire(blocking=False) for c_key in range(8)]
+		# ## Assert
+		self.assertEqual([False, True, True, True] * 2, result)
+		self.assertIs(current_rw_lock.stripe(0), current_rw_lock.stripe(4))
+		c_lock_w.release()
+		self.assertRaises(ValueError, rwlock.StripedRWLock, 0)
+
+	def test_all(self) -> None:
+		"""
+		# Given: a striped RW lock with a key of its last stripe read.
+
+		# When: locking all the stripes.
+
+		# Then: the writer gives up at its deadline without keeping any stripe, then gets all of them and excludes every key until it downgrades.
+		"""
+		for current_strategy in (rwlock.RWLockFairD, rwlock.RWLockWriteM, rwlock.RWLockFairQ):
+			with self.subTest(current_strategy):
+				# ## Arrange
+				current_rw_lock = rwlock.StripedRWLock(4, current_strategy)
+				c_lock_r = current_rw_lock.gen_rlock(3)
+				self.assertTrue(c_lock_r.acquire())
+				c_lock_w_all = current_rw_lock.gen_wlock_all()
+				# ## Act
+				result = [c_lock_w_all.acquire(timeout=0.05), c_lock_w_all.acquire(blocking=False)]
+				# ## Assert
+				self.assertEqual([False, False], result)
+				self.assertEqual([True, True, True], [current_rw_lock.gen_wlock(c_key).acquire(blocking=False) for c_key in range(3)])
+				current_rw_lock = rwlock.StripedRWLock(4, current_strategy)
+				c_lock_w_all = current_rw_lock.gen_wlock_all()
+				self.assertTrue(c_lock_w_all.acquire())
+				self.assertEqual([False] * 4, [current_rw_lock.gen_rlock(c_key).acquire(blocking=False) for c_key in range(4)])
+				c_lock_r_all = c_lock_w_all.downgrade()
+				self.assertFalse(c_lock_w_all.locked())
+				self.assertEqual([True] * 4, [current_rw_lock.gen_rlock(c_key).acquire(blocking=False) for c_key in range(4)])
+				self.assertFalse(current_rw_lock.gen_wlock(0).acquire(blocking=False))
+				c_lock_r_all.release()
+				self.assertRaises(rwlock.RELEASE_ERR_CLS, c_lock_r_all.release)
+				self.assertTrue(current_rw_lock.gen_rlock_all().acquire(blocking=False))
+
+
+class TestAcquireAll(unittest.TestCase):
+	"""Test the acquisition of several RW locks at once."""
+
+	def test_order(self) -> None:
+		"""
+		# Given: two threads writing the same RW locks listed in opposite orders.
+
+		# When: they repeatedly acquire all of them at once.
+
+		# Then: they never deadlock.
+		"""
+		# ## Arrange
+		c_rw_locks = [rwlock.RWLockFair() for _ in range(3)]
+		c_counts: List[int] = [0, 0]
+
+		def worker(p_index: int) -> None:
+			c_requests = [(c_rw_lock, "w") for c_rw_lock in (c_rw_locks if 0 == p_index else reversed(c_rw_locks))]
+			for _ in range(2000):
+				with rwlock.gen_lock_all(c_requests):
+					c_counts[p_index] += 1
+					time.sleep(0)
+		c_threads = [threading.Thread(target=worker, args=(c_index,)) for c_index in range(2)]
+		# ## Act
+		for c_thread in c_threads:
+			c_thread.start()
+		for c_thread in c_threads:
+			c_thread.join(30)
+		# ## Assert
+		self.assertEqual([2000, 2000], c_counts)
+
+	def test_timeout(self) -> None:
+		"""
+		# Given: RW locks A, B and C, C being written by another thread.
+
+		# When: reading A and B and writing C all at once with a timeout, then without blocking.
+
+		# Then: it gives up at its deadline without keeping any lock, then succeeds once C is free.
+		"""
+		# ## Arrange
+		c_rw_lock_a, c_rw_lock_b, c_rw_lock_c = rwlock.RWLockFairD(), rwlock.RWLockWriteM(), rwlock.RWLockFairQ()
+		c_locked = threading.Event()
+		c_done = threading.Event()
+
+		def writer() -> None:
+			with c_rw_lock_c.gen_wlock():
+				c_locked.set()
+				c_done.wait()
+		c_thread = threading.Thread(target=writer)
+		c_thread.start()
+		c_locked.wait()
+		c_requests = [(c_rw_lock_a, "r"), (c_rw_lock_b, "r"), (c_rw_lock_c, "w")]
+		# ## Act
+		c_start = time.perf_counter()
+		result = [rwlock.acquire_all(c_requests, timeout=0.05), rwlock.acquire_all(c_requests, deadline=time.perf_counter() + 0.05), rwlock.acquire_all(c_requests, blocking=False)]
+		# ## Assert
+		self.assertEqual([None, None, None], result)
+		self.assertLessEqual(0.09, time.perf_counter() - c_start)
+		for c_rw_lock in (c_rw_lock_a, c_rw_lock_b):
+			c_lock = c_rw_lock.gen_wlock()
+			self.assertTrue(c_lock.acquire(blocking=False))
+			c_lock.release()
+		c_done.set()
+		c_thread.join()
+		c_lock_all = rwlock.acquire_all(c_requests, timeout=5)
+		assert c_lock_all is not None
+		self.assertTrue(c_lock_all.locked())
+		self.assertTrue(c_rw_lock_a.gen_rlock().acquire(blocking=False))
+		self.assertFalse(c_rw_lock_c.gen_rlock().acquire(blocking=False))
+		c_lock_r = c_lock_all.downgrade()
+		self.assertTrue(c_rw_lock_c.gen_rlock().acquire(blocking=False))
+		c_lock_r.release()
+		self.assertRaises(rwlock.RELEASE_ERR_CLS, c_lock_all.release)
+
+	def test_requests(self) -> None:
+		"""
+		# Given: a RW lock requested both as a reader and as a writer.
+
+		# When: acquiring the requests at once.
+
+		# Then: it is written once, an unknown mode is refused.
+		"""
+		# ## Arrange
+		c_rw_lock = rwlock.RWLockFair()
+		# ## Act
+		c_lock_all = rwlock.acquire_all([(c_rw_lock, "r"), (c_rw_lock, "w"), (c_rw_lock, "r")])
+		# ## Assert
+		assert c_lock_all is not None
+		self.assertEqual(1, len(c_lock_all.c_locks))
+		self.assertFalse(c_rw_lock.gen_rlock().acquire(blocking=False))
+		c_lock_all.release()
+		self.assertRaises(ValueError, rwlock.gen_lock_all, [(c_rw_lock, "x")])
+
+
+class TestDeadlockDetector(unittest.TestCase):
+	"""Test the detection of deadlocks."""
+
+	def test_cycle(self) -> None:
+		"""
+		# Given: a thread holding A and waiting for B.
+
+		# When: another thread holding B requests A.
+
+		# Then: the request closing the cycle raises DeadlockError right away, once B is released the first thread proceeds.
+		"""
+		# ## Arrange
+		c_detector = rwlock.DeadlockDetector()
+		c_rw_lock_a, c_rw_lock_b = rwlock.RWLockFair(), rwlock.RWLockFairQ()
+		c_a, c_b = c_detector.wrap(c_rw_lock_a), c_detector.wrap(c_rw_lock_b)
+		c_lock_b = c_b.gen_rlock()
+		self.assertTrue(c_lock_b.acquire())
+		c_locked = threading.Event()
+		c_done: List[bool] = []
+
+		def worker() -> None:
+			with c_a.gen_wlock():
+				c_locked.set()
+				with c_b.gen_wlock():
+					c_done.append(True)
+		c_thread = threading.Thread(target=worker)
+		c_thread.start()
+		c_locked.wait()
+		while not c_detector.c_waiting:
+			time.sleep(0.001)
+		time.sleep(0.05)  # The worker is past its grace: it waits for good.
+		# ## Act
+		c_start = time.perf_counter()
+		with self.assertRaises(rwlock.DeadlockError) as c_context:
+			c_a.gen_rlock().acquire(timeout=5)
+		c_elapsed = time.perf_counter() - c_start
+		c_lock_b.release()
+		c_thread.join()
+		# ## Assert
+		self.assertLess(c_elapsed, 1)
+		self.assertEqual([(threading.get_ident(), c_rw_lock_a), (c_thread.ident, c_rw_lock_b)], c_context.exception.cycle)
+		self.assertIsInstance(c_context.exception, RuntimeError)
+		self.assertEqual([True], c_done)
+		self.assertEqual({}, c_detector.c_waiting)
+		self.assertEqual(({}, {}, {}, {}), (c_a.v_readers, c_a.v_writers, c_b.v_readers, c_b.v_writers))
+
+	def test_report(self) -> None:
+		"""
+		# Given: a thread writing A and waiting to write B, a detector reporting to on_deadlock.
+
+		# When: another thread writing B requests to write A with a timeout.
+
+		# Then: the cycle is reported, then the request times out; a downgrade turns the writer into a reader.
+		"""
+		# ## Arrange
+		c_reports: List[List[Tuple[int, rwlock.RWLockable]]] = []
+		c_detector = rwlock.DeadlockDetector(on_deadlock=c_reports.append)
+		c_rw_lock_a, c_rw_lock_b = rwlock.RWLockWriteD(), rwlock.RWLockFairD()
+		c_a, c_b = c_detector.wrap(c_rw_lock_a), c_detector.wrap(c_rw_lock_b)
+		c_lock_b = c_b.gen_wlock()
+		self.assertTrue(c_lock_b.acquire())
+		c_locked = threading.Event()
+
+		def worker() -> None:
+			with c_a.gen_wlock():
+				c_locked.set()
+				with c_b.gen_wlock():
+					pass
+		c_thread = threading.Thread(target=worker)
+		c_thread.start()
+		c_locked.wait()
+		while not c_detector.c_waiting:
+			time.sleep(0.001)
+		time.sleep(0.05)  # The worker is past its grace: it waits for good.
+		# ## Act
+		result = c_a.gen_wlock().acquire(timeout=0.1)
+		# ## Assert
+		self.assertFalse(result)
+		self.assertEqual([[(threading.get_ident(), c_rw_lock_a), (c_thread.ident, c_rw_lock_b)]], c_reports)
+		c_lock_d = c_lock_b.downgrade()
+		self.assertEqual(({threading.get_ident(): 1}, {}), (c_b.v_readers, c_b.v_writers))
+		c_lock_d.release()
+		c_thread.join()
+		self.assertRaises(rwlock.RELEASE_ERR_CLS, c_lock_d.release)
+		self.assertEqual(({}, {}), (c_b.v_readers, c_b.v_writers))
+
+	def test_contention(self) -> None:
+		"""
+		# Given: two threads reading a lock, one of them also reading a second lock the other one requests.
+
+		# When: the first thread reads the lock again while another thread holds an internal lock of it for a while.
+
+		# Then: no deadlock is reported, its own reader lock and the compatible ones do not block it.
+		"""
+		# ## Arrange
+		c_detector = rwlock.DeadlockDetector()
+		c_rw_lock, c_rw_lock_other = rwlock.RWLockRead(), rwlock.RWLockRead()
+		c_wrapped, c_other = c_detector.wrap(c_rw_lock), c_detector.wrap(c_rw_lock_other)
+		c_lock_r, c_lock_other = c_wrapped.gen_rlock(), c_other.gen_rlock()
+		self.assertTrue(c_lock_r.acquire())
+		self.assertTrue(c_lock_other.acquire())
+		c_locked = threading.Event()
+
+		def reader() -> None:
+			with c_wrapped.gen_rlock():
+				c_rw_lock_other.c_lock_read_count.acquire()
+				c_locked.set()
+				time.sleep(0.1)
+				c_rw_lock_other.c_lock_read_count.release()
+				with c_other.gen_rlock():
+					pass
+
+		def busy() -> None:
+			c_rw_lock.c_lock_read_count.acquire()
+			c_locked.set()
+			time.sleep(0.1)
+			c_rw_lock.c_lock_read_count.release()
+		c_threads = [threading.Thread(target=reader), threading.Thread(target=busy)]
+		for c_thread in c_threads:
+			c_thread.start()
+			c_locked.wait()
+			c_locked.clear()
+		# ## Act
+		c_lock_nested = c_wrapped.gen_rlock()
+		result = c_lock_nested.acquire(timeout=5)
+		# ## Assert
+		self.assertTrue(result)
+		c_lock_nested.release()
+		c_lock_other.release()
+		c_lock_r.release()
+		for c_thread in c_threads:
+			c_thread.join()
+		self.assertEqual(({}, {}, {}), (c_detector.c_waiting, c_wrapped.v_readers, c_other.v_readers))
+
+
+class TestLockOrderValidator(unittest.TestCase):
+	"""Test the validation of the order of nested locks."""
+
+	def test_inversion(self) -> None:
+		"""
+		# Given: locks of the classes A, B and C nested A then B, then B then C, without any deadlock.
+
+		# When: nesting C then A, then A then B again and C then A again.
+
+		# Then: the inversion is reported once, with the place where each edge was first seen.
+		"""
+		# ## Arrange
+		c_reports: List[str] = []
+		c_validator = rwlock.LockOrderValidator(on_inversion=c_reports.append)
+		c_a = c_validator.wrap(rwlock.RWLockFair(), "A")
+		c_b = c_validator.wrap(rwlock.RWLockWriteD(), "B")
+		c_c = c_validator.wrap(rwlock.RWLockFairQ(), "C")
+		c_a_other = c_validator.wrap(rwlock.RWLockRead(), "A")
+
+		def nest(p_outer: rwlock.RWLockable, p_inner: rwlock.RWLockable) -> None:
+			with p_outer.gen_rlock():
+				with p_inner.gen_wlock():
+					pass
+		nest(c_a, c_b)
+		nest(c_b, c_c)
+		self.assertEqual([], c_reports)
+		# ## Act
+		threading.Thread(target=nest, args=(c_c, c_a_other)).run()
+		nest(c_a, c_b)
+		nest(c_c, c_a)
+		# ## Assert
+		self.assertEqual(1, len(c_reports))
+		self.assertIn("A acquired while holding C", c_reports[0])
+		self.assertIn("A was held while acquiring B", c_reports[0])
+		self.assertIn("B was held while acquiring C", c_reports[0])
+		self.assertIn(__file__, c_reports[0])
+		self.assertEqual([], c_validator.c_held.v_ids)
+
+	def test_warning(self) -> None:
+		"""
+		# Given: a validator without on_inversion, lock classes named after their types.
+
+		# When: nesting them in both orders, out of order releases, non-blocking requests and downgrades included.
+
+		# Then: a LockOrderWarning is issued once, non-blocking requests never report.
+		"""
+		# ## Arrange
+		c_validator = rwlock.LockOrderValidator()
+		c_a, c_b = c_validator.wrap(rwlock.RWLockFairD()), c_validator.wrap(rwlock.RWLockWrite())
+		c_lock_a, c_lock_b = c_a.gen_wlock(), c_b.gen_rlock()
+		self.assertTrue(c_lock_a.acquire())
+		self.assertTrue(c_lock_b.acquire())
+		c_lock_a.release()
+		c_lock_b.release()
+		self.assertTrue(c_lock_b.acquire())
+		self.assertTrue(c_lock_a.acquire(blocking=False))
+		c_lock_a.release()
+		c_lock_b.release()
+		# ## Act
+		with c_b.gen_wlock():
+			with self.assertWarns(rwlock.LockOrderWarning) as c_context:
+				self.assertTrue(c_lock_a.acquire())
+			c_lock_d = c_lock_a.downgrade()
+		c_lock_d.release()
+		# ## Assert
+		self.assertIn("RWLockFairD acquired while holding RWLockWrite", str(c_context.warning))
+		self.assertEqual(__file__, c_context.filename)
+		self.assertRaises(rwlock.RELEASE_ERR_CLS, c_lock_a.release)
+		self.assertEqual([], c_validator.c_held.v_ids)
+
+
+class TestRWLockStats(unittest.TestCase):
+	"""Test the statistics of the lock requests."""
+
+	def test_stats(self) -> None:
+		"""
+		# Given: a RW lock keeping statistics with a controlled time source.
+
+		# When: writing it for 1us, failing to read it, reading it after a 2ms wait, then downgrading a writer lock.
+
+		# Then: the counters and the histograms (bucket i: [2 ** (i - 1), 2 ** i) ns) reflect it.
+		"""
+		for c_rw_lock_type in (rwlock.RWLockFairD, rwlock.RWLockWriteD, rwlock.RWLockFairQ):
+			with self.subTest(c_rw_lock_type):
+				# ## Arrange
+				c_now = [0.0]
+				c_rw_lock = rwlock.RWLockStats(c_rw_lock_type(), time_source=lambda: c_now[0])
+				c_lock_w = c_rw_lock.gen_wlock()
+				c_lock_r = c_rw_lock.gen_rlock()
+				c_locked = threading.Event()
+
+				def writer() -> None:
+					c_lock_w.acquire()
+					c_locked.set()
+					time.sleep(0.05)
+					c_now[0] += 0.002
+					c_lock_w.release()
+				# ## Act
+				self.assertTrue(c_lock_w.acquire())
+				c_now[0] += 0.000001
+				c_lock_w.release()
+				c_thread = threading.Thread(target=writer)
+				c_thread.start()
+				c_locked.wait()
+				self.assertFalse(c_lock_r.acquire(blocking=False))
+				self.assertTrue(c_lock_r.acquire())
+				c_thread.join()
+				c_lock_r.release()
+				self.assertTrue(c_lock_w.acquire())
+				c_lock_d = c_lock_w.downgrade()
+				c_lock_d.release()
+				result = c_rw_lock.stats()
+				# ## Assert
+				c_wait_r, c_hold_r = [0] * 32, [0] * 32
+				c_wait_r[0], c_wait_r[21], c_hold_r[0] = 1, 1, 2
+				c_wait_w, c_hold_w = [0] * 32, [0] * 32
+				c_wait_w[0], c_hold_w[0], c_hold_w[10], c_hold_w[21] = 3, 1, 1, 1
+				self.assertEqual({"acquisitions": 2, "contended": 2, "timeouts": 0, "wait": c_wait_r, "hold": c_hold_r}, result["reader"])
+				self.assertEqual({"acquisitions": 3, "contended": 0, "timeouts": 0, "wait": c_wait_w, "hold": c_hold_w}, result["writer"])
+				self.assertRaises(rwlock.RELEASE_ERR_CLS, c_lock_w.release)
+				self.assertRaises(rwlock.RELEASE_ERR_CLS, c_lock_w.downgrade)
+
+
+class TestHoldWatchdog(unittest.TestCase):
+	"""Test the reporting of long holds."""
+
+	def test_thread(self) -> None:
+		"""
+		# Given: a started watchdog with a 50ms budget.
+
+		# When: a thread holds a writer lock for 300ms in slow_io() while short reader locks come and go.
+
+		# Then: the long hold is reported once, with the stack of the holder.
+		"""
+		# ## Arrange
+		c_reports: List[rwlock.LongHold] = []
+		c_watchdog = rwlock.HoldWatchdog(c_reports.append, budget=0.05, interval=0.01)
+		c_rw_lock = rwlock.RWLockWrite()
+		c_watched = c_watchdog.wrap(c_rw_lock)
+
+		def slow_io() -> None:
+			time.sleep(0.3)
+
+		def writer() -> None:
+			with c_watched.gen_wlock():
+				slow_io()
+		c_watchdog.start()
+		self.assertRaises(RuntimeError, c_watchdog.start)
+		# ## Act
+		for _ in range(3):
+			with c_watched.gen_rlock():
+				time.sleep(0.01)
+		c_thread = threading.Thread(target=writer)
+		c_thread.start()
+		c_thread.join()
+		c_watchdog.stop()
+		c_watchdog.stop()
+		# ## Assert
+		self.assertEqual(1, len(c_reports))
+		self.assertIs(c_rw_lock, c_reports[0].rw_lock)
+		self.assertTrue(c_reports[0].is_writer)
+		self.assertEqual(c_thread.ident, c_reports[0].thread_ident)
+		self.assertLessEqual(0.05, c_reports[0].duration)
+		self.assertIn("slow_io", [c_frame.name for c_frame in c_reports[0].stack])
+		self.assertEqual(set(), c_watchdog.c_holds)
+
+	def test_check(self) -> None:
+		"""
+		# Given: a watchdog with a controlled time source, a RW lock with its own hold budget.
+
+		# When: checking the holds as the time goes by, a writer lock being downgraded.
+
+		# Then: each hold over its budget is reported once, from its acquisition.
+		"""
+		# ## Arrange
+		c_now = [0.0]
+		c_reports: List[rwlock.LongHold] = []
+		c_watchdog = rwlock.HoldWatchdog(c_reports.append, budget=1, time_source=lambda: c_now[0])
+		c_watched_a, c_watched_b = c_watchdog.wrap(rwlock.RWLockFairD()), c_watchdog.wrap(rwlock.RWLockFairQ(), budget=5)
+		c_lock_a, c_lock_b = c_watched_a.gen_wlock(), c_watched_b.gen_rlock()
+		self.assertTrue(c_lock_a.acquire())
+		self.assertTrue(c_lock_b.acquire())
+		# ## Act
+		c_now[0] = 0.5
+		c_watchdog.check()
+		c_lock_d = c_lock_a.downgrade()
+		c_now[0] = 2
+		c_watchdog.check()
+		c_watchdog.check()
+		c_now[0] = 6
+		c_watchdog.check()
+		c_lock_d.release()
+		c_lock_b.release()
+		# ## Assert
+		self.assertEqual([(False, 2.0), (False, 6.0)], [(c_report.is_writer, c_report.duration) for c_report in c_reports])
+		self.assertEqual(threading.get_ident(), c_reports[0].thread_ident)
+		self.assertIn("test_check", [c_frame.name for c_frame in c_reports[0].stack])
+		self.assertRaises(rwlock.RELEASE_ERR_CLS, c_lock_d.release)
+		self.assertEqual(set(), c_watchdog.c_holds)
+
+	def test_downgrade_reported(self) -> None:
+		"""
+		# Given: a watchdog with a controlled time source and a writer lock held over budget.
+
+		# When: downgrading it once reported, then checking the holds again.
+
+		# Then: the hold is not reported again.
+		"""
+		# ## Arrange
+		c_now = [0.0]
+		c_reports: List[rwlock.LongHold] = []
+		c_watchdog = rwlock.HoldWatchdog(c_reports.append, budget=1, time_source=lambda: c_now[0])
+		c_lock = c_watchdog.wrap(rwlock.RWLockFairD()).gen_wlock()
+		self.assertTrue(c_lock.acquire())
+		c_now[0] = 2
+		c_watchdog.check()
+		# ## Act
+		c_lock_d = c_lock.downgrade()
+		c_now[0] = 3
+		c_watchdog.check()
+		c_lock_d.release()
+		# ## Assert
+		self.assertEqual([(True, 2.0)], [(c_report.is_writer, c_report.duration) for c_report in c_reports])
+		self.assertEqual(set(), c_watchdog.c_holds)
+
+
+class TestLockTracer(unittest.TestCase):
+	"""Test the tracing of the lock events."""
+
+	def test_trace(self) -> None:
+		"""
+		# Given: a traced RW lock written by a thread.
+
+		# When: reading it with a timeout, then without, then writing and downgrading it.
+
+		# Then: the Chrome trace has a slice per wait and per hold, on the track of each thread.
+		"""
+		# ## Arrange
+		c_tracer = rwlock.LockTracer(capacity=64)
+		c_traced = c_tracer.wrap(rwlock.RWLockFairD(), "db")
+		c_locked = threading.Event()
+
+		def writer() -> None:
+			with c_traced.gen_wlock():
+				c_locked.set()
+				time.sleep(0.05)
+		c_thread = threading.Thread(target=writer, name="writer")
+		c_thread.start()
+		c_locked.wait()
+		# ## Act
+		c_lock_r = c_traced.gen_rlock()
+		self.assertFalse(c_lock_r.acquire(timeout=0.01))
+		self.assertTrue(c_lock_r.acquire())
+		c_lock_r.release()
+		c_thread.join()
+		c_lock_w = c_traced.gen_wlock()
+		self.assertTrue(c_lock_w.acquire())
+		c_lock_d = c_lock_w.downgrade()
+		c_lock_d.release()
+		with tempfile.TemporaryDirectory() as c_dir:
+			c_path = os.path.join(c_dir, "trace.json")
+			c_tracer.export(c_path)
+			with open(c_path, encoding="utf-8") as c_file:
+				result = json.load(c_file)
+		# ## Assert
+		c_main = threading.get_ident()
+		c_slices = sorted((c_event["tid"], c_event["name"], *c_event["args"].items()) for c_event in result["traceEvents"] if "X" == c_event["ph"])
+		self.assertEqual(sorted([
+			(c_thread.ident, "wait write db", ("timeout", False)),
+			(c_thread.ident, "hold write db", ("downgraded", False)),
+			(c_main, "wait read db", ("timeout", True)),
+			(c_main, "wait read db", ("timeout", False)),
+			(c_main, "hold read db", ("downgraded", False)),
+			(c_main, "wait write db", ("timeout", False)),
+			(c_main, "hold write db", ("downgraded", True)),
+			(c_main, "hold read db", ("downgraded", False))]), c_slices)
+		c_wait = [c_event for c_event in result["traceEvents"] if "X" == c_event["ph"] and c_event["args"] == {"timeout": False} and "wait read db" == c_event["name"]]
+		self.assertLessEqual(10000, c_wait[0]["dur"])
+		self.assertIn({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": c_main, "args": {"name": threading.current_thread().name}}, result["traceEvents"])
+		self.assertRaises(rwlock.RELEASE_ERR_CLS, c_lock_d.release)
+
+	def test_ring(self) -> None:
+		"""
+		# Given: a tracer keeping the last 5 events.
+
+		# When: more events are recorded.
+
+		# Then: only the slices fully within the last events are exported, the default name identifies the lock.
+		"""
+		# ## Arrange
+		c_tracer = rwlock.LockTracer(capacity=5)
+		c_traced = c_tracer.wrap(rwlock.RWLockRead())
+		self.assertRaises(ValueError, rwlock.LockTracer, 0)
+		# ## Act
+		for _ in range(10):
+			with c_traced.gen_wlock():
+				pass
+		result = c_tracer.trace()
+		# ## Assert
+		self.assertEqual(["hold write RWLockRead#0", "wait write RWLockRead#0", "hold write RWLockRead#0"], [c_event["name"] for c_event in result["traceEvents"] if "X" == c_event["ph"]])
+		self.assertEqual(result, c_tracer.trace())
+
+	def test_in_flight(self) -> None:
+		"""
+		# Given: a tracer which recorded a write hold.
+
+		# When: exporting while the release event is being written, then once it is published.
+
+		# Then: the slot being written is skipped, then the hold is exported.
+		"""
+		# ## Arrange
+		c_tracer = rwlock.LockTracer(capacity=8)
+		c_traced = c_tracer.wrap(rwlock.RWLockRead(), "db")
+		with c_traced.gen_wlock():
+			pass
+		c_kind = c_tracer.c_kinds[2]
+		c_tracer.c_kinds[2] = rwlock._TRACE_NONE
+		# ## Act
+		result = [c_tracer.trace()]
+		c_tracer.c_kinds[2] = c_kind
+		result.append(c_tracer.trace())
+		# ## Assert
+		self.assertEqual([["wait write db"], ["wait write db", "hold write db"]], [[c_event["name"] for c_event in c_trace["traceEvents"] if "X" == c_event["ph"]] for c_trace in result])
+
+	def test_without_gil(self) -> None:
+		"""
+		# Given: a traced RW lock used as on a free-threaded build running without the GIL.
+
+		# When: reader threads hammer it.
+
+		# Then: each event gets its own slot, no hold is lost.
+		"""
+		# ## Arrange
+		self.addCleanup(setattr, rwlock, "_GIL_ENABLED", rwlock._GIL_ENABLED)
+		rwlock._GIL_ENABLED = False
+		c_tracer = rwlock.LockTracer()
+		c_traced = c_tracer.wrap(rwlock.RWLockRead())
+
+		def reader() -> None:
+			c_lock = c_traced.gen_rlock()
+			for _ in range(200):
+				with c_lock:
+					pass
+		c_threads = [threading.Thread(target=reader) for _ in range(4)]
+		# ## Act
+		for c_thread in c_threads:
+			c_thread.start()
+		for c_thread in c_threads:
+			c_thread.join()
+		result = c_tracer.trace()
+		# ## Assert
+		self.assertEqual(800, sum("hold read RWLockRead#0" == c_event["name"] for c_event in result["traceEvents"]))
+
+
 if "__main__" == __name__:
 	unittest.main(failfast=False)  # pragma: no cover
@@ -4,12 +4,16 @@
 """Unit tests for rwlock_async."""
 
 import unittest
+import unittest.mock
 import sys
 import time
 import asyncio
 
 from typing import Any
+from typing import Callable
 from typing import cast
+from typing import List
+from typing import Tuple
 from typing import Union
 
 from readerwriterlock import rwlock_async
@@ -20,8 +24,10 @@ class TestRWLock_Async(unittest.TestCase):
 
 	def setUp(self) -> None:
 		"""Test setup."""
-		self.c_rwlock_type_downgradable = (rwlock_async.RWLockReadD, rwlock_async.RWLockWriteD, rwlock_async.RWLockFairD)
-		self.c_rwlock_type = (rwlock_async.RWLockRead, rwlock_async.RWLockWrite, rwlock_async.RWLockFair) + self.c_rwlock_type_downgradable
+		self.c_rwlock_type_downgradable = (rwlock_async.RWLockReadD, rwlock_async.RWLockWriteD, rwlock_async.RWLockFairD, rwlock_async.RWLockFairM, rwlock_async.RWLockFairU, rwlock_async.RWLockFairS, rwlock_async.RWLockPhaseFair)
+		self.c_rwlock_type_reentrant = (rwlock_async.RWLockFairR,)
+		self.c_rwlock_type = (rwlock_async.RWLockRead, rwlock_async.RWLockWrite, rwlock_async.RWLockFair) + self.c_rwlock_type_downgradable + self.c_rwlock_type_reentrant
+		self.c_rwlock_type_short = self.c_rwlock_type[6:]  # One per engine family added later, their targeted tests cover the other variants.
 
 	def test_multi_async(self) -> None:
 		"""
@@ -32,7 +38,8 @@ class TestRWLock_Async(unittest.TestCase):
 		# Then: the locks shall not deadlock.
 		"""
 		s_period_sec: int = 30
-		print(f"\ntest_MultiThread {s_period_sec * len(self.c_rwlock_type)} sec…", flush=True)
+		s_period_sec_short: int = 5
+		print(f"\ntest_MultiThread {s_period_sec * (len(self.c_rwlock_type) - len(self.c_rwlock_type_short)) + s_period_sec_short * len(self.c_rwlock_type_short)} sec…", flush=True)
 		exception_occured: bool = False
 
 		async def test_it() -> None:
@@ -41,6 +48,7 @@ class TestRWLock_Async(unittest.TestCase):
 					print(f"    {c_curr_lock_type} …", end="", flush=True)
 					c_curr_rw_lock: Union[rwlock_async.RWLockable, rwlock_async.RWLockableD] = c_curr_lock_type()
 					v_value: int = 0
+					c_period_sec: int = s_period_sec_short if c_curr_lock_type in self.c_rwlock_type_short else s_period_sec
 
 					async def downgrader1() -> None:
 						"""Downgrader using a blocking acquire strategy."""
@@ -48,7 +56,7 @@ class TestRWLock_Async(unittest.TestCase):
 						try:
 							nonlocal v_value
 							c_enter_time: float = time.time()
-							while time.time() - c_enter_time <= s_period_sec:
+							while time.time() - c_enter_time <= c_period_sec:
 								c_lock_w1: Union[rwlock_async.Lockable, rwlock_async.LockableD] = await c_curr_rw_lock.gen_wlock()
 								self.assertIsInstance(obj=c_lock_w1, cls=rwlock_async.LockableD, msg=type(c_lock_w1))
 
@@ -85,7 +93,7 @@ class TestRWLock_Async(unittest.TestCase):
 							nonlocal v_value
 							c_enter_time: float = time.time()
 							c_lock_w1 = await c_curr_rw_lock.gen_wlock()
-							while time.time() - c_enter_time <= s_period_sec:
+							while time.time() - c_enter_time <= c_period_sec:
 								await asyncio.sleep(sys.float_info.min)
 								async with c_lock_w1:
 									v_temp = v_value
@@ -103,7 +111,7 @@ class TestRWLock_Async(unittest.TestCase):
 							nonlocal v_value
 							c_enter_time: float = time.time()
 							c_lock_w1 = await c_curr_rw_lock.gen_wlock()
-							while time.time() - c_enter_time <= s_period_sec:
+							while time.time() - c_enter_time <= c_period_sec:
 								await asyncio.sleep(sys.float_info.min)
 								locked: bool
 								try:
@@ -127,7 +135,7 @@ class TestRWLock_Async(unittest.TestCase):
 							nonlocal v_value
 							c_enter_time: float = time.time()
 							c_lock_r1 = await c_curr_rw_lock.gen_rlock()
-							while time.time() - c_enter_time <= s_period_sec:
+							while time.time() - c_enter_time <= c_period_sec:
 								await asyncio.sleep(sys.float_info.min)
 								async with c_lock_r1:
 									vv_value: int = v_value
@@ -144,7 +152,7 @@ class TestRWLock_Async(unittest.TestCase):
 							nonlocal v_value
 							c_enter_time: float = time.time()
 							c_lock_r2 = await c_curr_rw_lock.gen_rlock()
-							while time.time() - c_enter_time <= s_period_sec:
+							while time.time() - c_enter_time <= c_period_sec:
 								await asyncio.sleep(sys.float_info.min)
 								locked: bool = False
 								try:
@@ -180,7 +188,7 @@ class TestRWLockSpecificCase(unittest.TestCase):
 
 	def setUp(self) -> None:
 		"""Test setup."""
-		self.c_rwlock_type_downgradable = (rwlock_async.RWLockWriteD, rwlock_async.RWLockFairD, rwlock_async.RWLockReadD)
+		self.c_rwlock_type_downgradable = (rwlock_async.RWLockWriteD, rwlock_async.RWLockFairD, rwlock_async.RWLockReadD, rwlock_async.RWLockReadM, rwlock_async.RWLockWriteM, rwlock_async.RWLockFairM, rwlock_async.RWLockReadU, rwlock_async.RWLockWriteU, rwlock_async.RWLockFairU, rwlock_async.RWLockReadS, rwlock_async.RWLockWriteS, rwlock_async.RWLockFairS, rwlock_async.RWLockPhaseFair)
 		self.c_rwlock_type = (rwlock_async.RWLockRead, rwlock_async.RWLockWrite, rwlock_async.RWLockFair) + self.c_rwlock_type_downgradable
 
 	def test_write_req00(self) -> None:
@@ -577,9 +585,10 @@ class TestWhiteBoxRWLockReadD(unittest.TestCase):
 		async def test_it() -> None:
 
 			def assert_internal_state() -> None:
-				self.assertEqual(int(c_rwlock_1.v_read_count), int(c_rwlock_2.v_read_count))
-				self.assertEqual(c_rwlock_1.c_resource.locked(), c_rwlock_2.c_resource.locked())
-				self.assertEqual(c_rwlock_1.c_lock_read_count.locked(), c_rwlock_2.c_lock_read_count.locked())
+				self.assertEqual(c_rwlock_1.v_read_count, c_rwlock_2.v_read_count)
+				self.assertEqual(c_rwlock_1.v_read_waiting, c_rwlock_2.v_read_waiting)
+				self.assertEqual(c_rwlock_1.v_write_count, c_rwlock_2.v_write_count)
+				self.assertEqual(c_rwlock_1.c_lock_state.locked(), c_rwlock_2.c_lock_state.locked())
 
 			# ## Assume
 			assert_internal_state()
@@ -683,5 +692,1010 @@ class TestWhiteBoxRWLockReadD(unittest.TestCase):
 		eloop.run_until_complete(test_it())
 
 
+class TestRWLockM(unittest.TestCase):
+	"""Test the event loop native engine specificity."""
+
+	def setUp(self) -> None:
+		"""Test setup."""
+		self.c_rwlock_type = (rwlock_async.RWLockReadM, rwlock_async.RWLockWriteM, rwlock_async.RWLockFairM)
+
+	def test_uncontended_does_not_suspend(self) -> None:
+		"""
+		# Given: an unlocked RW lock.
+
+		# When: acquiring and releasing a reader lock and a writer lock.
+
+		# Then: the awaitables are already completed, awaiting them never suspends.
+		"""
+		async def test_it() -> None:
+			for current_rw_lock_type in self.c_rwlock_type:
+				with self.subTest(current_rw_lock_type):
+					# ## Arrange
+					current_rw_lock = current_rw_lock_type()
+					for current_lock in (await current_rw_lock.gen_rlock(), await current_rw_lock.gen_wlock()):
+						# ## Act
+						for c_awaitable, c_expected in ((current_lock.acquire(), True), (current_lock.release(), None)):
+							# ## Assert
+							with self.assertRaises(StopIteration) as c_stop:
+								c_awaitable.__await__().send(None)
+							self.assertEqual(c_expected, c_stop.exception.value)
+		eloop = asyncio.get_event_loop()
+		eloop.run_until_complete(test_it())
+
+	def test_timeout_leaves_fifo(self) -> None:
+		"""
+		# Given: a RW lock locked by a writer.
+
+		# When: a reader and a writer time out waiting for it.
+
+		# Then: no waiter is left behind in the FIFO.
+		"""
+		eloop = asyncio.get_event_loop()
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				async def test_it() -> None:
+					# ## Arrange
+					current_rw_lock = current_rw_lock_type()
+					async with await current_rw_lock.gen_wlock():
+						# ## Act
+						result = await asyncio.gather((await current_rw_lock.gen_rlock()).acquire(timeout=0.1), (await current_rw_lock.gen_wlock()).acquire(timeout=0.1))
+						# ## Assert
+						self.assertEqual([False, False], result)
+						self.assertEqual(0, len(current_rw_lock.c_read_waiters) + len(current_rw_lock.c_write_waiters))
+						self.assertEqual(0, current_rw_lock.v_read_waiting)
+						self.assertEqual(0, current_rw_lock.v_write_waiting)
+					self.assertEqual(0, current_rw_lock.v_write_count)
+				eloop.run_until_complete(test_it())
+
+	def test_cancel_while_waiting(self) -> None:
+		"""
+		# Given: a RW lock locked by a writer and a waiting writer.
+
+		# When: the waiting task is cancelled.
+
+		# Then: the lock is not leaked and remains usable.
+		"""
+		eloop = asyncio.get_event_loop()
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				async def test_it() -> None:
+					# ## Arrange
+					current_rw_lock = current_rw_lock_type()
+					current_lock = await current_rw_lock.gen_wlock()
+					await current_lock.acquire()
+					c_task = asyncio.ensure_future((await current_rw_lock.gen_wlock()).acquire())
+					await asyncio.sleep(0)
+					# ## Act
+					await current_lock.release()  # Hands the lock over to the waiting task…
+					c_task.cancel()  # … which is cancelled before it could resume.
+					with self.assertRaises(asyncio.CancelledError):
+						await c_task
+					# ## Assert
+					self.assertEqual(0, current_rw_lock.v_write_count)
+					self.assertEqual(0, len(current_rw_lock.c_read_waiters) + len(current_rw_lock.c_write_waiters))
+					self.assertTrue(await current_lock.acquire(blocking=False))
+					await current_lock.release()
+				eloop.run_until_complete(test_it())
+
+	def test_timeout_after_cancel(self) -> None:
+		"""
+		# Given: a RW lock locked by a writer and a waiting writer with a timeout.
+
+		# When: the waiting task is cancelled and its timeout fires before it could resume.
+
+		# Then: the timeout leaves the cancelled waiter alone and the lock remains usable.
+		"""
+		eloop = asyncio.get_event_loop()
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				async def test_it() -> None:
+					# ## Arrange
+					current_rw_lock = current_rw_lock_type()
+					current_lock = await current_rw_lock.gen_wlock()
+					await current_lock.acquire()
+					c_task = asyncio.ensure_future((await current_rw_lock.gen_wlock()).acquire(timeout=5))
+					await asyncio.sleep(0)
+					c_waiter = current_rw_lock.c_write_waiters[0]
+					# ## Act
+					c_task.cancel()
+					current_rw_lock._timeout(c_waiter)
+					with self.assertRaises(asyncio.CancelledError):
+						await c_task
+					# ## Assert
+					self.assertEqual(0, current_rw_lock.v_write_waiting)
+					await current_lock.release()
+					self.assertTrue(await current_lock.acquire(blocking=False))
+					await current_lock.release()
+				eloop.run_until_complete(test_it())
+
+	def test_fair_fifo(self) -> None:
+		"""
+		# Given: a RWLockFairM locked by a reader.
+
+		# When: a writer then a reader wait for the lock.
+
+		# Then: the lock is handed over in arrival order.
+		"""
+		eloop = asyncio.get_event_loop()
+
+		async def test_it() -> None:
+			# ## Arrange
+			current_rw_lock = rwlock_async.RWLockFairM()
+			c_order: List[str] = []
+
+			async def waiter(p_name: str, p_lock: rwlock_async.Lockable) -> None:
+				async with p_lock:
+					c_order.append(p_name)
+					await asyncio.sleep(0.01)
+
+			current_lock = await current_rw_lock.gen_rlock()
+			await current_lock.acquire()
+			c_tasks = [asyncio.ensure_future(waiter("writer", await current_rw_lock.gen_wlock())), asyncio.ensure_future(waiter("reader", await current_rw_lock.gen_rlock()))]
+			await asyncio.sleep(0)
+			# ## Act
+			await current_lock.release()
+			await asyncio.gather(*c_tasks)
+			# ## Assert
+			self.assertEqual(["writer", "reader"], c_order)
+		eloop.run_until_complete(test_it())
+
+
+class TestWhiteBoxRWLockPhaseFair(unittest.TestCase):
+	"""Test RWLockPhaseFair internal specifity."""
+
+	def test_phases(self) -> None:
+		"""
+		# Given: Instance of RWLockPhaseFair locked by a writer, with readers then a writer waiting for it.
+
+		# When: The writer releases the lock while another reader comes in.
+
+		# Then: The waiting readers are admitted together, the late reader waits for the next write phase.
+		"""
+		eloop = asyncio.get_event_loop()
+
+		async def test_it() -> None:
+			# ## Arrange
+			c_rwlock = rwlock_async.RWLockPhaseFair()
+			c_lock_w1 = await c_rwlock.gen_wlock()
+			c_lock_w2 = await c_rwlock.gen_wlock()
+			c_locks_r = [await c_rwlock.gen_rlock() for _ in range(3)]
+			await c_lock_w1.acquire()
+			c_tasks = [asyncio.ensure_future(c_lock.acquire()) for c_lock in c_locks_r[:2]]
+			await asyncio.sleep(0)
+			c_task_w2 = asyncio.ensure_future(c_lock_w2.acquire())
+			await asyncio.sleep(0)
+			# ## Act
+			await c_lock_w1.release()
+			await asyncio.gather(*c_tasks)
+			# ## Assert
+			self.assertEqual(2, c_rwlock.v_read_count)
+			self.assertFalse(c_lock_w2.locked())
+			self.assertFalse(await c_locks_r[2].acquire(blocking=False))
+			c_task_r3 = asyncio.ensure_future(c_locks_r[2].acquire())
+			await asyncio.sleep(0)
+			for c_lock in c_locks_r[:2]:
+				await c_lock.release()
+			await c_task_w2
+			self.assertTrue(c_lock_w2.locked())
+			self.assertFalse(c_locks_r[2].locked())
+			await c_lock_w2.release()
+			await c_task_r3
+			self.assertTrue(c_locks_r[2].locked())
+			await c_locks_r[2].release()
+			self.assertEqual(0, len(c_rwlock.c_read_waiters) + len(c_rwlock.c_write_waiters) + c_rwlock.v_read_count + c_rwlock.v_write_count)
+		eloop.run_until_complete(test_it())
+
+
+class TestRWLockReentrant(unittest.TestCase):
+	"""Test reentrant RW Locks specificity."""
+
+	def setUp(self) -> None:
+		"""Test setup."""
+		self.c_rwlock_type = (rwlock_async.RWLockReadR, rwlock_async.RWLockWriteR, rwlock_async.RWLockFairR)
+
+	async def try_acquire_in_task(self, p_lock: rwlock_async.Lockable) -> bool:
+		"""Try to acquire (non blocking) the given lock from another task, release it if successful."""
+		async def target() -> bool:
+			result = await p_lock.acquire(blocking=False)
+			if result:
+				await p_lock.release()
+			return result
+		return await asyncio.ensure_future(target())
+
+	def test_nested(self) -> None:
+		"""
+		# Given: a reentrant RW lock.
+
+		# When: a task nests read in read, read in write and write in write.
+
+		# Then: every nested acquire succeeds and other tasks remain excluded until the outermost release.
+		"""
+		eloop = asyncio.get_event_loop()
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				async def test_it() -> None:
+					# ## Arrange
+					current_rw_lock = current_rw_lock_type()
+					# ## Act
+					async with await current_rw_lock.gen_rlock():
+						async with await current_rw_lock.gen_rlock():
+							# ## Assert
+							self.assertTrue(await self.try_acquire_in_task(await current_rw_lock.gen_rlock()))
+							self.assertFalse(await self.try_acquire_in_task(await current_rw_lock.gen_wlock()))
+					async with await current_rw_lock.gen_wlock():
+						async with await current_rw_lock.gen_wlock():
+							async with await current_rw_lock.gen_rlock():
+								self.assertFalse(await self.try_acquire_in_task(await current_rw_lock.gen_rlock()))
+						self.assertFalse(await self.try_acquire_in_task(await current_rw_lock.gen_wlock()))
+					self.assertTrue(await self.try_acquire_in_task(await current_rw_lock.gen_wlock()))
+					self.assertEqual({}, current_rw_lock.c_states)
+				eloop.run_until_complete(test_it())
+
+	def test_release_writer_while_reading(self) -> None:
+		"""
+		# Given: a reentrant RW lock locked by a writer and a nested reader.
+
+		# When: the writer lock is released first.
+
+		# Then: the task is left holding a reader lock.
+		"""
+		eloop = asyncio.get_event_loop()
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				async def test_it() -> None:
+					# ## Arrange
+					current_rw_lock = current_rw_lock_type()
+					c_lock_w = await current_rw_lock.gen_wlock()
+					c_lock_r = await current_rw_lock.gen_rlock()
+					await c_lock_w.acquire()
+					await c_lock_r.acquire()
+					# ## Act
+					await c_lock_w.release()
+					# ## Assert
+					self.assertTrue(await self.try_acquire_in_task(await current_rw_lock.gen_rlock()))
+					self.assertFalse(await self.try_acquire_in_task(await current_rw_lock.gen_wlock()))
+					await c_lock_r.release()
+					self.assertTrue(await self.try_acquire_in_task(await current_rw_lock.gen_wlock()))
+					self.assertEqual({}, current_rw_lock.c_states)
+				eloop.run_until_complete(test_it())
+
+	def test_write_in_read(self) -> None:
+		"""
+		# Given: a reentrant RW lock locked by a reader.
+
+		# When: the same task requests a writer lock.
+
+		# Then: it is refused instead of deadlocking.
+		"""
+		eloop = asyncio.get_event_loop()
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				async def test_it() -> None:
+					# ## Arrange
+					current_rw_lock = current_rw_lock_type()
+					async with await current_rw_lock.gen_rlock():
+						# ## Act
+						# ## Assert
+						with self.assertRaises(RuntimeError):
+							await (await current_rw_lock.gen_wlock()).acquire()
+					self.assertTrue(await self.try_acquire_in_task(await current_rw_lock.gen_wlock()))
+				eloop.run_until_complete(test_it())
+
+	def test_release_from_other_task(self) -> None:
+		"""
+		# Given: a reentrant RW lock locked by a task.
+
+		# When: another task releases it.
+
+		# Then: the release is refused.
+		"""
+		eloop = asyncio.get_event_loop()
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				async def test_it() -> None:
+					# ## Arrange
+					current_rw_lock = current_rw_lock_type()
+					for c_lock in (await current_rw_lock.gen_rlock(), await current_rw_lock.gen_wlock()):
+						await c_lock.acquire()
+						# ## Act
+						with self.assertRaises(rwlock_async.RELEASE_ERR_CLS):
+							await asyncio.ensure_future(c_lock.release())
+						# ## Assert
+						self.assertTrue(c_lock.locked())
+						await c_lock.release()
+						self.assertFalse(c_lock.locked())
+				eloop.run_until_complete(test_it())
+
+
+class TestRWLockUpgradable(unittest.TestCase):
+	"""Test upgradable RW Locks specificity."""
+
+	def setUp(self) -> None:
+		"""Test setup."""
+		self.c_rwlock_type = (rwlock_async.RWLockReadU, rwlock_async.RWLockWriteU, rwlock_async.RWLockFairU)
+
+	def test_exclusion(self) -> None:
+		"""
+		# Given: an upgradable RW lock locked by an upgradable reader.
+
+		# When: other lock requests are made.
+
+		# Then: readers get in while writers and other upgradable readers do not.
+		"""
+		eloop = asyncio.get_event_loop()
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				async def test_it() -> None:
+					# ## Arrange
+					current_rw_lock = current_rw_lock_type()
+					async with await current_rw_lock.gen_ulock():
+						# ## Act
+						# ## Assert
+						async with await current_rw_lock.gen_rlock():
+							self.assertFalse(await (await current_rw_lock.gen_wlock()).acquire(blocking=False))
+							self.assertFalse(await (await current_rw_lock.gen_ulock()).acquire(blocking=False))
+							self.assertFalse(await (await current_rw_lock.gen_ulock()).acquire(blocking=True, timeout=0.01))
+					async with await current_rw_lock.gen_wlock():
+						self.assertFalse(await (await current_rw_lock.gen_ulock()).acquire(blocking=False))
+					self.assertIsInstance(await current_rw_lock.gen_ulock(), rwlock_async.LockableU)
+				eloop.run_until_complete(test_it())
+
+	def test_upgrade(self) -> None:
+		"""
+		# Given: an upgradable RW lock locked by an upgradable reader and a reader, and a writer waiting for it.
+
+		# When: upgrading.
+
+		# Then: the upgrade waits for the reader and gets the lock before the waiting writer.
+		"""
+		eloop = asyncio.get_event_loop()
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				async def test_it() -> None:
+					# ## Arrange
+					current_rw_lock = current_rw_lock_type()
+					c_order: List[str] = []
+					c_lock_u = await current_rw_lock.gen_ulock()
+					c_lock_r = await current_rw_lock.gen_rlock()
+					await c_lock_u.acquire()
+					await c_lock_r.acquire()
+
+					async def writer() -> None:
+						async with await current_rw_lock.gen_wlock():
+							c_order.append("writer")
+
+					async def reader() -> None:
+						await asyncio.sleep(0.1)
+						c_order.append("reader")
+						await c_lock_r.release()
+					c_tasks = [asyncio.ensure_future(writer()), asyncio.ensure_future(reader())]
+					# ## Act
+					c_lock_w = cast(rwlock_async.LockableD, await c_lock_u.upgrade())
+					c_order.append("upgrade")
+					# ## Assert
+					self.assertFalse(c_lock_u.locked())
+					self.assertTrue(c_lock_w.locked())
+					self.assertFalse(await (await current_rw_lock.gen_rlock()).acquire(blocking=False))
+					await (await c_lock_w.downgrade()).release()
+					await asyncio.gather(*c_tasks)
+					self.assertEqual(["reader", "upgrade", "writer"], c_order)
+					with self.assertRaises(rwlock_async.RELEASE_ERR_CLS):
+						await c_lock_u.upgrade()
+				eloop.run_until_complete(test_it())
+
+	def test_upgrade_timeout(self) -> None:
+		"""
+		# Given: an upgradable RW lock locked by an upgradable reader and a reader which does not release it.
+
+		# When: upgrading without blocking, with a timeout and with a deadline.
+
+		# Then: the upgrade gives up, the upgradable reader lock is still held and the readers are let in again.
+		"""
+		eloop = asyncio.get_event_loop()
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				async def test_it() -> None:
+					# ## Arrange
+					current_rw_lock = current_rw_lock_type()
+					c_lock_u = await current_rw_lock.gen_ulock()
+					c_lock_r = await current_rw_lock.gen_rlock()
+					await c_lock_u.acquire()
+					await c_lock_r.acquire()
+					# ## Act
+					c_start = time.perf_counter()
+					result = [await c_lock_u.upgrade(blocking=False), await c_lock_u.upgrade(timeout=0.05), await c_lock_u.upgrade(deadline=time.perf_counter() + 0.05)]
+					# ## Assert
+					self.assertEqual([None, None, None], result)
+					self.assertLessEqual(0.09, time.perf_counter() - c_start)
+					self.assertTrue(c_lock_u.locked())
+					c_lock_r2 = await current_rw_lock.gen_rlock()
+					self.assertTrue(await c_lock_r2.acquire(blocking=False))
+					await c_lock_r2.release()
+					self.assertFalse(await (await current_rw_lock.gen_wlock()).acquire(blocking=False))
+					await c_lock_r.release()
+					c_lock_w = await c_lock_u.upgrade(timeout=1)
+					self.assertIsNotNone(c_lock_w)
+					await cast(rwlock_async.LockableD, c_lock_w).release()
+				eloop.run_until_complete(test_it())
+
+	def test_upgrade_starvation(self) -> None:
+		"""
+		# Given: a RWLockReadU locked by an upgradable reader, with reader tasks keeping overlapping reader locks.
+
+		# When: upgrading.
+
+		# Then: the new readers wait for the upgrade which gets the lock once the current readers drained.
+		"""
+		eloop = asyncio.get_event_loop()
+
+		async def test_it() -> None:
+			# ## Arrange
+			current_rw_lock = rwlock_async.RWLockReadU()
+			c_lock_u = await current_rw_lock.gen_ulock()
+			await c_lock_u.acquire()
+			c_end = time.perf_counter() + 5
+
+			async def reader() -> None:
+				c_lock_r = await current_rw_lock.gen_rlock()
+				while time.perf_counter() < c_end:
+					async with c_lock_r:
+						await asyncio.sleep(0.005)
+			c_tasks = [asyncio.ensure_future(reader()) for _ in range(4)]
+			await asyncio.sleep(0.05)
+			# ## Act
+			c_lock_w = await c_lock_u.upgrade(timeout=2)
+			# ## Assert
+			self.assertIsNotNone(c_lock_w)
+			await cast(rwlock_async.LockableD, c_lock_w).release()
+			c_end = time.perf_counter()
+			await asyncio.gather(*c_tasks)
+		eloop.run_until_complete(test_it())
+
+
+class TestRWLockOptimistic(unittest.TestCase):
+	"""Test optimistic read RW Locks specificity."""
+
+	def setUp(self) -> None:
+		"""Test setup."""
+		self.c_rwlock_type = (rwlock_async.RWLockReadS, rwlock_async.RWLockWriteS, rwlock_async.RWLockFairS)
+
+	def test_stamp(self) -> None:
+		"""
+		# Given: a RW lock providing optimistic reads.
+
+		# When: stamps are taken around readers and writers.
+
+		# Then: a stamp only remains valid as long as no writer got the lock.
+		"""
+		eloop = asyncio.get_event_loop()
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				async def test_it() -> None:
+					# ## Arrange
+					current_rw_lock = current_rw_lock_type()
+					# ## Act
+					c_stamp = current_rw_lock.try_optimistic_read()
+					# ## Assert
+					self.assertNotEqual(0, c_stamp)
+					async with await current_rw_lock.gen_rlock():
+						self.assertEqual(c_stamp, current_rw_lock.try_optimistic_read())
+					self.assertTrue(current_rw_lock.validate(c_stamp))
+					async with await current_rw_lock.gen_wlock():
+						self.assertEqual(0, current_rw_lock.try_optimistic_read())
+						self.assertFalse(current_rw_lock.validate(0))
+					self.assertFalse(current_rw_lock.validate(c_stamp))
+					c_stamp = current_rw_lock.try_optimistic_read()
+					c_lock = await current_rw_lock.gen_wlock()
+					await c_lock.acquire()
+					await (await c_lock.downgrade()).release()
+					self.assertFalse(current_rw_lock.validate(c_stamp))
+					self.assertNotEqual(0, current_rw_lock.try_optimistic_read())
+				eloop.run_until_complete(test_it())
+
+
+class TestDeadline(unittest.TestCase):
+	"""Test acquiring before an absolute deadline."""
+
+	def setUp(self) -> None:
+		"""Test setup."""
+		self.c_rwlock_type = (rwlock_async.RWLockRead, rwlock_async.RWLockWrite, rwlock_async.RWLockFair, rwlock_async.RWLockReadD, rwlock_async.RWLockWriteD, rwlock_async.RWLockFairD, rwlock_async.RWLockReadM, rwlock_async.RWLockWriteM, rwlock_async.RWLockFairM, rwlock_async.RWLockPhaseFair, rwlock_async.RWLockReadR, rwlock_async.RWLockWriteR, rwlock_async.RWLockFairR, rwlock_async.RWLockReadU, rwlock_async.RWLockWriteU, rwlock_async.RWLockFairU, rwlock_async.RWLockReadS, rwlock_async.RWLockWriteS, rwlock_async.RWLockFairS)
+
+	def test_deadline(self) -> None:
+		"""
+		# Given: a RW lock whose writer lock is held by another task.
+
+		# When: acquiring its reader and writer locks before a deadline.
+
+		# Then: they fail once the deadline is reached, the earliest of the deadline and the timeout applies, and they succeed once the lock is free.
+		"""
+		eloop = asyncio.get_event_loop()
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				async def test_it() -> None:
+					# ## Arrange
+					current_rw_lock = current_rw_lock_type()
+					c_lock: Any
+					c_locked = asyncio.Event()
+					c_done = asyncio.Event()
+
+					async def writer() -> None:
+						async with await current_rw_lock.gen_wlock():
+							c_locked.set()
+							await c_done.wait()
+					c_task = asyncio.ensure_future(writer())
+					await c_locked.wait()
+					for c_lock in (await current_rw_lock.gen_rlock(), await current_rw_lock.gen_wlock()):
+						# ## Act
+						c_deadline = time.perf_counter() + 0.05
+						result = await c_lock.acquire(deadline=c_deadline)
+						# ## Assert
+						self.assertFalse(result)
+						self.assertLessEqual(c_deadline - 0.01, time.perf_counter())
+						c_start = time.perf_counter()
+						self.assertFalse(await c_lock.acquire(timeout=5, deadline=c_start - 1))
+						self.assertFalse(await c_lock.acquire(blocking=False, deadline=c_start + 5))
+						self.assertFalse(await c_lock.acquire(timeout=0.01, deadline=c_start + 5))
+						self.assertGreater(1, time.perf_counter() - c_start)
+						self.assertFalse(c_lock.locked())
+					c_done.set()
+					await c_task
+					for c_lock in (await current_rw_lock.gen_rlock(), await current_rw_lock.gen_wlock()):
+						self.assertTrue(await c_lock.acquire(deadline=time.perf_counter() + 5))
+						await c_lock.release()
+				eloop.run_until_complete(test_it())
+
+	def test_nested(self) -> None:
+		"""
+		# Given: two RW locks, the second one being held by another task.
+
+		# When: acquiring both of them before the same deadline.
+
+		# Then: the first one is acquired and the whole acquisition gives up at the deadline.
+		"""
+		eloop = asyncio.get_event_loop()
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				async def test_it() -> None:
+					# ## Arrange
+					current_rw_lock_outer = current_rw_lock_type()
+					current_rw_lock_inner = current_rw_lock_type()
+					c_locked = asyncio.Event()
+					c_done = asyncio.Event()
+
+					async def reader() -> None:
+						async with await current_rw_lock_inner.gen_rlock():
+							c_locked.set()
+							await c_done.wait()
+					c_task = asyncio.ensure_future(reader())
+					await c_locked.wait()
+					c_lock_outer: Any = await current_rw_lock_outer.gen_rlock()
+					c_lock_inner: Any = await current_rw_lock_inner.gen_wlock()
+					c_deadline = time.perf_counter() + 0.05
+					# ## Act
+					result = [await c_lock_outer.acquire(deadline=c_deadline), await c_lock_inner.acquire(deadline=c_deadline)]
+					# ## Assert
+					self.assertEqual([True, False], result)
+					self.assertLessEqual(c_deadline - 0.01, time.perf_counter())
+					self.assertGreater(c_deadline + 1, time.perf_counter())
+					await c_lock_outer.release()
+					c_done.set()
+					await c_task
+				eloop.run_until_complete(test_it())
+
+	def test_clock(self) -> None:
+		"""
+		# Given: a RW lock with a time source counting its calls.
+
+		# When: acquiring its free reader and writer locks with a timeout, with or without a deadline.
+
+		# Then: the clock is never read nor asyncio.wait_for() used, only a lock request about to block needs them.
+		"""
+		eloop = asyncio.get_event_loop()
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				async def test_it() -> None:
+					# ## Arrange
+					c_reads = [0]
+
+					def time_source() -> float:
+						c_reads[0] += 1
+						return time.perf_counter()
+					current_rw_lock = current_rw_lock_type(time_source=time_source)
+					c_lock: Any
+					for c_lock in (await current_rw_lock.gen_rlock(), await current_rw_lock.gen_wlock()):
+						for c_deadline in (None, time.perf_counter() + 5):
+							# ## Act
+							with unittest.mock.patch("asyncio.wait_for", side_effect=AssertionError):
+								result = await c_lock.acquire(timeout=1, deadline=c_deadline)
+							await c_lock.release()
+							# ## Assert
+							self.assertTrue(result)
+							self.assertEqual([0], c_reads)
+				eloop.run_until_complete(test_it())
+
+	def test_handoff(self) -> None:
+		"""
+		# Given: an asyncio.Lock released to a waiting task which did not run yet, it is thus not locked().
+
+		# When: acquiring it before a deadline, then acquiring a free lock before a deadline.
+
+		# Then: the acquisition gives up at the deadline instead of queuing behind the waiter, the free lock is taken without reading the clock.
+		"""
+		eloop = asyncio.get_event_loop()
+
+		async def test_it() -> None:
+			# ## Arrange
+			c_lock = asyncio.Lock()
+			await c_lock.acquire()
+			c_done = asyncio.Event()
+
+			async def waiter() -> None:
+				async with c_lock:
+					await c_done.wait()
+			c_task = asyncio.ensure_future(waiter())
+			await asyncio.sleep(0)
+			eloop.call_later(0.2, c_done.set)  # Fails instead of hanging when queued behind the waiter.
+			c_lock.release()
+			self.assertFalse(c_lock.locked())
+			c_deadline = time.perf_counter() + 0.05
+			# ## Act
+			result = [await rwlock_async._acquire_before(c_lock, c_deadline, time.perf_counter)]
+			c_lock_free = asyncio.Lock()
+			result.append(await rwlock_async._acquire_before(c_lock_free, c_deadline, cast(Callable[[], float], None)))
+			# ## Assert
+			self.assertEqual([False, True], result)
+			self.assertLessEqual(c_deadline - 0.01, time.perf_counter())
+			self.assertTrue(c_lock.locked())
+			self.assertTrue(c_lock_free.locked())
+			await c_task
+			self.assertFalse(c_lock.locked())
+		eloop.run_until_complete(test_it())
+
+	def test_other_lock(self) -> None:
+		"""
+		# Given: a RW lock of another package, its acquire only takes blocking and timeout, wrapped by the wrappers of this package.
+
+		# When: acquiring the wrapped locks (or the lock with acquire_all()) before a deadline, while the lock is held then while it is free.
+
+		# Then: the deadline is turned into a timeout: they fail once the deadline is reached and succeed once the lock is free.
+		"""
+		eloop = asyncio.get_event_loop()
+
+		class OtherLock():
+			def __init__(self, p_lock: asyncio.Lock) -> None:
+				self.c_lock = p_lock
+
+			async def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+				if not blocking: return False if self.c_lock.locked() else await self.c_lock.acquire()
+				try:
+					return await asyncio.wait_for(self.c_lock.acquire(), None if timeout < 0 else timeout)
+				except asyncio.TimeoutError:
+					return False
+
+			async def release(self) -> None:
+				self.c_lock.release()
+
+			def locked(self) -> bool:
+				return self.c_lock.locked()
+
+		class OtherRWLock():
+			def __init__(self) -> None:
+				self.c_lock = asyncio.Lock()
+
+			async def gen_rlock(self) -> OtherLock:
+				return OtherLock(self.c_lock)
+
+			async def gen_wlock(self) -> OtherLock:
+				return OtherLock(self.c_lock)
+
+		async def test_it() -> None:
+			c_other = OtherRWLock()
+			c_wrapped: Tuple[Any, ...] = (rwlock_async.RWLockStats(cast(rwlock_async.RWLockable, c_other)), rwlock_async.LockTracer().wrap(cast(rwlock_async.RWLockable, c_other)))
+			c_table = rwlock_async.RWLockTable(strategy=lambda: cast(rwlock_async.RWLockable, c_other))
+			c_pairs = [(await c_rw_lock.gen_rlock(), await c_rw_lock.gen_wlock()) for c_rw_lock in c_wrapped] + [(await c_table.gen_rlock("a"), await c_table.gen_wlock("a"))]
+			for c_pair in c_pairs:
+				with self.subTest(type(c_pair[0])):
+					for c_lock in c_pair:
+						# ## Arrange
+						await c_other.c_lock.acquire()
+						c_deadline = time.perf_counter() + 0.05
+						# ## Act
+						try:
+							result = [await c_lock.acquire(deadline=c_deadline), await c_lock.acquire(blocking=False, deadline=c_deadline + 5)]
+						finally:
+							c_other.c_lock.release()
+						result.append(await c_lock.acquire(deadline=time.perf_counter() + 5))
+						await c_lock.release()
+						# ## Assert
+						self.assertEqual([False, False, True], result)
+						self.assertLessEqual(c_deadline - 0.01, time.perf_counter())
+						self.assertFalse(c_lock.locked())
+			with self.subTest(rwlock_async.acquire_all):
+				# ## Arrange
+				c_any = cast(rwlock_async.RWLockable, c_other)
+				await c_other.c_lock.acquire()
+				c_deadline = time.perf_counter() + 0.05
+				# ## Act
+				try:
+					result_all = [await rwlock_async.acquire_all([(c_any, "w")], timeout=0.05), await rwlock_async.acquire_all([(c_any, "r")], deadline=c_deadline)]
+				finally:
+					c_other.c_lock.release()
+				c_lock_all = await rwlock_async.acquire_all([(c_any, "r")], deadline=time.perf_counter() + 5)
+				# ## Assert
+				self.assertEqual([None, None], result_all)
+				self.assertLessEqual(c_deadline - 0.01, time.perf_counter())
+				assert c_lock_all is not None
+				await c_lock_all.release()
+				self.assertFalse(c_other.c_lock.locked())
+		eloop.run_until_complete(test_it())
+
+
+class TestSlots(unittest.TestCase):
+	"""Test the memory layout of the locks."""
+
+	def setUp(self) -> None:
+		"""Test setup."""
+		self.c_rwlock_type = (rwlock_async.RWLockRead, rwlock_async.RWLockWrite, rwlock_async.RWLockFair, rwlock_async.RWLockReadR, rwlock_async.RWLockWriteR, rwlock_async.RWLockFairR, rwlock_async.RWLockReadD, rwlock_async.RWLockWriteD, rwlock_async.RWLockFairD, rwlock_async.RWLockReadM, rwlock_async.RWLockWriteM, rwlock_async.RWLockFairM, rwlock_async.RWLockPhaseFair, rwlock_async.RWLockReadU, rwlock_async.RWLockWriteU, rwlock_async.RWLockFairU, rwlock_async.RWLockReadS, rwlock_async.RWLockWriteS, rwlock_async.RWLockFairS)
+
+	def test_slots(self) -> None:
+		"""
+		# Given: a RW lock and its handles.
+
+		# When: looking for their instance dictionary.
+
+		# Then: there is none since all the classes declare their __slots__.
+		"""
+		eloop = asyncio.get_event_loop()
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				async def test_it() -> None:
+					# ## Arrange
+					current_rw_lock = current_rw_lock_type()
+					# ## Act
+					c_objects = (current_rw_lock, await current_rw_lock.gen_rlock(), await current_rw_lock.gen_wlock())
+					# ## Assert
+					for c_object in c_objects:
+						self.assertFalse(hasattr(c_object, "__dict__"), c_object)
+				eloop.run_until_complete(test_it())
+
+
+class TestRWLockTable(unittest.TestCase):
+	"""Test the table of RW locks."""
+
+	def test_keys(self) -> None:
+		"""
+		# Given: a table of RW locks with a key written.
+
+		# When: locking the same key and another key.
+
+		# Then: only the locks of the same key conflict.
+		"""
+		eloop = asyncio.get_event_loop()
+
+		async def test_it() -> None:
+			# ## Arrange
+			current_table = rwlock_async.RWLockTable()
+			c_lock_w = await current_table.gen_wlock("a")
+			self.assertTrue(await c_lock_w.acquire())
+			# ## Act
+			result = [await (await current_table.gen_rlock("a")).acquire(blocking=False), await (await current_table.gen_wlock("a")).acquire(timeout=0.01)]
+			c_lock_b = await current_table.gen_wlock("b")
+			# ## Assert
+			self.assertEqual([False, False], result)
+			self.assertTrue(await c_lock_b.acquire(blocking=False))
+			await c_lock_b.release()
+			await c_lock_w.release()
+			self.assertFalse(c_lock_w.locked())
+			with self.assertRaises(rwlock_async.RELEASE_ERR_CLS):
+				await c_lock_w.release()
+		eloop.run_until_complete(test_it())
+
+	def test_eviction(self) -> None:
+		"""
+		# Given: a table of RW locks.
+
+		# When: its keys are locked, waited for, given up, cancelled and released.
+
+		# Then: the lock of a key lives as long as a handle holds or waits for it, and only then.
+		"""
+		eloop = asyncio.get_event_loop()
+
+		async def test_it() -> None:
+			# ## Arrange
+			current_table = rwlock_async.RWLockTable(strategy=rwlock_async.RWLockFairM)
+			c_lock_r = await current_table.gen_rlock("a")
+			c_lock_w1 = await current_table.gen_wlock("a")
+			c_lock_w2 = await current_table.gen_wlock("a")
+			# ## Act
+			self.assertTrue(await c_lock_r.acquire())
+			c_task_w1 = asyncio.ensure_future(c_lock_w1.acquire())
+			c_task_w2 = asyncio.ensure_future(c_lock_w2.acquire())
+			await asyncio.sleep(0.01)
+			self.assertEqual(3, current_table.c_entries["a"].v_users)
+			c_task_w2.cancel()
+			await asyncio.sleep(0.01)
+			self.assertEqual(2, current_table.c_entries["a"].v_users)
+			await c_lock_r.release()
+			self.assertTrue(await c_task_w1)
+			# ## Assert
+			self.assertEqual(1, current_table.c_entries["a"].v_users)
+			c_lock_r2 = await c_lock_w1.downgrade()
+			self.assertEqual(1, current_table.c_entries["a"].v_users)
+			await c_lock_r2.release()
+			self.assertEqual({}, current_table.c_entries)
+		eloop.run_until_complete(test_it())
+
+
+class TestAcquireAll(unittest.TestCase):
+	"""Test the acquisition of several RW locks at once."""
+
+	def test_order(self) -> None:
+		"""
+		# Given: two tasks writing the same RW locks listed in opposite orders.
+
+		# When: they repeatedly acquire all of them at once.
+
+		# Then: they never deadlock.
+		"""
+		eloop = asyncio.get_event_loop()
+
+		async def test_it() -> None:
+			# ## Arrange
+			c_rw_locks = [rwlock_async.RWLockFair() for _ in range(3)]
+			c_counts: List[int] = [0, 0]
+
+			async def worker(p_index: int) -> None:
+				c_requests = [(c_rw_lock, "w") for c_rw_lock in (c_rw_locks if 0 == p_index else reversed(c_rw_locks))]
+				for _ in range(500):
+					async with await rwlock_async.gen_lock_all(c_requests):
+						c_counts[p_index] += 1
+						await asyncio.sleep(0)
+			# ## Act
+			await asyncio.wait_for(asyncio.gather(worker(0), worker(1)), 30)
+			# ## Assert
+			self.assertEqual([500, 500], c_counts)
+		eloop.run_until_complete(test_it())
+
+	def test_timeout(self) -> None:
+		"""
+		# Given: RW locks A and B, B being written by another task.
+
+		# When: reading A and writing B all at once with a timeout, then cancelling such an acquire.
+
+		# Then: it gives up without keeping any lock, then succeeds once B is free.
+		"""
+		eloop = asyncio.get_event_loop()
+
+		async def test_it() -> None:
+			# ## Arrange
+			c_rw_lock_a, c_rw_lock_b = rwlock_async.RWLockFairM(), rwlock_async.RWLockFairD()
+			c_lock_b = await c_rw_lock_b.gen_wlock()
+			self.assertTrue(await c_lock_b.acquire())
+			c_requests = [(c_rw_lock_a, "r"), (c_rw_lock_b, "w"), (c_rw_lock_a, "r")]
+			# ## Act
+			result = await rwlock_async.acquire_all(c_requests, timeout=0.05)
+			c_task = asyncio.ensure_future(rwlock_async.acquire_all(c_requests))
+			await asyncio.sleep(0.01)
+			c_task.cancel()
+			with self.assertRaises(asyncio.CancelledError):
+				await c_task
+			# ## Assert
+			self.assertIsNone(result)
+			c_lock_a = await c_rw_lock_a.gen_wlock()
+			self.assertTrue(await c_lock_a.acquire(blocking=False))
+			await c_lock_a.release()
+			await c_lock_b.release()
+			c_lock_all = await rwlock_async.acquire_all(c_requests, timeout=5)
+			assert c_lock_all is not None
+			self.assertEqual(2, len(c_lock_all.c_locks))
+			c_lock_r = await c_lock_all.downgrade()
+			self.assertTrue(await (await c_rw_lock_b.gen_rlock()).acquire(blocking=False))
+			await c_lock_r.release()
+			with self.assertRaises(ValueError):
+				await rwlock_async.gen_lock_all([(c_rw_lock_a, "x")])
+		eloop.run_until_complete(test_it())
+
+
+class TestRWLockStats(unittest.TestCase):
+	"""Test the statistics of the lock requests."""
+
+	def test_stats(self) -> None:
+		"""
+		# Given: a RW lock keeping statistics with a controlled time source.
+
+		# When: writing it for 1us, failing to read it, reading it after a 2ms wait, then downgrading a writer lock.
+
+		# Then: the counters and the histograms (bucket i: [2 ** (i - 1), 2 ** i) ns) reflect it.
+		"""
+		eloop = asyncio.get_event_loop()
+
+		async def test_it() -> None:
+			for c_rw_lock_type in (rwlock_async.RWLockFairD, rwlock_async.RWLockWriteM):
+				with self.subTest(c_rw_lock_type):
+					# ## Arrange
+					c_now = [0.0]
+					c_rw_lock = rwlock_async.RWLockStats(c_rw_lock_type(), time_source=lambda: c_now[0])
+					c_lock_w = await c_rw_lock.gen_wlock()
+					c_lock_r = await c_rw_lock.gen_rlock()
+					# ## Act
+					self.assertTrue(await c_lock_w.acquire())
+					c_now[0] += 0.000001
+					await c_lock_w.release()
+					self.assertTrue(await c_lock_w.acquire())
+					self.assertFalse(await c_lock_r.acquire(blocking=False))
+					c_task = asyncio.ensure_future(c_lock_r.acquire())
+					await asyncio.sleep(0.01)
+					c_now[0] += 0.002
+					await c_lock_w.release()
+					self.assertTrue(await c_task)
+					await c_lock_r.release()
+					self.assertTrue(await c_lock_w.acquire())
+					c_lock_d = await c_lock_w.downgrade()
+					await c_lock_d.release()
+					result = c_rw_lock.stats()
+					# ## Assert
+					c_wait_r, c_hold_r = [0] * 32, [0] * 32
+					c_wait_r[0], c_wait_r[21], c_hold_r[0] = 1, 1, 2
+					c_wait_w, c_hold_w = [0] * 32, [0] * 32
+					c_wait_w[0], c_hold_w[0], c_hold_w[10], c_hold_w[21] = 3, 1, 1, 1
+					self.assertEqual({"acquisitions": 2, "contended": 2, "timeouts": 0, "wait": c_wait_r, "hold": c_hold_r}, result["reader"])
+					self.assertEqual({"acquisitions": 3, "contended": 0, "timeouts": 0, "wait": c_wait_w, "hold": c_hold_w}, result["writer"])
+					with self.assertRaises(rwlock_async.RELEASE_ERR_CLS):
+						await c_lock_w.release()
+		eloop.run_until_complete(test_it())
+
+
+class TestLockTracer(unittest.TestCase):
+	"""Test the tracing of the lock events."""
+
+	def test_trace(self) -> None:
+		"""
+		# Given: a traced RW lock written by a task.
+
+		# When: another task reads it with a timeout, then without, then writes and downgrades it.
+
+		# Then: the Chrome trace has a slice per wait and per hold, on the track of each task.
+		"""
+		eloop = asyncio.get_event_loop()
+
+		async def test_it() -> None:
+			# ## Arrange
+			c_tracer = rwlock_async.LockTracer()
+			c_traced = c_tracer.wrap(rwlock_async.RWLockFairM(), "db")
+			c_lock_w = await c_traced.gen_wlock()
+			self.assertTrue(await c_lock_w.acquire())
+
+			async def reader() -> int:
+				c_lock_r = await c_traced.gen_rlock()
+				self.assertFalse(await c_lock_r.acquire(timeout=0.01))
+				self.assertTrue(await c_lock_r.acquire())
+				await c_lock_r.release()
+				c_lock = await c_traced.gen_wlock()
+				self.assertTrue(await c_lock.acquire())
+				await (await c_lock.downgrade()).release()
+				return id(asyncio.current_task())
+			# ## Act
+			c_task = asyncio.ensure_future(reader())
+			await asyncio.sleep(0.05)
+			await c_lock_w.release()
+			c_reader = await c_task
+			result = c_tracer.trace()
+			# ## Assert
+			c_main = id(asyncio.current_task())
+			c_slices = sorted((c_event["tid"], c_event["name"], *c_event["args"].items()) for c_event in result["traceEvents"] if "X" == c_event["ph"])
+			self.assertEqual(sorted([
+				(c_main, "wait write db", ("timeout", False)),
+				(c_main, "hold write db", ("downgraded", False)),
+				(c_reader, "wait read db", ("timeout", True)),
+				(c_reader, "wait read db", ("timeout", False)),
+				(c_reader, "hold read db", ("downgraded", False)),
+				(c_reader, "wait write db", ("timeout", False)),
+				(c_reader, "hold write db", ("downgraded", True)),
+				(c_reader, "hold read db", ("downgraded", False))]), c_slices)
+			with self.assertRaises(rwlock_async.RELEASE_ERR_CLS):
+				await c_lock_w.release()
+		eloop.run_until_complete(test_it())
+
+
 if "__main__" == __name__:
 	unittest.main(failfast=False)  # pragma: no cover
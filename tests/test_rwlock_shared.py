@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Unit tests for rwlock_shared."""
+
+import multiprocessing
+import os
+import pickle
+import tempfile
+import threading
+import time
+import unittest
+
+from typing import Any
+from typing import cast
+from typing import List
+
+from readerwriterlock import rwlock
+
+try:
+	import fcntl
+	from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+	raise unittest.SkipTest("rwlock_shared requires POSIX fcntl and python 3.8+ multiprocessing.shared_memory")
+
+from readerwriterlock import rwlock_shared  # noqa: E402
+
+
+def _increment(p_rw_lock: rwlock_shared.RWLockWrite, p_name: str, p_count: int) -> None:
+	"""Increment p_count times the counter of the given shared memory segment, each time under the writer lock (in a child process)."""
+	c_shm = shared_memory.SharedMemory(name=p_name)
+	c_buf = cast(memoryview, c_shm.buf)
+	c_lock_w = p_rw_lock.gen_wlock()
+	c_lock_r = p_rw_lock.gen_rlock()
+	try:
+		for _ in range(p_count):
+			with c_lock_w:
+				c_value = int.from_bytes(bytes(c_buf[:8]), "little")
+				time.sleep(0)
+				c_buf[:8] = (c_value + 1).to_bytes(8, "little")
+			with c_lock_r:
+				pass
+	finally:
+		c_shm.close()
+		p_rw_lock.close()
+
+
+def _increment_file(p_rw_lock: rwlock_shared.RWLockFile, p_count: int) -> None:
+	"""Increment p_count times the counter stored in the file, each time under the writer lock (in a child process)."""
+	c_lock_w = p_rw_lock.gen_wlock()
+	c_lock_r = p_rw_lock.gen_rlock()
+	for _ in range(p_count):
+		with c_lock_w:
+			with open(p_rw_lock.c_path, "r+b") as c_file:
+				c_value = int.from_bytes(c_file.read(8), "little")
+				time.sleep(0)
+				c_file.seek(0)
+				c_file.write((c_value + 1).to_bytes(8, "little"))
+		with c_lock_r:
+			pass
+
+
+def _hold(p_rw_lock: rwlock_shared.RWLockFile, p_ready: Any, p_done: Any) -> None:
+	"""Hold the writer lock until told to stop (in a child process)."""
+	with p_rw_lock.gen_wlock():
+		p_ready.set()
+		p_done.wait(30)
+
+
+class TestRWLockShared(unittest.TestCase):
+	"""Test the RW locks shared between processes."""
+
+	def setUp(self) -> None:
+		"""Test setup."""
+		self.c_rwlock_type = (rwlock_shared.RWLockRead, rwlock_shared.RWLockWrite, rwlock_shared.RWLockFair)
+
+	def new(self, p_rwlock_type: Any, **p_kwargs: Any) -> Any:
+		"""Create a shared RW lock destroyed at the end of the test."""
+		result = p_rwlock_type(**p_kwargs)
+		self.addCleanup(result.unlink)
+		self.addCleanup(result.close)
+		return result
+
+	def test_protocols(self) -> None:
+		"""
+		# Given: a shared RW lock type.
+
+		# When: instantiating it.
+
+		# Then: it is a RW lock whose reader and writer locks are lockable.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Act
+				current_rw_lock = self.new(current_rw_lock_type)
+				# ## Assert
+				self.assertIsInstance(current_rw_lock, rwlock.RWLockable)
+				self.assertIsInstance(current_rw_lock.gen_rlock(), rwlock.Lockable)
+				self.assertIsInstance(current_rw_lock.gen_wlock(), rwlock.Lockable)
+				self.assertFalse(hasattr(current_rw_lock, "__dict__"))
+
+	def test_attach(self) -> None:
+		"""
+		# Given: a shared RW lock.
+
+		# When: attaching to its segment by name (directly or by unpickling it).
+
+		# Then: both instances share the same lock state, attaching with another strategy or to a foreign segment is refused.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = self.new(current_rw_lock_type)
+				# ## Act
+				c_attached = current_rw_lock_type(current_rw_lock.name)
+				c_unpickled = pickle.loads(pickle.dumps(current_rw_lock))
+				# ## Assert
+				c_lock_w = current_rw_lock.gen_wlock()
+				self.assertTrue(c_lock_w.acquire())
+				self.assertFalse(c_attached.gen_rlock().acquire(blocking=False))
+				self.assertFalse(c_unpickled.gen_wlock().acquire(blocking=False))
+				c_lock_w.release()
+				c_lock_r = c_attached.gen_rlock()
+				self.assertTrue(c_lock_r.acquire(blocking=False))
+				self.assertTrue(c_unpickled.gen_rlock().acquire(blocking=False))
+				self.assertFalse(current_rw_lock.gen_wlock().acquire(blocking=False))
+				c_attached.close()
+				c_unpickled.close()
+				for c_other_type in self.c_rwlock_type:
+					if c_other_type is not current_rw_lock_type:
+						self.assertRaises(ValueError, c_other_type, current_rw_lock.name)
+				c_foreign = shared_memory.SharedMemory(create=True, size=64)
+				self.addCleanup(c_foreign.unlink)
+				self.addCleanup(c_foreign.close)
+				self.assertRaises(ValueError, current_rw_lock_type, c_foreign.name)
+
+	def test_timeout(self) -> None:
+		"""
+		# Given: a shared RW lock whose writer lock is held by another thread.
+
+		# When: acquiring its locks with a timeout, with a deadline and without blocking.
+
+		# Then: they give up once expired and leave no trace in the lock state.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = self.new(current_rw_lock_type)
+				c_lock_w = current_rw_lock.gen_wlock()
+				c_thread = threading.Thread(target=c_lock_w.acquire)
+				c_thread.start()
+				c_thread.join()
+				for c_lock in (current_rw_lock.gen_rlock(), current_rw_lock.gen_wlock()):
+					# ## Act
+					c_start = time.perf_counter()
+					result: List[bool] = [c_lock.acquire(timeout=0.05), c_lock.acquire(deadline=time.perf_counter() + 0.05), c_lock.acquire(blocking=False)]
+					# ## Assert
+					self.assertEqual([False, False, False], result)
+					self.assertLessEqual(0.09, time.perf_counter() - c_start)
+				self.assertEqual([0, 1, 0, 0], list(current_rw_lock.c_state[2:6]))
+				c_lock_w.release()
+				self.assertTrue(current_rw_lock.gen_wlock().acquire(timeout=0.05))
+
+	def test_interrupted(self) -> None:
+		"""
+		# Given: a shared RW lock whose writer lock is held.
+
+		# When: a waiting reader or writer is interrupted (KeyboardInterrupt from its time source), before or right after the writer gave back the lock.
+
+		# Then: it leaves the queue or gives back the lock it was granted, the lock state is left clean.
+		"""
+		for current_rw_lock_type in self.c_rwlock_type:
+			for c_release_first in (False, True):
+				for c_is_writer in (False, True):
+					with self.subTest(current_rw_lock_type, release_first=c_release_first, writer=c_is_writer):
+						# ## Arrange
+						current_rw_lock = self.new(current_rw_lock_type)
+						c_lock_w = current_rw_lock.gen_wlock()
+						self.assertTrue(c_lock_w.acquire())
+						c_calls: List[int] = []
+
+						def time_source() -> float:
+							c_calls.append(0)  # pylint: disable=cell-var-from-loop
+							if 1 == len(c_calls) and c_release_first:  # pylint: disable=cell-var-from-loop
+								return time.perf_counter()
+							if c_lock_w.locked(): c_lock_w.release()  # pylint: disable=cell-var-from-loop
+							raise KeyboardInterrupt()
+						c_attached = current_rw_lock_type(current_rw_lock.name, time_source=time_source)
+						self.addCleanup(c_attached.close)
+						c_lock = c_attached.gen_wlock() if c_is_writer else c_attached.gen_rlock()
+						# ## Act
+						with self.assertRaises(KeyboardInterrupt):
+							c_lock.acquire(timeout=5)
+						# ## Assert
+						self.assertFalse(c_lock.locked())
+						self.assertEqual([0, 0, 0, 0], list(current_rw_lock.c_state[2:6]))
+						c_lock_w2 = current_rw_lock.gen_wlock()
+						self.assertTrue(c_lock_w2.acquire(blocking=False))
+						c_lock_w2.release()
+						self.assertTrue(current_rw_lock.gen_rlock().acquire(blocking=False))
+
+	def test_priority(self) -> None:
+		"""
+		# Given: a shared RW lock held by a reader.
+
+		# When: a writer waits for it while a new reader comes in.
+
+		# Then: the new reader gets in right away only with the reader priority, when the writer gives up the waiting readers get in.
+		"""
+		for current_rw_lock_type, c_expected in ((rwlock_shared.RWLockRead, True), (rwlock_shared.RWLockWrite, False), (rwlock_shared.RWLockFair, False)):
+			with self.subTest(current_rw_lock_type):
+				# ## Arrange
+				current_rw_lock = self.new(current_rw_lock_type)
+				c_lock_r1 = current_rw_lock.gen_rlock()
+				c_lock_r2 = current_rw_lock.gen_rlock()
+				c_lock_w = current_rw_lock.gen_wlock()
+				self.assertTrue(c_lock_r1.acquire())
+				c_thread_w = threading.Thread(target=lambda: c_lock_w.acquire(timeout=0.3))  # pylint: disable=cell-var-from-loop
+				c_thread_w.start()
+				time.sleep(0.05)
+				# ## Act
+				result = c_lock_r2.acquire(blocking=False)
+				# ## Assert
+				self.assertEqual(c_expected, result)
+				if not result:
+					self.assertTrue(c_lock_r2.acquire(timeout=5))
+				c_thread_w.join()
+				self.assertFalse(c_lock_w.locked())
+				c_lock_r2.release()
+				c_lock_r1.release()
+				self.assertTrue(c_lock_w.acquire(blocking=False))
+				c_lock_w.release()
+
+	def test_fair_phases(self) -> None:
+		"""
+		# Given: a fair shared RW lock held by a writer, with a reader waiting and then a writer waiting.
+
+		# When: the writer gives back the lock.
+
+		# Then: the waiting reader is admitted before the waiting writer.
+		"""
+		# ## Arrange
+		current_rw_lock = self.new(rwlock_shared.RWLockFair)
+		c_lock_w1 = current_rw_lock.gen_wlock()
+		c_lock_w2 = current_rw_lock.gen_wlock()
+		c_lock_r = current_rw_lock.gen_rlock()
+		self.assertTrue(c_lock_w1.acquire())
+		c_order: List[str] = []
+
+		def reader() -> None:
+			c_lock_r.acquire()
+			c_order.append("r")
+
+		def writer() -> None:
+			c_lock_w2.acquire()
+			c_order.append("w")
+		c_thread_r = threading.Thread(target=reader)
+		c_thread_r.start()
+		time.sleep(0.05)
+		c_thread_w = threading.Thread(target=writer)
+		c_thread_w.start()
+		time.sleep(0.05)
+		# ## Act
+		c_lock_w1.release()
+		c_thread_r.join()
+		time.sleep(0.05)
+		# ## Assert
+		self.assertEqual(["r"], c_order)
+		c_lock_r.release()
+		c_thread_w.join()
+		self.assertEqual(["r", "w"], c_order)
+		c_lock_w2.release()
+
+	def test_multi_process(self) -> None:
+		"""
+		# Given: a shared RW lock and a counter in shared memory.
+
+		# When: several processes increment the counter under the writer lock.
+
+		# Then: no increment is lost.
+		"""
+		# ## Arrange
+		current_rw_lock = self.new(rwlock_shared.RWLockWrite)
+		c_counter = shared_memory.SharedMemory(create=True, size=8)
+		self.addCleanup(c_counter.unlink)
+		self.addCleanup(c_counter.close)
+		c_buf = cast(memoryview, c_counter.buf)
+		c_buf[:8] = bytes(8)
+		c_context = multiprocessing.get_context("spawn")
+		c_processes = [c_context.Process(target=_increment, args=(current_rw_lock, c_counter.name, 200)) for _ in range(4)]
+		# ## Act
+		for c_process in c_processes:
+			c_process.start()
+		for c_process in c_processes:
+			c_process.join()
+		# ## Assert
+		self.assertEqual([0] * 4, [c_process.exitcode for c_process in c_processes])
+		self.assertEqual(800, int.from_bytes(bytes(c_buf[:8]), "little"))
+		self.assertEqual([0, 0, 0, 0], list(current_rw_lock.c_state[2:6]))
+
+
+@unittest.skipUnless("posix" == os.name and hasattr(fcntl, "lockf"), "fcntl record locks are POSIX only")
+class TestRWLockFile(unittest.TestCase):
+	"""Test the RW lock on a file."""
+
+	def setUp(self) -> None:
+		"""Test setup."""
+		c_dir = tempfile.TemporaryDirectory()
+		self.addCleanup(c_dir.cleanup)
+		self.c_path = os.path.join(c_dir.name, "index")
+
+	def test_protocols(self) -> None:
+		"""
+		# Given: a RW lock on a file.
+
+		# When: generating its locks.
+
+		# Then: it is a downgradable RW lock whose writer locks are downgradable, it pickles with its path and byte range.
+		"""
+		# ## Act
+		current_rw_lock = rwlock_shared.RWLockFile(self.c_path)
+		# ## Assert
+		self.assertIsInstance(current_rw_lock, rwlock.RWLockableD)
+		self.assertIsInstance(current_rw_lock.gen_rlock(), rwlock.Lockable)
+		self.assertIsInstance(current_rw_lock.gen_wlock(), rwlock.LockableD)
+		self.assertFalse(hasattr(current_rw_lock, "__dict__"))
+		c_unpickled = pickle.loads(pickle.dumps(rwlock_shared.RWLockFile(self.c_path, 8, 16)))
+		self.assertEqual((self.c_path, 8, 16), (c_unpickled.c_path, c_unpickled.c_start, c_unpickled.c_length))
+
+	def test_ranges(self) -> None:
+		"""
+		# Given: a writer lock held on a byte range of a file.
+
+		# When: locking byte ranges of the same file from other handles.
+
+		# Then: only the overlapping ranges conflict (and all of them without open file description locks).
+		"""
+		for c_ofd in (False, True):
+			with self.subTest(ofd=c_ofd):
+				# ## Arrange
+				self.patch_ofd(c_ofd)
+				current_rw_lock = rwlock_shared.RWLockFile(self.c_path, 100, 10)
+				c_lock_w = current_rw_lock.gen_wlock()
+				self.assertTrue(c_lock_w.acquire())
+				# ## Act
+				result = [
+					current_rw_lock.gen_rlock().acquire(blocking=False),
+					current_rw_lock.gen_wlock(105, 1).acquire(blocking=False),
+					current_rw_lock.gen_rlock(0, 0).acquire(blocking=False),
+				]
+				c_lock_disjoint = [current_rw_lock.gen_rlock(0, 100), current_rw_lock.gen_wlock(110, 0)]
+				# ## Assert
+				self.assertEqual([False, False, False], result)
+				self.assertEqual([c_ofd, c_ofd], [c_lock.acquire(blocking=False) for c_lock in c_lock_disjoint])
+				for c_lock in c_lock_disjoint:
+					if c_lock.locked(): c_lock.release()
+				c_lock_w.release()
+				self.assertFalse(c_lock_w.locked())
+				self.assertRaises(rwlock.RELEASE_ERR_CLS, c_lock_w.release)
+				c_lock_r1 = current_rw_lock.gen_rlock()
+				c_lock_r2 = current_rw_lock.gen_rlock()
+				self.assertTrue(c_lock_r1.acquire(blocking=False))
+				self.assertEqual(c_ofd, c_lock_r2.acquire(blocking=False))
+				self.assertFalse(current_rw_lock.gen_wlock().acquire(blocking=False))
+				c_lock_r1.release()
+				if c_lock_r2.locked(): c_lock_r2.release()
+
+	def test_timeout(self) -> None:
+		"""
+		# Given: a file whose writer lock is held by another process.
+
+		# When: acquiring its locks with a timeout, with a deadline and without blocking.
+
+		# Then: they give up once expired, and succeed once it is released.
+		"""
+		# ## Arrange
+		current_rw_lock = rwlock_shared.RWLockFile(self.c_path)
+		c_context = multiprocessing.get_context("spawn")
+		c_ready = c_context.Event()
+		c_done = c_context.Event()
+		c_process = c_context.Process(target=_hold, args=(current_rw_lock, c_ready, c_done))
+		c_process.start()
+		self.assertTrue(c_ready.wait(30))
+		try:
+			for c_lock in (current_rw_lock.gen_rlock(), current_rw_lock.gen_wlock()):
+				# ## Act
+				c_start = time.perf_counter()
+				result: List[bool] = [c_lock.acquire(timeout=0.05), c_lock.acquire(deadline=time.perf_counter() + 0.05), c_lock.acquire(blocking=False)]
+				# ## Assert
+				self.assertEqual([False, False, False], result)
+				self.assertLessEqual(0.09, time.perf_counter() - c_start)
+		finally:
+			c_done.set()
+			c_process.join()
+		c_lock_w = current_rw_lock.gen_wlock()
+		self.assertTrue(c_lock_w.acquire(timeout=5))
+		c_lock_w.release()
+
+	def test_downgrade(self) -> None:
+		"""
+		# Given: a writer lock held on a file.
+
+		# When: downgrading it.
+
+		# Then: it becomes a reader lock without ever being released: other readers get in, writers only once it is released.
+		"""
+		for c_ofd in (False, True):
+			with self.subTest(ofd=c_ofd):
+				# ## Arrange
+				self.patch_ofd(c_ofd)
+				current_rw_lock = rwlock_shared.RWLockFile(self.c_path)
+				c_lock_w = current_rw_lock.gen_wlock()
+				self.assertRaises(rwlock.RELEASE_ERR_CLS, c_lock_w.downgrade)
+				self.assertTrue(c_lock_w.acquire())
+				# ## Act
+				c_lock_r = c_lock_w.downgrade()
+				# ## Assert
+				self.assertFalse(c_lock_w.locked())
+				self.assertTrue(c_lock_r.locked())
+				c_lock_r2 = current_rw_lock.gen_rlock()
+				self.assertEqual(c_ofd, c_lock_r2.acquire(blocking=False))
+				self.assertFalse(current_rw_lock.gen_wlock().acquire(blocking=False))
+				c_lock_r.release()
+				if c_lock_r2.locked(): c_lock_r2.release()
+				self.assertTrue(c_lock_w.acquire(blocking=False))
+				c_lock_w.release()
+
+	def test_multi_process(self) -> None:
+		"""
+		# Given: a RW lock on a file which stores a counter.
+
+		# When: several processes, with several threads each, increment the counter under the writer lock.
+
+		# Then: no increment is lost.
+		"""
+		# ## Arrange
+		with open(self.c_path, "wb") as c_file:
+			c_file.write(bytes(8))
+		current_rw_lock = rwlock_shared.RWLockFile(self.c_path)
+		c_context = multiprocessing.get_context("spawn")
+		c_processes = [c_context.Process(target=_increment_file, args=(current_rw_lock, 100)) for _ in range(4)]
+		c_threads = [threading.Thread(target=_increment_file, args=(current_rw_lock, 100)) for _ in range(2)]
+		# ## Act
+		for c_process in c_processes:
+			c_process.start()
+		for c_thread in c_threads:
+			c_thread.start()
+		for c_thread in c_threads:
+			c_thread.join()
+		for c_process in c_processes:
+			c_process.join()
+		# ## Assert
+		self.assertEqual([0] * 4, [c_process.exitcode for c_process in c_processes])
+		with open(self.c_path, "rb") as c_file:
+			self.assertEqual(600, int.from_bytes(c_file.read(8), "little"))
+
+	def patch_ofd(self, p_ofd: bool) -> None:
+		"""Use open file description locks or not until the end of the test, skip it without them."""
+		if p_ofd and not hasattr(fcntl, "F_OFD_SETLK"): self.skipTest("no open file description locks (Linux only)")
+		self.addCleanup(setattr, rwlock_shared, "_OFD", rwlock_shared._OFD)
+		rwlock_shared._OFD = p_ofd
+
+
+if "__main__" == __name__:
+	unittest.main(failfast=False)  # pragma: no cover